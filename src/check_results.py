@@ -0,0 +1,280 @@
+# check_results.py
+"""
+Check Results - one compact result type for every validated section
+
+Every validator (the four bespoke ones and validation_engine.py) returns a
+SectionResult. It keeps its checks column-wise instead of one dict per
+check:
+
+    ids         ["S1.1", "S1.2", ...]     interned - one string object per id
+    tiers       bytearray                 index into check_specs.TIERS
+    passed      bytearray                 0 / 1
+    severities  bytearray                 index into SEVERITIES
+    messages    [str | (template, args)]  interned; templates are rendered
+                                          only when a message is read
+
+so a check costs a few bytes plus two shared pointers, and corpus-scale
+validation can keep millions of them in memory. Scores, grade and status
+are computed from the columns. to_dict() gives the stored shape
+(validation_results in DPR state, reports, repair_agent); to_columns() /
+from_columns() the compact JSON form.
+"""
+import sys
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from check_specs import TIERS
+from section_registry import SECTIONS
+
+
+SEVERITIES = ("low", "medium", "high", "critical")
+
+_TIER_CODES = {tier.lower(): code for code, tier in enumerate(TIERS)}
+_SEVERITY_CODES = {severity: code for code, severity in enumerate(SEVERITIES)}
+
+
+def get_grade(percentage: float) -> str:
+    """
+    Convert percentage to letter grade
+    """
+    if percentage >= 95:
+        return "A+"
+    elif percentage >= 90:
+        return "A"
+    elif percentage >= 85:
+        return "A-"
+    elif percentage >= 80:
+        return "B+"
+    elif percentage >= 75:
+        return "B"
+    elif percentage >= 70:
+        return "B-"
+    elif percentage >= 65:
+        return "C+"
+    elif percentage >= 60:
+        return "C"
+    else:
+        return "F"
+
+
+def get_status(percentage: float) -> str:
+    if percentage >= 80:
+        return "PASS"
+    elif percentage >= 70:
+        return "ACCEPTABLE"
+    return "FAIL"
+
+
+def render(message) -> str:
+    """Text of a stored message (plain string or (template, args))"""
+    if isinstance(message, tuple):
+        template, args = message
+        return template.format(*args)
+    return message
+
+
+class Check:
+    """
+    Read-only view of one check of a SectionResult
+    """
+    __slots__ = ("id", "tier", "passed", "severity", "_message")
+
+    def __init__(self, check_id: str, tier: str, passed: bool, severity: str, message):
+        self.id = check_id
+        self.tier = tier
+        self.passed = passed
+        self.severity = severity
+        self._message = message
+
+    @property
+    def message(self) -> str:
+        return render(self._message)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "description": self.message,
+                "passed": self.passed, "severity": self.severity}
+
+    def __repr__(self) -> str:
+        return f"Check({self.id} {'PASS' if self.passed else 'FAIL'}: {self.message})"
+
+
+class SectionResult:
+    """
+    Validation result of one section (checks stored column-wise)
+
+    weights: tier name → weight of its score in overall_score (None = every
+    check counts the same)
+    """
+    __slots__ = ("key", "weights", "ids", "tiers", "passed", "severities", "messages")
+
+    def __init__(self, key: str, weights: Optional[Dict[str, float]] = None):
+        self.key = key
+        self.weights = weights
+        self.ids: List[str] = []
+        self.tiers = bytearray()
+        self.passed = bytearray()
+        self.severities = bytearray()
+        self.messages: List[Any] = []
+
+    # ------------------------------------------------------------------
+    # Recording checks
+    # ------------------------------------------------------------------
+
+    def add(self, tier: str, check_id: str, passed: bool, template: str,
+            args: Tuple = (), severity: str = "medium") -> None:
+        """
+        Record one check; the message is template.format(*args), rendered
+        when read
+        """
+        self.ids.append(sys.intern(check_id))
+        self.tiers.append(_TIER_CODES[tier.lower()])
+        self.passed.append(1 if passed else 0)
+        self.severities.append(_SEVERITY_CODES.get(severity, 1))
+        template = sys.intern(template)
+        self.messages.append((template, tuple(args)) if args else template)
+
+    def add_tier(self, tier_result: Dict[str, Any], tier: Optional[str] = None) -> None:
+        """
+        Record the checks of a tier function's result - "checks" entries
+        ({"id", "description", "passed", "severity"}) or "details" entries
+        ({"check", "name", "status", "message"}, PASS_WITH_WARNING passes)
+        (tier: for results without a "tier" name)
+        """
+        tier = tier or tier_result["tier"]
+        for check in tier_result.get("checks", ()):
+            self.add(tier, check["id"], check["passed"], check["description"],
+                     severity=check.get("severity", "medium"))
+        for detail in tier_result.get("details", ()):
+            self.add(tier, detail["check"], detail["status"] != "FAIL",
+                     detail.get("message") or detail.get("name", ""))
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def check(self, position: int) -> Check:
+        return Check(self.ids[position], TIERS[self.tiers[position]], bool(self.passed[position]),
+                     SEVERITIES[self.severities[position]], self.messages[position])
+
+    def checks(self, tier: Optional[str] = None) -> Iterator[Check]:
+        code = None if tier is None else _TIER_CODES[tier.lower()]
+        for position in range(len(self.ids)):
+            if code is None or self.tiers[position] == code:
+                yield self.check(position)
+
+    def failed(self) -> Iterator[Check]:
+        return (check for check in self.checks() if not check.passed)
+
+    @property
+    def title(self) -> str:
+        spec = SECTIONS.get(self.key)
+        return spec.title if spec else self.key.replace("_", " ").title()
+
+    def tier_counts(self, tier: str) -> Tuple[int, int]:
+        """(passed, total) of one tier"""
+        code = _TIER_CODES[tier.lower()]
+        passed = total = 0
+        for tier_code, ok in zip(self.tiers, self.passed):
+            if tier_code == code:
+                total += 1
+                passed += ok
+        return passed, total
+
+    def tier_score(self, tier: str) -> float:
+        passed, total = self.tier_counts(tier)
+        return (passed / total) * 100 if total else 0.0
+
+    @property
+    def total_checks(self) -> int:
+        return len(self.ids)
+
+    @property
+    def passed_checks(self) -> int:
+        return sum(self.passed)
+
+    @property
+    def overall_score(self) -> float:
+        if self.weights:
+            return sum(self.tier_score(tier) * weight for tier, weight in self.weights.items())
+        return (self.passed_checks / self.total_checks) * 100 if self.ids else 0.0
+
+    @property
+    def grade(self) -> str:
+        return get_grade(self.overall_score)
+
+    @property
+    def status(self) -> str:
+        return get_status(self.overall_score)
+
+    @property
+    def ready_for_submission(self) -> bool:
+        return self.overall_score >= 80
+
+    @property
+    def issues(self) -> List[str]:
+        """Messages of the failed checks"""
+        return [check.message for check in self.failed()]
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Stored shape: scores plus a per-tier breakdown ("structure" ...)
+        with the checks of each tier
+        """
+        breakdown = {}
+        for tier in TIERS:
+            passed, total = self.tier_counts(tier)
+            if not total:
+                continue
+            breakdown[tier.lower()] = {
+                "tier": tier,
+                "score": (passed / total) * 100,
+                "passed": passed,
+                "failed": total - passed,
+                "total": total,
+                "checks": [check.to_dict() for check in self.checks(tier)],
+            }
+        overall_score = self.overall_score
+        return {
+            "section": self.title,
+            "overall_score": round(overall_score, 2),
+            "grade": get_grade(overall_score),
+            "status": get_status(overall_score),
+            "breakdown": breakdown,
+            "issues": self.issues,
+            "ready_for_submission": overall_score >= 80,
+        }
+
+    def to_columns(self) -> Dict[str, Any]:
+        """
+        Compact JSON-ready form - one list/string per column:
+        tiers, passed and severities as digit strings
+        """
+        return {
+            "key": self.key,
+            "weights": self.weights,
+            "ids": self.ids,
+            "tiers": "".join(str(code) for code in self.tiers),
+            "passed": "".join(str(ok) for ok in self.passed),
+            "severities": "".join(str(code) for code in self.severities),
+            "messages": [render(message) for message in self.messages],
+        }
+
+    @classmethod
+    def from_columns(cls, data: Dict[str, Any]) -> "SectionResult":
+        result = cls(data["key"], data.get("weights"))
+        result.ids = [sys.intern(check_id) for check_id in data["ids"]]
+        result.tiers = bytearray(int(code) for code in data["tiers"])
+        result.passed = bytearray(int(ok) for ok in data["passed"])
+        result.severities = bytearray(int(code) for code in data["severities"])
+        result.messages = [sys.intern(message) for message in data["messages"]]
+        return result
+
+    def __repr__(self) -> str:
+        return (f"SectionResult({self.key}: {self.overall_score:.1f}% {self.grade}, "
+                f"{self.passed_checks}/{self.total_checks} checks)")
@@ -0,0 +1,116 @@
+# check_specs.py
+"""
+Check Specs - declarative validation checks for section_registry.py
+
+A section without bespoke validators declares what its text must show as
+a tuple of CheckSpecs (SectionSpec.checks); validation_engine.py runs them:
+
+    heading("## Project Cost")            ## subsection present
+    terms("Risk categories", ("technical risk", "market risk"), min_found=2)
+                                          keyword family: phrases found
+                                          (case-insensitive, whole words,
+                                          singular/plural alike)
+    figures("Timeline in months", "period", min_found=3)
+                                          amount | percent | number | period
+    project_term("cluster_type")          a project_data value is mentioned
+    word_budget(300)                      (min, max) words
+    judge("Specific risks", "Risks are specific to ...")
+                                          LLM judge PASS/FAIL on a requirement
+                                          (only with config.VALIDATION_LLM_JUDGE)
+
+Check ids are assigned by the engine from tier, section number and the
+check's position in the section (S11.1, C11.1, CP11.1, Q11.1 - the prefixes
+of the bespoke validators). Like the registry, this module is pure data.
+"""
+from typing import Optional, Tuple
+
+
+TIERS = ("Structure", "Content", "Compliance", "Quality")
+
+# Check id prefix of each tier
+ID_PREFIXES = {"Structure": "S", "Content": "C", "Compliance": "CP", "Quality": "Q"}
+
+FIGURE_KINDS = ("amount", "percent", "number", "period")
+
+
+class CheckSpec:
+    """
+    One declarative check: kind + tier + what to look for
+    """
+    def __init__(self, kind: str, tier: str, description: str, severity: str = "medium",
+                 phrases: Tuple[str, ...] = (), min_found: int = 1,
+                 max_found: Optional[int] = None, field: str = "", requirement: str = ""):
+        if tier not in TIERS:
+            raise ValueError(f"Unknown tier '{tier}' (one of {', '.join(TIERS)})")
+        self.kind = kind
+        self.tier = tier
+        self.description = description
+        self.severity = severity
+        self.phrases = phrases        # heading title / keyword family / figure kind
+        self.min_found = min_found
+        self.max_found = max_found    # word budgets only
+        self.field = field            # project_data key for project_term
+        self.requirement = requirement  # what the LLM judge verifies
+
+    def __repr__(self) -> str:
+        return f"CheckSpec({self.kind} {self.tier}: {self.description})"
+
+
+def heading(title: str, severity: str = "high") -> CheckSpec:
+    """A "## title" subsection is present"""
+    return CheckSpec("heading", "Structure", f"'{title}' subsection present", severity,
+                     phrases=(title.lstrip("#").strip(),))
+
+
+def topic(description: str, *phrases: str, severity: str = "high") -> CheckSpec:
+    """A topic the prompt asks for is covered (any of the phrases)"""
+    return CheckSpec("terms", "Structure", f"Covers {description}", severity, phrases=phrases)
+
+
+def terms(description: str, phrases: Tuple[str, ...], min_found: int = 1,
+          tier: str = "Content", severity: str = "medium") -> CheckSpec:
+    """At least min_found different phrases of a keyword family are used"""
+    return CheckSpec("terms", tier, description, severity, phrases=phrases, min_found=min_found)
+
+
+def figures(description: str, kind: str = "number", min_found: int = 1,
+            tier: str = "Content", severity: str = "medium") -> CheckSpec:
+    """
+    At least min_found figures of a kind: rupee amounts, percentages, plain
+    numbers or periods ("month 6", "18 months", "Q3", "Year 2")
+    """
+    if kind not in FIGURE_KINDS:
+        raise ValueError(f"Unknown figure kind '{kind}' (one of {', '.join(FIGURE_KINDS)})")
+    return CheckSpec("figures", tier, description, severity, phrases=(kind,), min_found=min_found)
+
+
+def project_term(field: str, tier: str = "Content", severity: str = "medium") -> CheckSpec:
+    """The section names the project's value for a project_data field"""
+    label = field.replace("_", " ")
+    return CheckSpec("project", tier, f"Specific to the project's {label}", severity, field=field)
+
+
+def word_budget(min_words: Optional[int], max_words: Optional[int] = None,
+                severity: str = "medium") -> CheckSpec:
+    """Section length within (min_words, max_words)"""
+    if max_words is None:
+        description = f"At least {min_words} words"
+    elif min_words is None:
+        description = f"At most {max_words} words"
+    else:
+        description = f"{min_words}-{max_words} words"
+    return CheckSpec("words", "Quality", description, severity,
+                     min_found=min_words or 0, max_found=max_words)
+
+
+def judge(description: str, requirement: str, tier: str = "Quality",
+          severity: str = "medium") -> CheckSpec:
+    """LLM judge deciding PASS/FAIL on a requirement the section must meet"""
+    return CheckSpec("judge", tier, description, severity, requirement=requirement)
+
+
+# Checks every generic section gets (cluster and location named)
+PROJECT_SPECIFIC = (
+    project_term("cluster_type"),
+    project_term("location"),
+)
@@ -13,46 +13,132 @@ APP_NAME = "DPR Automation Platform"
 VERSION = "1.0.0"  # 🎉 PRODUCTION READY - All 21 sections complete!
 
 # DPR Sections (MSE-CDP Compliant - ALL 21 SECTIONS COMPLETE!)
-DPR_SECTIONS = [
-    # Core Sections (1-3)
-    "executive_summary",           # Section 1
-    "organization_details",         # Section 2
-    "financial_plan",              # Section 3
-    
-    # Project Overview (4-5)
-    "project_introduction",        # Section 4
-    "cluster_profile",             # Section 5
-    
-    # Technical & Market (6-7)
-    "technical_feasibility",       # Section 6
-    "market_analysis",             # Section 7
-    
-    # Implementation (8)
-    "implementation_timeline",     # Section 8
-    
-    # Management & Analysis (9-13)
-    "management_structure",        # Section 9
-    "economic_viability",          # Section 10
-    "swot_analysis",              # Section 11
-    "risk_analysis",              # Section 12
-    "environmental_impact",        # Section 13
-    
-    # Operations & Compliance (14-18)
-    "quality_assurance",          # Section 14
-    "supply_chain",               # Section 15
-    "infrastructure",             # Section 16
-    "legal_compliance",           # Section 17
-    "human_resource",             # Section 18
-    
-    # Strategy & Monitoring (19-21)
-    "marketing_strategy",         # Section 19
-    "monitoring_framework",       # Section 20
-    "annexures"                   # Section 21
+# Declared once in section_registry.py (order, titles, prompts, validators);
+# re-exported here as config.DPR_SECTIONS for existing callers
+from section_registry import SECTION_KEYS
+DPR_SECTIONS = SECTION_KEYS
+
+# Agent Configuration (used by llm_resilience.py for every LLM call)
+AGENT_TIMEOUT = 300  # seconds - deadline for ONE LLM call attempt
+MAX_RETRIES = 3  # extra attempts after a failed, timed-out or unusable answer
+RETRY_BACKOFF_BASE_SECONDS = 2.0  # exponential backoff with full jitter
+RETRY_BACKOFF_MAX_SECONDS = 30.0
+
+# Hedged Requests
+# Send a duplicate request when a call is slower than the observed p95
+# latency and keep the first answer (costs extra tokens on slow calls only;
+# never used for token-streamed sections)
+HEDGE_REQUESTS = False
+HEDGE_LATENCY_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20  # latencies observed before hedging starts
+
+# LLM Rate Limiting (rate_governor.py - shared by every agent and every
+# concurrent project; waiting calls are served round-robin per project)
+LLM_REQUESTS_PER_MINUTE = 0  # 0 = unlimited
+LLM_TOKENS_PER_MINUTE = 0  # prompt + output tokens, 0 = unlimited
+LLM_EXPECTED_OUTPUT_TOKENS = 1500  # reserved per call, corrected from usage metadata
+LLM_MAX_CONCURRENT_CALLS = 16  # in-flight ceiling; halved on each 429, then regrows
+LLM_MIN_CONCURRENT_CALLS = 1
+LLM_THROTTLE_PAUSE_SECONDS = 5.0  # all calls pause this long after a 429
+
+# Validation Configuration
+# LLM judge for the executive summary's content checks (C1.2 cluster profile
+# quality) and the judge() checks of the registry sections
+# (validation_engine.py) - extra governed LLM calls per validation run
+VALIDATION_LLM_JUDGE = False
+VALIDATION_JUDGE_CONCURRENCY = 4  # judge prompts of one DPR run concurrently
+# Tier results cached in SQLite by (content hash, inputs hash) and each
+# tier's rule version (validation_cache.py): the source of the tier, of the
+# helpers it calls and of the shared validation modules below. Bump the
+# rule-set version for changes the source can't show (data files, models)
+VALIDATION_CACHE = True
+VALIDATION_CACHE_FILE = ".validation_cache.sqlite3"  # relative to output/ unless absolute
+VALIDATION_RULESET_VERSION = "1"
+VALIDATION_HELPER_MODULES = ("section_index", "indian_numbers", "check_results",
+                             "check_specs", "financial_placeholders")
+
+# Targeted Repair (repair_agent.py)
+# Failing subsections found by VALIDATION_AGENT are regenerated one by one
+# and the section re-validated, up to this many rounds per section (0 =
+# validate only). Can be overridden per run with
+# config["configurable"]["repair_rounds"]
+REPAIR_MAX_ROUNDS = 2
+
+# Numeric Consistency Check (consistency_agent.py)
+# Figures stated in the sections (NPV, IRR, DSCR, cost, grant ...) that
+# contradict the financial model are reported in state["consistency"];
+# True = also rewrite them before export (label matching is heuristic, so
+# flag-only is the default)
+CONSISTENCY_AUTO_PATCH = False
+CONSISTENCY_AMOUNT_TOLERANCE = 0.01  # relative - "₹8.2 crore" for ₹8,19,50,000 is fine
+
+# Async Orchestrator Configuration
+# Max sections of ONE DPR generated concurrently on the event loop
+ASYNC_SECTION_CONCURRENCY = 8
+
+# Token Streaming Configuration
+# Stream section content token-by-token (model.stream/astream) to the
+# progress callback, registered listeners and <output_dir>/.streaming/
+# Can be overridden per run with config["configurable"]["stream_tokens"]
+STREAM_SECTION_TOKENS = False
+STREAM_DIR_NAME = ".streaming"
+
+# Financial Placeholders (financial_placeholders.py)
+# Sections are written with {{npv}} / {{irr}} ... placeholders bound to the
+# financial model at validation/export, so generation runs in parallel with
+# financial modeling and financial changes never need new LLM calls
+# (False = figures are baked into the prompts, generation waits for them)
+FINANCIAL_PLACEHOLDERS = True
+
+# Section Store (section_store.py)
+# Section bodies are stored once by content hash; DPR state keeps only
+# {"blob", "chars", "words"} references and loads text on access
+SECTION_STORE_DIR = ".blobs"  # relative to output/ unless absolute
+SECTION_STORE_CACHE_SIZE = 64  # section bodies kept in memory (LRU)
+# Blobs no export manifest references are deleted after each export
+# (export_archive.gc_blobs) once older than the grace period - running and
+# checkpointed DPRs keep their fresh blobs
+SECTION_STORE_GC = True
+SECTION_STORE_GC_GRACE_SECONDS = 7 * 24 * 3600
+
+# Prompt Compiler Configuration (prompt_compiler.py)
+# Store the shared project/financial prefix as Vertex AI cached content and
+# send only the section suffixes (the model must support context caching and
+# the prefix must meet the provider's minimum cache size - otherwise prompts
+# are sent unchanged)
+PROMPT_CONTEXT_CACHE = False
+PROMPT_CONTEXT_CACHE_TTL_SECONDS = 3600
+# Send shared prefix + suffix even without an explicit cache: True / False,
+# or None = only on models with implicit prefix caching (re-sending the
+# prefix 21 times pays off only when the provider caches it by itself)
+PROMPT_SHARED_PREFIX_WITHOUT_CACHE = None
+IMPLICIT_PREFIX_CACHE_MODELS = ("gemini-2.5", "gemini-3")  # model name prefixes
+
+# Batched Section Generation
+# Generate groups of short sections in ONE LLM call (delimited output, split
+# back into dpr_sections; sections that fail to parse are regenerated one
+# by one). Can be overridden per run with config["configurable"]["batch_sections"]
+BATCHED_SECTION_GENERATION = False
+SECTION_BATCH_GROUPS = [
+    ["swot_analysis", "risk_analysis", "environmental_impact"],
+    ["quality_assurance", "supply_chain", "infrastructure"],
+    ["management_structure", "legal_compliance", "human_resource"],
+    ["marketing_strategy", "monitoring_framework", "annexures"],
 ]
 
-# Agent Configuration
-AGENT_TIMEOUT = 300  # seconds
-MAX_RETRIES = 3
+# Batch Runner Configuration (dpr_batch.py)
+BATCH_MAX_CONCURRENT_PROJECTS = 4
+
+# HTTP Service Configuration (dpr_service.py)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+SERVICE_WORKERS = 4             # concurrent DPR runs
+SERVICE_QUEUE_SIZE = 100        # queued jobs before requests get 503
+SERVICE_MAX_FINISHED_JOBS = 500 # finished jobs kept for polling
+
+# Export Configuration
+# Submission documents rendered in-process next to the Markdown files
+EXPORT_DOCUMENT_FORMATS = ["pdf", "docx"]
 
 # Project Metrics (v1.0.0)
 PROJECT_METRICS = {
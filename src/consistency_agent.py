@@ -0,0 +1,295 @@
+# consistency_agent.py
+"""
+Consistency Agent - numeric cross-check between financial state and text
+
+Runs after document generation, before export. Every section is scanned
+ONCE with a single label pattern (NPV, IRR, DSCR, break-even, payback,
+project cost, grant, loan, member units); the figure stated right after
+each label is compared with the source of truth:
+
+    state["dpr_sections"]["financial"]  - metrics, loan_details
+    state["project_data"]               - project_cost, members
+
+Mismatches are recorded in state["consistency"] and, with
+config.CONSISTENCY_AUTO_PATCH (off by default), rewritten in place in the same style the
+model used ("₹2.87 crore" stays in crore, "18.5%" keeps one decimal) so
+the exported files never contradict the financial model.
+
+Threshold statements ("IRR exceeds 10%", "DSCR above 3:1") and figures
+about another subject ("DSCR for year 1", "IRR of comparable clusters in
+2019", "working capital loan amount") are not claims about the project and
+are skipped. So are {{npv}}-style placeholders
+(config.FINANCIAL_PLACEHOLDERS) - they are bound to the model at export.
+"""
+import re
+from typing import Dict, Any, List, Optional
+from termcolor import cprint
+
+from langchain_core.messages import AIMessage
+
+from config import CONSISTENCY_AUTO_PATCH, CONSISTENCY_AMOUNT_TOLERANCE
+from indian_numbers import iter_amounts, format_inr, format_crore, AMOUNT_SCALES
+from section_registry import SECTION_KEYS
+from section_store import section_text, store_section
+
+
+# Label alternatives → metric (longest first inside each alternative)
+METRIC_LABELS = {
+    "npv": r"net present value|npv",
+    "irr": r"internal rate of return|irr",
+    "dscr": r"debt service coverage ratio|dscr",
+    "breakeven": r"break[- ]?even(?: point)?",
+    "payback": r"payback(?: period)?",
+    "project_cost": r"total project cost|project cost",
+    "grant_amount": r"grant amount|grant component|grant support",
+    "loan_amount": r"loan amount|loan component|bank loan",
+}
+
+# How each metric's figure is written
+METRIC_KINDS = {
+    "npv": "amount", "project_cost": "amount", "grant_amount": "amount", "loan_amount": "amount",
+    "irr": "percent", "breakeven": "percent",
+    "dscr": "ratio", "payback": "years",
+}
+
+LABEL_PATTERN = re.compile(
+    "|".join(f"(?P<{metric}>\\b(?:{labels}))" for metric, labels in METRIC_LABELS.items()),
+    re.IGNORECASE
+)
+
+# "50 member units" / "50 cluster members" (count comes before its label)
+MEMBERS_PATTERN = re.compile(
+    r'\b(\d[\d,]*)\s+(?:member units|member enterprises|member msmes|cluster members)\b',
+    re.IGNORECASE
+)
+
+VALUE_PATTERNS = {
+    "percent": re.compile(r'(-?\d+(?:\.\d+)?)\s*%'),
+    # "1.85" / "2:1" / "2x" (a bare integer is more likely a year number)
+    "ratio": re.compile(r'(\d+\.\d+|\d+(?=\s*:\s*1|x\b))(?![\d%])'),
+    "years": re.compile(r'(\d+(?:\.\d+)?)\s*years?', re.IGNORECASE),
+}
+
+# Words that turn the following figure into a threshold, not a claim
+THRESHOLD_WORDS = re.compile(
+    r'exceed|above|below|minimum|maximum|threshold|require|at least|greater than|'
+    r'less than|more than|over|under|benchmark|target|limit|[<>≥≤]',
+    re.IGNORECASE
+)
+
+# Qualifiers that make the figure about something else than the project
+# headline ("DSCR for year 1", "IRR of comparable clusters in 2019",
+# "working capital loan amount", "project cost of the building") - checked
+# between label and figure and just before the label
+OTHER_SUBJECT_WORDS = re.compile(
+    r'\bfor (?:the )?(?:year|yr|month|quarter|phase)\s*\d|\byear\s*\d|\b(?:19|20)\d{2}\b|'
+    r'\bcomparable\b|\bsimilar\b|\bother\b|\bindustry\b|\bsector\b|\baverage\b|'
+    r'\bworking capital\b|\bper (?:unit|member|month|annum|year)\b|'
+    r'\bof the (?!(?:proposed |cfc |whole |entire )?(?:project|cfc|scheme)\b)\w+',
+    re.IGNORECASE
+)
+QUALIFIER_LOOKBEHIND = 30
+
+# A claim's value must follow its label within the same clause
+# ("NPV of {{npv}}" is bound at export and is not a claim)
+CLAIM_WINDOW = 80
+CLAUSE_END = re.compile(r'\n|(?<![Rr]s)\.\s|;|\{\{')
+
+
+# ============================================================================
+# EXPECTED VALUES
+# ============================================================================
+
+def expected_values(project_data: Dict[str, Any], financial_data: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Source-of-truth figures for every metric that has a value
+    """
+    metrics = financial_data.get("metrics", {})
+    loan = financial_data.get("loan_details", {})
+    expected = {
+        "npv": metrics.get("npv"),
+        "irr": metrics.get("irr"),
+        "dscr": metrics.get("dscr"),
+        "breakeven": metrics.get("breakeven_percentage"),
+        "payback": metrics.get("payback_period_years"),
+        "project_cost": project_data.get("project_cost"),
+        "grant_amount": loan.get("grant_amount"),
+        "loan_amount": loan.get("loan_amount"),
+        "members": project_data.get("members"),
+    }
+    return {k: float(v) for k, v in expected.items() if isinstance(v, (int, float)) and v}
+
+
+def _decimals(text: str) -> int:
+    _, _, fraction = text.partition(".")
+    return len(fraction)
+
+
+def _matches(kind: str, claimed: float, expected: float, shown: str) -> bool:
+    """Equal up to how precisely the text states it"""
+    if kind == "amount":
+        return abs(claimed - expected) <= abs(expected) * CONSISTENCY_AMOUNT_TOLERANCE
+    return abs(claimed - expected) <= 0.5 * 10 ** -_decimals(shown) + 1e-9
+
+
+def _restate(kind: str, expected: float, shown: str, scale: str = "") -> str:
+    """Expected value written the way the claim was written"""
+    decimals = _decimals(shown)
+    if kind == "amount":
+        if scale in ("crore", "crores", "cr", "lakh", "lakhs", "lac", "lacs"):
+            amount = format_crore(expected, decimals or 2)
+            # Keep the model's unit when it wrote lakh for a crore-sized value
+            if scale.startswith("la") and "crore" in amount:
+                amount = f"₹{expected / AMOUNT_SCALES['lakh']:.{decimals or 2}f} lakh"
+            return amount
+        return format_inr(expected, decimals)
+    # Add decimals (up to 2) when the claim's precision would misstate it
+    while decimals < 2 and abs(round(expected, decimals) - expected) > 1e-9:
+        decimals += 1
+    if kind == "percent":
+        return f"{expected:.{decimals}f}%"
+    return f"{expected:.{decimals}f}"
+
+
+# ============================================================================
+# CLAIM EXTRACTION
+# ============================================================================
+
+def _other_subject(text: str, label_start: int, label_end: int, value_start: int) -> bool:
+    """True if the clause qualifies the figure (other year, unit, cluster ...)"""
+    if OTHER_SUBJECT_WORDS.search(text, label_end, value_start):
+        return True
+    before_start = max(0, label_start - QUALIFIER_LOOKBEHIND)
+    clause_break = max(text.rfind(mark, before_start, label_start) for mark in ("\n", ". ", ";"))
+    return bool(OTHER_SUBJECT_WORDS.search(text, max(before_start, clause_break + 1), label_start))
+
+
+def _claim_after_label(text: str, metric: str, label_start: int, label_end: int) -> Optional[Dict[str, Any]]:
+    """
+    The figure stated right after a label (None for thresholds, figures
+    about another subject, no figure)
+    """
+    window_end = min(len(text), label_end + CLAIM_WINDOW)
+    clause_end = CLAUSE_END.search(text, label_end, window_end)
+    if clause_end:
+        window_end = clause_end.start()
+
+    kind = METRIC_KINDS[metric]
+    if kind == "amount":
+        found = next(iter_amounts(text, label_end, window_end), None)
+        if not found:
+            return None
+        value, start, end, scale = found
+        shown = re.search(r'\d[\d,]*(?:\.\d+)?', text[start:end]).group(0)
+    else:
+        match = VALUE_PATTERNS[kind].search(text, label_end, window_end)
+        if not match:
+            return None
+        value, start, end, scale = float(match.group(1)), match.start(1), match.end(1), ""
+        shown = match.group(1)
+        if kind == "percent":
+            end = match.end()
+
+    if THRESHOLD_WORDS.search(text, label_end, start):
+        return None
+    if _other_subject(text, label_start, label_end, start):
+        return None
+    return {"metric": metric, "kind": kind, "value": value, "start": start, "end": end,
+            "shown": shown, "scale": scale}
+
+
+def extract_claims(text: str) -> List[Dict[str, Any]]:
+    """
+    Every numeric claim about a tracked metric in one section (one scan)
+    """
+    claims, seen_spans = [], set()
+    for match in LABEL_PATTERN.finditer(text):
+        claim = _claim_after_label(text, match.lastgroup, match.start(), match.end())
+        if claim and claim["start"] not in seen_spans:
+            seen_spans.add(claim["start"])
+            claims.append(claim)
+
+    for match in MEMBERS_PATTERN.finditer(text):
+        claims.append({"metric": "members", "kind": "count",
+                       "value": float(match.group(1).replace(",", "")),
+                       "start": match.start(1), "end": match.end(1),
+                       "shown": match.group(1), "scale": ""})
+    return claims
+
+
+# ============================================================================
+# CHECK + PATCH
+# ============================================================================
+
+def check_section(text: str, expected: Dict[str, float], auto_patch: bool = CONSISTENCY_AUTO_PATCH):
+    """
+    Reconcile one section's claims with the expected values
+
+    Returns:
+        (possibly patched text, claims checked, mismatches)
+    """
+    checked, mismatches = 0, []
+    for claim in extract_claims(text):
+        if claim["metric"] not in expected:
+            continue
+        checked += 1
+        target = expected[claim["metric"]]
+        if _matches(claim["kind"], claim["value"], target, claim["shown"]):
+            continue
+        claim["expected"] = target
+        claim["claimed_text"] = text[claim["start"]:claim["end"]]
+        claim["replacement"] = (str(int(target)) if claim["kind"] == "count"
+                                else _restate(claim["kind"], target, claim["shown"], claim["scale"]))
+        mismatches.append(claim)
+
+    if auto_patch:
+        # Right to left so earlier spans stay valid
+        for claim in sorted(mismatches, key=lambda c: c["start"], reverse=True):
+            text = text[:claim["start"]] + claim["replacement"] + text[claim["end"]:]
+    return text, checked, mismatches
+
+
+def consistency_agent(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Cross-check every generated section against the financial model
+    """
+    print()
+    cprint(f"{'NODE: consistency_agent':-^80}", 'blue', attrs=['bold'])
+
+    dpr_sections = state.get("dpr_sections", {})
+    expected = expected_values(state.get("project_data", {}), dpr_sections.get("financial", {}))
+    if not expected:
+        print("⚠️  No financial data to check against")
+        return {}
+
+    total_checked, report, patched_sections = 0, [], {}
+    for key in SECTION_KEYS:
+        if key not in dpr_sections:
+            continue
+        patched, checked, mismatches = check_section(section_text(dpr_sections[key]), expected)
+        total_checked += checked
+        for claim in mismatches:
+            print(f"  ❌ {key}: {claim['metric']} stated as {claim['claimed_text']!r}, "
+                  f"expected {claim['replacement']!r}")
+            report.append({
+                "section": key,
+                "metric": claim["metric"],
+                "claimed": claim["claimed_text"],
+                "expected": claim["replacement"],
+            })
+        if mismatches and CONSISTENCY_AUTO_PATCH:
+            patched_sections[key] = store_section(patched)
+
+    action = "patched" if CONSISTENCY_AUTO_PATCH else "flagged"
+    print(f"\n🔢 Checked {total_checked} numeric claims: {len(report)} mismatches {action}")
+    return {
+        "dpr_sections": patched_sections,
+        "consistency": {
+            "claims_checked": total_checked,
+            "mismatches": report,
+            "patched": len(report) if CONSISTENCY_AUTO_PATCH else 0,
+        },
+        "messages": [AIMessage(
+            content=f"Numeric consistency check: {total_checked} claims, {len(report)} mismatches {action}."
+        )],
+    }
@@ -2,36 +2,186 @@
 """
 Data Collection Agent - Stage 2
 Extracts and validates project data from user input
+
+Extraction order:
+1. Rule-based extractor - a JSON object, or "Label: value" lines (bullet
+   lists like the dpr_main.py sample) with label synonyms, "₹8.2 crore" /
+   "45 lakh" amounts, "50 units" counts and "60-80%" ranges; when it
+   yields every required field no LLM is called
+2. LLM extraction bound to the ProjectData schema (JSON mode via
+   with_structured_output) for the fields still missing only, retried
+   while the answer holds no JSON object; rule-based values win
 """
 import json
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from termcolor import cprint
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 
 from langchain_core.messages import SystemMessage, AIMessage, HumanMessage
-from langchain_google_vertexai import ChatVertexAI
-from config import LLM_MODEL
+from llm_client import get_llm
+from llm_resilience import invoke_resilient, ainvoke_resilient, response_text
+from indian_numbers import parse_rupee_amount, parse_count, parse_percent_range, PARENTHETICAL_PATTERN
 
 
-def extract_json_from_string(text: str) -> Dict[str, Any]:
+# ============================================================================
+# PROJECT SCHEMA
+# ============================================================================
+
+class ProjectData(BaseModel):
     """
-    Extract JSON from LLM response text
+    Project fields extracted from the user's request
+    (unknown extra fields are kept as-is)
     """
-    if isinstance(text, dict):
-        return text
-    
-    # Try to find JSON in the response
-    match = re.search(r'\{.*?\}', text, re.DOTALL)
+    model_config = ConfigDict(extra="allow")
+
+    cluster_type: Optional[str] = Field(None, description='Type of industry/cluster, e.g. "Printing Industry"')
+    location: Optional[str] = Field(None, description="Full location (city, state)")
+    members: Optional[int] = Field(None, description="Number of units/members in the cluster")
+    project_cost: Optional[int] = Field(None, description="Total project cost in rupees")
+    facility_type: Optional[str] = Field(None, description="Type of Common Facility Centre")
+    grant_scheme: Optional[str] = Field(None, description='Government scheme, e.g. "MSE-CDP"')
+    subsidy_range: Optional[str] = Field(None, description='Subsidy percentage or range, e.g. "60-80%"')
+    turnover: Optional[str] = Field(None, description="Average turnover if mentioned")
+    address: Optional[str] = Field(None, description="Delivery address if mentioned")
+    sector: Optional[str] = Field(None, description="Industry sector")
+
+    @field_validator("members", mode="before")
+    @classmethod
+    def _member_count(cls, value):
+        # "50" / "50 units" / 50.0 → 50
+        if isinstance(value, str):
+            value = parse_count(value)
+        if isinstance(value, float):
+            value = int(round(value))
+        return value
+
+    @field_validator("project_cost", mode="before")
+    @classmethod
+    def _rupee_amount(cls, value):
+        # "82,000,000" / "₹8.2 crore" / 82000000.0 → 82000000
+        if isinstance(value, str):
+            value = parse_rupee_amount(value)
+        if isinstance(value, float):
+            value = int(round(value))
+        return value
+
+
+def coerce_project_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate raw extracted fields against ProjectData
+
+    Fields that fail validation are dropped (reported as missing by
+    validate_project_data) instead of failing the whole extraction.
+    """
+    data = {k: v for k, v in data.items() if v not in (None, "")}
+    while True:
+        try:
+            return ProjectData.model_validate(data).model_dump(exclude_none=True)
+        except ValidationError as e:
+            bad = {error["loc"][0] for error in e.errors() if error.get("loc")}
+            if not bad & set(data):
+                return {}
+            print(f"  ⚠️  Dropping invalid fields: {', '.join(sorted(bad))}")
+            data = {k: v for k, v in data.items() if k not in bad}
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+_json_decoder = json.JSONDecoder()
+
+# "- Field Name: value" lines (bullets optional)
+KEY_VALUE_PATTERN = re.compile(r'^[ \t]*(?:[-*•][ \t]*)?([A-Za-z][A-Za-z ._/()-]*?)[ \t]*:[ \t]*(\S[^\n]*?)[ \t]*$', re.MULTILINE)
+
+# Request labels → ProjectData fields (schema field names also match)
+FIELD_LABELS = {
+    "cluster type": "cluster_type", "type of cluster": "cluster_type", "cluster": "cluster_type",
+    "industry": "cluster_type",
+    "location": "location", "place": "location", "city": "location",
+    "number of members": "members", "no. of members": "members", "members": "members",
+    "number of units": "members", "no. of units": "members", "member units": "members",
+    "units": "members",
+    "project cost": "project_cost", "total project cost": "project_cost", "cost": "project_cost",
+    "total cost": "project_cost", "investment": "project_cost", "budget": "project_cost",
+    "common facility centre": "facility_type", "common facility center": "facility_type",
+    "cfc": "facility_type", "facility": "facility_type", "facility type": "facility_type",
+    "seeking": "grant_scheme", "scheme": "grant_scheme", "grant scheme": "grant_scheme",
+    "grant": "grant_scheme", "government scheme": "grant_scheme",
+    "subsidy": "subsidy_range", "subsidy range": "subsidy_range",
+    "turnover": "turnover", "average turnover": "turnover",
+    "address": "address", "delivery address": "address",
+    "sector": "sector",
+}
+
+KNOWN_SCHEMES = re.compile(r'\b(MSE-CDP|PMEGP|SFURTI|CLCSS|TUFS|PMFME|ZED|CGTMSE)\b', re.IGNORECASE)
+
+
+def parse_grant_scheme(text: str) -> str:
+    """Scheme name, e.g. "MSE-CDP Grant (60-80% subsidy)" → MSE-CDP"""
+    match = KNOWN_SCHEMES.search(text)
     if match:
-        json_str = match.group(0)
+        return match.group(1).upper()
+    return re.sub(r'\s+(?:grant|scheme)$', '', PARENTHETICAL_PATTERN.sub("", text).strip(), flags=re.IGNORECASE)
+
+
+def parse_json_object(text: str) -> Dict[str, Any]:
+    """
+    First JSON object in text (nested objects, braces inside strings and
+    ```json fences are fine), or {} if there is none
+    """
+    start = text.find("{")
+    while start != -1:
         try:
-            return json.loads(json_str)
+            value, _ = _json_decoder.raw_decode(text, start)
+            if isinstance(value, dict):
+                return value
         except json.JSONDecodeError:
             pass
-    
+        start = text.find("{", start + 1)
     return {}
 
 
+def extract_json_from_string(text: str) -> Dict[str, Any]:
+    """
+    Extract JSON from LLM response text
+    """
+    if isinstance(text, dict):
+        return text
+    return parse_json_object(text)
+
+
+def preparse_project_data(text: str) -> Dict[str, Any]:
+    """
+    Rule-based extraction: a JSON object in the request, or "Label: value"
+    lines with known labels (FIELD_LABELS)
+
+    Returns:
+        Validated fields found (may be incomplete or empty)
+    """
+    data = parse_json_object(text)
+    if data:
+        return coerce_project_data(data)
+
+    for label, value in KEY_VALUE_PATTERN.findall(text):
+        label = label.strip().lower()
+        field = FIELD_LABELS.get(label) or label.replace(" ", "_")
+        if field not in ProjectData.model_fields or field in data:
+            continue
+        if field == "grant_scheme":
+            data[field] = parse_grant_scheme(value)
+            # "Seeking: MSE-CDP Grant (60-80% subsidy)"
+            subsidy = parse_percent_range(value)
+            if subsidy:
+                data.setdefault("subsidy_range", subsidy)
+        elif field == "subsidy_range":
+            data[field] = parse_percent_range(value) or value
+        else:
+            data[field] = value
+    return coerce_project_data(data) if data else {}
+
+
 def validate_project_data(project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate required fields and return validation result
@@ -87,24 +237,7 @@ def validate_project_data(project_data: Dict[str, Any]) -> Dict[str, Any]:
     return validation_result
 
 
-def data_collection_agent(state: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Extract structured project data from user input using LLM
-    """
-    print()
-    cprint(f"{'NODE: data_collection_agent':-^80}", 'blue', attrs=['bold'])
-    
-    messages = state.get("messages", [])
-    if not messages:
-        print("⚠️  No messages found in state")
-        return state
-    
-    # Get user input
-    user_input = messages[-1].content if messages else ""
-    print(f"\n📥 Extracting project data from user input...")
-    
-    # System prompt for data extraction
-    system_prompt = """You are a Data Extraction Agent for DPR (Detailed Project Report) generation.
+EXTRACTION_SYSTEM_PROMPT = """You are a Data Extraction Agent for DPR (Detailed Project Report) generation.
 
 Your task is to extract structured project information from the user's input.
 
@@ -135,19 +268,101 @@ Example output:
   "subsidy_range": "60-80%"
 }"""
 
-    sys_msg = SystemMessage(content=system_prompt)
-    human_msg = HumanMessage(content=user_input)
-    
-    # Initialize LLM
-    llm = ChatVertexAI(model_name=LLM_MODEL, temperature=0)
+
+def latest_user_input(state: Dict[str, Any]) -> Optional[str]:
+    """Content of the latest message, or None if there are no messages"""
+    messages = state.get("messages", [])
+    return messages[-1].content if messages else None
+
+
+def structured_extractor(llm):
+    """
+    Model bound to the ProjectData schema (JSON mode, raw response kept
+    for the retry check); the plain model if the client can't bind it
+    """
+    try:
+        return llm.with_structured_output(ProjectData, method="json_mode", include_raw=True)
+    except (AttributeError, NotImplementedError, TypeError, ValueError):
+        return llm
+
+
+def extraction_problem(content: str) -> Optional[str]:
+    """Retry check: the answer must contain a JSON object"""
+    return None if parse_json_object(content) else "no JSON object in response"
+
+
+def read_extraction(response) -> Dict[str, Any]:
+    """
+    Project fields from an extraction response: the schema-parsed object
+    when available, else the JSON object in the raw text
+    """
+    parsed = response.get("parsed") if isinstance(response, dict) else None
+    if isinstance(parsed, BaseModel):
+        return coerce_project_data(parsed.model_dump(exclude_none=True))
+    return coerce_project_data(parse_json_object(response_text(response)))
+
+
+def build_extraction_prompt(state: Dict[str, Any], known: Dict[str, Any] = None,
+                            missing: list = None):
+    """
+    Build the extraction prompt from the latest user message
     
-    # Get structured data
-    prompt = [sys_msg, human_msg]
-    response = llm.invoke(prompt)
+    With `known` fields (from preparse_project_data) the model is asked
+    for the `missing` fields only.
+
+    Returns:
+        [SystemMessage, HumanMessage], or None if there is no user input
+    """
+    user_input = latest_user_input(state)
+    if user_input is None:
+        return None
     
-    # Extract JSON from response
-    project_data = extract_json_from_string(response.content)
+    if known:
+        user_input += (
+            f"\n\nALREADY EXTRACTED (do not change): {json.dumps(known)}"
+            f"\nReturn JSON with ONLY these fields: {', '.join(missing or [])}"
+        )
     
+    sys_msg = SystemMessage(content=EXTRACTION_SYSTEM_PROMPT)
+    human_msg = HumanMessage(content=user_input)
+    return [sys_msg, human_msg]
+
+
+def carried_over_fields(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fields collected before a clarification question (the latest message
+    is then the user's answer and only adds to them)
+    """
+    if not state.get("clarification", {}).get("missing_fields"):
+        return {}
+    return {field: value for field, value in state.get("project_data", {}).items()
+            if field in ProjectData.model_fields and value}
+
+
+def rule_based_extraction(state: Dict[str, Any]):
+    """
+    Run the rule-based extractor on the latest user message
+    (merged over the fields collected before a clarification question)
+
+    Returns:
+        (fields found, required fields still missing)
+    """
+    project_data = {**carried_over_fields(state), **preparse_project_data(latest_user_input(state))}
+    missing = validate_project_data(project_data)["missing_fields"]
+    if not missing:
+        print(f"\n⚡ Project data parsed directly from the request (no LLM call)")
+    elif project_data:
+        print(f"\n⚡ Parsed {len(project_data)} fields directly; LLM needed for: {', '.join(missing)}")
+    return project_data, missing
+
+
+def apply_extracted_data(project_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate the extracted fields
+
+    Returns:
+        State update (project_data, validation, message)
+    """
     if not project_data:
         print("⚠️  Could not extract structured data from user input")
         project_data = {"error": "Failed to parse project data"}
@@ -171,15 +386,114 @@ Example output:
         for warning in validation["warnings"]:
             print(f"     - {warning}")
     
-    # Store in state
-    state["project_data"] = project_data
-    state["validation"] = validation
-    
     # Add data collection message to conversation
     data_msg = AIMessage(
         content=f"Project data collected and validated. Found {len(project_data)} fields."
     )
-    state["messages"].append(data_msg)
     
     print(f"\n✅ Data collection complete")
-    return state
\ No newline at end of file
+    update = {"project_data": project_data, "validation": validation, "messages": [data_msg]}
+    if validation["valid"]:
+        update["clarification"] = {}
+    return update
+
+
+def data_collection_agent(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract structured project data from user input
+    (rule-based first, LLM only for fields it cannot resolve)
+    """
+    print()
+    cprint(f"{'NODE: data_collection_agent':-^80}", 'blue', attrs=['bold'])
+    
+    if latest_user_input(state) is None:
+        print("⚠️  No messages found in state")
+        return {}
+    
+    project_data, missing = rule_based_extraction(state)
+    if not missing:
+        return apply_extracted_data(project_data)
+    
+    print(f"\n📥 Extracting project data from user input...")
+    
+    # Get structured data (rule-based values win)
+    prompt = build_extraction_prompt(state, project_data, missing)
+    extractor = structured_extractor(get_llm(temperature=0))
+    response = invoke_resilient(extractor, prompt, check=extraction_problem, key="data_collection")
+    
+    return apply_extracted_data({**read_extraction(response), **project_data})
+
+
+async def data_collection_agent_async(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async variant of data_collection_agent (non-blocking LLM call)
+    """
+    print()
+    cprint(f"{'NODE: data_collection_agent (async)':-^80}", 'blue', attrs=['bold'])
+    
+    if latest_user_input(state) is None:
+        print("⚠️  No messages found in state")
+        return {}
+    
+    project_data, missing = rule_based_extraction(state)
+    if not missing:
+        return apply_extracted_data(project_data)
+    
+    print(f"\n📥 Extracting project data from user input...")
+    
+    prompt = build_extraction_prompt(state, project_data, missing)
+    extractor = structured_extractor(get_llm(temperature=0))
+    response = await ainvoke_resilient(extractor, prompt, check=extraction_problem, key="data_collection")
+    
+    return apply_extracted_data({**read_extraction(response), **project_data})
+
+
+# ============================================================================
+# CLARIFICATION (graph routes here while validation["valid"] is False)
+# ============================================================================
+
+# Field → (label the rule-based extractor understands, example answer)
+CLARIFICATION_FIELDS = {
+    "cluster_type": ("Cluster Type", "Printing Industry"),
+    "location": ("Location", "Tirupati, Andhra Pradesh"),
+    "members": ("Number of Members", "50 units"),
+    "project_cost": ("Project Cost", "₹8.2 crore"),
+    "facility_type": ("Common Facility Centre", "Digital Printing Equipment"),
+    "grant_scheme": ("Seeking", "MSE-CDP Grant (60-80% subsidy)"),
+}
+
+
+def clarification_question(missing_fields: list) -> str:
+    """
+    Question asking for exactly the missing fields, in "Label: value" form
+    so the answer is parsed without an LLM call
+    """
+    lines = [f"- {CLARIFICATION_FIELDS[field][0]}: (e.g. {CLARIFICATION_FIELDS[field][1]})"
+             if field in CLARIFICATION_FIELDS else f"- {field}:"
+             for field in missing_fields]
+    return ("To generate the DPR I still need the following details. "
+            "Please reply in this format:\n\n" + "\n".join(lines))
+
+
+def clarification_agent(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ask for the missing project fields and stop before any generation
+
+    The run ends here; to resume, append the user's answer as a
+    HumanMessage to the final state and invoke the graph again - data
+    collection merges the answer into the fields already collected.
+    """
+    print()
+    cprint(f"{'NODE: clarification_agent':-^80}", 'yellow', attrs=['bold'])
+    
+    missing = state.get("validation", {}).get("missing_fields") or list(CLARIFICATION_FIELDS)
+    question = clarification_question(missing)
+    
+    print(f"❓ Missing fields: {', '.join(missing)}")
+    print("⏸️  Skipping financial modeling and section generation until they are provided")
+    
+    return {
+        "clarification": {"missing_fields": missing, "question": question},
+        "current_stage": "awaiting_clarification",
+        "messages": [AIMessage(content=question)],
+    }
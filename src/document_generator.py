@@ -37,1711 +37,396 @@ Stage 8 (3 FINAL sections):
 20. Monitoring & Evaluation Framework
 21. Annexures & Supporting Documents
 
-Uses: Template structure + LLM content enhancement
+Uses: Section specs from section_registry.py (prompt, required headings,
+      word budget) driven by one engine (generate_section)
 Format: Markdown
 Content: Real data from collected project_data and financial metrics
 Status: 100% COMPLETE! 🎉
 """
+import os
+import re
 import json
+import asyncio
+import contextlib
 from typing import Dict, Any
 from termcolor import cprint
 
-from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_google_vertexai import ChatVertexAI
-from config import LLM_MODEL
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from langchain_core.runnables import RunnableConfig
+from llm_client import get_llm
+from llm_resilience import invoke_resilient, ainvoke_resilient
+from file_export_agent import get_output_directory
+from prompt_compiler import create_prompt_compiler
+from section_registry import (
+    SectionSpec, SECTION_REGISTRY, SECTIONS, SECTION_KEYS, TOTAL_SECTIONS,
+    build_prompt_context
+)
+from financial_placeholders import (
+    has_placeholders, bind_placeholders, financial_values, PLACEHOLDER_RULE
+)
+from section_store import store_sections
+from config import (
+    ASYNC_SECTION_CONCURRENCY, STREAM_SECTION_TOKENS, STREAM_DIR_NAME,
+    BATCHED_SECTION_GENERATION, SECTION_BATCH_GROUPS, FINANCIAL_PLACEHOLDERS
+)
 
 
 # ============================================================================
-# SECTION TEMPLATES
+# SECTION ENGINE (driven by section_registry.SECTION_REGISTRY)
 # ============================================================================
 
-def get_executive_summary_template() -> str:
+def build_section_prompt(spec: SectionSpec, project_data: Dict, financial_data: Dict = None,
+                         placeholders: bool = FINANCIAL_PLACEHOLDERS) -> list:
     """
-    Template for Executive Summary section
-    Structure is predefined, content filled by LLM
+    [SystemMessage, HumanMessage] for one section from its spec
+    (financial figures as {{npv}} placeholders when `placeholders` is set)
     """
-    template = """# EXECUTIVE SUMMARY
-
-## Project Overview
-{project_overview}
-
-## Cluster Profile
-{cluster_profile}
-
-## Financial Highlights
-{financial_highlights}
-
-## Expected Impact
-{expected_impact}
-
-## Recommendation
-{recommendation}
-"""
-    return template
-
-
-def get_organization_details_template() -> str:
-    """
-    Template for Organization Details section
-    """
-    template = """# ORGANIZATION DETAILS
-
-## Cluster Information
-{cluster_info}
-
-## Membership Structure
-{membership_structure}
-
-## Common Facility Centre
-{cfc_details}
-
-## Geographic Coverage
-{geographic_coverage}
-
-## Governance Structure
-{governance_structure}
-"""
-    return template
-
-
-def get_financial_plan_template() -> str:
-    """
-    Template for Financial Plan section
-    Uses calculated financial metrics
-    """
-    template = """# FINANCIAL PLAN
-
-## Project Cost Breakdown
-{cost_breakdown}
-
-## Funding Structure
-{funding_structure}
-
-## Financial Viability Metrics
-{financial_metrics}
-
-## Revenue Projections
-{revenue_projections}
-
-## Debt Service Analysis
-{debt_service_analysis}
-
-## Financial Feasibility Assessment
-{feasibility_assessment}
-"""
-    return template
-
-
-# ============================================================================
-# STAGE 5: NEW SECTION TEMPLATES
-# ============================================================================
-
-def get_project_introduction_template() -> str:
-    """
-    Template for Project Introduction & Background section
-    """
-    template = """# PROJECT INTRODUCTION & BACKGROUND
-
-## Project Genesis
-{project_genesis}
-
-## Problem Statement
-{problem_statement}
-
-## Project Objectives
-{project_objectives}
-
-## Expected Outcomes
-{expected_outcomes}
-
-## Project Scope
-{project_scope}
-"""
-    return template
-
-
-def get_cluster_profile_template() -> str:
-    """
-    Template for Cluster Profile Analysis section
-    """
-    template = """# CLUSTER PROFILE ANALYSIS
-
-## Cluster Overview
-{cluster_overview}
-
-## Industry Characteristics
-{industry_characteristics}
-
-## Current Challenges
-{current_challenges}
-
-## Competitive Advantages
-{competitive_advantages}
-
-## Growth Potential
-{growth_potential}
-"""
-    return template
-
-
-def get_technical_feasibility_template() -> str:
-    """
-    Template for Technical Feasibility Study section
-    """
-    template = """# TECHNICAL FEASIBILITY STUDY
-
-## Technology Overview
-{technology_overview}
-
-## Equipment & Machinery
-{equipment_machinery}
-
-## Production Process
-{production_process}
-
-## Capacity Analysis
-{capacity_analysis}
-
-## Technical Specifications
-{technical_specifications}
-
-## Technology Transfer & Training
-{technology_training}
-"""
-    return template
-
-
-def get_market_analysis_template() -> str:
-    """
-    Template for Market Analysis & Demand Assessment section
-    """
-    template = """# MARKET ANALYSIS & DEMAND ASSESSMENT
-
-## Market Size & Trends
-{market_size_trends}
-
-## Target Market Segments
-{target_segments}
-
-## Competition Analysis
-{competition_analysis}
-
-## Demand Projections
-{demand_projections}
-
-## Market Entry Strategy
-{market_entry}
-"""
-    return template
-
-
-def get_implementation_schedule_template() -> str:
-    """
-    Template for Implementation Schedule & Timeline section
-    """
-    template = """# IMPLEMENTATION SCHEDULE & TIMELINE
-
-## Project Phases
-{project_phases}
-
-## Timeline & Milestones
-{timeline_milestones}
-
-## Critical Path Activities
-{critical_path}
-
-## Resource Deployment Plan
-{resource_deployment}
-
-## Monitoring Checkpoints
-{monitoring_checkpoints}
-"""
-    return template
-
-
-# ============================================================================
-# STAGE 6: NEW SECTION TEMPLATES
-# ============================================================================
-
-def get_management_structure_template() -> str:
-    """
-    Template for Management & Organizational Structure section
-    """
-    template = """# MANAGEMENT & ORGANIZATIONAL STRUCTURE
-
-## Organizational Framework
-{organizational_framework}
-
-## Management Team
-{management_team}
-
-## Roles & Responsibilities
-{roles_responsibilities}
-
-## Governance Structure
-{governance_structure}
-
-## Decision-Making Process
-{decision_making}
-"""
-    return template
-
-
-def get_economic_viability_template() -> str:
-    """
-    Template for Economic & Commercial Viability section
-    """
-    template = """# ECONOMIC & COMMERCIAL VIABILITY
-
-## Economic Impact Analysis
-{economic_impact}
-
-## Commercial Feasibility
-{commercial_feasibility}
-
-## Cost-Benefit Analysis
-{cost_benefit}
-
-## Revenue Model
-{revenue_model}
-
-## Sustainability Assessment
-{sustainability_assessment}
-"""
-    return template
-
-
-def get_swot_analysis_template() -> str:
-    """
-    Template for SWOT Analysis section
-    """
-    template = """# SWOT ANALYSIS
-
-## Strengths
-{strengths}
-
-## Weaknesses
-{weaknesses}
-
-## Opportunities
-{opportunities}
-
-## Threats
-{threats}
-
-## Strategic Implications
-{strategic_implications}
-"""
-    return template
-
-
-def get_risk_analysis_template() -> str:
-    """
-    Template for Risk Analysis & Mitigation section
-    """
-    template = """# RISK ANALYSIS & MITIGATION
-
-## Risk Identification
-{risk_identification}
-
-## Risk Assessment
-{risk_assessment}
-
-## Mitigation Strategies
-{mitigation_strategies}
-
-## Contingency Plans
-{contingency_plans}
-
-## Risk Monitoring
-{risk_monitoring}
-"""
-    return template
-
-
-def get_environmental_impact_template() -> str:
-    """
-    Template for Environmental & Social Impact Assessment section
-    """
-    template = """# ENVIRONMENTAL & SOCIAL IMPACT ASSESSMENT
-
-## Environmental Impact
-{environmental_impact}
-
-## Social Impact
-{social_impact}
-
-## Sustainability Measures
-{sustainability_measures}
-
-## Compliance Requirements
-{compliance_requirements}
-
-## CSR Initiatives
-{csr_initiatives}
-"""
-    return template
-
-
-# ============================================================================
-# STAGE 7: NEW SECTION TEMPLATES
-# ============================================================================
-
-def get_quality_assurance_template() -> str:
-    """
-    Template for Quality Assurance & Standards section
-    """
-    template = """# QUALITY ASSURANCE & STANDARDS
-
-## Quality Policy
-{quality_policy}
-
-## Quality Standards & Certifications
-{quality_standards}
-
-## Quality Control Processes
-{quality_control}
-
-## Testing & Inspection
-{testing_inspection}
-
-## Continuous Improvement
-{continuous_improvement}
-"""
-    return template
-
-
-def get_supply_chain_template() -> str:
-    """
-    Template for Raw Material & Supply Chain Management section
-    """
-    template = """# RAW MATERIAL & SUPPLY CHAIN MANAGEMENT
-
-## Raw Material Requirements
-{raw_material_requirements}
-
-## Supplier Identification
-{supplier_identification}
-
-## Supply Chain Strategy
-{supply_chain_strategy}
-
-## Inventory Management
-{inventory_management}
-
-## Logistics & Distribution
-{logistics_distribution}
-"""
-    return template
-
-
-def get_infrastructure_template() -> str:
-    """
-    Template for Infrastructure & Utilities Requirements section
-    """
-    template = """# INFRASTRUCTURE & UTILITIES REQUIREMENTS
-
-## Land & Building Requirements
-{land_building}
-
-## Power & Energy
-{power_energy}
-
-## Water & Effluent Treatment
-{water_treatment}
-
-## Communication & IT Infrastructure
-{communication_it}
-
-## Other Utilities
-{other_utilities}
-"""
-    return template
-
-
-def get_legal_compliance_template() -> str:
-    """
-    Template for Legal & Regulatory Compliance section
-    """
-    template = """# LEGAL & REGULATORY COMPLIANCE
-
-## Legal Structure
-{legal_structure}
-
-## Required Licenses & Permits
-{licenses_permits}
-
-## Regulatory Framework
-{regulatory_framework}
-
-## Compliance Timeline
-{compliance_timeline}
-
-## Legal Risks & Mitigation
-{legal_risks}
-"""
-    return template
-
-
-def get_human_resource_template() -> str:
-    """
-    Template for Human Resource & Manpower Plan section
-    """
-    template = """# HUMAN RESOURCE & MANPOWER PLAN
-
-## Manpower Requirements
-{manpower_requirements}
-
-## Recruitment Strategy
-{recruitment_strategy}
-
-## Training & Development
-{training_development}
-
-## Compensation & Benefits
-{compensation_benefits}
-
-## HR Policies
-{hr_policies}
-"""
-    return template
-
-
-# ============================================================================
-# STAGE 8: FINAL SECTION TEMPLATES (COMPLETION!)
-# ============================================================================
-
-def get_marketing_strategy_template() -> str:
-    """
-    Template for Marketing & Sales Strategy section
-    """
-    template = """# MARKETING & SALES STRATEGY
-
-## Market Positioning
-{market_positioning}
-
-## Marketing Mix (4Ps)
-{marketing_mix}
-
-## Sales Strategy
-{sales_strategy}
-
-## Distribution Channels
-{distribution_channels}
-
-## Promotional Activities
-{promotional_activities}
-"""
-    return template
-
-
-def get_monitoring_framework_template() -> str:
-    """
-    Template for Monitoring & Evaluation Framework section
-    """
-    template = """# MONITORING & EVALUATION FRAMEWORK
-
-## Performance Indicators
-{performance_indicators}
-
-## Monitoring Mechanism
-{monitoring_mechanism}
-
-## Evaluation Methodology
-{evaluation_methodology}
-
-## Reporting Structure
-{reporting_structure}
-
-## Corrective Actions
-{corrective_actions}
-"""
-    return template
-
-
-def get_annexures_template() -> str:
-    """
-    Template for Annexures & Supporting Documents section
-    """
-    template = """# ANNEXURES & SUPPORTING DOCUMENTS
-
-## Financial Documents
-{financial_documents}
-
-## Technical Documents
-{technical_documents}
-
-## Legal Documents
-{legal_documents}
-
-## Organizational Documents
-{organizational_documents}
-
-## Other Supporting Documents
-{other_documents}
-"""
-    return template
-
-
-# ============================================================================
-# CONTENT GENERATORS (Template + LLM)
-# ============================================================================
-
-def generate_executive_summary(project_data: Dict, financial_data: Dict, llm) -> str:
-    """
-    Generate Executive Summary using Template + LLM
-    FIXED: Now properly uses template structure with ## subsections
-    """
-    print("  📝 Generating: Executive Summary")
-    print("     🔧 [DEBUG] Using Template + LLM approach with enforced structure")
-    
-    # Prepare data for LLM
-    cluster_type = project_data.get("cluster_type", "N/A")
-    location = project_data.get("location", "N/A")
-    members = project_data.get("members", 0)
-    cost = project_data.get("project_cost", 0)
-    grant_scheme = project_data.get("grant_scheme", "N/A")
-    facility_type = project_data.get("facility_type", "N/A")
-    
-    metrics = financial_data.get("metrics", {})
-    compliance = financial_data.get("mse_cdp_compliance", {})
-    
-    # LLM prompt for content generation - EXPLICIT STRUCTURE REQUIRED
-    system_prompt = """You are a professional DPR writer specializing in MSME cluster development projects under MSE-CDP scheme.
-
-CRITICAL REQUIREMENTS:
-1. Generate content with EXACT markdown subsection headings (## heading format)
-2. Follow the structure EXACTLY as specified
-3. Write 800-1500 words total
-4. Use formal, professional business language
-5. Be specific with numbers and data
-6. No meta-commentary (don't say "here's a draft" or "based on the data")
-7. Write as if this is the final, polished DPR section
-8. Do NOT include the main heading (# EXECUTIVE SUMMARY) - it will be added automatically"""
-
-    user_prompt = f"""Generate a complete Executive Summary section with EXACTLY these subsections in this order:
-
-## Project Overview
-Write 2-3 paragraphs covering:
-- Introduction to the {cluster_type} cluster in {location}
-- Purpose of the Common Facility Centre ({facility_type})
-- Number of member units ({members})
-- Total project cost (₹{cost:,})
-- Government scheme ({grant_scheme}) with subsidy: "60-80% grant" or "70% subsidy"  ← ADD THIS
-
-## Cluster Profile
-Write 2-3 paragraphs covering:
-- Current status of the cluster
-- Key challenges faced by member units (technology, capital, skills, market access)
-- Existing capabilities and strengths
-- Need for the proposed CFC
-
-## Financial Highlights
-Write 2-3 paragraphs covering:
-- Total Project Cost: ₹{cost:,}
-- Grant/Subsidy breakdown
-- Key financial metrics:
-  * NPV: ₹{metrics.get('npv', 0):,.2f} (must be positive)
-  * IRR: {metrics.get('irr', 0):.2f}% (must be > 10%)
-  * DSCR: {metrics.get('dscr', 0):.2f} (must be > 3:1)
-  * Break-even: {metrics.get('breakeven_percentage', 0):.1f}% capacity
-- Statement of financial viability
-
-## Expected Impact
-Write 2-3 paragraphs covering:
-- Direct employment generation (MUST include specific numbers: e.g., "85 direct jobs")
-- Indirect employment opportunities (MUST include numbers: e.g., "150+ indirect jobs")
-- Revenue/turnover increase projections (MUST include % or absolute numbers: e.g., "40% increase from ₹25 crore to ₹35 crore")
-- Technology upgradation benefits (be specific)
-- Market access improvements (be specific)
-- Skill development outcomes (include numbers if possible)
-- Social and economic benefits to the region
-CRITICAL: Use specific quantitative data throughout (numbers, percentages, amounts)
-
-## Recommendation
-## Recommendation
-Write 1-2 paragraphs with:
-- MUST start with: "This project is strongly recommended for approval under the MSE-CDP scheme"
-- Justify using THESE EXACT WORDS: "financial viability" (mention NPV, IRR, DSCR), "compliance" (MSE-CDP requirements met), and "impact" (employment, economic benefits)
-- Implementation timeline: State "18 months" or similar timeframe  ← ADD THIS
-- Readiness: Mention SPV formation and approvals in progress  ← ADD THIS
-- Summary of key strengths based on data:
-  * Financial viability: NPV ₹{metrics.get('npv', 0):,.2f} (positive), IRR {metrics.get('irr', 0):.2f}% (exceeds 10%), DSCR {metrics.get('dscr', 0):.2f} (exceeds 3:1)
-  * MSE-CDP compliance requirements met
-  * Significant economic and social impact potential
-- Readiness for implementation (mention SPV formation, approvals)
-- Expected outcomes and benefits
-CRITICAL: Base recommendation explicitly on the financial metrics provided above
-
-CRITICAL: 
-- Use EXACT heading format: "## Project Overview" (not "Project Overview:" or "**Project Overview**")
-- Total length: 800-1500 words
-- Be specific with numbers and data provided
-- Professional tone throughout
-- No meta-commentary or draft language"""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for structured content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content.strip()
-    
-    # Verify content has required subsections (basic check)
-    required_subsections = [
-        "## Project Overview",
-        "## Cluster Profile", 
-        "## Financial Highlights",
-        "## Expected Impact",
-        "## Recommendation"
+    context = build_prompt_context(project_data, financial_data, placeholders)
+    user_prompt = spec.user_prompt.format(**context)
+    system_prompt = spec.system_prompt
+    if has_placeholders(user_prompt):
+        system_prompt += "\n\n" + PLACEHOLDER_RULE
+    return [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=user_prompt)
     ]
-    
-    missing_subsections = []
-    for subsection in required_subsections:
-        if subsection not in content:
-            missing_subsections.append(subsection)
-            print(f"     ⚠️  [WARNING] Missing subsection: {subsection}")
-    
-    if missing_subsections:
-        print(f"     ⚠️  [WARNING] LLM output missing {len(missing_subsections)} subsections!")
-        print(f"     💡 [INFO] Consider regenerating or manual review needed")
-    else:
-        print(f"     ✅ [DEBUG] All 5 required subsections present")
-    
-    word_count = len(content.split())
-    print(f"     📊 [DEBUG] Word count: {word_count} (target: 800-1500)")
-    
-    print("     ✅ [DEBUG] Executive Summary generated with proper structure")
-    
-    # Return with main heading
-    return f"# EXECUTIVE SUMMARY\n\n{content}"
-
-def generate_organization_details(project_data: Dict, llm) -> str:
-    """
-    Generate Organization Details using Template + LLM
-    """
-    print("  📝 Generating: Organization Details")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    location = project_data.get("location", "N/A")
-    members = project_data.get("members", 0)
-    facility_type = project_data.get("facility_type", "N/A")
-    
-    system_prompt = """You are a professional DPR writer specializing in MSME cluster development.
-Generate clear, detailed content for the Organization Details section.
-Focus on structure, governance, and operational details.
-Write in formal business language."""
-
-    user_prompt = f"""Generate content for Organization Details section:
-
-PROJECT DATA:
-- Cluster Type: {cluster_type}
-- Location: {location}
-- Number of Members: {members} units
-- Facility Type: {facility_type}
-
-Generate detailed content covering:
-1. CLUSTER INFORMATION - History, current status, key characteristics
-2. MEMBERSHIP STRUCTURE - Member profiles, size distribution, specializations
-3. COMMON FACILITY CENTRE - Detailed description of proposed facility
-4. GEOGRAPHIC COVERAGE - Area covered, accessibility, infrastructure
-5. GOVERNANCE STRUCTURE - Proposed SPV structure, management, decision-making
-
-Write 5-6 paragraphs with specific details. Be professional and comprehensive."""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Organization Details generated")
-    
-    return f"# ORGANIZATION DETAILS\n\n{content}"
-
-
-def generate_financial_plan(project_data: Dict, financial_data: Dict, llm) -> str:
-    """
-    Generate Financial Plan using Template + LLM + Real Metrics
-    FIXED: Now uses structured subsections
-    """
-    print("  📝 Generating: Financial Plan")
-    print("     🔧 [DEBUG] Using structured template with real financial metrics")
-    
-    cost = project_data.get("project_cost", 0)
-    metrics = financial_data.get("metrics", {})
-    loan_details = financial_data.get("loan_details", {})
-    compliance = financial_data.get("mse_cdp_compliance", {})
-    projections = financial_data.get("projections", {})
-    
-    system_prompt = """You are a financial analyst specializing in MSME project financing under MSE-CDP.
-
-CRITICAL REQUIREMENTS:
-1. Generate content with EXACT markdown subsection headings (## heading format)
-2. Follow the structure EXACTLY as specified
-3. Write 1200-2000 words total
-4. Use formal, professional financial language
-5. Be specific with numbers and financial data
-6. No meta-commentary
-7. Write as final polished DPR section
-8. Do NOT include main heading (# FINANCIAL PLAN) - it will be added automatically"""
-
-    user_prompt = f"""Generate a complete Financial Plan section with EXACTLY these subsections in order:
-
-## Project Cost Breakdown
-Write 2-3 paragraphs covering:
-- Total project cost: ₹{cost:,}
-- Breakdown by category (equipment, civil works, training, working capital, contingency)
-- Cost justification and basis of estimates
-- Any cost optimization measures
-
-## Funding Structure  
-Write 2-3 paragraphs covering:
-- Total funding requirement: ₹{cost:,}
-- Grant component: ₹{loan_details.get('grant_amount', 0):,.2f} ({loan_details.get('grant_percentage', 0):.0f}% under MSE-CDP)
-- Loan component: ₹{loan_details.get('loan_amount', 0):,.2f}
-- Member contribution/equity (if any)
-- Funding sources and terms
-- Loan tenure, interest rate, moratorium period
-
-## Financial Viability Metrics
-Write 2-3 paragraphs covering these EXACT metrics:
-- Net Present Value (NPV): ₹{metrics.get('npv', 0):,.2f} ({'positive - PASS' if metrics.get('npv', 0) > 0 else 'negative - FAIL'})
-- Internal Rate of Return (IRR): {metrics.get('irr', 0):.2f}% ({'exceeds 10% - PASS' if metrics.get('irr', 0) > 10 else 'below 10% - FAIL'})
-- Debt Service Coverage Ratio (DSCR): {metrics.get('dscr', 0):.2f} ({'exceeds 3:1 - PASS' if metrics.get('dscr', 0) > 3.0 else 'below 3:1 - FAIL'})
-- Break-even: {metrics.get('breakeven_percentage', 0):.1f}% capacity ({'below 60% - PASS' if metrics.get('breakeven_percentage', 0) < 60 else 'exceeds 60% - FAIL'})
-- Payback Period: {metrics.get('payback_period_years', 0):.1f} years
-- MSE-CDP Compliance: {compliance.get('status', 'UNKNOWN')}
-Explain what each metric means and why the project passes/fails
-
-## Revenue Projections
-Write 2-3 paragraphs covering:
-- Revenue model and sources
-- Year-wise revenue projections ({projections.get('duration_years', 10)} years)
-- Growth assumptions and basis
-- Capacity utilization assumptions
-- Market demand justification
-- Operating expenses and profitability
-
-## Debt Service Analysis
-Write 2-3 paragraphs covering:
-- Loan amount: ₹{loan_details.get('loan_amount', 0):,.2f}
-- Repayment schedule (year-wise)
-- Interest payments
-- Principal repayments  
-- Total debt service obligations
-- DSCR year-wise showing ability to service debt
-- Surplus cash flow analysis
-
-## Financial Feasibility Assessment
-Write 1-2 paragraphs with:
-- Overall financial viability conclusion
-- Key strengths (NPV positive, IRR > 10%, DSCR > 3:1)
-- Risk mitigation for financial sustainability
-- Recommendation on financial feasibility
-
-CRITICAL:
-- Use EXACT heading format: "## Project Cost Breakdown" (not variations)
-- Total length: 1200-2000 words
-- Include all metrics and numbers provided
-- Professional financial analysis tone
-- No meta-commentary"""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for structured content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content.strip()
-    
-    # Verify subsections
-    required_subsections = [
-        "## Project Cost Breakdown",
-        "## Funding Structure",
-        "## Financial Viability Metrics",
-        "## Revenue Projections",
-        "## Debt Service Analysis",
-        "## Financial Feasibility Assessment"
-    ]
-    
-    missing = []
-    for subsection in required_subsections:
-        if subsection not in content:
-            missing.append(subsection)
-            print(f"     ⚠️  [WARNING] Missing: {subsection}")
-    
-    if not missing:
-        print(f"     ✅ [DEBUG] All 6 subsections present")
-    
-    word_count = len(content.split())
-    print(f"     📊 [DEBUG] Word count: {word_count} (target: 1200-2000)")
-    
-    print("     ✅ [DEBUG] Financial Plan generated with structure")
-    
-    return f"# FINANCIAL PLAN\n\n{content}"
-
-# ============================================================================
-# STAGE 5: NEW CONTENT GENERATORS
-# ============================================================================
-
-def generate_project_introduction(project_data: Dict, llm) -> str:
-    """
-    Generate Project Introduction & Background using Template + LLM
-    """
-    print("  📝 Generating: Project Introduction & Background")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    location = project_data.get("location", "N/A")
-    members = project_data.get("members", 0)
-    facility_type = project_data.get("facility_type", "N/A")
-    cost = project_data.get("project_cost", 0)
-    
-    system_prompt = """You are a professional DPR writer specializing in MSME cluster development.
-Generate clear, compelling content for the Project Introduction & Background section.
-Focus on the rationale, context, and strategic importance of the project.
-Write in formal business language suitable for government submissions."""
-
-    user_prompt = f"""Generate content for Project Introduction & Background section:
-
-PROJECT DATA:
-- Cluster Type: {cluster_type}
-- Location: {location}
-- Members: {members} units
-- Facility Type: {facility_type}
-- Project Cost: ₹{cost:,}
-
-Generate detailed content covering:
-1. PROJECT GENESIS - How the project idea originated, stakeholder consultations
-2. PROBLEM STATEMENT - Current challenges faced by cluster members
-3. PROJECT OBJECTIVES - Clear, measurable objectives for the CFC
-4. EXPECTED OUTCOMES - Tangible benefits and impact expected
-5. PROJECT SCOPE - Boundaries and coverage of the project
-
-Write 5-6 comprehensive paragraphs. Be specific and strategic."""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Project Introduction & Background generated")
-    
-    return f"# PROJECT INTRODUCTION & BACKGROUND\n\n{content}"
-
-
-def generate_cluster_profile(project_data: Dict, llm) -> str:
-    """
-    Generate Cluster Profile Analysis using Template + LLM
-    """
-    print("  📝 Generating: Cluster Profile Analysis")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    location = project_data.get("location", "N/A")
-    members = project_data.get("members", 0)
-    
-    system_prompt = """You are an industry analyst specializing in MSME clusters.
-Generate detailed, analytical content for the Cluster Profile Analysis section.
-Include industry-specific insights and competitive dynamics.
-Write professionally with data-driven insights."""
-
-    user_prompt = f"""Generate content for Cluster Profile Analysis:
-
-CLUSTER DATA:
-- Type: {cluster_type}
-- Location: {location}
-- Number of Units: {members}
-
-Generate comprehensive analysis covering:
-1. CLUSTER OVERVIEW - History, evolution, current state
-2. INDUSTRY CHARACTERISTICS - Specific to {cluster_type}
-3. CURRENT CHALLENGES - Infrastructure gaps, technology limitations, market access issues
-4. COMPETITIVE ADVANTAGES - Unique strengths of this cluster
-5. GROWTH POTENTIAL - Future opportunities and expansion possibilities
 
-Write 5-6 detailed paragraphs with industry-specific insights."""
 
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Cluster Profile Analysis generated")
-    
-    return f"# CLUSTER PROFILE ANALYSIS\n\n{content}"
-
-
-def generate_technical_feasibility(project_data: Dict, llm) -> str:
+def missing_financial_data(project_data: Dict, financial_data: Dict) -> bool:
     """
-    Generate Technical Feasibility Study using Template + LLM
+    True if generation has to wait for the financial model (figures are
+    baked into the prompts when config.FINANCIAL_PLACEHOLDERS is off)
     """
-    print("  📝 Generating: Technical Feasibility Study")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    facility_type = project_data.get("facility_type", "N/A")
-    members = project_data.get("members", 0)
-    
-    system_prompt = """You are a technical consultant specializing in manufacturing and production facilities.
-Generate detailed technical content for the Technical Feasibility Study section.
-Include specific equipment, processes, and technical specifications.
-Write with technical accuracy and practical implementation focus."""
-
-    user_prompt = f"""Generate content for Technical Feasibility Study:
-
-PROJECT DATA:
-- Cluster Type: {cluster_type}
-- Facility Type: {facility_type}
-- Serving: {members} member units
-
-Generate technical analysis covering:
-**1. TECHNOLOGY OVERVIEW:** (250-300 words minimum)
-Provide a comprehensive analysis of the technology landscape for {facility_type}:
-- Current technology trends in the {cluster_type} sector
-- Specific technologies being proposed (inkjet, laser, digital, offset, etc.)
-- Technical specifications and capabilities of each technology
-- Comparison of different technology options (advantages/disadvantages)
-- Why the selected technology is appropriate for this cluster
-- Industry standards and best practices
-- Future-readiness and scalability of the technology
-- Integration with existing workflows in member units
-
-Example structure:
-"Modern digital printing technologies suitable for this facility include... [detailed explanation of 2-3 technologies]. The selection of [chosen technology] is based on several factors including... [explain benefits]. This technology enables... [capabilities]. Industry standards such as... [mention standards]. The proposed equipment meets/exceeds... [technical requirements]."
-
-2. EQUIPMENT & MACHINERY (200+ words)
-   - List 3-5 specific equipment with brand/model names (e.g., HP Latex 360, Xerox Iridesse)
-   - Include specifications: dimensions, capacity, power requirements
-   - Installation requirements and space needs
-
-3. PRODUCTION PROCESS (150+ words)
-   - Detailed step-by-step workflow
-   - Quality control checkpoints
-   - Safety procedures
-
-4. CAPACITY ANALYSIS (150+ words)
-   - Quantitative data: impressions/day, sq.m/hour, units/month
-   - Utilization projections with numbers
-   - Shift operations and capacity scaling
-
-5. TECHNICAL SPECIFICATIONS (150+ words)
-   - Quality standards (ISO, dpi, resolution)
-   - Technical parameters with numbers
-   - Industry certifications required
-
-6. TECHNOLOGY TRANSFER & TRAINING (150+ words)
-   - Specific training programs
-   - Duration and manpower requirements
-   - Skill development milestones"""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Technical Feasibility Study generated")
-    
-    return f"# TECHNICAL FEASIBILITY STUDY\n\n{content}"
-
-
-def generate_market_analysis(project_data: Dict, llm) -> str:
-    """
-    Generate Market Analysis & Demand Assessment using Template + LLM
-    """
-    print("  📝 Generating: Market Analysis & Demand Assessment")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    location = project_data.get("location", "N/A")
-    members = project_data.get("members", 0)
-    
-    system_prompt = """You are a market research analyst specializing in MSME sectors.
-Generate comprehensive market analysis for the Market Analysis & Demand Assessment section.
-Include market sizing, trends, competition, and demand projections.
-Use data-driven language with market insights."""
-
-    user_prompt = f"""Generate content for Market Analysis & Demand Assessment:
-
-PROJECT DATA:
-- Industry: {cluster_type}
-- Location: {location}
-- Cluster Size: {members} units
-
-Generate market analysis covering:
-1. MARKET SIZE & TRENDS - Current market size, growth trends, drivers
-2. TARGET MARKET SEGMENTS - B2B/B2C segments, customer profiles
-3. COMPETITION ANALYSIS - Key competitors, market positioning
-4. DEMAND PROJECTIONS - 5-10 year demand forecast with assumptions
-5. MARKET ENTRY STRATEGY - How cluster will access and grow market share
-
-Write 5-6 paragraphs with market data and strategic insights."""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Market Analysis & Demand Assessment generated")
-    
-    return f"# MARKET ANALYSIS & DEMAND ASSESSMENT\n\n{content}"
-
-
-def generate_implementation_schedule(project_data: Dict, llm) -> str:
-    """
-    Generate Implementation Schedule & Timeline using Template + LLM
-    """
-    print("  📝 Generating: Implementation Schedule & Timeline")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cost = project_data.get("project_cost", 0)
-    facility_type = project_data.get("facility_type", "N/A")
-    
-    system_prompt = """You are a project management consultant specializing in infrastructure projects.
-Generate detailed implementation schedule for the Implementation Schedule & Timeline section.
-Include realistic timelines, milestones, and critical path activities.
-Write with project management rigor and practical implementation focus."""
-
-    user_prompt = f"""Generate content for Implementation Schedule & Timeline:
-
-PROJECT DATA:
-- Facility: {facility_type}
-- Budget: ₹{cost:,}
-
-Generate implementation plan covering:
-1. PROJECT PHASES - Pre-implementation, construction, commissioning, operations
-2. TIMELINE & MILESTONES - Month-by-month schedule with key milestones
-3. CRITICAL PATH ACTIVITIES - Dependencies and critical activities
-4. RESOURCE DEPLOYMENT PLAN - When resources (funds, equipment, people) deploy
-5. MONITORING CHECKPOINTS - Review points and progress tracking
-
-Include a realistic 12-18 month implementation timeline. Write 5-6 detailed paragraphs."""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Implementation Schedule & Timeline generated")
-    
-    return f"# IMPLEMENTATION SCHEDULE & TIMELINE\n\n{content}"
-
-
-# ============================================================================
-# STAGE 6: NEW CONTENT GENERATORS
-# ============================================================================
-
-def generate_management_structure(project_data: Dict, llm) -> str:
-    """
-    Generate Management & Organizational Structure using Template + LLM
-    """
-    print("  📝 Generating: Management & Organizational Structure")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    members = project_data.get("members", 0)
-    location = project_data.get("location", "N/A")
-    
-    system_prompt = """You are an organizational development consultant specializing in MSME clusters.
-Generate detailed content for the Management & Organizational Structure section.
-Include governance models, management hierarchy, and decision-making processes.
-Write professionally with focus on practical implementation."""
-
-    user_prompt = f"""Generate content for Management & Organizational Structure:
-
-PROJECT DATA:
-- Cluster Type: {cluster_type}
-- Number of Members: {members} units
-- Location: {location}
-
-Generate organizational structure covering:
-1. ORGANIZATIONAL FRAMEWORK - SPV/Trust structure, legal entity
-2. MANAGEMENT TEAM - Board composition, management positions, qualifications
-3. ROLES & RESPONSIBILITIES - Clear role definitions for each position
-4. GOVERNANCE STRUCTURE - Decision-making authority, reporting lines
-5. DECISION-MAKING PROCESS - Consensus mechanisms, voting procedures
-
-Write 5-6 detailed paragraphs with practical governance details."""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Management & Organizational Structure generated")
-    
-    return f"# MANAGEMENT & ORGANIZATIONAL STRUCTURE\n\n{content}"
-
-
-def generate_economic_viability(project_data: Dict, financial_data: Dict, llm) -> str:
-    """
-    Generate Economic & Commercial Viability using Template + LLM
-    """
-    print("  📝 Generating: Economic & Commercial Viability")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    cost = project_data.get("project_cost", 0)
-    members = project_data.get("members", 0)
-    
-    # Get financial metrics
-    npv = financial_data.get("npv", 0)
-    irr = financial_data.get("irr", 0)
-    payback = financial_data.get("payback_period", 0)
-    
-    system_prompt = """You are a financial analyst specializing in MSME projects.
-Generate comprehensive content for the Economic & Commercial Viability section.
-Include economic impact, commercial feasibility, and sustainability analysis.
-Use data-driven language with financial insights."""
-
-    user_prompt = f"""Generate content for Economic & Commercial Viability:
-
-PROJECT DATA:
-- Industry: {cluster_type}
-- Investment: ₹{cost:,}
-- Member Units: {members}
-- NPV: ₹{npv:,.2f}
-- IRR: {irr}%
-- Payback Period: {payback} years
-
-Generate viability analysis covering:
-1. ECONOMIC IMPACT ANALYSIS - Job creation, GDP contribution, multiplier effects
-2. COMMERCIAL FEASIBILITY - Revenue potential, market demand validation
-3. COST-BENEFIT ANALYSIS - Using NPV, IRR, and other metrics provided
-4. REVENUE MODEL - Income streams, pricing strategy, sustainability
-5. SUSTAINABILITY ASSESSMENT - Long-term viability, scalability
-
-Write 5-6 paragraphs using the financial metrics provided."""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Economic & Commercial Viability generated")
-    
-    return f"# ECONOMIC & COMMERCIAL VIABILITY\n\n{content}"
-
-
-def generate_swot_analysis(project_data: Dict, llm) -> str:
-    """
-    Generate SWOT Analysis using Template + LLM
-    """
-    print("  📝 Generating: SWOT Analysis")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    location = project_data.get("location", "N/A")
-    members = project_data.get("members", 0)
-    facility_type = project_data.get("facility_type", "N/A")
-    
-    system_prompt = """You are a strategic planning consultant specializing in MSME clusters.
-Generate comprehensive SWOT Analysis for the project.
-Be specific, realistic, and strategic in identifying factors.
-Write in clear, business-focused language."""
-
-    user_prompt = f"""Generate SWOT Analysis content:
-
-PROJECT DATA:
-- Cluster Type: {cluster_type}
-- Location: {location}
-- Members: {members} units
-- Facility: {facility_type}
-
-Generate detailed SWOT covering:
-1. STRENGTHS - Internal advantages (skilled workforce, established cluster, location, etc.)
-2. WEAKNESSES - Internal limitations (technology gaps, infrastructure, capital constraints)
-3. OPPORTUNITIES - External favorable factors (market growth, government schemes, exports)
-4. THREATS - External challenges (competition, policy changes, economic factors)
-5. STRATEGIC IMPLICATIONS - How to leverage S, overcome W, exploit O, mitigate T
-
-Write 5-6 detailed paragraphs with specific, actionable insights."""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] SWOT Analysis generated")
-    
-    return f"# SWOT ANALYSIS\n\n{content}"
+    if not financial_data and not FINANCIAL_PLACEHOLDERS:
+        print("⚠️  No financial data available for document generation")
+        return True
+    return False
 
 
-def generate_risk_analysis(project_data: Dict, llm) -> str:
+def finish_section(spec: SectionSpec, content: str) -> str:
     """
-    Generate Risk Analysis & Mitigation using Template + LLM
+    Check an LLM response against the spec and add the main heading
     """
-    print("  📝 Generating: Risk Analysis & Mitigation")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
+    content = content.strip()
+    
+    missing = [heading for heading in spec.required_headings if heading not in content]
+    for heading in missing:
+        print(f"     ⚠️  [WARNING] Missing subsection: {heading}")
+    if missing:
+        print(f"     ⚠️  [WARNING] LLM output missing {len(missing)} subsections!")
+        print(f"     💡 [INFO] Consider regenerating or manual review needed")
+    elif spec.required_headings:
+        print(f"     ✅ [DEBUG] All {len(spec.required_headings)} required subsections present")
     
-    cluster_type = project_data.get("cluster_type", "N/A")
-    cost = project_data.get("project_cost", 0)
-    facility_type = project_data.get("facility_type", "N/A")
+    if spec.word_budget:
+        low, high = spec.word_budget
+        target = f"{low}-{high}" if high else f"{low}+"
+        print(f"     📊 [DEBUG] Word count: {len(content.split())} (target: {target})")
     
-    system_prompt = """You are a risk management consultant specializing in manufacturing and MSME projects.
-Generate comprehensive Risk Analysis & Mitigation strategies.
-Identify specific risks and provide actionable mitigation plans.
-Write with practical risk management focus."""
-
-    user_prompt = f"""Generate content for Risk Analysis & Mitigation:
+    print(f"     ✅ [DEBUG] {spec.title} generated")
+    
+    return f"# {spec.heading}\n\n{content}"
 
-PROJECT DATA:
-- Industry: {cluster_type}
-- Facility: {facility_type}
-- Investment: ₹{cost:,}
 
-Generate risk analysis covering:
-1. RISK IDENTIFICATION - Technical, financial, market, operational, regulatory risks
-2. RISK ASSESSMENT - Probability and impact assessment for each risk
-3. MITIGATION STRATEGIES - Specific actions to reduce/prevent each risk
-4. CONTINGENCY PLANS - Backup plans if risks materialize
-5. RISK MONITORING - How to track and review risks ongoing
+def section_response_problem(spec: SectionSpec, content: str):
+    """
+    Why an LLM response can't be used for a section (None if it can)
+    - an empty answer or missing required subsections triggers a retry
+    """
+    if not content or not content.strip():
+        return "empty response"
+    missing = [heading for heading in spec.required_headings if heading not in content]
+    if missing:
+        return f"missing {len(missing)} required subsections"
+    return None
 
-Write 5-6 detailed paragraphs with specific risks and mitigation strategies."""
 
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Risk Analysis & Mitigation generated")
-    
-    return f"# RISK ANALYSIS & MITIGATION\n\n{content}"
+def bind_figures(content: str, financial_data: Dict) -> str:
+    """
+    Section text with its {{npv}} placeholders bound to financial_data
+    (unchanged without a financial model)
+    """
+    if not financial_data:
+        return content
+    return bind_placeholders(content, financial_values(financial_data))
 
 
-def generate_environmental_impact(project_data: Dict, llm) -> str:
+def generate_section(spec: SectionSpec, project_data: Dict, financial_data: Dict, llm,
+                     bind: bool = True) -> str:
     """
-    Generate Environmental & Social Impact Assessment using Template + LLM
+    Generate one section: spec prompt → LLM → checks → Markdown
+
+    With `bind` (default) the figures are bound into the returned text; the
+    graph passes bind=False and keeps the placeholders until export
+    (financial_placeholders.py)
     """
-    print("  📝 Generating: Environmental & Social Impact Assessment")
+    print(f"  📝 Generating: {spec.title}")
     print("     🔧 [DEBUG] Using Template + LLM approach")
     
-    cluster_type = project_data.get("cluster_type", "N/A")
-    location = project_data.get("location", "N/A")
-    facility_type = project_data.get("facility_type", "N/A")
-    members = project_data.get("members", 0)
-    
-    system_prompt = """You are a sustainability consultant specializing in environmental and social impact.
-Generate comprehensive Environmental & Social Impact Assessment.
-Include compliance, sustainability measures, and CSR initiatives.
-Write with focus on responsible and sustainable operations."""
-
-    user_prompt = f"""Generate content for Environmental & Social Impact Assessment:
-
-PROJECT DATA:
-- Industry: {cluster_type}
-- Location: {location}
-- Facility: {facility_type}
-- Serving: {members} units
-
-Generate impact assessment covering:
-1. ENVIRONMENTAL IMPACT - Emissions, waste management, resource usage, carbon footprint
-2. SOCIAL IMPACT - Employment generation, skill development, community benefits
-3. SUSTAINABILITY MEASURES - Green technologies, renewable energy, waste recycling
-4. COMPLIANCE REQUIREMENTS - Environmental clearances, pollution norms, regulations
-5. CSR INITIATIVES - Community development, education, health programs
-
-Write 5-6 detailed paragraphs with specific environmental and social considerations."""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
+    messages = build_section_prompt(spec, project_data, financial_data)
     
     print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Environmental & Social Impact Assessment generated")
+    response = invoke_resilient(llm, messages, key=spec.key,
+                                check=lambda content: section_response_problem(spec, content))
     
-    return f"# ENVIRONMENTAL & SOCIAL IMPACT ASSESSMENT\n\n{content}"
+    content = finish_section(spec, response.content)
+    return bind_figures(content, financial_data) if bind else content
 
 
 # ============================================================================
-# STAGE 7: NEW CONTENT GENERATORS
+# SECTION GENERATORS (thin wrappers - kept for callers and tests)
 # ============================================================================
 
-def generate_quality_assurance(project_data: Dict, llm) -> str:
-    """
-    Generate Quality Assurance & Standards using Template + LLM
-    """
-    print("  📝 Generating: Quality Assurance & Standards")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    facility_type = project_data.get("facility_type", "N/A")
-    members = project_data.get("members", 0)
-    
-    system_prompt = """You are a quality management consultant specializing in manufacturing and MSME sectors.
-Generate comprehensive content for the Quality Assurance & Standards section.
-Include quality standards, certifications, and continuous improvement processes.
-Write with focus on industry best practices and quality excellence."""
+def generate_executive_summary(project_data: Dict, financial_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["executive_summary"], project_data, financial_data, llm)
 
-    user_prompt = f"""Generate content for Quality Assurance & Standards:
 
-PROJECT DATA:
-- Industry: {cluster_type}
-- Facility: {facility_type}
-- Serving: {members} member units
+def generate_organization_details(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["organization_details"], project_data, None, llm)
 
-Generate quality assurance content covering:
-1. QUALITY POLICY - Quality vision, commitment to excellence
-2. QUALITY STANDARDS & CERTIFICATIONS - ISO standards, industry certifications
-3. QUALITY CONTROL PROCESSES - Inspection points, quality checks
-4. TESTING & INSPECTION - Testing protocols, equipment calibration
-5. CONTINUOUS IMPROVEMENT - Kaizen, Six Sigma, quality improvement cycles
 
-Write 5-6 detailed paragraphs with specific quality management practices."""
+def generate_financial_plan(project_data: Dict, financial_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["financial_plan"], project_data, financial_data, llm)
 
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Quality Assurance & Standards generated")
-    
-    return f"# QUALITY ASSURANCE & STANDARDS\n\n{content}"
 
+def generate_project_introduction(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["project_introduction"], project_data, None, llm)
 
-def generate_supply_chain(project_data: Dict, llm) -> str:
-    """
-    Generate Raw Material & Supply Chain Management using Template + LLM
-    """
-    print("  📝 Generating: Raw Material & Supply Chain Management")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    location = project_data.get("location", "N/A")
-    facility_type = project_data.get("facility_type", "N/A")
-    
-    system_prompt = """You are a supply chain consultant specializing in MSME manufacturing.
-Generate comprehensive content for the Raw Material & Supply Chain Management section.
-Include supplier strategies, inventory management, and logistics.
-Write with practical supply chain optimization focus."""
 
-    user_prompt = f"""Generate content for Raw Material & Supply Chain Management:
+def generate_cluster_profile(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["cluster_profile"], project_data, None, llm)
 
-PROJECT DATA:
-- Industry: {cluster_type}
-- Location: {location}
-- Facility: {facility_type}
 
-Generate supply chain content covering:
-1. RAW MATERIAL REQUIREMENTS - Materials needed, specifications, quantities
-2. SUPPLIER IDENTIFICATION - Local/national suppliers, sourcing strategy
-3. SUPPLY CHAIN STRATEGY - Procurement approach, vendor relationships
-4. INVENTORY MANAGEMENT - Stock levels, reorder points, JIT principles
-5. LOGISTICS & DISTRIBUTION - Transportation, warehousing, distribution
+def generate_technical_feasibility(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["technical_feasibility"], project_data, None, llm)
 
-Write 5-6 detailed paragraphs with specific supply chain strategies."""
 
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Raw Material & Supply Chain Management generated")
-    
-    return f"# RAW MATERIAL & SUPPLY CHAIN MANAGEMENT\n\n{content}"
+def generate_market_analysis(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["market_analysis"], project_data, None, llm)
 
 
-def generate_infrastructure(project_data: Dict, llm) -> str:
-    """
-    Generate Infrastructure & Utilities Requirements using Template + LLM
-    """
-    print("  📝 Generating: Infrastructure & Utilities Requirements")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    facility_type = project_data.get("facility_type", "N/A")
-    location = project_data.get("location", "N/A")
-    cost = project_data.get("project_cost", 0)
-    
-    system_prompt = """You are an infrastructure planning consultant for industrial facilities.
-Generate comprehensive content for the Infrastructure & Utilities Requirements section.
-Include detailed specifications for land, utilities, and infrastructure needs.
-Write with technical accuracy and practical implementation focus."""
-
-    user_prompt = f"""Generate content for Infrastructure & Utilities Requirements:
-
-PROJECT DATA:
-- Industry: {cluster_type}
-- Facility: {facility_type}
-- Location: {location}
-- Investment: ₹{cost:,}
-
-Generate infrastructure requirements covering:
-1. LAND & BUILDING REQUIREMENTS - Area needed, building specifications, layout
-2. POWER & ENERGY - Electricity requirements, backup power, renewable energy
-3. WATER & EFFLUENT TREATMENT - Water supply, consumption, wastewater treatment
-4. COMMUNICATION & IT INFRASTRUCTURE - Internet, networking, software systems
-5. OTHER UTILITIES - Gas, compressed air, HVAC, safety systems
-
-Write 5-6 detailed paragraphs with specific infrastructure specifications."""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Infrastructure & Utilities Requirements generated")
-    
-    return f"# INFRASTRUCTURE & UTILITIES REQUIREMENTS\n\n{content}"
+def generate_implementation_schedule(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["implementation_schedule"], project_data, None, llm)
 
 
-def generate_legal_compliance(project_data: Dict, llm) -> str:
-    """
-    Generate Legal & Regulatory Compliance using Template + LLM
-    """
-    print("  📝 Generating: Legal & Regulatory Compliance")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    location = project_data.get("location", "N/A")
-    grant_scheme = project_data.get("grant_scheme", "N/A")
-    
-    system_prompt = """You are a legal and compliance consultant specializing in MSME regulations.
-Generate comprehensive content for the Legal & Regulatory Compliance section.
-Include all required licenses, permits, and regulatory frameworks.
-Write with detailed compliance requirements and timelines."""
+def generate_management_structure(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["management_structure"], project_data, None, llm)
 
-    user_prompt = f"""Generate content for Legal & Regulatory Compliance:
 
-PROJECT DATA:
-- Industry: {cluster_type}
-- Location: {location}
-- Grant Scheme: {grant_scheme}
+def generate_economic_viability(project_data: Dict, financial_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["economic_viability"], project_data, financial_data, llm)
 
-Generate legal compliance content covering:
-1. LEGAL STRUCTURE - SPV registration, legal entity formation
-2. REQUIRED LICENSES & PERMITS - Factory license, trade license, GST, pollution clearances
-3. REGULATORY FRAMEWORK - Central and state regulations, labor laws, safety norms
-4. COMPLIANCE TIMELINE - When each license/permit must be obtained
-5. LEGAL RISKS & MITIGATION - Regulatory risks, compliance strategies
 
-Write 5-6 detailed paragraphs with specific compliance requirements."""
+def generate_swot_analysis(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["swot_analysis"], project_data, None, llm)
 
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Legal & Regulatory Compliance generated")
-    
-    return f"# LEGAL & REGULATORY COMPLIANCE\n\n{content}"
 
+def generate_risk_analysis(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["risk_analysis"], project_data, None, llm)
 
-def generate_human_resource(project_data: Dict, llm) -> str:
-    """
-    Generate Human Resource & Manpower Plan using Template + LLM
-    """
-    print("  📝 Generating: Human Resource & Manpower Plan")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    members = project_data.get("members", 0)
-    facility_type = project_data.get("facility_type", "N/A")
-    
-    system_prompt = """You are a human resources consultant specializing in manufacturing and MSME sectors.
-Generate comprehensive content for the Human Resource & Manpower Plan section.
-Include staffing requirements, recruitment, training, and HR policies.
-Write with practical HR management and workforce development focus."""
 
-    user_prompt = f"""Generate content for Human Resource & Manpower Plan:
+def generate_environmental_impact(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["environmental_impact"], project_data, None, llm)
 
-PROJECT DATA:
-- Industry: {cluster_type}
-- Facility: {facility_type}
-- Serving: {members} member units
 
-Generate HR plan covering:
-1. MANPOWER REQUIREMENTS - Positions needed, skill requirements, headcount
-2. RECRUITMENT STRATEGY - Hiring approach, local employment, skill sourcing
-3. TRAINING & DEVELOPMENT - Technical training, skill upgradation programs
-4. COMPENSATION & BENEFITS - Salary structure, benefits, incentives
-5. HR POLICIES - Leave policy, performance management, employee welfare
+def generate_quality_assurance(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["quality_assurance"], project_data, None, llm)
 
-Write 5-6 detailed paragraphs with specific HR strategies and workforce plans."""
 
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Human Resource & Manpower Plan generated")
-    
-    return f"# HUMAN RESOURCE & MANPOWER PLAN\n\n{content}"
+def generate_supply_chain(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["supply_chain"], project_data, None, llm)
 
 
-# ============================================================================
-# STAGE 8: FINAL CONTENT GENERATORS (COMPLETION!)
-# ============================================================================
+def generate_infrastructure(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["infrastructure"], project_data, None, llm)
 
-def generate_marketing_strategy(project_data: Dict, llm) -> str:
-    """
-    Generate Marketing & Sales Strategy using Template + LLM
-    """
-    print("  📝 Generating: Marketing & Sales Strategy")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    location = project_data.get("location", "N/A")
-    members = project_data.get("members", 0)
-    facility_type = project_data.get("facility_type", "N/A")
-    
-    system_prompt = """You are a marketing consultant specializing in MSME and manufacturing sectors.
-Generate comprehensive content for the Marketing & Sales Strategy section.
-Include market positioning, marketing mix, sales approach, and promotional strategies.
-Write with practical marketing and business development focus."""
-
-    user_prompt = f"""Generate content for Marketing & Sales Strategy:
-
-PROJECT DATA:
-- Industry: {cluster_type}
-- Location: {location}
-- Members: {members} units
-- Facility: {facility_type}
-
-Generate marketing strategy covering:
-1. MARKET POSITIONING - Value proposition, competitive advantage, target segments
-2. MARKETING MIX (4Ps) - Product strategy, pricing, place/distribution, promotion
-3. SALES STRATEGY - Sales approach, customer acquisition, relationship management
-4. DISTRIBUTION CHANNELS - Direct sales, dealers, online, exports
-5. PROMOTIONAL ACTIVITIES - Advertising, trade fairs, digital marketing, branding
-
-Write 5-6 detailed paragraphs with specific marketing and sales strategies."""
-
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Marketing & Sales Strategy generated")
-    
-    return f"# MARKETING & SALES STRATEGY\n\n{content}"
 
+def generate_legal_compliance(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["legal_compliance"], project_data, None, llm)
 
-def generate_monitoring_framework(project_data: Dict, llm) -> str:
-    """
-    Generate Monitoring & Evaluation Framework using Template + LLM
-    """
-    print("  📝 Generating: Monitoring & Evaluation Framework")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
-    
-    cluster_type = project_data.get("cluster_type", "N/A")
-    members = project_data.get("members", 0)
-    cost = project_data.get("project_cost", 0)
-    
-    system_prompt = """You are a project management consultant specializing in monitoring and evaluation.
-Generate comprehensive content for the Monitoring & Evaluation Framework section.
-Include KPIs, monitoring mechanisms, evaluation methodology, and corrective actions.
-Write with focus on measurable outcomes and continuous improvement."""
 
-    user_prompt = f"""Generate content for Monitoring & Evaluation Framework:
+def generate_human_resource(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["human_resource"], project_data, None, llm)
 
-PROJECT DATA:
-- Industry: {cluster_type}
-- Investment: ₹{cost:,}
-- Serving: {members} member units
 
-Generate monitoring framework covering:
-1. PERFORMANCE INDICATORS - KPIs for financial, operational, social impact metrics
-2. MONITORING MECHANISM - Regular reviews, data collection, tracking systems
-3. EVALUATION METHODOLOGY - Baseline, mid-term, end-term evaluations
-4. REPORTING STRUCTURE - Monthly/quarterly reports, stakeholder communication
-5. CORRECTIVE ACTIONS - Issue identification, intervention strategies, feedback loops
+def generate_marketing_strategy(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["marketing_strategy"], project_data, None, llm)
 
-Write 5-6 detailed paragraphs with specific monitoring and evaluation approaches."""
 
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Monitoring & Evaluation Framework generated")
-    
-    return f"# MONITORING & EVALUATION FRAMEWORK\n\n{content}"
+def generate_monitoring_framework(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["monitoring_framework"], project_data, None, llm)
 
 
 def generate_annexures(project_data: Dict, llm) -> str:
+    return generate_section(SECTIONS["annexures"], project_data, None, llm)
+
+
+def report_progress(config, **event) -> None:
     """
-    Generate Annexures & Supporting Documents using Template + LLM
-    """
-    print("  📝 Generating: Annexures & Supporting Documents")
-    print("     🔧 [DEBUG] Using Template + LLM approach")
+    Send a progress event to the caller, if one is listening
     
-    cluster_type = project_data.get("cluster_type", "N/A")
-    grant_scheme = project_data.get("grant_scheme", "N/A")
-    
-    system_prompt = """You are a documentation specialist for DPR preparation.
-Generate comprehensive content for the Annexures & Supporting Documents section.
-List all required supporting documents and their relevance.
-Write as a structured checklist of required documents."""
+    Callers (e.g. dpr_service.py) pass a callable as
+    config["configurable"]["on_progress"] when invoking the graph.
+    """
+    callback = ((config or {}).get("configurable") or {}).get("on_progress")
+    if callback:
+        try:
+            callback(event)
+        except Exception as e:
+            print(f"  ⚠️  Progress callback failed: {e}")
+
+
+# ============================================================================
+# TOKEN STREAMING
+# ============================================================================
 
-    user_prompt = f"""Generate content for Annexures & Supporting Documents:
+# Callables listener(section_key, text) that receive every streamed token
+_token_listeners = []
 
-PROJECT DATA:
-- Industry: {cluster_type}
-- Grant Scheme: {grant_scheme}
 
-Generate annexures list covering:
-1. FINANCIAL DOCUMENTS - Balance sheets, bank statements, cost estimates, quotes
-2. TECHNICAL DOCUMENTS - Technical specifications, drawings, equipment details
-3. LEGAL DOCUMENTS - Registration certificates, licenses, land documents, MoUs
-4. ORGANIZATIONAL DOCUMENTS - SPV/Trust deed, member list, board resolutions
-5. OTHER SUPPORTING DOCUMENTS - Market studies, feasibility reports, photos
+def add_token_listener(listener) -> None:
+    """Register a callback that receives (section_key, text) for each streamed token"""
+    if listener not in _token_listeners:
+        _token_listeners.append(listener)
 
-Write 5-6 detailed paragraphs listing specific documents required for DPR submission."""
 
-    sys_msg = SystemMessage(content=system_prompt)
-    user_msg = HumanMessage(content=user_prompt)
-    
-    print("     🤖 [DEBUG] Invoking LLM for content generation...")
-    response = llm.invoke([sys_msg, user_msg])
-    content = response.content
-    
-    print("     ✅ [DEBUG] Annexures & Supporting Documents generated")
-    
-    return f"# ANNEXURES & SUPPORTING DOCUMENTS\n\n{content}"
+def remove_token_listener(listener) -> None:
+    """Unregister a callback added with add_token_listener"""
+    if listener in _token_listeners:
+        _token_listeners.remove(listener)
+
+
+def streaming_enabled(config) -> bool:
+    """
+    Token streaming is on when config["configurable"]["stream_tokens"]
+    says so (default: config.STREAM_SECTION_TOKENS)
+    """
+    configurable = (config or {}).get("configurable") or {}
+    return bool(configurable.get("stream_tokens", STREAM_SECTION_TOKENS))
+
+
+def _chunk_text(chunk) -> str:
+    """Text of a streamed message chunk (content may be a list of parts)"""
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    return "".join(
+        part if isinstance(part, str) else part.get("text", "")
+        for part in content
+    )
+
+
+class _StreamingLLM:
+    """
+    Model proxy for the generate_* functions: invoke()/ainvoke() use the
+    real model's stream()/astream() and pass each token to emit() as it
+    arrives, then return the full message as invoke() would
+    
+    A retried call (llm_resilience) calls reset() first and stops any
+    abandoned earlier attempt from emitting further tokens.
+    """
+    streams_tokens = True  # never hedged (listeners would see the section twice)
+
+    def __init__(self, llm, emit, reset=None):
+        self.llm = llm
+        self.emit = emit
+        self.reset = reset
+        self._attempt = 0
+
+    def _start_attempt(self) -> int:
+        self._attempt += 1
+        if self._attempt > 1 and self.reset:
+            self.reset()
+        return self._attempt
+
+    def invoke(self, messages, *args, **kwargs):
+        attempt = self._start_attempt()
+        parts, usage = [], None
+        for chunk in self.llm.stream(messages, *args, **kwargs):
+            if attempt != self._attempt:
+                break
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            text = _chunk_text(chunk)
+            if text:
+                parts.append(text)
+                self.emit(text)
+        return AIMessage(content="".join(parts), usage_metadata=usage)
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        attempt = self._start_attempt()
+        parts, usage = [], None
+        async for chunk in self.llm.astream(messages, *args, **kwargs):
+            if attempt != self._attempt:
+                break
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            text = _chunk_text(chunk)
+            if text:
+                parts.append(text)
+                self.emit(text)
+        return AIMessage(content="".join(parts), usage_metadata=usage)
+
+
+@contextlib.contextmanager
+def section_model(llm, section_key: str, output_dir: str, config):
+    """
+    Model to hand a generate_* function for one section
+    
+    With streaming off this is just `llm`. With streaming on, tokens go
+    to <output_dir>/.streaming/<section_key>.md (flushed per token), to
+    the progress callback as {"type": "token", ...} events and to every
+    registered token listener.
+    """
+    if not streaming_enabled(config):
+        yield llm
+        return
+    
+    stream_dir = os.path.join(output_dir, STREAM_DIR_NAME)
+    os.makedirs(stream_dir, exist_ok=True)
+    
+    with open(os.path.join(stream_dir, f"{section_key}.md"), "w", encoding="utf-8") as stream_file:
+        def emit(text: str) -> None:
+            stream_file.write(text)
+            stream_file.flush()
+            report_progress(config, type="token", section=section_key, text=text)
+            for listener in list(_token_listeners):
+                try:
+                    listener(section_key, text)
+                except Exception as e:
+                    print(f"  ⚠️  Token listener failed: {e}")
+        
+        def reset() -> None:
+            # Retry: the section starts over
+            stream_file.seek(0)
+            stream_file.truncate()
+            report_progress(config, type="token_reset", section=section_key)
+        
+        yield _StreamingLLM(llm, emit, reset)
+
+
+def print_prompt_stats(prompt_stats: Dict[str, Any]) -> None:
+    """Print per-section prompt token counts from PromptCompiler.summary()"""
+    sections = prompt_stats.get("sections", {})
+    if not sections:
+        return
+    
+    print(f"🧮 Prompt tokens (shared prefix: ~{prompt_stats['shared_prefix_tokens']} tokens"
+          f"{', cached' if prompt_stats.get('context_cache') else ''}):")
+    for key, entry in sections.items():
+        actual = f" | billed input: {entry['input_tokens']}" if "input_tokens" in entry else ""
+        print(f"   {key:<25} original ~{entry['original_prompt_tokens']:>5} | "
+              f"section suffix ~{entry['suffix_tokens']:>5} | sent ~{entry['prompt_tokens']:>5}{actual}")
+    print(f"   Total sent: ~{prompt_stats['prompt_tokens']} "
+          f"(original prompts: ~{prompt_stats['original_prompt_tokens']}, "
+          f"section suffixes: ~{prompt_stats['section_suffix_tokens']} "
+          f"+ prefix ~{prompt_stats['shared_prefix_tokens']} once when cached)")
+    print()
 
 
 # ============================================================================
 # MAIN AGENT FUNCTION
 # ============================================================================
 
-def document_generator_agent(state: Dict[str, Any]) -> Dict[str, Any]:
+def document_generator_agent(state: Dict[str, Any], config: RunnableConfig = None) -> Dict[str, Any]:
     """
     Document Generation Agent - Generates ALL 21 DPR sections in Markdown format
     
@@ -1791,11 +476,10 @@ def document_generator_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     
     if not project_data:
         print("⚠️  No project data available for document generation")
-        return state
+        return {}
     
-    if not financial_data:
-        print("⚠️  No financial data available for document generation")
-        return state
+    if missing_financial_data(project_data, financial_data):
+        return {}
     
     print(f"\n📄 Generating DPR sections for {project_data.get('cluster_type', 'project')}...")
     print(f"   Format: Markdown")
@@ -1803,283 +487,316 @@ def document_generator_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     print(f"   Content: Real data")
     print(f"   Stage: 8 (FINAL - 21 sections total!) 🎉\n")
     
-    # Initialize LLM
-    llm = ChatVertexAI(model_name=LLM_MODEL, temperature=0.3)
+    # Initialize LLM + shared-context prompt compiler
+    llm = get_llm(temperature=0.3)
+    compiler = create_prompt_compiler(project_data, financial_data, llm)
     
-    print("🔄 Generating ALL 21 sections:")
+    print(f"🔄 Generating ALL {TOTAL_SECTIONS} sections:")
     print("="*50)
     
-    # ========================================================================
-    # STAGE 4 SECTIONS
-    # ========================================================================
-    
-    # Generate Section 1: Executive Summary
-    try:
-        executive_summary = generate_executive_summary(project_data, financial_data, llm)
-        state["dpr_sections"]["executive_summary"] = executive_summary
-        print("  ✅ Executive Summary complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Executive Summary: {e}")
-        state["dpr_sections"]["executive_summary"] = "# EXECUTIVE SUMMARY\n\nError generating content."
-    
-    print()
-    
-    # Generate Section 2: Organization Details
-    try:
-        organization_details = generate_organization_details(project_data, llm)
-        state["dpr_sections"]["organization_details"] = organization_details
-        print("  ✅ Organization Details complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Organization Details: {e}")
-        state["dpr_sections"]["organization_details"] = "# ORGANIZATION DETAILS\n\nError generating content."
-    
-    print()
-    
-    # Generate Section 3: Financial Plan
-    try:
-        financial_plan = generate_financial_plan(project_data, financial_data, llm)
-        state["dpr_sections"]["financial_plan"] = financial_plan
-        print("  ✅ Financial Plan complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Financial Plan: {e}")
-        state["dpr_sections"]["financial_plan"] = "# FINANCIAL PLAN\n\nError generating content."
-    
-    print()
-    
-    # ========================================================================
-    # STAGE 5 SECTIONS
-    # ========================================================================
-    
-    # Generate Section 4: Project Introduction & Background
-    try:
-        project_intro = generate_project_introduction(project_data, llm)
-        state["dpr_sections"]["project_introduction"] = project_intro
-        print("  ✅ Project Introduction & Background complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Project Introduction: {e}")
-        state["dpr_sections"]["project_introduction"] = "# PROJECT INTRODUCTION & BACKGROUND\n\nError generating content."
-    
-    print()
-    
-    # Generate Section 5: Cluster Profile Analysis
-    try:
-        cluster_profile = generate_cluster_profile(project_data, llm)
-        state["dpr_sections"]["cluster_profile"] = cluster_profile
-        print("  ✅ Cluster Profile Analysis complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Cluster Profile: {e}")
-        state["dpr_sections"]["cluster_profile"] = "# CLUSTER PROFILE ANALYSIS\n\nError generating content."
-    
-    print()
-    
-    # Generate Section 6: Technical Feasibility Study
-    try:
-        technical_feasibility = generate_technical_feasibility(project_data, llm)
-        state["dpr_sections"]["technical_feasibility"] = technical_feasibility
-        print("  ✅ Technical Feasibility Study complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Technical Feasibility: {e}")
-        state["dpr_sections"]["technical_feasibility"] = "# TECHNICAL FEASIBILITY STUDY\n\nError generating content."
-    
-    print()
-    
-    # Generate Section 7: Market Analysis & Demand Assessment
-    try:
-        market_analysis = generate_market_analysis(project_data, llm)
-        state["dpr_sections"]["market_analysis"] = market_analysis
-        print("  ✅ Market Analysis & Demand Assessment complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Market Analysis: {e}")
-        state["dpr_sections"]["market_analysis"] = "# MARKET ANALYSIS & DEMAND ASSESSMENT\n\nError generating content."
-    
-    print()
-    
-    # Generate Section 8: Implementation Schedule & Timeline
-    try:
-        implementation_schedule = generate_implementation_schedule(project_data, llm)
-        state["dpr_sections"]["implementation_schedule"] = implementation_schedule
-        print("  ✅ Implementation Schedule & Timeline complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Implementation Schedule: {e}")
-        state["dpr_sections"]["implementation_schedule"] = "# IMPLEMENTATION SCHEDULE & TIMELINE\n\nError generating content."
-    
-    print()
-    
-    # ========================================================================
-    # STAGE 6 SECTIONS
-    # ========================================================================
-    
-    # Generate Section 9: Management & Organizational Structure
-    try:
-        management_structure = generate_management_structure(project_data, llm)
-        state["dpr_sections"]["management_structure"] = management_structure
-        print("  ✅ Management & Organizational Structure complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Management Structure: {e}")
-        state["dpr_sections"]["management_structure"] = "# MANAGEMENT & ORGANIZATIONAL STRUCTURE\n\nError generating content."
-    
-    print()
-    
-    # Generate Section 10: Economic & Commercial Viability
-    try:
-        economic_viability = generate_economic_viability(project_data, financial_data, llm)
-        state["dpr_sections"]["economic_viability"] = economic_viability
-        print("  ✅ Economic & Commercial Viability complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Economic Viability: {e}")
-        state["dpr_sections"]["economic_viability"] = "# ECONOMIC & COMMERCIAL VIABILITY\n\nError generating content."
-    
-    print()
-    
-    # Generate Section 11: SWOT Analysis
-    try:
-        swot_analysis = generate_swot_analysis(project_data, llm)
-        state["dpr_sections"]["swot_analysis"] = swot_analysis
-        print("  ✅ SWOT Analysis complete")
-    except Exception as e:
-        print(f"  ❌ Error generating SWOT Analysis: {e}")
-        state["dpr_sections"]["swot_analysis"] = "# SWOT ANALYSIS\n\nError generating content."
-    
-    print()
-    
-    # Generate Section 12: Risk Analysis & Mitigation
-    try:
-        risk_analysis = generate_risk_analysis(project_data, llm)
-        state["dpr_sections"]["risk_analysis"] = risk_analysis
-        print("  ✅ Risk Analysis & Mitigation complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Risk Analysis: {e}")
-        state["dpr_sections"]["risk_analysis"] = "# RISK ANALYSIS & MITIGATION\n\nError generating content."
-    
-    print()
-    
-    # Generate Section 13: Environmental & Social Impact Assessment
-    try:
-        environmental_impact = generate_environmental_impact(project_data, llm)
-        state["dpr_sections"]["environmental_impact"] = environmental_impact
-        print("  ✅ Environmental & Social Impact Assessment complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Environmental Impact: {e}")
-        state["dpr_sections"]["environmental_impact"] = "# ENVIRONMENTAL & SOCIAL IMPACT ASSESSMENT\n\nError generating content."
-    
-    print()
-    
-    # ========================================================================
-    # STAGE 7 SECTIONS
-    # ========================================================================
-    
-    # Generate Section 14: Quality Assurance & Standards
-    try:
-        quality_assurance = generate_quality_assurance(project_data, llm)
-        state["dpr_sections"]["quality_assurance"] = quality_assurance
-        print("  ✅ Quality Assurance & Standards complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Quality Assurance: {e}")
-        state["dpr_sections"]["quality_assurance"] = "# QUALITY ASSURANCE & STANDARDS\n\nError generating content."
-    
-    print()
-    
-    # Generate Section 15: Raw Material & Supply Chain Management
-    try:
-        supply_chain = generate_supply_chain(project_data, llm)
-        state["dpr_sections"]["supply_chain"] = supply_chain
-        print("  ✅ Raw Material & Supply Chain Management complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Supply Chain: {e}")
-        state["dpr_sections"]["supply_chain"] = "# RAW MATERIAL & SUPPLY CHAIN MANAGEMENT\n\nError generating content."
+    output_dir = get_output_directory(project_data, state.get("run_id"))
+    if streaming_enabled(config):
+        print(f"   Streaming tokens to: {os.path.join(output_dir, STREAM_DIR_NAME)}\n")
+    
+    batched = {}
+    if batching_enabled(config):
+        batched = generate_section_batches(project_data, financial_data, llm, compiler)
+    
+    sections = {}
+    
+    for index, spec in enumerate(SECTION_REGISTRY, start=1):
+        key = spec.key
+        if key in batched:
+            sections[key] = batched[key]
+            print(f"  ✅ {spec.title} complete (batched)")
+            report_progress(config, type="section", section=key, index=index,
+                            total=TOTAL_SECTIONS, status="complete", batched=True)
+            continue
+        
+        try:
+            with section_model(compiler.model_for(llm), key, output_dir, config) as model:
+                sections[key] = generate_section(
+                    spec, project_data, financial_data, compiler.bind(model, key), bind=False
+                )
+            print(f"  ✅ {spec.title} complete")
+            report_progress(config, type="section", section=key, index=index,
+                            total=TOTAL_SECTIONS, status="complete",
+                            prompt_tokens=compiler.stats.get(key, {}).get("prompt_tokens"))
+        except Exception as e:
+            print(f"  ❌ Error generating {spec.title}: {e}")
+            sections[key] = f"# {spec.heading}\n\nError generating content."
+            report_progress(config, type="section", section=key, index=index,
+                            total=TOTAL_SECTIONS, status="error", error=str(e))
+        
+        if index < TOTAL_SECTIONS:
+            print()
     
+    print("="*50)
     print()
     
-    # Generate Section 16: Infrastructure & Utilities Requirements
-    try:
-        infrastructure = generate_infrastructure(project_data, llm)
-        state["dpr_sections"]["infrastructure"] = infrastructure
-        print("  ✅ Infrastructure & Utilities Requirements complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Infrastructure: {e}")
-        state["dpr_sections"]["infrastructure"] = "# INFRASTRUCTURE & UTILITIES REQUIREMENTS\n\nError generating content."
+    prompt_stats = compiler.summary()
+    compiler.release_context_cache()
+    print_prompt_stats(prompt_stats)
     
-    print()
-    
-    # Generate Section 17: Legal & Regulatory Compliance
-    try:
-        legal_compliance = generate_legal_compliance(project_data, llm)
-        state["dpr_sections"]["legal_compliance"] = legal_compliance
-        print("  ✅ Legal & Regulatory Compliance complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Legal Compliance: {e}")
-        state["dpr_sections"]["legal_compliance"] = "# LEGAL & REGULATORY COMPLIANCE\n\nError generating content."
+    # Summary
+    sections_generated = len([k for k in SECTION_KEYS if k in sections])
     
+    print(f"🎉 Document generation COMPLETE!")
+    print(f"   Sections generated: {sections_generated}/21 (Stage 8 - FINAL!)")
+    print(f"   Progress: {sections_generated}/21 total MSE-CDP sections ({round(sections_generated/21*100, 1)}%)")
+    print(f"   Status: ALL MSE-CDP SECTIONS COMPLETE! 🎊")
+    print(f"   Storage: section_store (state['dpr_sections'] holds references)")
+    print(f"   Format: Markdown")
     print()
     
-    # Generate Section 18: Human Resource & Manpower Plan
-    try:
-        human_resource = generate_human_resource(project_data, llm)
-        state["dpr_sections"]["human_resource"] = human_resource
-        print("  ✅ Human Resource & Manpower Plan complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Human Resource: {e}")
-        state["dpr_sections"]["human_resource"] = "# HUMAN RESOURCE & MANPOWER PLAN\n\nError generating content."
-    
+    # Delta only - runs in parallel with financial modeling (dpr_sections
+    # is merged key by key, see DPRState); bodies go to the section store
+    return {"dpr_sections": store_sections(sections), "prompt_stats": prompt_stats}
+
+
+# ============================================================================
+# ASYNC GENERATION (used by the async orchestrator graph)
+# ============================================================================
+
+async def agenerate_section(spec: SectionSpec, project_data: Dict, financial_data: Dict, llm,
+                            bind: bool = True) -> str:
+    """
+    Async equivalent of generate_section
+    """
+    messages = build_section_prompt(spec, project_data, financial_data)
+    response = await ainvoke_resilient(llm, messages, key=spec.key,
+                                       check=lambda content: section_response_problem(spec, content))
+    print(f"  📝 Generated: {spec.title}")
+    content = finish_section(spec, response.content)
+    return bind_figures(content, financial_data) if bind else content
+
+
+async def document_generator_agent_async(state: Dict[str, Any], config: RunnableConfig = None) -> Dict[str, Any]:
+    """
+    Async variant of document_generator_agent
+
+    All 21 sections are generated concurrently on the event loop
+    (bounded by ASYNC_SECTION_CONCURRENCY), so one process can multiplex
+    many DPR runs without a thread per in-flight LLM call.
+    """
     print()
+    cprint(f"{'NODE: document_generator_agent (async)':-^80}", 'yellow', attrs=['bold'])
     
-    # ========================================================================
-    # STAGE 8 SECTIONS (FINAL - 3 sections!)
-    # ========================================================================
-    
-    # Generate Section 19: Marketing & Sales Strategy
-    try:
-        marketing_strategy = generate_marketing_strategy(project_data, llm)
-        state["dpr_sections"]["marketing_strategy"] = marketing_strategy
-        print("  ✅ Marketing & Sales Strategy complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Marketing Strategy: {e}")
-        state["dpr_sections"]["marketing_strategy"] = "# MARKETING & SALES STRATEGY\n\nError generating content."
+    project_data = state.get("project_data", {})
+    dpr_sections = state.get("dpr_sections", {})
+    financial_data = dpr_sections.get("financial", {})
     
+    if not project_data:
+        print("⚠️  No project data available for document generation")
+        return {}
+    
+    if missing_financial_data(project_data, financial_data):
+        return {}
+    
+    print(f"\n📄 Generating {TOTAL_SECTIONS} DPR sections concurrently "
+          f"(max {ASYNC_SECTION_CONCURRENCY} in flight)...")
+    
+    llm = get_llm(temperature=0.3)
+    compiler = await asyncio.to_thread(create_prompt_compiler, project_data, financial_data, llm)
+    semaphore = asyncio.Semaphore(ASYNC_SECTION_CONCURRENCY)
+    
+    output_dir = get_output_directory(project_data, state.get("run_id"))
+    total = TOTAL_SECTIONS
+    completed = 0
+    
+    batched = {}
+    if batching_enabled(config):
+        batched = await agenerate_section_batches(project_data, financial_data, llm, compiler, semaphore)
+    
+    async def run_section(spec: SectionSpec):
+        nonlocal completed
+        key = spec.key
+        if key in batched:
+            completed += 1
+            print(f"  ✅ {spec.title} complete (batched)")
+            report_progress(config, type="section", section=key, index=completed,
+                            total=total, status="complete", batched=True)
+            return key, batched[key]
+        async with semaphore:
+            try:
+                with section_model(compiler.model_for(llm), key, output_dir, config) as model:
+                    content = await agenerate_section(
+                        spec, project_data, financial_data, compiler.bind(model, key), bind=False
+                    )
+                status, error = "complete", None
+                print(f"  ✅ {spec.title} complete")
+            except Exception as e:
+                content = f"# {spec.heading}\n\nError generating content."
+                status, error = "error", str(e)
+                print(f"  ❌ Error generating {spec.title}: {e}")
+        completed += 1
+        report_progress(config, type="section", section=key, index=completed,
+                        total=total, status=status, error=error,
+                        prompt_tokens=compiler.stats.get(key, {}).get("prompt_tokens"))
+        return key, content
+    
+    results = await asyncio.gather(*(run_section(spec) for spec in SECTION_REGISTRY))
+    
+    prompt_stats = compiler.summary()
+    await asyncio.to_thread(compiler.release_context_cache)
+    print_prompt_stats(prompt_stats)
+    
+    print(f"\n🎉 Document generation COMPLETE! ({len(results)}/21 sections)")
     print()
     
-    # Generate Section 20: Monitoring & Evaluation Framework
-    try:
-        monitoring_framework = generate_monitoring_framework(project_data, llm)
-        state["dpr_sections"]["monitoring_framework"] = monitoring_framework
-        print("  ✅ Monitoring & Evaluation Framework complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Monitoring Framework: {e}")
-        state["dpr_sections"]["monitoring_framework"] = "# MONITORING & EVALUATION FRAMEWORK\n\nError generating content."
+    sections = await asyncio.to_thread(store_sections, dict(results))
+    return {"dpr_sections": sections, "prompt_stats": prompt_stats}
+
+
+# ============================================================================
+# BATCHED GENERATION (several short sections per LLM call)
+# ============================================================================
+
+BATCH_SYSTEM_PROMPT = """You are a professional DPR writer specializing in MSME cluster development projects under the MSE-CDP scheme.
+Write in formal business language suitable for government submissions."""
+
+BATCH_INSTRUCTIONS = """Write the {count} DPR sections below in ONE response.
+
+OUTPUT FORMAT (mandatory):
+- Start each section with a line containing exactly: <<<SECTION: section_key>>>
+- End each section with a line containing exactly: <<<END SECTION>>>
+- Use the section keys from the "=== SECTION:" headers below, in the same order
+- Inside each section, follow that section's own instructions and length
+- Do NOT include a section's main heading (# HEADING) - it is added automatically
+- Write nothing outside the delimited sections"""
+
+BATCH_SECTION_PATTERN = re.compile(r'<<<SECTION:\s*([a-z_]+)\s*>>>\s*(.*?)\s*<<<END SECTION>>>', re.DOTALL)
+
+# Shorter bodies are treated as a failed parse and regenerated individually
+BATCH_MIN_SECTION_WORDS = 50
+
+
+def batching_enabled(config) -> bool:
+    """
+    Batched generation is on when config["configurable"]["batch_sections"]
+    says so (default: config.BATCHED_SECTION_GENERATION)
+    """
+    configurable = (config or {}).get("configurable") or {}
+    return bool(configurable.get("batch_sections", BATCHED_SECTION_GENERATION))
+
+
+def section_batches() -> list:
+    """
+    SECTION_BATCH_GROUPS resolved to section specs
+    (unknown keys are ignored; single-section groups are not batched)
+    """
+    groups = []
+    for group in SECTION_BATCH_GROUPS:
+        resolved = [SECTIONS[key] for key in group if key in SECTIONS]
+        if len(resolved) > 1:
+            groups.append(resolved)
+    return groups
+
+
+def split_batch_response(text: str, keys: list) -> Dict[str, str]:
+    """
+    Split a batched response into {section_key: body}
     
-    print()
+    Sections that are missing, unknown, duplicated or too short are left
+    out (the caller regenerates them individually).
+    """
+    sections = {}
+    for key, body in BATCH_SECTION_PATTERN.findall(text):
+        # Drop the main heading if the model added one anyway
+        body = re.sub(r'^#\s[^\n]*\n+', '', body.strip())
+        if key in keys and key not in sections and len(body.split()) >= BATCH_MIN_SECTION_WORDS:
+            sections[key] = body
+    return sections
+
+
+def build_batch_request(group: list, project_data: Dict, financial_data: Dict, compiler):
+    """
+    One request for a group of sections, built from each section's own prompt
     
-    # Generate Section 21: Annexures & Supporting Documents
-    try:
-        annexures = generate_annexures(project_data, llm)
-        state["dpr_sections"]["annexures"] = annexures
-        print("  ✅ Annexures & Supporting Documents complete")
-    except Exception as e:
-        print(f"  ❌ Error generating Annexures: {e}")
-        state["dpr_sections"]["annexures"] = "# ANNEXURES & SUPPORTING DOCUMENTS\n\nError generating content."
+    Returns:
+        (messages to send, the sections' individual messages)
+    """
+    blocks, originals = [], []
+    for spec in group:
+        messages = build_section_prompt(spec, project_data, financial_data)
+        originals.extend(messages)
+        section_text = compiler.compile_suffix(messages, strip_facts=compiler.active)
+        blocks.append(f"=== SECTION: {spec.key} ({spec.title}) ===\n{section_text}")
     
-    print("="*50)
-    print()
+    body = BATCH_INSTRUCTIONS.format(count=len(group)) + "\n\n" + "\n\n".join(blocks)
+    return compiler.compile_request(BATCH_SYSTEM_PROMPT, body), originals
+
+
+def batch_response_problem(group: list, content: str):
+    """
+    Retry a batched call only when nothing in it parsed - partially parsed
+    batches are cheaper to complete with individual calls
+    """
+    if not split_batch_response(content or "", [spec.key for spec in group]):
+        return "no sections could be parsed"
+    return None
+
+
+def finish_section_batch(group: list, response) -> Dict[str, str]:
+    """
+    Split a batched response and finish each section from its part
+    (same heading and structure checks as an individual call)
+    """
+    parsed = split_batch_response(response.content, [spec.key for spec in group])
     
-    # Summary
-    section_keys = [
-        "executive_summary", "organization_details", "financial_plan",
-        "project_introduction", "cluster_profile", "technical_feasibility",
-        "market_analysis", "implementation_schedule",
-        "management_structure", "economic_viability", "swot_analysis",
-        "risk_analysis", "environmental_impact",
-        "quality_assurance", "supply_chain", "infrastructure",
-        "legal_compliance", "human_resource",
-        "marketing_strategy", "monitoring_framework", "annexures"
-    ]
-    sections_generated = len([k for k in section_keys if k in state["dpr_sections"]])
+    results = {}
+    for spec in group:
+        if spec.key not in parsed:
+            print(f"  ⚠️  {spec.title}: not found in batched response - generating individually")
+            continue
+        results[spec.key] = finish_section(spec, parsed[spec.key])
+    return results
+
+
+def generate_section_batches(project_data: Dict, financial_data: Dict, llm, compiler) -> Dict[str, str]:
+    """
+    Generate every SECTION_BATCH_GROUPS group with one LLM call each
     
-    print(f"🎉 Document generation COMPLETE!")
-    print(f"   Sections generated: {sections_generated}/21 (Stage 8 - FINAL!)")
-    print(f"   Progress: {sections_generated}/21 total MSE-CDP sections ({round(sections_generated/21*100, 1)}%)")
-    print(f"   Status: ALL MSE-CDP SECTIONS COMPLETE! 🎊")
-    print(f"   Storage: state['dpr_sections'][section_name]")
-    print(f"   Format: Markdown")
-    print()
+    Returns:
+        {section_key: content} for the sections that parsed
+        (batched calls are not token-streamed)
+    """
+    results = {}
+    for group in section_batches():
+        keys = [spec.key for spec in group]
+        print(f"📦 Batched call: {', '.join(keys)}")
+        try:
+            messages, originals = build_batch_request(group, project_data, financial_data, compiler)
+            response = invoke_resilient(compiler.model_for(llm), messages, key="batch",
+                                        check=lambda content: batch_response_problem(group, content))
+            compiler.record(f"batch:{'+'.join(keys)}", originals, messages, response)
+            results.update(finish_section_batch(group, response))
+        except Exception as e:
+            print(f"  ⚠️  Batched call failed ({e}) - generating individually")
+        print()
+    return results
+
+
+async def agenerate_section_batches(project_data: Dict, financial_data: Dict, llm, compiler,
+                                    semaphore: asyncio.Semaphore) -> Dict[str, str]:
+    """
+    Async variant of generate_section_batches (groups run concurrently)
+    """
+    async def run_batch(group):
+        keys = [spec.key for spec in group]
+        async with semaphore:
+            try:
+                messages, originals = build_batch_request(group, project_data, financial_data, compiler)
+                response = await ainvoke_resilient(compiler.model_for(llm), messages, key="batch",
+                                                   check=lambda content: batch_response_problem(group, content))
+                compiler.record(f"batch:{'+'.join(keys)}", originals, messages, response)
+                print(f"📦 Batched call complete: {', '.join(keys)}")
+                return finish_section_batch(group, response)
+            except Exception as e:
+                print(f"  ⚠️  Batched call for {', '.join(keys)} failed ({e}) - generating individually")
+                return {}
     
-    return state
\ No newline at end of file
+    results = {}
+    for group_results in await asyncio.gather(*(run_batch(group) for group in section_batches())):
+        results.update(group_results)
+    return results
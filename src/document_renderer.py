@@ -0,0 +1,570 @@
+# document_renderer.py
+"""
+Document Renderer - Stage 11
+Renders the DPR sections into a paginated PDF and a DOCX submission document
+
+Both writers are pure Python (standard library only):
+- PDF:  PDF 1.4, A4 pages, built-in Helvetica / Helvetica-Bold fonts
+- DOCX: WordprocessingML package assembled with zipfile
+
+Rendering is incremental:
+- Every section starts on a new page, so its layout does not depend on
+  any other section
+- Section layouts (PDF page streams + DOCX body XML) are cached by content
+  hash in <output_dir>/.render_cache.json
+- On the next export only changed sections are laid out again; page
+  numbers and footers are applied at assembly time
+"""
+import os
+import re
+import json
+import zlib
+import hashlib
+import zipfile
+from typing import Dict, Any, List, Tuple
+from datetime import datetime
+from xml.sax.saxutils import escape as xml_escape
+
+
+# Bump when the layout logic changes (invalidates every cached layout)
+RENDERER_VERSION = "1.0"
+
+RENDER_CACHE_FILE = ".render_cache.json"
+
+
+# ============================================================================
+# PAGE GEOMETRY (A4, points)
+# ============================================================================
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+MARGIN_LEFT = 64
+MARGIN_RIGHT = 64
+MARGIN_TOP = 72
+MARGIN_BOTTOM = 72
+TEXT_WIDTH = PAGE_WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+
+# Block styles: (font resource, size, leading, space before, space after)
+BLOCK_STYLES = {
+    "h1": ("F2", 18, 24, 0, 12),
+    "h2": ("F2", 13.5, 18, 10, 4),
+    "h3": ("F2", 11.5, 16, 8, 2),
+    "p": ("F1", 10.5, 14, 0, 6),
+    "pb": ("F2", 10.5, 14, 0, 6),
+    "li": ("F1", 10.5, 14, 0, 2),
+    "tr": ("F1", 9, 12, 0, 1),
+}
+
+BULLET_INDENT = 14
+
+
+# ============================================================================
+# FONT METRICS (Adobe AFM widths, 1/1000 em)
+# ============================================================================
+
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+
+_HELVETICA_BOLD_WIDTHS = [
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+]
+
+_FONT_WIDTHS = {"F1": _HELVETICA_WIDTHS, "F2": _HELVETICA_BOLD_WIDTHS}
+
+
+def text_width(text: str, font: str, size: float) -> float:
+    """
+    Width of a string in points for one of the built-in fonts
+    """
+    widths = _FONT_WIDTHS[font]
+    total = 0
+    for ch in text:
+        code = ord(ch)
+        total += widths[code - 32] if 32 <= code <= 126 else 556
+    return total * size / 1000.0
+
+
+# ============================================================================
+# MARKDOWN → BLOCKS
+# ============================================================================
+
+_INLINE_MARKUP = re.compile(r'\*\*|__|`')
+_TABLE_SEPARATOR = re.compile(r'^\|?\s*:?-{2,}')
+
+
+def _clean_inline(text: str) -> str:
+    """Strip inline markdown markers that the writers do not style"""
+    return _INLINE_MARKUP.sub('', text).strip()
+
+
+def parse_markdown_blocks(content: str) -> List[Tuple[str, str]]:
+    """
+    Convert section markdown into a flat list of (block_type, text)
+
+    Block types: h1, h2, h3, p, pb (bold paragraph), li, tr (table row)
+    """
+    blocks = []
+    paragraph = []
+
+    def flush():
+        if paragraph:
+            blocks.append(("p", _clean_inline(" ".join(paragraph))))
+            paragraph.clear()
+
+    for raw_line in content.split("\n"):
+        line = raw_line.strip()
+
+        if not line:
+            flush()
+            continue
+
+        if line.startswith("#"):
+            flush()
+            level = len(line) - len(line.lstrip("#"))
+            text = _clean_inline(line.lstrip("#"))
+            blocks.append(("h1" if level == 1 else "h2" if level == 2 else "h3", text))
+        elif line.startswith(("- ", "* ", "• ")):
+            flush()
+            blocks.append(("li", _clean_inline(line[2:])))
+        elif re.match(r'^\d+[.)]\s', line):
+            flush()
+            blocks.append(("li", _clean_inline(line)))
+        elif line.startswith("|"):
+            flush()
+            if not _TABLE_SEPARATOR.match(line):
+                cells = [_clean_inline(c) for c in line.strip("|").split("|")]
+                blocks.append(("tr", "  |  ".join(cells)))
+        elif line.startswith("**") and line.endswith("**") and len(line) > 4:
+            flush()
+            blocks.append(("pb", _clean_inline(line)))
+        else:
+            paragraph.append(line)
+
+    flush()
+    return [(kind, text) for kind, text in blocks if text]
+
+
+# ============================================================================
+# PDF WRITER
+# ============================================================================
+
+# Characters outside WinAnsi that show up in generated sections
+_PDF_SUBSTITUTIONS = {
+    "₹": "Rs.",
+    "≥": ">=",
+    "≤": "<=",
+    "→": "->",
+    "✓": "-",
+    "✅": "",
+    "❌": "",
+}
+
+
+def _pdf_text(text: str) -> str:
+    """
+    Convert text to an escaped WinAnsi PDF string literal body
+    """
+    for src, dst in _PDF_SUBSTITUTIONS.items():
+        text = text.replace(src, dst)
+    encoded = text.encode("cp1252", errors="replace").decode("latin-1")
+    return encoded.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap_text(text: str, font: str, size: float, max_width: float) -> List[str]:
+    """
+    Greedy word wrap using the font metrics
+    """
+    lines = []
+    current = ""
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if current and text_width(candidate, font, size) > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines
+
+
+def layout_section_pdf(content: str) -> List[str]:
+    """
+    Lay out one section into PDF page content streams (body only)
+
+    Returns:
+        List of uncompressed content streams, one per page
+    """
+    pages = []
+    ops = []
+    y = PAGE_HEIGHT - MARGIN_TOP
+
+    def new_page():
+        nonlocal ops, y
+        if ops:
+            pages.append("\n".join(ops))
+        ops = []
+        y = PAGE_HEIGHT - MARGIN_TOP
+
+    for kind, text in parse_markdown_blocks(content):
+        font, size, leading, space_before, space_after = BLOCK_STYLES[kind]
+        indent = BULLET_INDENT if kind == "li" else 0
+        lines = _wrap_text(text, font, size, TEXT_WIDTH - indent)
+
+        # Keep headings together with at least two lines of what follows
+        needed = leading * (len(lines) if not kind.startswith("h") else len(lines) + 2)
+        if ops and y - space_before - min(needed, leading * 3) < MARGIN_BOTTOM:
+            new_page()
+        elif ops:
+            y -= space_before
+
+        for i, line in enumerate(lines):
+            if y - leading < MARGIN_BOTTOM:
+                new_page()
+            y -= leading
+            if kind == "li" and i == 0:
+                ops.append(f"BT /F1 {size} Tf {MARGIN_LEFT + 3} {y:.2f} Td ({_pdf_text('•')}) Tj ET")
+            ops.append(f"BT /{font} {size} Tf {MARGIN_LEFT + indent} {y:.2f} Td ({_pdf_text(line)}) Tj ET")
+
+        y -= space_after
+
+    if ops or not pages:
+        pages.append("\n".join(ops))
+    return pages
+
+
+def _pdf_footer(page_number: int, footer_title: str) -> str:
+    """Footer stream drawn at assembly time (not cached)"""
+    label = f"Page {page_number}"
+    label_x = PAGE_WIDTH - MARGIN_RIGHT - text_width(label, "F1", 8)
+    return "\n".join([
+        f"0.6 G {MARGIN_LEFT} 48 m {PAGE_WIDTH - MARGIN_RIGHT} 48 l S 0 G",
+        f"BT /F1 8 Tf {MARGIN_LEFT} 36 Td ({_pdf_text(footer_title)}) Tj ET",
+        f"BT /F1 8 Tf {label_x:.2f} 36 Td ({label}) Tj ET",
+    ])
+
+
+def write_pdf(path: str, page_streams: List[str], footer_title: str, doc_title: str) -> int:
+    """
+    Assemble page body streams into a PDF file
+
+    Returns:
+        Number of bytes written
+    """
+    objects = []  # index 0 → object 1
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    catalog_id = add(b"")  # placeholder, filled once pages exist
+    pages_id = add(b"")
+    font_regular = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    font_bold = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+    info_id = add(
+        f"<< /Title ({_pdf_text(doc_title)}) /Producer (DPR Automation Platform) "
+        f"/CreationDate (D:{datetime.now().strftime('%Y%m%d%H%M%S')}) >>".encode("latin-1")
+    )
+
+    page_ids = []
+    for number, body in enumerate(page_streams, start=1):
+        stream_ids = []
+        for stream in (body, _pdf_footer(number, footer_title)):
+            data = zlib.compress(stream.encode("latin-1"))
+            stream_ids.append(add(
+                f"<< /Length {len(data)} /Filter /FlateDecode >>\nstream\n".encode("latin-1")
+                + data + b"\nendstream"
+            ))
+        contents = " ".join(f"{sid} 0 R" for sid in stream_ids)
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 {font_regular} 0 R /F2 {font_bold} 0 R >> >> "
+            f"/Contents [{contents}] >>".encode("latin-1")
+        ))
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects[pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("latin-1")
+    objects[catalog_id - 1] = f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode("latin-1")
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode("latin-1") + obj + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("latin-1")
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root {catalog_id} 0 R /Info {info_id} 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1")
+
+    with open(path, "wb") as f:
+        f.write(output)
+    return len(output)
+
+
+# ============================================================================
+# DOCX WRITER
+# ============================================================================
+
+_DOCX_STYLE_IDS = {"h1": "Heading1", "h2": "Heading2", "h3": "Heading3", "li": "ListParagraph"}
+
+
+def _docx_run(text: str, bold: bool = False) -> str:
+    props = "<w:rPr><w:b/></w:rPr>" if bold else ""
+    return f'<w:r>{props}<w:t xml:space="preserve">{xml_escape(text)}</w:t></w:r>'
+
+
+def layout_section_docx(content: str) -> str:
+    """
+    Convert one section into WordprocessingML body paragraphs
+    """
+    paragraphs = []
+    for kind, text in parse_markdown_blocks(content):
+        style = _DOCX_STYLE_IDS.get(kind)
+        props = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+        if kind == "li":
+            text = f"•  {text}"
+        paragraphs.append(f"<w:p>{props}{_docx_run(text, bold=(kind == 'pb'))}</w:p>")
+    return "".join(paragraphs)
+
+
+_DOCX_PAGE_BREAK = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+_DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+<Override PartName="/word/footer1.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footer+xml"/>
+<Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>
+</Types>"""
+
+_DOCX_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>
+</Relationships>"""
+
+_DOCX_DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/footer" Target="footer1.xml"/>
+</Relationships>"""
+
+_DOCX_STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:cs="Calibri"/><w:sz w:val="21"/></w:rPr></w:rPrDefault>
+<w:pPrDefault><w:pPr><w:spacing w:after="120" w:line="276" w:lineRule="auto"/></w:pPr></w:pPrDefault></w:docDefaults>
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:pPr><w:jc w:val="both"/></w:pPr></w:style>
+<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/><w:pPr><w:jc w:val="center"/><w:spacing w:before="2400" w:after="480"/></w:pPr><w:rPr><w:b/><w:sz w:val="48"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:pPr><w:keepNext/><w:spacing w:after="240"/><w:jc w:val="left"/><w:outlineLvl w:val="0"/></w:pPr><w:rPr><w:b/><w:sz w:val="36"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:pPr><w:keepNext/><w:spacing w:before="240" w:after="80"/><w:jc w:val="left"/><w:outlineLvl w:val="1"/></w:pPr><w:rPr><w:b/><w:sz w:val="27"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading3"><w:name w:val="heading 3"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:pPr><w:keepNext/><w:spacing w:before="160" w:after="40"/><w:jc w:val="left"/><w:outlineLvl w:val="2"/></w:pPr><w:rPr><w:b/><w:sz w:val="23"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="ListParagraph"><w:name w:val="List Paragraph"/><w:basedOn w:val="Normal"/><w:pPr><w:spacing w:after="40"/><w:ind w:left="360" w:hanging="220"/><w:jc w:val="left"/></w:pPr></w:style>
+</w:styles>"""
+
+_DOCX_FOOTER = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:ftr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:p><w:pPr><w:jc w:val="right"/></w:pPr>
+<w:r><w:rPr><w:sz w:val="16"/></w:rPr><w:t xml:space="preserve">{title}  |  Page </w:t></w:r>
+<w:r><w:rPr><w:sz w:val="16"/></w:rPr><w:fldChar w:fldCharType="begin"/></w:r>
+<w:r><w:rPr><w:sz w:val="16"/></w:rPr><w:instrText xml:space="preserve"> PAGE </w:instrText></w:r>
+<w:r><w:rPr><w:sz w:val="16"/></w:rPr><w:fldChar w:fldCharType="end"/></w:r>
+</w:p>
+</w:ftr>"""
+
+_DOCX_CORE = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+<dc:title>{title}</dc:title>
+<dc:creator>DPR Automation Platform</dc:creator>
+<dcterms:created xsi:type="dcterms:W3CDTF">{created}</dcterms:created>
+</cp:coreProperties>"""
+
+
+def write_docx(path: str, body_parts: List[str], footer_title: str, doc_title: str) -> int:
+    """
+    Assemble section body XML into a .docx package
+
+    Returns:
+        Number of bytes written
+    """
+    body = _DOCX_PAGE_BREAK.join(body_parts)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<w:body>{body}'
+        '<w:sectPr><w:footerReference w:type="default" r:id="rId2"/>'
+        '<w:pgSz w:w="11906" w:h="16838"/>'
+        '<w:pgMar w:top="1440" w:right="1280" w:bottom="1440" w:left="1280" w:header="708" w:footer="708" w:gutter="0"/>'
+        '</w:sectPr></w:body></w:document>'
+    )
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", _DOCX_CONTENT_TYPES)
+        docx.writestr("_rels/.rels", _DOCX_ROOT_RELS)
+        docx.writestr("word/_rels/document.xml.rels", _DOCX_DOCUMENT_RELS)
+        docx.writestr("word/styles.xml", _DOCX_STYLES)
+        docx.writestr("word/footer1.xml", _DOCX_FOOTER.format(title=xml_escape(footer_title)))
+        docx.writestr("word/document.xml", document)
+        docx.writestr("docProps/core.xml", _DOCX_CORE.format(
+            title=xml_escape(doc_title),
+            created=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+        ))
+
+    return os.path.getsize(path)
+
+
+# ============================================================================
+# LAYOUT CACHE
+# ============================================================================
+
+def section_layout_key(section_key: str, content: str) -> str:
+    """
+    Cache key for a section layout (content hash + renderer version)
+    """
+    digest = hashlib.sha256()
+    digest.update(RENDERER_VERSION.encode("utf-8"))
+    digest.update(section_key.encode("utf-8"))
+    digest.update(content.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_render_cache(output_dir: str) -> Dict[str, Any]:
+    """
+    Load the per-directory layout cache (empty on first run or if unreadable)
+    """
+    path = os.path.join(output_dir, RENDER_CACHE_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("renderer_version") == RENDERER_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"renderer_version": RENDERER_VERSION, "sections": {}}
+
+
+def save_render_cache(output_dir: str, cache: Dict[str, Any]) -> None:
+    path = os.path.join(output_dir, RENDER_CACHE_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+# ============================================================================
+# MAIN RENDER FUNCTION
+# ============================================================================
+
+def build_cover_page(project_data: Dict[str, Any]) -> str:
+    """
+    Markdown for the cover page (rendered fresh every time, never cached)
+    """
+    return f"""# DETAILED PROJECT REPORT
+
+## {project_data.get("cluster_type", "MSME Cluster")} Cluster - Common Facility Centre
+
+**Location:** {project_data.get("location", "N/A")}
+
+**Scheme:** {project_data.get("grant_scheme", "MSE-CDP")}
+
+**Member Units:** {project_data.get("members", "N/A")}
+
+**Date:** {datetime.now().strftime("%d %B %Y")}
+"""
+
+
+def render_dpr_documents(sections: List[Tuple[str, str]], project_data: Dict[str, Any],
+                         output_dir: str, formats: List[str] = None) -> Dict[str, Any]:
+    """
+    Render the full DPR as PDF and/or DOCX in output_dir
+
+    Args:
+        sections: Ordered list of (section_key, markdown_content)
+        project_data: Collected project information (cover page, footer)
+        output_dir: Export directory (also holds the layout cache)
+        formats: Subset of ["pdf", "docx"] (default: both)
+
+    Returns:
+        {
+            "files": {"pdf": path, "docx": path},
+            "sizes": {...},
+            "sections_rendered": int,
+            "sections_reused": int,
+            "pages": int
+        }
+    """
+    formats = formats or ["pdf", "docx"]
+    cache = load_render_cache(output_dir)
+    cached_sections = cache["sections"]
+
+    cluster = project_data.get("cluster_type", "DPR")
+    footer_title = f"DPR - {cluster} Cluster, {project_data.get('location', '')}".strip(", ")
+    doc_title = f"Detailed Project Report - {cluster} Cluster"
+
+    rendered = 0
+    reused = 0
+    pdf_pages = layout_section_pdf(build_cover_page(project_data))
+    docx_parts = [layout_section_docx(build_cover_page(project_data))]
+    fresh_cache = {}
+
+    for section_key, content in sections:
+        layout_key = section_layout_key(section_key, content)
+        layout = cached_sections.get(section_key)
+
+        if layout and layout.get("key") == layout_key:
+            reused += 1
+        else:
+            layout = {
+                "key": layout_key,
+                "pdf_pages": layout_section_pdf(content),
+                "docx_xml": layout_section_docx(content),
+            }
+            rendered += 1
+
+        fresh_cache[section_key] = layout
+        pdf_pages.extend(layout["pdf_pages"])
+        docx_parts.append(layout["docx_xml"])
+
+    result = {
+        "files": {},
+        "sizes": {},
+        "sections_rendered": rendered,
+        "sections_reused": reused,
+        "pages": len(pdf_pages),
+    }
+
+    base_name = "DPR_" + re.sub(r'[^A-Za-z0-9]+', '_', cluster).strip("_")
+
+    if "pdf" in formats:
+        pdf_path = os.path.join(output_dir, f"{base_name}.pdf")
+        result["sizes"]["pdf"] = write_pdf(pdf_path, pdf_pages, footer_title, doc_title)
+        result["files"]["pdf"] = pdf_path
+
+    if "docx" in formats:
+        docx_path = os.path.join(output_dir, f"{base_name}.docx")
+        result["sizes"]["docx"] = write_docx(docx_path, docx_parts, footer_title, doc_title)
+        result["files"]["docx"] = docx_path
+
+    # Only keep layouts for sections in this document
+    cache["sections"] = fresh_cache
+    save_render_cache(output_dir, cache)
+
+    return result
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# dpr_batch.py
+"""
+DPR Batch Runner - Multi-project entry point
+Runs many DPR requests through the orchestrator graph concurrently
+
+Input file formats:
+    JSONL - one object per line:
+        {"project_id": "tirupati-print", "prompt": "I need to create a DPR ..."}
+    CSV   - header row with either a 'prompt' column, or the project fields
+            (cluster_type, location, members, project_cost, facility_type,
+             grant_scheme, subsidy_range) which are turned into a prompt
+
+Usage:
+    python dpr_batch.py --input projects.jsonl
+    python dpr_batch.py --input projects.csv --concurrency 8 --rpm 120 --tpm 400000
+
+Output (../output/batch_runs/<timestamp>/):
+    <project_id>.json   - per-project result (status, project data, metrics, export info)
+    summary.json        - batch summary (counts, durations, failures)
+Exports: ../output/<Cluster>_<City>_<project_id>/ (one per project, so
+projects of the same cluster and city don't overwrite each other)
+
+All projects share the global LLM rate governor (rate_governor.py): RPM/TPM
+budgets, round-robin between projects and adaptive concurrency on 429s
+"""
+import os
+import re
+import sys
+import csv
+import json
+import time
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List
+
+from langchain_core.messages import HumanMessage
+
+from config import BATCH_MAX_CONCURRENT_PROJECTS, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE
+from llm_client import configure_rate_limit, get_rate_limit
+from rate_governor import governed_project, get_governor
+
+
+# Project fields accepted as CSV columns (in prompt order)
+PROMPT_FIELDS = {
+    "cluster_type": "Cluster Type",
+    "location": "Location",
+    "members": "Number of Members",
+    "project_cost": "Project Cost",
+    "facility_type": "Common Facility Centre",
+    "grant_scheme": "Seeking",
+    "subsidy_range": "Subsidy",
+}
+
+
+# ============================================================================
+# INPUT LOADING
+# ============================================================================
+
+def build_prompt(fields: Dict[str, Any]) -> str:
+    """
+    Build a user prompt (same shape as dpr_main.py) from project fields
+    """
+    lines = [
+        f"- {label}: {fields[key]}"
+        for key, label in PROMPT_FIELDS.items()
+        if fields.get(key) not in (None, "")
+    ]
+    return (
+        "I need to create a DPR for my MSME cluster project with the following details:\n\n"
+        + "\n".join(lines)
+        + "\n\nPlease help me generate a complete DPR with all 21 sections."
+    )
+
+
+def _safe_project_id(value: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', value).strip("_") or "project"
+
+
+def load_requests(path: str) -> List[Dict[str, str]]:
+    """
+    Load project requests from a JSONL or CSV file
+
+    Returns:
+        List of {"project_id": str, "prompt": str}
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        rows = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line_num, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_num}: invalid JSON ({e})")
+
+    requests = []
+    seen_ids = set()
+    for index, row in enumerate(rows, start=1):
+        prompt = (row.get("prompt") or "").strip() or build_prompt(row)
+        project_id = _safe_project_id(str(row.get("project_id") or f"project_{index:03d}"))
+
+        # Keep result files unique even if the input repeats an id
+        base_id, suffix = project_id, 2
+        while project_id in seen_ids:
+            project_id = f"{base_id}_{suffix}"
+            suffix += 1
+        seen_ids.add(project_id)
+
+        requests.append({"project_id": project_id, "prompt": prompt})
+
+    return requests
+
+
+# ============================================================================
+# PROJECT RUNNER
+# ============================================================================
+
+def summarize_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the JSON-serializable parts of a final graph state
+    (section bodies are already on disk via file_export_agent)
+    """
+    dpr_sections = state.get("dpr_sections", {})
+    financial = dpr_sections.get("financial", {})
+    messages = state.get("messages", [])
+
+    return {
+        "current_stage": state.get("current_stage"),
+        "project_data": state.get("project_data", {}),
+        "validation": state.get("validation", {}),
+        "clarification": state.get("clarification", {}),
+        "financial_metrics": financial.get("metrics", {}),
+        "mse_cdp_compliance": financial.get("mse_cdp_compliance", {}).get("status"),
+        "sections_generated": len([k for k in dpr_sections if k != "financial"]),
+        "consistency": state.get("consistency", {}),
+        "validation_results": {key: {"overall_score": r.get("overall_score"), "status": r.get("status")}
+                               for key, r in state.get("validation_results", {}).items()},
+        "repair": state.get("repair", {}),
+        "export_info": state.get("export_info", {}),
+        "final_message": messages[-1].content if messages else None,
+    }
+
+
+def run_project(graph, request: Dict[str, str], results_dir: str) -> Dict[str, Any]:
+    """
+    Run one project through the graph and write <project_id>.json
+    """
+    project_id = request["project_id"]
+    started = time.time()
+    result = {
+        "project_id": project_id,
+        "started_at": datetime.now().isoformat(),
+        "prompt": request["prompt"],
+    }
+
+    try:
+        with governed_project(project_id):
+            # project_id (unique per batch) keeps same-cluster exports apart
+            state = graph.invoke({"messages": [HumanMessage(content=request["prompt"])],
+                                  "run_id": project_id})
+        result.update(summarize_state(state))
+        result["status"] = "complete" if state.get("validation", {}).get("valid") else "incomplete"
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["duration_seconds"] = round(time.time() - started, 2)
+
+    with open(os.path.join(results_dir, f"{project_id}.json"), "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, default=str)
+
+    return result
+
+
+def run_batch(requests: List[Dict[str, str]], results_dir: str,
+              concurrency: int = BATCH_MAX_CONCURRENT_PROJECTS) -> Dict[str, Any]:
+    """
+    Run all requests with at most `concurrency` projects in flight
+
+    Returns:
+        Batch summary (also written to summary.json)
+    """
+    # Imported here so the graph is only built when a batch actually runs
+    from dpr_orchestrator import orchestrator_graph
+
+    os.makedirs(results_dir, exist_ok=True)
+    print_lock = threading.Lock()
+    started = time.time()
+    results = []
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dpr") as pool:
+        futures = {
+            pool.submit(run_project, orchestrator_graph, request, results_dir): request
+            for request in requests
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results.append(result)
+            icon = {"complete": "✅", "incomplete": "⚠️ "}.get(result["status"], "❌")
+            with print_lock:
+                print(f"\n{icon} [{done}/{len(requests)}] {result['project_id']}: "
+                      f"{result['status']} ({result['duration_seconds']}s)")
+
+    wall_time = time.time() - started
+    durations = [r["duration_seconds"] for r in results]
+    summary = {
+        "finished_at": datetime.now().isoformat(),
+        "total_projects": len(results),
+        "complete": sum(1 for r in results if r["status"] == "complete"),
+        "incomplete": sum(1 for r in results if r["status"] == "incomplete"),
+        "failed": sum(1 for r in results if r["status"] == "failed"),
+        "concurrency": concurrency,
+        "requests_per_minute_limit": get_rate_limit(),
+        "llm_governor": get_governor().snapshot(),
+        "wall_time_seconds": round(wall_time, 2),
+        "avg_project_seconds": round(sum(durations) / len(durations), 2) if durations else 0,
+        "projects": [
+            {
+                "project_id": r["project_id"],
+                "status": r["status"],
+                "duration_seconds": r["duration_seconds"],
+                "output_directory": r.get("export_info", {}).get("output_directory"),
+                "error": r.get("error"),
+            }
+            for r in sorted(results, key=lambda r: r["project_id"])
+        ],
+    }
+
+    with open(os.path.join(results_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    return summary
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="DPR Batch Runner - generate many DPRs concurrently",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python dpr_batch.py --input projects.jsonl
+  python dpr_batch.py --input projects.csv --concurrency 8 --rpm 120
+        """
+    )
+    parser.add_argument('--input', required=True, help='JSONL or CSV file of project requests')
+    parser.add_argument('--concurrency', type=int, default=BATCH_MAX_CONCURRENT_PROJECTS,
+                        help=f'Projects in flight at once (default: {BATCH_MAX_CONCURRENT_PROJECTS})')
+    parser.add_argument('--rpm', type=int, default=LLM_REQUESTS_PER_MINUTE,
+                        help='Global LLM requests per minute across all projects (0 = unlimited)')
+    parser.add_argument('--tpm', type=int, default=LLM_TOKENS_PER_MINUTE,
+                        help='Global LLM tokens per minute across all projects (0 = unlimited)')
+    parser.add_argument('--output', type=str, help='Results directory (default: ../output/batch_runs/<timestamp>)')
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    try:
+        requests = load_requests(args.input)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    if not requests:
+        print("⚠️  No project requests found in input file")
+        return 1
+
+    configure_rate_limit(args.rpm, args.tpm)
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    results_dir = args.output or os.path.join(
+        base_dir, "..", "output", "batch_runs", datetime.now().strftime("%Y%m%d_%H%M%S")
+    )
+
+    print("\n" + "="*80)
+    print("🗂️  DPR BATCH RUNNER")
+    print("="*80)
+    print(f"   Projects:    {len(requests)}")
+    print(f"   Concurrency: {args.concurrency}")
+    print(f"   Rate limit:  {args.rpm or 'unlimited'} LLM requests/min, "
+          f"{args.tpm or 'unlimited'} tokens/min (shared)")
+    print(f"   Results:     {results_dir}")
+    print("="*80 + "\n")
+
+    summary = run_batch(requests, results_dir, args.concurrency)
+
+    print("\n" + "="*80)
+    print("📊 BATCH SUMMARY")
+    print("="*80)
+    print(f"   Complete:   {summary['complete']}/{summary['total_projects']}")
+    print(f"   Incomplete: {summary['incomplete']}")
+    print(f"   Failed:     {summary['failed']}")
+    print(f"   Wall time:  {summary['wall_time_seconds']}s "
+          f"(avg {summary['avg_project_seconds']}s per project)")
+    governor = summary["llm_governor"]
+    print(f"   LLM calls:  {governor['calls']} ({governor['throttled']} throttled, "
+          f"{governor['waited_seconds']}s queued)")
+    print(f"   Summary:    {os.path.join(results_dir, 'summary.json')}")
+    print("="*80 + "\n")
+
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
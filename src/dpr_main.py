@@ -46,6 +46,15 @@ def main():
     print("🚀 Starting orchestrator...\n")
     response = orchestrator_graph.invoke(init_state)
     
+    # Incomplete project data: answer the clarification question and resume
+    while response.get("current_stage") == "awaiting_clarification":
+        print(f"\n{response['messages'][-1].content}\n")
+        answer = input("Your answer (empty line to stop): ").strip()
+        if not answer:
+            break
+        response["messages"].append(HumanMessage(content=answer))
+        response = orchestrator_graph.invoke(response)
+    
     # Display final result
     print("\n" + "="*80)
     print("FINAL RESULT")
@@ -4,6 +4,7 @@ DPR Orchestrator Agent - Stage 9: File Export Integration! 📁
 Orchestrator with modular agent integration
 ALL 21 MSE-CDP SECTIONS COMPLETE + FILE EXPORT!
 """
+import asyncio
 from typing import TypedDict, Annotated
 from termcolor import cprint
 
@@ -13,22 +14,39 @@ from langgraph.graph import START, END, StateGraph
 from langgraph.graph.message import add_messages
 
 from lg_utility import save_graph_as_png
-from config import LLM_MODEL
+from config import LLM_MODEL, FINANCIAL_PLACEHOLDERS
+from section_registry import SECTION_KEYS, TOTAL_SECTIONS
 
 # Import agents
-from data_collection_agent import data_collection_agent
-from financial_agent import financial_modeling_agent
-from document_generator import document_generator_agent
-from file_export_agent import file_export_agent  # NEW!
+from data_collection_agent import data_collection_agent, data_collection_agent_async, clarification_agent
+from financial_agent import financial_modeling_agent, financial_modeling_agent_async
+from document_generator import document_generator_agent, document_generator_agent_async
+from file_export_agent import file_export_agent, file_export_agent_async
+from consistency_agent import consistency_agent
+from validation_agent import validation_agent, validation_agent_async
+from repair_agent import repair_agent, repair_agent_async
 
 
 # ============================================================================
 # STATE DEFINITION
 # ============================================================================
 
+def merge_dicts(current: dict, update: dict) -> dict:
+    """
+    Reducer for dict channels: nodes return only the keys they changed
+    and updates are merged key by key (so parallel branches - financial
+    modeling and document generation - can write the same channel)
+    """
+    return {**(current or {}), **(update or {})}
+
+
 class DPRState(TypedDict):
     """
     State for DPR generation workflow
+
+    Node contract: nodes never mutate the incoming state - they return only
+    the keys they changed (messages are appended by add_messages, dict
+    channels merged by merge_dicts, other keys replaced)
     """
     # Conversation messages
     messages: Annotated[list[BaseMessage], add_messages]
@@ -37,23 +55,43 @@ class DPRState(TypedDict):
     project_data: dict
     
     # Validation results
-    validation: dict
+    validation: Annotated[dict, merge_dicts]
     
-    # Generated DPR sections
-    dpr_sections: dict
+    # Generated DPR sections as section_store references - hash, size,
+    # word count; text loaded on access (+ "financial": financial model output)
+    dpr_sections: Annotated[dict, merge_dicts]
     
     # Current processing stage
     current_stage: str
     
     # Export information (NEW!)
-    export_info: dict
+    export_info: Annotated[dict, merge_dicts]
+    
+    # Per-section prompt token counts (prompt_compiler.py)
+    prompt_stats: dict
+    
+    # Numeric claims checked / mismatches found (consistency_agent.py)
+    consistency: dict
+    
+    # Per-section validator results (validation_agent.py) and what the
+    # repair stage regenerated (repair_agent.py)
+    validation_results: Annotated[dict, merge_dicts]
+    repair: dict
+    
+    # Missing fields asked for when project data doesn't validate
+    # (data_collection_agent.clarification_agent)
+    clarification: dict
+    
+    # Set by callers running projects concurrently (dpr_batch, dpr_service):
+    # keeps their export directories apart (file_export_agent.get_output_directory)
+    run_id: str
 
 
 # ============================================================================
 # DUMMY NODE FUNCTIONS
 # ============================================================================
 
-def orchestrator_init(state: DPRState) -> DPRState:
+def orchestrator_init(state: DPRState) -> dict:
     """
     Node 1: Initialize the orchestrator
     """
@@ -65,25 +103,15 @@ def orchestrator_init(state: DPRState) -> DPRState:
         print(f"Input: {messages[-1].content[:100]}...")
     
     # Initialize empty structures if not present
-    if "project_data" not in state:
-        state["project_data"] = {}
-    
-    if "dpr_sections" not in state:
-        state["dpr_sections"] = {}
-    
-    if "validation" not in state:
-        state["validation"] = {}
-    
-    if "export_info" not in state:
-        state["export_info"] = {}
-    
-    state["current_stage"] = "initialized"
+    update = {key: {} for key in ("project_data", "dpr_sections", "validation", "export_info")
+              if key not in state}
+    update["current_stage"] = "initialized"
     
     print(f"Status: ✅ Initialized")
-    return state
+    return update
 
 
-def coordinator_agent(state: DPRState) -> DPRState:
+def coordinator_agent(state: DPRState) -> dict:
     """
     Node 6: Main coordinator agent
     Uses collected project data, financial metrics, generated documents, and export info
@@ -113,19 +141,23 @@ def coordinator_agent(state: DPRState) -> DPRState:
             response_text += f" Financial modeling complete: {compliance}."
         
         # Check if documents are generated
-        doc_sections = [k for k in ["executive_summary", "organization_details", "financial_plan",
-                                    "project_introduction", "cluster_profile", "technical_feasibility",
-                                    "market_analysis", "implementation_schedule",
-                                    "management_structure", "economic_viability", "swot_analysis",
-                                    "risk_analysis", "environmental_impact",
-                                    "quality_assurance", "supply_chain", "infrastructure",
-                                    "legal_compliance", "human_resource",
-                                    "marketing_strategy", "monitoring_framework", "annexures"] 
-                       if k in dpr_sections]
+        doc_sections = [k for k in SECTION_KEYS if k in dpr_sections]
         if doc_sections:
-            print(f"📄 Documents Generated: {len(doc_sections)}/21 sections (Stage 8 - COMPLETE!) 🎉")
+            print(f"📄 Documents Generated: {len(doc_sections)}/{TOTAL_SECTIONS} sections (Stage 8 - COMPLETE!) 🎉")
             response_text += f" Generated {len(doc_sections)} DPR sections."
         
+        # Numeric consistency with the financial model
+        consistency = state.get("consistency", {})
+        if consistency.get("mismatches"):
+            print(f"🔢 Numeric mismatches: {len(consistency['mismatches'])} "
+                  f"({consistency.get('patched', 0)} patched)")
+        
+        # Targeted repairs after validation
+        repair = state.get("repair", {})
+        if repair.get("sections"):
+            print(f"🔧 Sections repaired: {len(repair['sections'])} "
+                  f"({repair.get('llm_calls', 0)} subsection calls)")
+        
         # Check if files are exported (NEW!)
         if export_info and export_info.get("files_created"):
             files_created = export_info.get("files_created", 0)
@@ -140,14 +172,11 @@ def coordinator_agent(state: DPRState) -> DPRState:
     
     print(f"\nResponse: {response_text}")
     
-    state["messages"].append(response)
-    state["current_stage"] = "coordinated"
-    
     print(f"Status: ✅ Coordination complete")
-    return state
+    return {"messages": [response], "current_stage": "coordinated"}
 
 
-def workflow_planner(state: DPRState) -> DPRState:
+def workflow_planner(state: DPRState) -> dict:
     """
     Node 7: Plan the workflow (dummy for now)
     """
@@ -160,15 +189,15 @@ def workflow_planner(state: DPRState) -> DPRState:
         "next_agents": ["Data Collection", "Financial", "Document Gen", "File Export"]
     }
     
-    state["project_data"]["workflow_plan"] = plan
-    state["current_stage"] = "planned"
-    
     print(f"Plan: {plan}")
     print(f"Status: ✅ Workflow planned")
-    return state
+    return {
+        "project_data": {**state.get("project_data", {}), "workflow_plan": plan},
+        "current_stage": "planned",
+    }
 
 
-def output_formatter(state: DPRState) -> DPRState:
+def output_formatter(state: DPRState) -> dict:
     """
     Node 8: Format final output
     Includes collected project data, financial metrics, generated documents, and export info
@@ -219,21 +248,13 @@ def output_formatter(state: DPRState) -> DPRState:
         }
     
     # Add document generation summary
-    doc_sections = [k for k in ["executive_summary", "organization_details", "financial_plan",
-                                "project_introduction", "cluster_profile", "technical_feasibility",
-                                "market_analysis", "implementation_schedule",
-                                "management_structure", "economic_viability", "swot_analysis",
-                                "risk_analysis", "environmental_impact",
-                                "quality_assurance", "supply_chain", "infrastructure",
-                                "legal_compliance", "human_resource",
-                                "marketing_strategy", "monitoring_framework", "annexures"] 
-                   if k in dpr_sections]
+    doc_sections = [k for k in SECTION_KEYS if k in dpr_sections]
     
     output["document_summary"] = {
         "sections_generated": len(doc_sections),
-        "total_sections_this_stage": 21,
-        "total_mse_cdp_sections": 21,
-        "progress_percentage": round((len(doc_sections) / 21) * 100, 1),
+        "total_sections_this_stage": TOTAL_SECTIONS,
+        "total_mse_cdp_sections": TOTAL_SECTIONS,
+        "progress_percentage": round((len(doc_sections) / TOTAL_SECTIONS) * 100, 1),
         "sections": doc_sections,
         "format": "Markdown",
         "method": "Template + LLM",
@@ -256,46 +277,110 @@ def output_formatter(state: DPRState) -> DPRState:
     print(f"Final Output:\n{output_str}")
     
     final_message = AIMessage(content=output_str)
-    state["messages"].append(final_message)
-    state["current_stage"] = "complete"
     
     print(f"Status: ✅ Output formatted")
-    return state
+    return {"messages": [final_message], "current_stage": "complete"}
+
+
+# ============================================================================
+# ASYNC NODE VARIANTS
+# ============================================================================
+
+def _async_node(node):
+    """
+    Wrap a CPU-only node (no LLM / no I/O) as a coroutine so the async
+    graph runs it inline instead of in an executor thread
+    """
+    async def run(state: DPRState) -> dict:
+        return node(state)
+    run.__name__ = f"{node.__name__}_async"
+    run.__doc__ = f"Async variant of {node.__name__}"
+    return run
+
+
+orchestrator_init_async = _async_node(orchestrator_init)
+coordinator_agent_async = _async_node(coordinator_agent)
+workflow_planner_async = _async_node(workflow_planner)
+output_formatter_async = _async_node(output_formatter)
+consistency_agent_async = _async_node(consistency_agent)
+clarification_agent_async = _async_node(clarification_agent)
+
+
+# Node name → (sync function, async function)
+GRAPH_NODES = {
+    "ORCHESTRATOR_INIT": (orchestrator_init, orchestrator_init_async),
+    "DATA_COLLECTION_AGENT": (data_collection_agent, data_collection_agent_async),
+    "CLARIFICATION_AGENT": (clarification_agent, clarification_agent_async),
+    "FINANCIAL_MODELING_AGENT": (financial_modeling_agent, financial_modeling_agent_async),
+    "DOCUMENT_GENERATOR_AGENT": (document_generator_agent, document_generator_agent_async),
+    "CONSISTENCY_AGENT": (consistency_agent, consistency_agent_async),
+    "VALIDATION_AGENT": (validation_agent, validation_agent_async),
+    "REPAIR_AGENT": (repair_agent, repair_agent_async),
+    "FILE_EXPORT_AGENT": (file_export_agent, file_export_agent_async),
+    "COORDINATOR_AGENT": (coordinator_agent, coordinator_agent_async),
+    "WORKFLOW_PLANNER": (workflow_planner, workflow_planner_async),
+    "OUTPUT_FORMATTER": (output_formatter, output_formatter_async),
+}
 
 
 # ============================================================================
 # GRAPH BUILDER
 # ============================================================================
 
-def build_orchestrator_agent():
+def route_after_data_collection(state: DPRState) -> list:
+    """
+    Next node(s) after data collection: generation only for valid project
+    data, otherwise a clarification question (no financial / LLM work)
+
+    With financial placeholders, financial modeling and document generation
+    start together (figures are bound at export)
+    """
+    if not state.get("validation", {}).get("valid"):
+        return ["CLARIFICATION_AGENT"]
+    if FINANCIAL_PLACEHOLDERS:
+        return ["FINANCIAL_MODELING_AGENT", "DOCUMENT_GENERATOR_AGENT"]
+    return ["FINANCIAL_MODELING_AGENT"]
+
+
+def build_orchestrator_agent(use_async: bool = False, save_png: bool = True):
     """
     Build the orchestrator graph with all agents
     Stage 9: FILE EXPORT INTEGRATION! 📁
+    
+    Args:
+        use_async: Wire the async node variants (drive with ainvoke/astream)
+        save_png: Save the graph visualization next to this file
     """
+    mode = "ASYNC" if use_async else "SYNC"
     print("\n" + "="*80)
-    print("🏗️  BUILDING DPR ORCHESTRATOR GRAPH - STAGE 9 (FILE EXPORT!)")
+    print(f"🏗️  BUILDING DPR ORCHESTRATOR GRAPH - STAGE 9 (FILE EXPORT!) [{mode}]")
     print("="*80)
     
     # Create state graph
     builder = StateGraph(DPRState)
     
     # Add nodes
-    builder.add_node("ORCHESTRATOR_INIT", orchestrator_init)
-    builder.add_node("DATA_COLLECTION_AGENT", data_collection_agent)
-    builder.add_node("FINANCIAL_MODELING_AGENT", financial_modeling_agent)
-    builder.add_node("DOCUMENT_GENERATOR_AGENT", document_generator_agent)
-    builder.add_node("FILE_EXPORT_AGENT", file_export_agent)  # NEW!
-    builder.add_node("COORDINATOR_AGENT", coordinator_agent)
-    builder.add_node("WORKFLOW_PLANNER", workflow_planner)
-    builder.add_node("OUTPUT_FORMATTER", output_formatter)
+    for name, (sync_node, async_node) in GRAPH_NODES.items():
+        builder.add_node(name, async_node if use_async else sync_node)
     
     # Add edges - Updated flow with file export
     builder.add_edge(START, "ORCHESTRATOR_INIT")
     builder.add_edge("ORCHESTRATOR_INIT", "DATA_COLLECTION_AGENT")
-    builder.add_edge("DATA_COLLECTION_AGENT", "FINANCIAL_MODELING_AGENT")
-    builder.add_edge("FINANCIAL_MODELING_AGENT", "DOCUMENT_GENERATOR_AGENT")
-    builder.add_edge("DOCUMENT_GENERATOR_AGENT", "FILE_EXPORT_AGENT")  # NEW!
-    builder.add_edge("FILE_EXPORT_AGENT", "COORDINATOR_AGENT")  # NEW!
+    # Only validated project data reaches the LLM-heavy agents
+    builder.add_conditional_edges("DATA_COLLECTION_AGENT", route_after_data_collection,
+                                  ["FINANCIAL_MODELING_AGENT", "DOCUMENT_GENERATOR_AGENT",
+                                   "CLARIFICATION_AGENT"])
+    builder.add_edge("CLARIFICATION_AGENT", END)
+    if FINANCIAL_PLACEHOLDERS:
+        # Parallel branches join before the numeric checks
+        builder.add_edge(["FINANCIAL_MODELING_AGENT", "DOCUMENT_GENERATOR_AGENT"], "CONSISTENCY_AGENT")
+    else:
+        builder.add_edge("FINANCIAL_MODELING_AGENT", "DOCUMENT_GENERATOR_AGENT")
+        builder.add_edge("DOCUMENT_GENERATOR_AGENT", "CONSISTENCY_AGENT")
+    builder.add_edge("CONSISTENCY_AGENT", "VALIDATION_AGENT")
+    builder.add_edge("VALIDATION_AGENT", "REPAIR_AGENT")
+    builder.add_edge("REPAIR_AGENT", "FILE_EXPORT_AGENT")
+    builder.add_edge("FILE_EXPORT_AGENT", "COORDINATOR_AGENT")
     builder.add_edge("COORDINATOR_AGENT", "WORKFLOW_PLANNER")
     builder.add_edge("WORKFLOW_PLANNER", "OUTPUT_FORMATTER")
     builder.add_edge("OUTPUT_FORMATTER", END)
@@ -304,16 +389,37 @@ def build_orchestrator_agent():
     graph = builder.compile()
     
     # Save visualization
-    save_graph_as_png(graph, __file__)
+    if save_png:
+        save_graph_as_png(graph, __file__)
     
-    print("\n✅ Orchestrator graph built successfully! (Stage 9 - FILE EXPORT!) 📁")
+    print(f"\n✅ Orchestrator graph built successfully! (Stage 9 - FILE EXPORT!) [{mode}] 📁")
     print("="*80 + "\n")
     
     return graph
 
 
 # ============================================================================
-# BUILD GRAPH ON MODULE IMPORT
+# BUILD GRAPHS ON MODULE IMPORT
 # ============================================================================
 
-orchestrator_graph = build_orchestrator_agent()
\ No newline at end of file
+# Sync graph - orchestrator_graph.invoke(...) / .stream(...) as before
+orchestrator_graph = build_orchestrator_agent()
+
+# Async graph - await async_orchestrator_graph.ainvoke(...) / .astream(...)
+# One event loop can drive many concurrent DPR runs through this graph
+async_orchestrator_graph = build_orchestrator_agent(use_async=True, save_png=False)
+
+
+async def arun_orchestrator(init_state: DPRState) -> DPRState:
+    """
+    Run one DPR through the async graph
+    """
+    return await async_orchestrator_graph.ainvoke(init_state)
+
+
+def run_orchestrator(init_state: DPRState) -> DPRState:
+    """
+    Sync wrapper over the async graph for callers without an event loop
+    (orchestrator_graph.invoke remains the default sync entry point)
+    """
+    return asyncio.run(arun_orchestrator(init_state))
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+# dpr_service.py
+"""
+DPR Service - long-running HTTP front-end for DPR generation
+
+Accepts DPR requests over HTTP, queues them in a bounded job queue and
+drains the queue with a pool of worker threads running orchestrator_graph.
+The compiled graph and the LLM clients (llm_client.get_llm) are created
+once at startup and stay warm across requests.
+
+Endpoints:
+    POST /dpr                   {"prompt": "...", "project_id": "optional"}
+                                → 202 {"job_id", "status", "queue_position"}
+                                → 503 when the queue is full (Retry-After)
+    GET  /dpr/<job_id>          Job status + per-section progress (polling)
+                                + the question when "awaiting_clarification"
+    GET  /dpr/<job_id>/events   Server-sent events: node/section progress
+                                (+ section tokens with --stream-tokens)
+    POST /dpr/<job_id>/reply    {"answer": "..."} answers the clarification
+                                question and re-queues the job
+                                → 409 when the job is not awaiting one
+    GET  /health                Queue depth, workers, job counts, LLM governor
+
+Usage:
+    python dpr_service.py --port 8080 --workers 4 --queue-size 100 --rpm 120 --tpm 400000
+"""
+import sys
+import json
+import time
+import uuid
+import queue
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+
+from langchain_core.messages import HumanMessage
+
+from config import (
+    SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_QUEUE_SIZE,
+    SERVICE_MAX_FINISHED_JOBS, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE,
+    STREAM_SECTION_TOKENS
+)
+from llm_client import configure_rate_limit
+from rate_governor import governed_project, get_governor
+from dpr_batch import summarize_state
+
+
+FINAL_STATUSES = ("complete", "incomplete", "failed")
+# Not running: finished, or waiting for POST /dpr/<job_id>/reply
+IDLE_STATUSES = FINAL_STATUSES + ("awaiting_clarification",)
+# Events kept once a job is idle (token events are dropped)
+KEPT_EVENT_TYPES = ("status", "node", "section")
+
+
+# ============================================================================
+# JOB MODEL
+# ============================================================================
+
+class Job:
+    """
+    One DPR request and its progress events
+    """
+    def __init__(self, prompt: str, project_id: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.project_id = project_id or self.id[:8]
+        self.prompt = prompt
+        self.status = "queued"
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.current_node = None
+        self.sections_done = 0
+        self.sections_total = 21
+        self.events = []
+        self.next_seq = 0
+        self.result = None
+        self.error = None
+        # Graph state to resume from after a clarification answer
+        self.state = None
+        self._changed = threading.Condition()
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        """Record a progress event and wake up SSE listeners"""
+        with self._changed:
+            event = dict(event, seq=self.next_seq, time=time.time())
+            self.next_seq += 1
+            if event.get("type") == "node":
+                self.current_node = event["node"]
+            elif event.get("type") == "section":
+                self.sections_done = event.get("index", self.sections_done)
+                self.sections_total = event.get("total", self.sections_total)
+            self.events.append(event)
+            self._changed.notify_all()
+
+    def compact_events(self) -> None:
+        """Drop token events of an idle job (keeps status / node / section)"""
+        with self._changed:
+            self.events = [e for e in self.events if e["type"] in KEPT_EVENT_TYPES]
+
+    def events_since(self, seq: int):
+        """Events with seq >= `seq` (events are in seq order; compaction leaves gaps)"""
+        start = max(0, len(self.events) - (self.next_seq - seq))
+        while start < len(self.events) and self.events[start]["seq"] < seq:
+            start += 1
+        return self.events[start:]
+
+    def wait_for_events(self, after: int, timeout: float = 15.0):
+        """
+        Block until there are events with seq >= `after` (or the job is idle)
+
+        Returns:
+            (new_events, idle)
+        """
+        with self._changed:
+            if self.next_seq <= after and self.status not in IDLE_STATUSES:
+                self._changed.wait(timeout)
+            return self.events_since(after), self.status in IDLE_STATUSES
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "project_id": self.project_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": {
+                "current_node": self.current_node,
+                "sections_done": self.sections_done,
+                "sections_total": self.sections_total,
+                "events": self.next_seq,
+            },
+        }
+        if self.status == "awaiting_clarification":
+            clarification = (self.state or {}).get("clarification", {})
+            data["clarification"] = {
+                "question": clarification.get("question"),
+                "missing_fields": clarification.get("missing_fields", []),
+                "reply_url": f"/dpr/{self.id}/reply",
+            }
+        if self.error:
+            data["error"] = self.error
+        if include_result and self.result is not None:
+            data["result"] = self.result
+        return data
+
+
+# ============================================================================
+# JOB QUEUE + WORKER POOL
+# ============================================================================
+
+class DPRJobService:
+    """
+    Bounded job queue drained by a fixed pool of worker threads
+    """
+    def __init__(self, graph, workers: int = SERVICE_WORKERS,
+                 queue_size: int = SERVICE_QUEUE_SIZE,
+                 max_finished_jobs: int = SERVICE_MAX_FINISHED_JOBS,
+                 stream_tokens: bool = STREAM_SECTION_TOKENS):
+        self.graph = graph
+        self.stream_tokens = stream_tokens
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.jobs_lock = threading.Lock()
+        self.max_finished_jobs = max_finished_jobs
+        self.workers = [
+            threading.Thread(target=self._worker, name=f"dpr-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, prompt: str, project_id: Optional[str] = None) -> Optional[Job]:
+        """
+        Enqueue a job
+
+        Returns:
+            The job, or None if the queue is full
+        """
+        job = Job(prompt, project_id)
+        with self.jobs_lock:
+            try:
+                self.queue.put_nowait(job)
+            except queue.Full:
+                return None
+            self.jobs[job.id] = job
+            self._evict_finished()
+        job.add_event({"type": "status", "status": "queued"})
+        return job
+
+    def reply(self, job: Job, answer: str) -> bool:
+        """
+        Answer a job's clarification question and re-queue it
+
+        Returns:
+            False if the job is not awaiting clarification or the queue is full
+        """
+        with self.jobs_lock:
+            if job.status != "awaiting_clarification":
+                return False
+            state = job.state
+            job.state = dict(state, messages=list(state.get("messages", [])) + [HumanMessage(content=answer)])
+            job.status = "queued"
+            try:
+                self.queue.put_nowait(job)
+            except queue.Full:
+                job.state = state
+                job.status = "awaiting_clarification"
+                return False
+        job.add_event({"type": "status", "status": "queued"})
+        return True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self.jobs_lock:
+            return self.jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.jobs_lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "status": "ok",
+            "workers": len(self.workers),
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "jobs": counts,
+            "llm_governor": get_governor().snapshot(),
+        }
+
+    def _evict_finished(self) -> None:
+        """Keep memory bounded: drop the oldest finished (or unanswered) jobs"""
+        finished = [jid for jid, job in self.jobs.items() if job.status in IDLE_STATUSES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
+
+    def _worker(self) -> None:
+        while True:
+            job = self.queue.get()
+            try:
+                self._run_job(job)
+            finally:
+                self.queue.task_done()
+
+    def _run_job(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = datetime.now().isoformat()
+        job.add_event({"type": "status", "status": "running"})
+
+        config = {"configurable": {"on_progress": job.add_event,
+                                   "stream_tokens": self.stream_tokens}}
+        # Resumed after a clarification answer, or a new request
+        init_state = job.state or {"messages": [HumanMessage(content=job.prompt)],
+                                   "run_id": job.project_id}
+        job.state = None
+        job.error = None
+        final_state = None
+
+        try:
+            # LLM calls of this job share the governor fairly with other jobs
+            with governed_project(job.id):
+                for mode, chunk in self.graph.stream(init_state, config=config,
+                                                     stream_mode=["updates", "values"]):
+                    if mode == "updates":
+                        for node in chunk:
+                            job.add_event({"type": "node", "node": node})
+                    else:
+                        final_state = chunk
+
+            final_state = final_state or {}
+            job.result = summarize_state(final_state)
+            if final_state.get("current_stage") == "awaiting_clarification":
+                # Kept until POST /dpr/<job_id>/reply resumes it
+                job.state = final_state
+                job.status = "awaiting_clarification"
+            else:
+                valid = final_state.get("validation", {}).get("valid")
+                job.status = "complete" if valid else "incomplete"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "failed"
+
+        job.finished_at = datetime.now().isoformat()
+        event = {"type": "status", "status": job.status}
+        if job.status == "awaiting_clarification":
+            event["question"] = job.state.get("clarification", {}).get("question")
+        job.add_event(event)
+        job.compact_events()
+
+
+# ============================================================================
+# HTTP HANDLER
+# ============================================================================
+
+class DPRRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON + server-sent-events API over DPRJobService
+    """
+    service: DPRJobService = None  # set by serve()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} - {format % args}")
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None) -> None:
+        body = json.dumps(payload, indent=2, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+
+        if parts == ["health"]:
+            return self._send_json(200, self.service.stats())
+
+        if len(parts) in (2, 3) and parts[0] == "dpr":
+            job = self.service.get(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": f"Unknown job: {parts[1]}"})
+            if len(parts) == 2:
+                return self._send_json(200, job.to_dict())
+            if parts[2] == "events":
+                return self._stream_events(job)
+
+        self._send_json(404, {"error": "Not found"})
+
+    def _read_json(self) -> Optional[Any]:
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            return None
+
+    def do_POST(self):
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        if len(parts) == 3 and parts[0] == "dpr" and parts[2] == "reply":
+            return self._reply(parts[1])
+        if parts != ["dpr"]:
+            return self._send_json(404, {"error": "Not found"})
+
+        payload = self._read_json()
+        if payload is None:
+            return self._send_json(400, {"error": "Request body must be JSON"})
+
+        prompt = (payload.get("prompt") or "").strip() if isinstance(payload, dict) else ""
+        if not prompt:
+            return self._send_json(400, {"error": "'prompt' is required"})
+
+        job = self.service.submit(prompt, payload.get("project_id"))
+        if job is None:
+            return self._send_json(503, {"error": "Job queue is full, retry later"},
+                                   headers={"Retry-After": "30"})
+
+        self._send_json(202, {
+            "job_id": job.id,
+            "status": job.status,
+            "queue_position": self.service.queue.qsize(),
+            "status_url": f"/dpr/{job.id}",
+            "events_url": f"/dpr/{job.id}/events",
+        })
+
+    def _reply(self, job_id: str) -> None:
+        """POST /dpr/<job_id>/reply: answer the clarification question"""
+        job = self.service.get(job_id)
+        if job is None:
+            return self._send_json(404, {"error": f"Unknown job: {job_id}"})
+
+        payload = self._read_json()
+        if payload is None:
+            return self._send_json(400, {"error": "Request body must be JSON"})
+        answer = (payload.get("answer") or "").strip() if isinstance(payload, dict) else ""
+        if not answer:
+            return self._send_json(400, {"error": "'answer' is required"})
+
+        if job.status != "awaiting_clarification":
+            return self._send_json(409, {"error": f"Job is {job.status}, not awaiting clarification"})
+        if not self.service.reply(job, answer):
+            return self._send_json(503, {"error": "Job queue is full, retry later"},
+                                   headers={"Retry-After": "30"})
+
+        self._send_json(202, {
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/dpr/{job.id}",
+            "events_url": f"/dpr/{job.id}/events",
+        })
+
+    def _stream_events(self, job: Job) -> None:
+        """
+        Server-sent events: replays past events, then streams new ones
+        until the job finishes (or asks a clarification question)
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        sent = 0
+        try:
+            while True:
+                events, finished = job.wait_for_events(sent)
+                for event in events:
+                    self.wfile.write(
+                        f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n".encode("utf-8")
+                    )
+                if events:
+                    sent = events[-1]["seq"] + 1
+                else:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+                if finished and sent >= job.next_seq:
+                    break
+            final = json.dumps(job.to_dict(), default=str)
+            self.wfile.write(f"event: done\ndata: {final}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def serve(host: str = SERVICE_HOST, port: int = SERVICE_PORT,
+          workers: int = SERVICE_WORKERS, queue_size: int = SERVICE_QUEUE_SIZE,
+          stream_tokens: bool = STREAM_SECTION_TOKENS) -> None:
+    """
+    Build the graph once, start the worker pool and serve HTTP forever
+    """
+    # Built once, kept warm for every request
+    from dpr_orchestrator import orchestrator_graph
+
+    service = DPRJobService(orchestrator_graph, workers=workers, queue_size=queue_size,
+                            stream_tokens=stream_tokens)
+    service.start()
+    DPRRequestHandler.service = service
+
+    server = ThreadingHTTPServer((host, port), DPRRequestHandler)
+    server.daemon_threads = True
+
+    print("\n" + "="*80)
+    print("🌐 DPR SERVICE RUNNING")
+    print("="*80)
+    print(f"   Listening:  http://{host}:{port}")
+    print(f"   Workers:    {workers}")
+    print(f"   Queue size: {queue_size}")
+    print(f"   Streaming:  {'tokens' if stream_tokens else 'sections'}")
+    print("="*80 + "\n")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down DPR service")
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DPR Service - HTTP front-end with job queue")
+    parser.add_argument('--host', default=SERVICE_HOST, help=f'Bind address (default: {SERVICE_HOST})')
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help=f'Port (default: {SERVICE_PORT})')
+    parser.add_argument('--workers', type=int, default=SERVICE_WORKERS,
+                        help=f'Concurrent DPR runs (default: {SERVICE_WORKERS})')
+    parser.add_argument('--queue-size', type=int, default=SERVICE_QUEUE_SIZE,
+                        help=f'Max queued jobs before 503 (default: {SERVICE_QUEUE_SIZE})')
+    parser.add_argument('--rpm', type=int, default=LLM_REQUESTS_PER_MINUTE,
+                        help='Global LLM requests per minute (0 = unlimited)')
+    parser.add_argument('--tpm', type=int, default=LLM_TOKENS_PER_MINUTE,
+                        help='Global LLM tokens per minute (0 = unlimited)')
+    parser.add_argument('--stream-tokens', action='store_true', default=STREAM_SECTION_TOKENS,
+                        help='Send section content token-by-token over /events')
+    args = parser.parse_args()
+
+    if args.workers < 1 or args.queue_size < 1:
+        parser.error("--workers and --queue-size must be at least 1")
+
+    configure_rate_limit(args.rpm, args.tpm)
+    serve(args.host, args.port, args.workers, args.queue_size, args.stream_tokens)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+# export_archive.py
+"""
+Export Archive - manifests and blob bookkeeping for exported section files
+
+Section bodies are stored ONCE, in the section store (by sha256, see
+section_store.py) - the blob the DPR state references. The exported .md
+file (header + body with the financial figures bound) is a plain file
+written from it; it is not stored again:
+
+    output/.blobs/3f/9a...e1                    <- the section body (one blob)
+    output/Printing_Industry_Tirupati/
+        01_executive_summary.md                 <- rendered from that blob
+        manifest.json                           <- latest run's manifest
+        .manifests/20261019T184251123456.json   <- one manifest per run
+
+A run manifest maps every file to its sha256, byte size, word count, mtime,
+the section blob it was rendered from and the hash of the prompt that
+generated it, plus the generator version and model. An unchanged file (same
+hash as in the previous run's manifest, still intact on disk) is not
+written again, and "did anything change?" is a hash comparison between two
+manifests (changed_files). Tools that read the tree (validate_standalone.py)
+trust a file's manifest hash when its size and mtime still match
+(file_hash) instead of reading it.
+
+Blobs no run manifest references (sections of abandoned runs, superseded
+drafts) are deleted by gc_blobs() once they are older than
+config.SECTION_STORE_GC_GRACE_SECONDS (in-flight runs and checkpoints
+still use fresh ones).
+"""
+import os
+import json
+import time
+import glob
+import tempfile
+from typing import Dict, Any, List, Optional, Set
+from datetime import datetime
+
+from config import APP_NAME, VERSION, LLM_MODEL, SECTION_STORE_GC_GRACE_SECONDS
+from section_store import store_root, content_hash
+
+
+MANIFEST_DIR = ".manifests"
+MANIFEST_FILE = "manifest.json"
+ARCHIVE_VERSION = "2.0"
+
+
+# ============================================================================
+# FILE MATERIALIZATION
+# ============================================================================
+
+def entry_hash(entry: Dict[str, Any]) -> Optional[str]:
+    """sha256 of a manifest entry's file ("blob" in archive 1.x manifests)"""
+    return entry.get("sha256") or entry.get("blob")
+
+
+def write_file(path: str, content: str) -> None:
+    """Write a file atomically (write-then-rename, 0644)"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def archive_file(path: str, content: str, previous: Optional[Dict[str, Any]] = None,
+                 section_blob: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write one exported file unless it is already in place
+
+    Args:
+        path: File in the human-readable tree
+        content: Full file content
+        previous: This file's entry in the previous run manifest
+        section_blob: Section store blob the content was rendered from
+
+    Returns:
+        Manifest entry {"sha256", "bytes", "changed", "written", "mtime_ns",
+        "section_blob"}
+    """
+    digest = content_hash(content)
+    entry = {
+        "sha256": digest,
+        "bytes": len(content.encode("utf-8")),
+        "changed": not previous or entry_hash(previous) != digest,
+        "section_blob": section_blob,
+    }
+
+    # Same content as last run and the file still holds it: nothing to write
+    entry["written"] = not (not entry["changed"] and os.path.exists(path)
+                            and file_hash(path, previous) == digest)
+    if entry["written"]:
+        write_file(path, content)
+    entry["mtime_ns"] = os.stat(path).st_mtime_ns
+    return entry
+
+
+def stat_matches(path: str, entry: Dict[str, Any]) -> bool:
+    """File still has the size and mtime its manifest entry recorded"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return stat.st_size == entry.get("bytes") and stat.st_mtime_ns == entry.get("mtime_ns")
+
+
+def file_hash(path: str, entry: Optional[Dict[str, Any]] = None) -> str:
+    """
+    sha256 of a file: taken from its manifest entry when the stat still
+    matches, otherwise read and hashed
+    """
+    if entry and stat_matches(path, entry):
+        return entry_hash(entry)
+    with open(path, encoding="utf-8", newline="") as f:
+        return content_hash(f.read())
+
+
+# ============================================================================
+# RUN MANIFESTS
+# ============================================================================
+
+def manifest_dir(output_dir: str) -> str:
+    return os.path.join(output_dir, MANIFEST_DIR)
+
+
+def list_manifests(output_dir: str) -> List[str]:
+    """Run manifest paths for an export directory, oldest first"""
+    directory = manifest_dir(output_dir)
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.endswith(".json")]
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def latest_manifest(output_dir: str) -> Dict[str, Any]:
+    """Manifest of the most recent run (empty if there is none)"""
+    manifest = load_manifest(os.path.join(output_dir, MANIFEST_FILE))
+    if manifest:
+        return manifest
+    manifests = list_manifests(output_dir)
+    return load_manifest(manifests[-1]) if manifests else {}
+
+
+def write_manifest(output_dir: str, files: Dict[str, Dict[str, Any]],
+                   project_data: Dict[str, Any]) -> str:
+    """
+    Write this run's manifest (file name → entry) to .manifests/ and as
+    manifest.json, and return the run manifest's path
+    """
+    run_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    manifest = {
+        "archive_version": ARCHIVE_VERSION,
+        "run_id": run_id,
+        "created": datetime.now().isoformat(),
+        "generator": APP_NAME,
+        "generator_version": VERSION,
+        "model": LLM_MODEL,
+        "project": {
+            "cluster_type": project_data.get("cluster_type"),
+            "location": project_data.get("location"),
+        },
+        "files": files,
+    }
+    directory = manifest_dir(output_dir)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{run_id}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    latest_path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(f"{latest_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{latest_path}.tmp", latest_path)
+    return path
+
+
+def changed_files(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Compare two run manifests by blob hash
+
+    Returns:
+        {"added": [...], "removed": [...], "changed": [...]} (file names)
+    """
+    old_files = old.get("files", {})
+    new_files = new.get("files", {})
+    return {
+        "added": sorted(name for name in new_files if name not in old_files),
+        "removed": sorted(name for name in old_files if name not in new_files),
+        "changed": sorted(name for name in new_files
+                          if name in old_files and entry_hash(old_files[name]) != entry_hash(new_files[name])),
+    }
+
+
+# ============================================================================
+# BLOB GARBAGE COLLECTION
+# ============================================================================
+
+def output_root() -> str:
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, "..", "output")
+
+
+def referenced_blobs(root: Optional[str] = None) -> Set[str]:
+    """Section blobs referenced by any run manifest under root (default: output/)"""
+    root = root or output_root()
+    paths = glob.glob(os.path.join(root, "*", MANIFEST_DIR, "*.json"))
+    paths += glob.glob(os.path.join(root, "*", MANIFEST_FILE))
+    referenced = set()
+    for path in paths:
+        for entry in load_manifest(path).get("files", {}).values():
+            if entry.get("section_blob"):
+                referenced.add(entry["section_blob"])
+    return referenced
+
+
+def gc_blobs(root: Optional[str] = None,
+             grace_seconds: float = SECTION_STORE_GC_GRACE_SECONDS) -> Dict[str, int]:
+    """
+    Delete section blobs no run manifest references and that are older
+    than grace_seconds
+
+    Returns:
+        {"removed", "bytes_freed", "kept"}
+    """
+    referenced = referenced_blobs(root)
+    cutoff = time.time() - grace_seconds
+    stats = {"removed": 0, "bytes_freed": 0, "kept": 0}
+    blob_root = store_root()
+    if not os.path.isdir(blob_root):
+        return stats
+
+    for prefix in os.listdir(blob_root):
+        directory = os.path.join(blob_root, prefix)
+        if len(prefix) != 2 or not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.startswith(".tmp-"):
+                continue
+            try:
+                stat = os.stat(path)
+                if prefix + name in referenced or stat.st_mtime > cutoff:
+                    stats["kept"] += 1
+                    continue
+                os.remove(path)
+            except OSError:
+                continue
+            stats["removed"] += 1
+            stats["bytes_freed"] += stat.st_size
+    return stats
@@ -4,52 +4,50 @@ File Export Agent - Stage 9
 Exports generated DPR sections to individual Markdown files
 
 Creates 21 separate .md files (one per section) in the output directory
+plus the combined PDF/DOCX submission document (see document_renderer.py)
+
+The .md files are rendered from the section store blobs
+(export_archive.py): each body is stored once by hash, unchanged sections
+are not rewritten, and every run writes manifest.json (per-file sha256,
+size, word count, prompt hash, generator version, model)
 """
 import os
-from typing import Dict, Any
+import re
+import asyncio
+from typing import Dict, Any, Optional
 from datetime import datetime
 from termcolor import cprint
 
+from config import EXPORT_DOCUMENT_FORMATS
+from document_renderer import render_dpr_documents
+from section_registry import SECTION_REGISTRY, TOTAL_SECTIONS
+from financial_placeholders import bind_sections
+from config import SECTION_STORE_GC
+from section_store import is_section_ref
+from export_archive import archive_file, latest_manifest, write_manifest, gc_blobs
+
 
-# Section number mapping (for file naming)
+# Section number mapping (for file naming) - derived from section_registry
 SECTION_MAPPING = {
-    "executive_summary": {"num": "01", "title": "Executive Summary"},
-    "organization_details": {"num": "02", "title": "Organization Details"},
-    "financial_plan": {"num": "03", "title": "Financial Plan"},
-    "project_introduction": {"num": "04", "title": "Project Introduction & Background"},
-    "cluster_profile": {"num": "05", "title": "Cluster Profile Analysis"},
-    "technical_feasibility": {"num": "06", "title": "Technical Feasibility Study"},
-    "market_analysis": {"num": "07", "title": "Market Analysis & Demand Assessment"},
-    "implementation_schedule": {"num": "08", "title": "Implementation Schedule & Timeline"},
-    "management_structure": {"num": "09", "title": "Management & Organizational Structure"},
-    "economic_viability": {"num": "10", "title": "Economic & Commercial Viability"},
-    "swot_analysis": {"num": "11", "title": "SWOT Analysis"},
-    "risk_analysis": {"num": "12", "title": "Risk Analysis & Mitigation"},
-    "environmental_impact": {"num": "13", "title": "Environmental & Social Impact Assessment"},
-    "quality_assurance": {"num": "14", "title": "Quality Assurance & Standards"},
-    "supply_chain": {"num": "15", "title": "Raw Material & Supply Chain Management"},
-    "infrastructure": {"num": "16", "title": "Infrastructure & Utilities Requirements"},
-    "legal_compliance": {"num": "17", "title": "Legal & Regulatory Compliance"},
-    "human_resource": {"num": "18", "title": "Human Resource & Manpower Plan"},
-    "marketing_strategy": {"num": "19", "title": "Marketing & Sales Strategy"},
-    "monitoring_framework": {"num": "20", "title": "Monitoring & Evaluation Framework"},
-    "annexures": {"num": "21", "title": "Annexures & Supporting Documents"}
+    spec.key: {"num": f"{spec.num:02d}", "title": spec.title}
+    for spec in SECTION_REGISTRY
 }
 
 
 def create_file_header(section_title: str, project_data: Dict[str, Any]) -> str:
     """
     Create metadata header for each file
+    
+    No generation timestamp - identical sections must produce identical
+    files to deduplicate (the run time is in the run manifest)
     """
     cluster = project_data.get("cluster_type", "N/A")
     location = project_data.get("location", "N/A")
-    date_generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     header = f"""---
 DPR Section: {section_title}
 Project: {cluster}
 Location: {location}
-Generated: {date_generated}
 Format: Markdown
 Generated by: DPR Automation Platform v1.0.0
 ---
@@ -58,34 +56,66 @@ Generated by: DPR Automation Platform v1.0.0
     return header
 
 
+def section_prompt_hash(prompt_stats: Dict[str, Any], section_key: str):
+    """
+    Hash of the prompt a section was generated from (prompt_compiler
+    stats; batched sections share their batch's prompt)
+    """
+    sections = prompt_stats.get("sections", {})
+    if section_key in sections:
+        return sections[section_key].get("prompt_hash")
+    for stats_key, entry in sections.items():
+        if stats_key.startswith("batch:") and section_key in stats_key[6:].split("+"):
+            return entry.get("prompt_hash")
+    return None
+
+
+def get_output_directory(project_data: Dict[str, Any], run_id: Optional[str] = None) -> str:
+    """
+    Export directory for a project: ../output/<Cluster>_<City>, or
+    ../output/<Cluster>_<City>_<run_id> when the run has an id (dpr_batch /
+    dpr_service runs projects of the same cluster concurrently)
+    (also used by document_generator for streamed section files)
+    """
+    # Get cluster name for directory naming
+    cluster = project_data.get("cluster_type", "Unknown_Cluster")
+    location = project_data.get("location", "Unknown_Location")
+    
+    # Clean names for directory (remove spaces, special chars)
+    cluster_clean = cluster.replace(" ", "_").replace(",", "")
+    location_clean = location.split(",")[0].replace(" ", "_")  # Just city name
+    
+    name = f"{cluster_clean}_{location_clean}"
+    if run_id:
+        # run ids can come from HTTP clients (dpr_service): no path separators
+        name = f"{name}_{re.sub(r'[^A-Za-z0-9_-]+', '_', run_id)}"
+    
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, "..", "output", name)
+
+
 def file_export_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     File Export Agent - Writes all 21 DPR sections to individual files
     
-    Input: state["dpr_sections"] (21 sections in memory)
+    Input: state["dpr_sections"] (21 section references, see section_store.py)
     Output: 21 individual .md files in /output directory
     """
     print()
     cprint(f"{'NODE: file_export_agent':-^80}", 'cyan', attrs=['bold'])
     
-    dpr_sections = state.get("dpr_sections", {})
+    # Financial placeholders ({{npv}} ...) bound to the financial model
+    section_refs = state.get("dpr_sections", {})
+    dpr_sections = bind_sections(section_refs)
     project_data = state.get("project_data", {})
+    prompt_stats = state.get("prompt_stats") or {}
     
     if not dpr_sections:
         print("⚠️  No DPR sections available for export")
-        return state
-    
-    # Get cluster name for directory naming
-    cluster = project_data.get("cluster_type", "Unknown_Cluster")
-    location = project_data.get("location", "Unknown_Location")
-    
-    # Clean names for directory (remove spaces, special chars)
-    cluster_clean = cluster.replace(" ", "_").replace(",", "")
-    location_clean = location.split(",")[0].replace(" ", "_")  # Just city name
+        return {}
     
     # Create output directory
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    output_dir = os.path.join(base_dir, "..", "output", f"{cluster_clean}_{location_clean}")
+    output_dir = get_output_directory(project_data, state.get("run_id"))
     
     # Create directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -96,6 +126,10 @@ def file_export_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     # Track export statistics
     files_created = 0
     total_size = 0
+    files_changed = 0
+    bytes_written = 0
+    manifest_files = {}
+    previous_files = latest_manifest(output_dir).get("files", {})
     
     # Export each section
     for section_key, section_content in dpr_sections.items():
@@ -120,36 +154,101 @@ def file_export_agent(state: Dict[str, Any]) -> Dict[str, Any]:
         file_header = create_file_header(section_title, project_data)
         file_content = file_header + section_content
         
-        # Write to file
+        # Write unless unchanged; the manifest records the section blob
+        ref = section_refs.get(section_key)
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(file_content)
+            entry = archive_file(filepath, file_content, previous_files.get(filename),
+                                 ref["blob"] if is_section_ref(ref) else None)
+            manifest_files[filename] = {
+                "section": section_key,
+                **entry,
+                "words": len(section_content.split()),
+                "prompt_hash": section_prompt_hash(prompt_stats, section_key),
+            }
             
-            file_size = len(file_content)
+            file_size = entry["bytes"]
             total_size += file_size
             files_created += 1
+            files_changed += entry["changed"]
+            bytes_written += file_size if entry["written"] else 0
             
-            print(f"  ✅ {filename:<45} ({file_size:>6} bytes)")
+            status = "" if entry["changed"] else ", unchanged"
+            print(f"  ✅ {filename:<45} ({file_size:>6} bytes{status})")
             
         except Exception as e:
             print(f"  ❌ Error writing {filename}: {e}")
     
+    # Render the combined submission document (incremental - unchanged
+    # sections reuse their cached page layout)
+    render_info = {}
+    if EXPORT_DOCUMENT_FORMATS:
+        ordered_sections = [
+            (key, dpr_sections[key])
+            for key in sorted(SECTION_MAPPING, key=lambda k: SECTION_MAPPING[k]["num"])
+            if key in dpr_sections
+        ]
+        try:
+            render_info = render_dpr_documents(
+                ordered_sections, project_data, output_dir, EXPORT_DOCUMENT_FORMATS
+            )
+            print()
+            for fmt, path in render_info["files"].items():
+                size = render_info["sizes"][fmt]
+                print(f"  ✅ {os.path.basename(path):<45} ({size:>6} bytes)")
+            print(f"     Pages: {render_info['pages']} | Sections re-rendered: "
+                  f"{render_info['sections_rendered']} | Reused from cache: {render_info['sections_reused']}")
+        except Exception as e:
+            print(f"  ❌ Error rendering submission document: {e}")
+    
+    manifest_path = write_manifest(output_dir, manifest_files, project_data)
+    
+    gc_stats = {}
+    if SECTION_STORE_GC:
+        try:
+            gc_stats = gc_blobs()
+            if gc_stats["removed"]:
+                print(f"\n🧹 Removed {gc_stats['removed']} unreferenced section blobs "
+                      f"({gc_stats['bytes_freed']:,} bytes)")
+        except Exception as e:
+            print(f"  ⚠️  Blob cleanup skipped: {e}")
+    
     print()
     print("="*80)
     print(f"📊 Export Summary:")
-    print(f"   Files Created: {files_created}/21")
+    print(f"   Files Created: {files_created}/{TOTAL_SECTIONS}")
+    print(f"   Files Changed: {files_changed} ({bytes_written:,} bytes written)")
     print(f"   Total Size: {total_size:,} bytes ({total_size/1024:.1f} KB)")
     print(f"   Location: {output_dir}")
     print("="*80)
     print()
     
-    # Store export info in state
-    state["export_info"] = {
+    export_info = {
         "files_created": files_created,
         "output_directory": output_dir,
         "total_size_bytes": total_size,
-        "timestamp": datetime.now().isoformat()
+        "files_changed": files_changed,
+        "bytes_written": bytes_written,
+        "blobs_removed": gc_stats.get("removed", 0),
+        "manifest": manifest_path,
+        "timestamp": datetime.now().isoformat(),
+        "documents": render_info.get("files", {}),
+        "render_stats": {
+            "pages": render_info.get("pages", 0),
+            "sections_rendered": render_info.get("sections_rendered", 0),
+            "sections_reused": render_info.get("sections_reused", 0)
+        }
     }
     
     print(f"✅ File export complete!")
-    return state
+    return {"export_info": export_info}
+
+
+
+async def file_export_agent_async(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async variant of file_export_agent
+
+    File writes and PDF/DOCX rendering run in a worker thread so the event
+    loop stays free for other in-flight DPR runs.
+    """
+    return await asyncio.to_thread(file_export_agent, state)
@@ -11,6 +11,7 @@ from typing import Dict, Any
 from termcolor import cprint
 
 from config import LLM_MODEL
+from indian_numbers import format_inr, format_crore
 
 
 # ============================================================================
@@ -224,7 +225,7 @@ def financial_modeling_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     
     if not project_data:
         print("⚠️  No project data available for financial modeling")
-        return state
+        return {}
     
     print(f"\n💰 Calculating financial metrics for {project_data.get('cluster_type', 'project')}...")
     print("⚠️  [IMPORTANT] Currently using DUMMY/SIMULATED calculations")
@@ -239,9 +240,9 @@ def financial_modeling_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     grant_percentage = 0.70  # Simulated 70% grant
     loan_amount = project_cost * (1 - grant_percentage)
     
-    print(f"📊 Project Cost: ₹{project_cost:,.0f}")
-    print(f"📊 Grant (70%): ₹{project_cost * grant_percentage:,.0f}")
-    print(f"📊 Loan Amount: ₹{loan_amount:,.0f}")
+    print(f"📊 Project Cost: {format_inr(project_cost)} ({format_crore(project_cost)})")
+    print(f"📊 Grant (70%): {format_inr(project_cost * grant_percentage)}")
+    print(f"📊 Loan Amount: {format_inr(loan_amount)}")
     print()
     
     # Calculate financial metrics
@@ -251,7 +252,7 @@ def financial_modeling_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     # 1. NPV (DUMMY)
     npv = calculate_npv_dummy(project_cost, loan_amount, years=10)
     npv_status = "✅ PASS" if npv > 0 else "❌ FAIL"
-    print(f"  NPV: ₹{npv:,.2f} {npv_status} (requirement: > 0)")
+    print(f"  NPV: {format_inr(npv, 2)} {npv_status} (requirement: > 0)")
     
     # 2. IRR (DUMMY)
     annual_profit = project_cost * 0.18  # Simulated
@@ -326,13 +327,19 @@ def financial_modeling_agent(state: Dict[str, Any]) -> Dict[str, Any]:
         "calculation_note": "⚠️ Using simulated/dummy calculations for development. Actual formulas to be implemented."
     }
     
-    # Initialize dpr_sections if not present
-    if "dpr_sections" not in state:
-        state["dpr_sections"] = {}
-    
-    state["dpr_sections"]["financial"] = financial_data
-    
     print("✅ Financial modeling complete")
     print("💾 Stored in state['dpr_sections']['financial']")
     
-    return state
\ No newline at end of file
+    # Delta only - runs in parallel with document generation (dpr_sections
+    # is merged key by key, see DPRState)
+    return {"dpr_sections": {"financial": financial_data}}
+
+
+async def financial_modeling_agent_async(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async variant of financial_modeling_agent
+
+    The calculations are pure Python (no LLM or I/O), so this runs them
+    inline on the event loop instead of handing them to a worker thread.
+    """
+    return financial_modeling_agent(state)
@@ -0,0 +1,101 @@
+# financial_placeholders.py
+"""
+Financial Placeholders - financial figures bound after generation
+
+Sections are written with typed placeholders instead of figures:
+
+    "The project has an NPV of {{npv}} and an IRR of {{irr}}."
+
+and bound to state["dpr_sections"]["financial"] when the text is used
+(validation, export):
+
+    "The project has an NPV of ₹2,87,45,123.40 and an IRR of 18.47%."
+
+So section generation does not wait for the financial model, and a change
+to the financial model (what-if scenarios) is one bind_sections() call - no
+LLM call. The same formatters fill the prompts when placeholders are off
+(config.FINANCIAL_PLACEHOLDERS), so both modes read identically.
+"""
+import re
+from typing import Dict, Any, Callable
+
+from indian_numbers import format_inr
+
+
+# Placeholder name → formatter over state["dpr_sections"]["financial"]
+PLACEHOLDER_FORMATS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    # Amounts
+    "npv": lambda f: format_inr(f.get("metrics", {}).get("npv", 0), 2),
+    "grant_amount": lambda f: format_inr(f.get("loan_details", {}).get("grant_amount", 0), 2),
+    "loan_amount": lambda f: format_inr(f.get("loan_details", {}).get("loan_amount", 0), 2),
+    # Percentages / ratios / periods
+    "irr": lambda f: f"{f.get('metrics', {}).get('irr', 0):.2f}%",
+    "dscr": lambda f: f"{f.get('metrics', {}).get('dscr', 0):.2f}",
+    "breakeven": lambda f: f"{f.get('metrics', {}).get('breakeven_percentage', 0):.1f}%",
+    "payback": lambda f: f"{f.get('metrics', {}).get('payback_period_years', 0):.1f} years",
+    "grant_percentage": lambda f: f"{f.get('loan_details', {}).get('grant_percentage', 0):.0f}%",
+    "projection_years": lambda f: str(f.get("projections", {}).get("duration_years", 10)),
+    # MSE-CDP verdicts
+    "compliance_status": lambda f: f.get("mse_cdp_compliance", {}).get("status", "UNKNOWN"),
+    "npv_check": lambda f: ("positive - PASS" if f.get("metrics", {}).get("npv", 0) > 0
+                            else "negative - FAIL"),
+    "irr_check": lambda f: ("exceeds 10% - PASS" if f.get("metrics", {}).get("irr", 0) > 10
+                            else "below 10% - FAIL"),
+    "dscr_check": lambda f: ("exceeds 3:1 - PASS" if f.get("metrics", {}).get("dscr", 0) > 3.0
+                             else "below 3:1 - FAIL"),
+    "breakeven_check": lambda f: ("below 60% - PASS"
+                                  if f.get("metrics", {}).get("breakeven_percentage", 0) < 60
+                                  else "exceeds 60% - FAIL"),
+}
+
+# "{{npv}}" - tolerant of the spacing models sometimes add ("{{ npv }}")
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*([a-z_]+)\s*\}\}')
+
+PLACEHOLDER_RULE = """Financial figures are given as placeholders such as {{npv}} or {{irr}}.
+Copy each placeholder exactly as written wherever the figure belongs - never
+replace it with a number, never compute or estimate financial figures yourself."""
+
+
+def financial_values(financial_data: Dict[str, Any]) -> Dict[str, str]:
+    """Formatted value of every placeholder"""
+    financial_data = financial_data or {}
+    return {name: render(financial_data) for name, render in PLACEHOLDER_FORMATS.items()}
+
+
+def placeholder_tokens() -> Dict[str, str]:
+    """Every placeholder as its own token ("npv" → "{{npv}}")"""
+    return {name: f"{{{{{name}}}}}" for name in PLACEHOLDER_FORMATS}
+
+
+def has_placeholders(text: str) -> bool:
+    return bool(text) and PLACEHOLDER_PATTERN.search(text) is not None
+
+
+def bind_placeholders(text: str, values: Dict[str, str]) -> str:
+    """
+    Replace known placeholders with their values (unknown ones are left
+    as written so they stay visible in review)
+    """
+    if "{{" not in text:
+        return text
+    return PLACEHOLDER_PATTERN.sub(lambda m: values.get(m.group(1), m.group(0)), text)
+
+
+def bind_sections(dpr_sections: Dict[str, Any], financial_data: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Copy of dpr_sections with every section (text or section_store
+    reference) loaded and bound to the financial model (default:
+    dpr_sections["financial"]; pass another model's output to re-render a
+    what-if scenario)
+    """
+    # Imported here: config → section_registry → this module, and
+    # section_store needs config
+    from section_store import is_section, section_text
+
+    if financial_data is None:
+        financial_data = dpr_sections.get("financial", {})
+    values = financial_values(financial_data)
+    return {
+        key: bind_placeholders(section_text(content), values) if is_section(content) else content
+        for key, content in dpr_sections.items()
+    }
@@ -0,0 +1,183 @@
+# indian_numbers.py
+"""
+Indian Numbers - currency and quantity normalization shared by all agents
+
+Amounts live in state as plain rupees (project_cost: 82000000) and appear
+in text as "₹8.2 crore", "Rs. 45 lakh", "₹8,20,00,000" or "₹82,000,000".
+Everything that reads or writes such numbers goes through this module:
+
+    Parsing     parse_rupee_amount("₹8.2 crore")       → 82000000.0
+                parse_count("50 units")                → 50
+                parse_percent_range("60 to 80% subsidy") → "60-80%"
+                find_amounts(text)                     → every rupee amount in text
+                iter_amounts(text)                     → the same, with text spans
+    Formatting  format_inr(82000000)                   → "₹8,20,00,000"
+                format_crore(82000000)                 → "₹8.20 crore"
+    Checks      mentions_amount(text, 82000000)        → True for any of the above forms
+
+Patterns are compiled once and results are memoized (the same section text
+is checked by several validators, the same amounts formatted by every
+section prompt).
+"""
+import re
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+
+AMOUNT_SCALES = {
+    "crore": 10_000_000, "crores": 10_000_000, "cr": 10_000_000,
+    "lakh": 100_000, "lakhs": 100_000, "lac": 100_000, "lacs": 100_000,
+    "billion": 1_000_000_000, "million": 1_000_000, "mn": 1_000_000,
+    "thousand": 1_000, "k": 1_000,
+}
+
+_SCALE_WORDS = "|".join(sorted(AMOUNT_SCALES, key=len, reverse=True))
+
+# Scale words that mean rupees on their own ("8.2 crore"); "5 million
+# pieces" or "2 thousand workers" are counts unless a currency is named
+INDIAN_SCALES = ("crore", "crores", "cr", "lakh", "lakhs", "lac", "lacs")
+_INDIAN_SCALE_WORDS = "|".join(sorted(INDIAN_SCALES, key=len, reverse=True))
+
+# ONE amount, the whole string: "₹8.2 crore", "Rs. 45 lakh", "5,00,00,000/-"
+AMOUNT_PATTERN = re.compile(
+    r'(?:₹|rs\.?|inr)?\s*(\d[\d,]*(?:\.\d+)?)\s*(' + _SCALE_WORDS + r')?\.?\s*(?:/-|only|approx\.?)?',
+    re.IGNORECASE
+)
+
+# Amounts inside running text: a currency prefix or a crore/lakh scale word
+# is required (so years, percentages and counts are not picked up)
+AMOUNT_IN_TEXT_PATTERN = re.compile(
+    r'(?:(?:₹|\brs\.?|\binr)\s*(\d[\d,]*(?:\.\d+)?)(?:\s*(' + _SCALE_WORDS + r')\b)?'
+    r'|\b(\d[\d,]*(?:\.\d+)?)\s*(' + _INDIAN_SCALE_WORDS + r')\b)',
+    re.IGNORECASE
+)
+
+COUNT_PATTERN = re.compile(
+    r'(?:about|approx\.?|around)?\s*(\d[\d,]*)\s*(?:units?|members?|msmes?|enterprises?|firms?)?',
+    re.IGNORECASE
+)
+PERCENT_RANGE_PATTERN = re.compile(
+    r'(\d+(?:\.\d+)?)\s*%?\s*(?:-|–|to)\s*(\d+(?:\.\d+)?)\s*%|(\d+(?:\.\d+)?)\s*%'
+)
+PARENTHETICAL_PATTERN = re.compile(r'\([^)]*\)')
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+def _number(digits: str) -> float:
+    return float(digits.replace(",", ""))
+
+
+@lru_cache(maxsize=1024)
+def parse_rupee_amount(text: str) -> Optional[float]:
+    """
+    Rupees from "82,000,000" / "₹8.2 crore" / "Rs. 45 lakh" (None if the
+    text is not a single amount; a trailing "(approx)" is ignored)
+    """
+    match = AMOUNT_PATTERN.fullmatch(PARENTHETICAL_PATTERN.sub("", text).strip())
+    if not match:
+        return None
+    return _number(match.group(1)) * AMOUNT_SCALES.get((match.group(2) or "").lower(), 1)
+
+
+@lru_cache(maxsize=1024)
+def parse_count(text: str) -> Optional[int]:
+    """Count from "50" / "50 units" / "about 1,200 members" (None otherwise)"""
+    match = COUNT_PATTERN.fullmatch(PARENTHETICAL_PATTERN.sub("", text).strip())
+    return int(_number(match.group(1))) if match else None
+
+
+@lru_cache(maxsize=1024)
+def parse_percent_range(text: str) -> Optional[str]:
+    """First percentage or range in text, normalized ("60-80%" / "25%")"""
+    match = PERCENT_RANGE_PATTERN.search(text)
+    if not match:
+        return None
+    if match.group(3):
+        return f"{match.group(3)}%"
+    return f"{match.group(1)}-{match.group(2)}%"
+
+
+def iter_amounts(text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[float, int, int, str]]:
+    """
+    Rupee amounts in text[start:end] as (rupees, span start, span end,
+    scale word or "") - the span covers the whole "₹8.2 crore"
+    """
+    for match in AMOUNT_IN_TEXT_PATTERN.finditer(text, start, len(text) if end is None else end):
+        prefixed, prefixed_scale, bare, bare_scale = match.groups()
+        digits, scale = (prefixed, prefixed_scale) if prefixed else (bare, bare_scale)
+        scale = (scale or "").lower()
+        try:
+            value = _number(digits) * AMOUNT_SCALES.get(scale, 1)
+        except ValueError:
+            continue
+        yield value, match.start(), match.end(), scale
+
+
+@lru_cache(maxsize=256)
+def find_amounts(text: str) -> Tuple[float, ...]:
+    """
+    Every rupee amount in running text, in order
+    ("₹8.2 crore (₹82,000,000)" → (82000000.0, 82000000.0))
+    """
+    return tuple(value for value, _, _, _ in iter_amounts(text))
+
+
+def has_amount(text: str) -> bool:
+    """True if text states at least one rupee amount"""
+    return bool(find_amounts(text))
+
+
+def mentions_amount(text: str, amount: float, tolerance: float = 0.01) -> bool:
+    """
+    True if text states `amount` in any format ("₹8.2 crore",
+    "₹8,20,00,000", "₹82,000,000", "820 lakh" ...), within a relative
+    tolerance that covers rounding like 8.2 crore for 8.19 crore
+    """
+    if not amount:
+        return False
+    return any(abs(found - amount) <= abs(amount) * tolerance for found in find_amounts(text))
+
+
+# ============================================================================
+# FORMATTING
+# ============================================================================
+
+def group_indian(integer_digits: str) -> str:
+    """Indian digit grouping of a digit string (82000000 → 8,20,00,000)"""
+    if len(integer_digits) <= 3:
+        return integer_digits
+    head, tail = integer_digits[:-3], integer_digits[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    if head:
+        groups.insert(0, head)
+    return ",".join(groups + [tail])
+
+
+@lru_cache(maxsize=1024)
+def format_inr(amount: float, decimals: int = 0) -> str:
+    """₹ amount with Indian grouping (82000000 → ₹8,20,00,000)"""
+    sign = "-" if amount < 0 else ""
+    text = f"{abs(amount):.{decimals}f}"
+    integer, _, fraction = text.partition(".")
+    grouped = group_indian(integer)
+    return f"{sign}₹{grouped}.{fraction}" if fraction else f"{sign}₹{grouped}"
+
+
+@lru_cache(maxsize=1024)
+def format_crore(amount: float, decimals: int = 2) -> str:
+    """
+    Amount in words the reader expects: "₹8.20 crore", "₹45.00 lakh"
+    (plain ₹ amount below one lakh)
+    """
+    sign = "-" if amount < 0 else ""
+    if abs(amount) >= AMOUNT_SCALES["crore"]:
+        return f"{sign}₹{abs(amount) / AMOUNT_SCALES['crore']:.{decimals}f} crore"
+    if abs(amount) >= AMOUNT_SCALES["lakh"]:
+        return f"{sign}₹{abs(amount) / AMOUNT_SCALES['lakh']:.{decimals}f} lakh"
+    return format_inr(amount)
@@ -0,0 +1,76 @@
+# llm_client.py
+"""
+LLM Client - shared chat model factory for all agents
+
+Every agent gets its ChatVertexAI instance from get_llm() so that:
+- Clients are created once per (model, temperature) and reused
+- Calls made through llm_resilience share ONE global rate governor
+  (rate_governor.py: requests + tokens per minute, fair per project),
+  which is what keeps concurrent batch/service runs inside the quota
+
+Clients don't retry on their own (max_retries=0): retries go through
+llm_resilience so they are rate-governed and 429s reach the governor.
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+from langchain_google_vertexai import ChatVertexAI
+
+from config import LLM_MODEL, LLM_TOKENS_PER_MINUTE
+from rate_governor import configure_governor, get_governor
+
+
+_lock = threading.Lock()
+_clients: Dict[Tuple[str, float, Optional[str]], ChatVertexAI] = {}
+
+
+def configure_rate_limit(requests_per_minute: int,
+                         tokens_per_minute: int = LLM_TOKENS_PER_MINUTE) -> None:
+    """
+    Set the global budgets shared by every LLM call site
+
+    Args:
+        requests_per_minute: Max LLM requests per minute (0 = unlimited)
+        tokens_per_minute: Max prompt + output tokens per minute (0 = unlimited)
+    """
+    configure_governor(requests_per_minute, tokens_per_minute)
+
+
+def get_rate_limit() -> int:
+    """Current global requests-per-minute budget (0 = unlimited)"""
+    return get_governor().requests_per_minute
+
+
+def get_llm(temperature: float = 0.3, model_name: str = LLM_MODEL,
+            cached_content: Optional[str] = None) -> ChatVertexAI:
+    """
+    Get a shared ChatVertexAI client
+
+    Args:
+        temperature: Sampling temperature
+        model_name: Vertex AI model name (default: config.LLM_MODEL)
+        cached_content: Vertex AI context cache name (see prompt_compiler.py)
+
+    Returns:
+        ChatVertexAI instance (call it through llm_resilience)
+    """
+    key = (model_name, temperature, cached_content)
+    with _lock:
+        llm = _clients.get(key)
+        if llm is None:
+            llm = ChatVertexAI(
+                model_name=model_name,
+                temperature=temperature,
+                max_retries=0,
+                cached_content=cached_content
+            )
+            _clients[key] = llm
+        return llm
+
+
+def discard_llm(cached_content: str) -> None:
+    """Drop clients bound to a context cache that has been deleted"""
+    with _lock:
+        for key in [k for k in _clients if k[2] == cached_content]:
+            del _clients[key]
+
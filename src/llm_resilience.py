@@ -0,0 +1,304 @@
+# llm_resilience.py
+"""
+LLM Resilience - deadlines, retries and hedged requests for LLM calls
+
+invoke_resilient() / ainvoke_resilient() wrap ONE logical LLM call:
+
+- Deadline:   each attempt is abandoned after config.AGENT_TIMEOUT seconds
+              of calling the model (waiting for a permit has its own
+              AGENT_TIMEOUT limit and is not counted)
+- Retries:    up to config.MAX_RETRIES more attempts, with exponential
+              backoff and full jitter between them
+- Checks:     an optional check(content) -> problem | None turns an
+              unusable answer (empty, missing required headings) into a
+              retry; if every attempt is unusable the best one is returned
+- Hedging:    (config.HEDGE_REQUESTS) when an attempt is slower than the
+              observed p95 latency, a duplicate request is sent and the
+              first answer wins
+
+Every attempt waits for a permit from the shared rate_governor BEFORE its
+deadline and latency clock start, so retries stay inside the RPM/TPM
+quotas and queueing doesn't count as model latency. A hedge leg is sent
+only if a permit is free right away. An attempt that times out cancels its
+call if it has not started yet; one already in flight finishes in the
+background, releases its permit and is discarded.
+
+The model can be anything with invoke()/ainvoke() (ChatVertexAI or the
+section proxies in document_generator/prompt_compiler). Models that stream
+tokens to listeners set `streams_tokens = True` and are never hedged, so
+listeners don't receive the same section twice.
+"""
+import time
+import random
+import asyncio
+import threading
+import contextvars
+from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Optional
+
+from rate_governor import get_governor, call_tokens
+from config import (
+    AGENT_TIMEOUT, MAX_RETRIES, RETRY_BACKOFF_BASE_SECONDS, RETRY_BACKOFF_MAX_SECONDS,
+    HEDGE_REQUESTS, HEDGE_LATENCY_PERCENTILE, HEDGE_MIN_SAMPLES
+)
+
+
+class LLMCallTimeout(TimeoutError):
+    """An LLM call attempt exceeded its deadline"""
+
+
+# Sync attempts run here so they can be abandoned at the deadline
+# (an abandoned HTTP call finishes in the background and is discarded)
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-call")
+
+
+# ============================================================================
+# LATENCY TRACKING (for hedging)
+# ============================================================================
+
+class LatencyTracker:
+    """
+    Rolling window of successful call latencies, per call key and overall
+    """
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._overall = deque(maxlen=window)
+        self._by_key: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, key: Optional[str], seconds: float) -> None:
+        with self._lock:
+            self._overall.append(seconds)
+            if key:
+                self._by_key[key].append(seconds)
+
+    @staticmethod
+    def _percentile(samples, percentile: float) -> float:
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(percentile / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def hedge_delay(self, key: Optional[str], percentile: float = HEDGE_LATENCY_PERCENTILE,
+                    min_samples: int = HEDGE_MIN_SAMPLES) -> Optional[float]:
+        """
+        Seconds to wait before hedging: the key's p95 if it has enough
+        samples, else the overall p95, else None (not enough data)
+        """
+        with self._lock:
+            samples = self._by_key.get(key) if key else None
+            if not samples or len(samples) < min_samples:
+                samples = self._overall
+            if len(samples) < min_samples:
+                return None
+            return self._percentile(list(samples), percentile)
+
+
+latency_tracker = LatencyTracker()
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BACKOFF_BASE_SECONDS,
+                  cap: float = RETRY_BACKOFF_MAX_SECONDS) -> float:
+    """Exponential backoff with full jitter for retry number `attempt` (1-based)"""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+def response_text(response) -> str:
+    """
+    Text of a model response (AIMessage, or the dict returned by
+    with_structured_output(..., include_raw=True))
+    """
+    if isinstance(response, dict):
+        response = response.get("raw")
+    return getattr(response, "content", None) or ""
+
+
+def _can_hedge(llm, hedge: Optional[bool]) -> bool:
+    if hedge is None:
+        hedge = HEDGE_REQUESTS
+    return hedge and not getattr(llm, "streams_tokens", False)
+
+
+# ============================================================================
+# SYNC
+# ============================================================================
+
+def _submit(llm, messages, permit):
+    # Worker threads run in the caller's context (governed_project)
+    context = contextvars.copy_context()
+    return _executor.submit(context.run, get_governor().call, llm, messages, permit)
+
+
+def _invoke_with_deadline(llm, messages, key: Optional[str], timeout: float, hedge: bool):
+    """One attempt: permit, then deadline + optional hedged duplicate"""
+    governor = get_governor()
+    tokens = call_tokens(messages)
+    permit = governor.acquire(tokens, timeout=timeout)
+    if permit is None:
+        raise LLMCallTimeout(f"No LLM permit within {timeout:g}s")
+
+    started = time.monotonic()
+    legs = {_submit(llm, messages, permit): permit}
+    delay = latency_tracker.hedge_delay(key) if hedge else None
+
+    try:
+        while True:
+            remaining = timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                raise LLMCallTimeout(f"LLM call exceeded {timeout:g}s deadline")
+
+            wait_for = remaining
+            if delay is not None and len(legs) == 1:
+                wait_for = min(remaining, max(0.0, delay - (time.monotonic() - started)))
+
+            done, _ = wait(legs, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None or len(legs) == 1 or all(f.done() for f in legs):
+                    latency_tracker.record(key, time.monotonic() - started)
+                    return future.result()
+                del legs[future]  # failed hedge leg - keep waiting for the other
+
+            if not done and delay is not None and len(legs) == 1:
+                hedge_after, delay = delay, None
+                hedge_permit = governor.try_acquire(tokens)
+                if hedge_permit is None:
+                    continue  # no spare quota - don't hedge
+                print(f"     ⏩ Hedging {key or 'LLM call'} (no answer after p{HEDGE_LATENCY_PERCENTILE} "
+                      f"{hedge_after:.1f}s)")
+                legs[_submit(llm, messages, hedge_permit)] = hedge_permit
+    finally:
+        # Legs still queued in the executor never run - hand their permits back
+        for future, leg_permit in legs.items():
+            if future.cancel():
+                governor.release(leg_permit, cancelled=True)
+
+
+def invoke_resilient(llm, messages, check: Optional[Callable[[str], Optional[str]]] = None,
+                     key: Optional[str] = None, timeout: float = AGENT_TIMEOUT,
+                     max_retries: int = MAX_RETRIES, hedge: Optional[bool] = None):
+    """
+    llm.invoke(messages) with deadline, retries, checks and hedging
+
+    Args:
+        check: Returns a problem description for an unusable answer (or None)
+        key: Call label for logs and per-key latency (e.g. section key)
+
+    Returns:
+        The first answer that passes `check`, else the best failing one
+
+    Raises:
+        The last error if no attempt produced an answer
+    """
+    hedge = _can_hedge(llm, hedge)
+    best, best_problem, last_error = None, None, None
+
+    for attempt in range(max_retries + 1):
+        if attempt:
+            delay = backoff_delay(attempt)
+            print(f"     🔁 Retry {attempt}/{max_retries} for {key or 'LLM call'} in {delay:.1f}s")
+            time.sleep(delay)
+        try:
+            response = _invoke_with_deadline(llm, messages, key, timeout, hedge)
+        except Exception as e:
+            last_error = e
+            print(f"     ⚠️  {key or 'LLM call'} attempt {attempt + 1} failed: {type(e).__name__}: {e}")
+            continue
+
+        problem = check(response_text(response)) if check else None
+        if not problem:
+            return response
+        print(f"     ⚠️  {key or 'LLM call'} attempt {attempt + 1} unusable: {problem}")
+        if best is None or len(response_text(response)) > len(response_text(best)):
+            best, best_problem = response, problem
+
+    if best is not None:
+        print(f"     ⚠️  Using best of {max_retries + 1} attempts ({best_problem})")
+        return best
+    raise last_error
+
+
+# ============================================================================
+# ASYNC
+# ============================================================================
+
+async def _ainvoke_with_deadline(llm, messages, key: Optional[str], timeout: float, hedge: bool):
+    """One async attempt: permit, then deadline + optional hedged duplicate"""
+    governor = get_governor()
+    tokens = call_tokens(messages)
+    permit = await governor.aacquire(tokens, timeout=timeout)
+    if permit is None:
+        raise LLMCallTimeout(f"No LLM permit within {timeout:g}s")
+
+    started = time.monotonic()
+    legs = {asyncio.ensure_future(governor.acall(llm, messages, permit)): permit}
+    delay = latency_tracker.hedge_delay(key) if hedge else None
+
+    try:
+        while True:
+            remaining = timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                raise LLMCallTimeout(f"LLM call exceeded {timeout:g}s deadline")
+
+            wait_for = remaining
+            if delay is not None and len(legs) == 1:
+                wait_for = min(remaining, max(0.0, delay - (time.monotonic() - started)))
+
+            done, _ = await asyncio.wait(legs, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None or len(legs) == 1 or all(t.done() for t in legs):
+                    latency_tracker.record(key, time.monotonic() - started)
+                    return task.result()
+                del legs[task]
+
+            if not done and delay is not None and len(legs) == 1:
+                hedge_after, delay = delay, None
+                hedge_permit = governor.try_acquire(tokens)
+                if hedge_permit is None:
+                    continue  # no spare quota - don't hedge
+                print(f"     ⏩ Hedging {key or 'LLM call'} (no answer after p{HEDGE_LATENCY_PERCENTILE} "
+                      f"{hedge_after:.1f}s)")
+                legs[asyncio.ensure_future(governor.acall(llm, messages, hedge_permit))] = hedge_permit
+    finally:
+        for task, leg_permit in legs.items():
+            if not task.done():
+                task.cancel()
+                # A task cancelled before it started never releases its permit
+                task.add_done_callback(lambda _, p=leg_permit: governor.release(p, cancelled=True))
+
+
+async def ainvoke_resilient(llm, messages, check: Optional[Callable[[str], Optional[str]]] = None,
+                            key: Optional[str] = None, timeout: float = AGENT_TIMEOUT,
+                            max_retries: int = MAX_RETRIES, hedge: Optional[bool] = None):
+    """
+    Async equivalent of invoke_resilient (losing hedge legs are cancelled)
+    """
+    hedge = _can_hedge(llm, hedge)
+    best, best_problem, last_error = None, None, None
+
+    for attempt in range(max_retries + 1):
+        if attempt:
+            delay = backoff_delay(attempt)
+            print(f"     🔁 Retry {attempt}/{max_retries} for {key or 'LLM call'} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        try:
+            response = await _ainvoke_with_deadline(llm, messages, key, timeout, hedge)
+        except Exception as e:
+            last_error = e
+            print(f"     ⚠️  {key or 'LLM call'} attempt {attempt + 1} failed: {type(e).__name__}: {e}")
+            continue
+
+        problem = check(response_text(response)) if check else None
+        if not problem:
+            return response
+        print(f"     ⚠️  {key or 'LLM call'} attempt {attempt + 1} unusable: {problem}")
+        if best is None or len(response_text(response)) > len(response_text(best)):
+            best, best_problem = response, problem
+
+    if best is not None:
+        print(f"     ⚠️  Using best of {max_retries + 1} attempts ({best_problem})")
+        return best
+    raise last_error
+
+
+def non_empty(content: str) -> Optional[str]:
+    """Default check: the answer must contain text"""
+    return None if content and content.strip() else "empty response"
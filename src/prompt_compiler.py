@@ -0,0 +1,315 @@
+# prompt_compiler.py
+"""
+Prompt Compiler - shared-context prompts for section generation
+
+Every section prompt (section_registry user_prompt templates) re-embeds
+the same project facts in its [SystemMessage, HumanMessage] pair. The
+compiler rewrites each pair into:
+
+    SystemMessage  - ONE shared prefix per DPR run: writer role, general
+                     rules and the full project + financial fact sheet
+                     (byte-identical for all 21 sections)
+    HumanMessage   - the section-specific suffix: the section's own role
+                     line and instructions, with its "PROJECT DATA:" fact
+                     block removed (the facts are in the prefix)
+
+The prefix is identical across sections, so it is stored once as
+provider-side cached content (Vertex AI, config.PROMPT_CONTEXT_CACHE) and
+each section sends only its suffix. Without a live cache, prefix + suffix
+are sent on models with implicit prefix caching (Gemini 2.5 and later,
+config.IMPLICIT_PREFIX_CACHE_MODELS) and the prompts are sent unchanged on
+others - re-sending an uncached prefix 21 times costs more than the facts
+it replaces (config.PROMPT_SHARED_PREFIX_WITHOUT_CACHE forces either way).
+
+Per-section prompt token counts and prompt hashes are recorded either way
+(stats/summary; the hashes end up in the export manifest).
+"""
+import re
+import hashlib
+import threading
+from datetime import timedelta
+from typing import Dict, Any, List, Optional
+
+from langchain_core.messages import SystemMessage, HumanMessage, BaseMessage
+
+from indian_numbers import format_inr, format_crore
+from financial_placeholders import financial_values, placeholder_tokens, PLACEHOLDER_RULE
+from config import (
+    LLM_MODEL, PROMPT_CONTEXT_CACHE, PROMPT_CONTEXT_CACHE_TTL_SECONDS,
+    PROMPT_SHARED_PREFIX_WITHOUT_CACHE, IMPLICIT_PREFIX_CACHE_MODELS, FINANCIAL_PLACEHOLDERS
+)
+
+
+# "PROJECT DATA:" / "CLUSTER DATA:" header followed by "- Label: value" lines
+FACT_BLOCK_PATTERN = re.compile(r'^[A-Z][A-Z ]* DATA:\n(?:- [^\n]*(?:\n|$))+', re.MULTILINE)
+
+FACT_BLOCK_REPLACEMENT = "PROJECT DATA: see PROJECT FACT SHEET\n"
+
+SHARED_ROLE = """You are a professional DPR (Detailed Project Report) writer specializing in MSME cluster development projects under the MSE-CDP scheme.
+You write one section of the DPR at a time; each request names the section and its required structure.
+
+GENERAL RULES (apply to every section):
+1. Use formal, professional business language suitable for government submissions
+2. Use the figures in the PROJECT FACT SHEET exactly as given - never contradict them
+3. Be specific with numbers and data
+4. No meta-commentary (don't say "here's a draft" or "based on the data")
+5. Do NOT include the section's main heading (# HEADING) - it is added automatically"""
+
+
+def prompt_hash(messages: List[BaseMessage]) -> str:
+    """sha256 of a prompt as written (before compilation)"""
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(f"{message.type}\n{message.content}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def implicit_prefix_cache(model_name: str) -> bool:
+    """True for models whose provider caches repeated prompt prefixes by itself"""
+    return (model_name or "").lower().startswith(IMPLICIT_PREFIX_CACHE_MODELS)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count (~4 characters per token), used for reporting
+    when the provider does not return usage metadata
+    """
+    return (len(text) + 3) // 4
+
+
+def build_fact_sheet(project_data: Dict[str, Any], financial_data: Dict[str, Any],
+                     placeholders: bool = FINANCIAL_PLACEHOLDERS) -> str:
+    """
+    Project + financial facts shared by all sections (financial figures
+    as {{npv}} placeholders when `placeholders` is set)
+    """
+    cost = project_data.get("project_cost", 0)
+
+    lines = [
+        "PROJECT FACT SHEET:",
+        f"- Cluster Type / Industry: {project_data.get('cluster_type', 'N/A')}",
+        f"- Location: {project_data.get('location', 'N/A')}",
+        f"- Number of Member Units: {project_data.get('members', 0)} units",
+        f"- Common Facility Centre: {project_data.get('facility_type', 'N/A')}",
+        f"- Project Cost / Investment / Budget: {format_inr(cost)} ({format_crore(cost)})",
+        f"- Government Scheme: {project_data.get('grant_scheme', 'N/A')}",
+    ]
+    if project_data.get("subsidy_range"):
+        lines.append(f"- Subsidy: {project_data['subsidy_range']}")
+
+    if not placeholders and not (financial_data or {}).get("metrics"):
+        return "\n".join(lines)
+
+    figures = placeholder_tokens() if placeholders else financial_values(financial_data)
+    lines += [
+        "",
+        "FINANCIAL METRICS:",
+        f"- NPV: {figures['npv']}",
+        f"- IRR: {figures['irr']}",
+        f"- DSCR: {figures['dscr']}",
+        f"- Break-even: {figures['breakeven']} capacity",
+        f"- Payback Period: {figures['payback']}",
+        f"- Grant Amount: {figures['grant_amount']} ({figures['grant_percentage']})",
+        f"- Loan Amount: {figures['loan_amount']}",
+        f"- MSE-CDP Compliance: {figures['compliance_status']}",
+    ]
+    if placeholders:
+        lines += ["", PLACEHOLDER_RULE]
+    return "\n".join(lines)
+
+
+class PromptCompiler:
+    """
+    Compiles section prompts for ONE DPR run against a shared prefix
+    """
+    def __init__(self, project_data: Dict[str, Any], financial_data: Dict[str, Any],
+                 shared_prefix_without_cache: Optional[bool] = PROMPT_SHARED_PREFIX_WITHOUT_CACHE,
+                 model_name: str = LLM_MODEL):
+        if shared_prefix_without_cache is None:
+            shared_prefix_without_cache = implicit_prefix_cache(model_name)
+        self.shared_prefix_without_cache = shared_prefix_without_cache
+        self.shared_prefix = f"{SHARED_ROLE}\n\n{build_fact_sheet(project_data, financial_data)}"
+        self.shared_prefix_tokens = estimate_tokens(self.shared_prefix)
+        self.cache_name: Optional[str] = None
+        self.cached_llm = None
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Provider-side context cache
+    # ------------------------------------------------------------------
+
+    def enable_context_cache(self, llm, ttl_seconds: int = PROMPT_CONTEXT_CACHE_TTL_SECONDS) -> bool:
+        """
+        Store the shared prefix as Vertex AI cached content
+
+        Falls back to plain prompts (returns False) when the model or
+        prefix size is not supported by context caching.
+        """
+        try:
+            from langchain_google_vertexai import create_context_cache
+            from llm_client import get_llm
+
+            self.cache_name = create_context_cache(
+                llm, [SystemMessage(content=self.shared_prefix)],
+                time_to_live=timedelta(seconds=ttl_seconds)
+            )
+            self.cached_llm = get_llm(temperature=llm.temperature, model_name=llm.model_name,
+                                      cached_content=self.cache_name)
+            print(f"   Context cache: {self.cache_name}")
+            return True
+        except Exception as e:
+            print(f"   ⚠️  Context cache unavailable ({type(e).__name__}: {e}) - using shared prefix")
+            self.cache_name = None
+            self.cached_llm = None
+            return False
+
+    def release_context_cache(self) -> None:
+        """Delete the cached content created for this run"""
+        if not self.cache_name:
+            return
+        try:
+            from vertexai.preview.caching import CachedContent
+            from llm_client import discard_llm
+            CachedContent(cached_content_name=self.cache_name).delete()
+            discard_llm(self.cache_name)
+        except Exception as e:
+            print(f"   ⚠️  Could not delete context cache {self.cache_name}: {e}")
+        self.cache_name = None
+        self.cached_llm = None
+
+    @property
+    def active(self) -> bool:
+        """True when prompts are rewritten as shared prefix + suffix"""
+        return bool(self.cache_name) or self.shared_prefix_without_cache
+
+    def model_for(self, llm):
+        """Model to call: the cache-bound client when the prefix is cached"""
+        return self.cached_llm or llm
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def compile_suffix(self, messages: List[BaseMessage], strip_facts: bool = True) -> str:
+        """Section-specific part of a generator's prompt"""
+        system = [m.content for m in messages if isinstance(m, SystemMessage)]
+        user = [m.content for m in messages if not isinstance(m, SystemMessage)]
+
+        parts = []
+        if system:
+            parts.append("SECTION ROLE:\n" + "\n".join(system))
+        user_text = "\n\n".join(user)
+        if strip_facts:
+            user_text = FACT_BLOCK_PATTERN.sub(FACT_BLOCK_REPLACEMENT, user_text)
+        parts.append(user_text)
+        return "\n\n".join(parts)
+
+    def compile(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """
+        Rewrite a generator's [system, user] prompt as shared prefix + suffix
+        (only the suffix is sent when the prefix is in the context cache)
+        """
+        if not self.active:
+            return list(messages)
+        suffix = HumanMessage(content=self.compile_suffix(messages))
+        if self.cache_name:
+            return [suffix]
+        return [SystemMessage(content=self.shared_prefix), suffix]
+
+    def compile_request(self, system_prompt: str, body: str) -> List[BaseMessage]:
+        """
+        Messages for a request that is not one generator prompt (e.g. a
+        batch of sections): body follows the shared prefix when compiling,
+        otherwise it follows system_prompt
+        """
+        if self.cache_name:
+            return [HumanMessage(content=body)]
+        if self.active:
+            return [SystemMessage(content=self.shared_prefix), HumanMessage(content=body)]
+        return [SystemMessage(content=system_prompt), HumanMessage(content=body)]
+
+    def bind(self, llm, section_key: str):
+        """Wrap a model so a generate_* function's prompt is compiled on the way out"""
+        return _CompiledSectionModel(self, llm, section_key)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def record(self, section_key: str, original: List[BaseMessage],
+               compiled: List[BaseMessage], response) -> Dict[str, Any]:
+        """Record prompt token counts and the prompt hash for one section"""
+        entry = {
+            "original_prompt_tokens": sum(estimate_tokens(m.content) for m in original),
+            "suffix_tokens": estimate_tokens(self.compile_suffix(original)),
+            "prompt_tokens": sum(estimate_tokens(m.content) for m in compiled),
+            "prompt_hash": prompt_hash(original),
+            "compiled": self.active,
+            "cached_prefix": bool(self.cache_name),
+        }
+
+        usage = getattr(response, "usage_metadata", None) or {}
+        if usage.get("input_tokens"):
+            entry["input_tokens"] = usage["input_tokens"]
+            entry["cache_read_tokens"] = (usage.get("input_token_details") or {}).get("cache_read", 0)
+
+        with self._lock:
+            self.stats[section_key] = entry
+        return entry
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals across all compiled sections"""
+        with self._lock:
+            sections = dict(self.stats)
+        original = sum(s["original_prompt_tokens"] for s in sections.values())
+        sent = sum(s["prompt_tokens"] for s in sections.values())
+        suffixes = sum(s["suffix_tokens"] for s in sections.values())
+        return {
+            "shared_prefix_tokens": self.shared_prefix_tokens,
+            "context_cache": self.cache_name,
+            "sections": sections,
+            "original_prompt_tokens": original,
+            "prompt_tokens": sent,
+            "section_suffix_tokens": suffixes,
+        }
+
+
+class _CompiledSectionModel:
+    """
+    Model proxy handed to a generate_* function: compiles its prompt,
+    calls the real model and records the token counts
+    """
+    def __init__(self, compiler: PromptCompiler, llm, section_key: str):
+        self.compiler = compiler
+        self.llm = llm
+        self.section_key = section_key
+
+    @property
+    def streams_tokens(self) -> bool:
+        """Token-streamed models are not hedged (see llm_resilience)"""
+        return getattr(self.llm, "streams_tokens", False)
+
+    def invoke(self, messages, *args, **kwargs):
+        compiled = self.compiler.compile(messages)
+        response = self.llm.invoke(compiled, *args, **kwargs)
+        self.compiler.record(self.section_key, messages, compiled, response)
+        return response
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        compiled = self.compiler.compile(messages)
+        response = await self.llm.ainvoke(compiled, *args, **kwargs)
+        self.compiler.record(self.section_key, messages, compiled, response)
+        return response
+
+
+def create_prompt_compiler(project_data: Dict[str, Any], financial_data: Dict[str, Any],
+                           llm) -> PromptCompiler:
+    """
+    Build the compiler for one DPR run (and its context cache, if enabled)
+    """
+    compiler = PromptCompiler(project_data, financial_data,
+                              model_name=getattr(llm, "model_name", None) or LLM_MODEL)
+    if PROMPT_CONTEXT_CACHE:
+        compiler.enable_context_cache(llm)
+    return compiler
@@ -0,0 +1,415 @@
+# rate_governor.py
+"""
+Rate Governor - client-side quota control for every LLM call
+
+One process-wide RateGovernor sits in front of all model calls (they all
+go through llm_resilience.invoke_resilient/ainvoke_resilient):
+
+- Token buckets:  requests-per-minute and tokens-per-minute budgets
+                  (config.LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE).
+                  A call reserves its estimated prompt + expected output
+                  tokens; the reservation is corrected from the response's
+                  usage metadata when it returns.
+- Fair queuing:   waiting calls are served round-robin across projects, so
+                  one 21-section DPR can't starve the others in a batch or
+                  service run (the project is a context variable, see
+                  governed_project()).
+- Adaptive limit: in-flight calls are capped by an AIMD limit - halved on
+                  a 429 / quota error (plus a short pause for everyone),
+                  grown by one per "window" of successful calls up to
+                  config.LLM_MAX_CONCURRENT_CALLS.
+
+Both budgets default to 0 (unlimited); the concurrency limit always applies.
+
+Waiting calls hold a ticket in their project's queue: threads wait on the
+governor's condition, coroutines on an event of their own loop (no thread
+per waiting coroutine). A wait can time out (acquire(timeout=...)) or be
+cancelled; either way the ticket leaves the queue and no permit is taken.
+"""
+import re
+import time
+import asyncio
+import threading
+import contextlib
+import contextvars
+from collections import deque, OrderedDict
+from typing import Any, Dict, Optional
+
+from config import (
+    LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_MAX_CONCURRENT_CALLS,
+    LLM_MIN_CONCURRENT_CALLS, LLM_EXPECTED_OUTPUT_TOKENS, LLM_THROTTLE_PAUSE_SECONDS
+)
+
+
+DEFAULT_PROJECT = "default"
+
+_current_project: contextvars.ContextVar = contextvars.ContextVar("llm_project", default=DEFAULT_PROJECT)
+
+
+@contextlib.contextmanager
+def governed_project(project_id: str):
+    """Attribute LLM calls made inside the block to `project_id` (fair queuing)"""
+    token = _current_project.set(project_id or DEFAULT_PROJECT)
+    try:
+        yield
+    finally:
+        _current_project.reset(token)
+
+
+def current_project() -> str:
+    return _current_project.get()
+
+
+# A 429 stated as a status ("429 Too Many Requests", "HTTP 429", "status
+# code: 429") - not any message that happens to contain the digits
+RATE_LIMIT_MESSAGE = re.compile(
+    r'^\s*429\b|\b(?:http|status(?: code)?|error code|code)[\s:=]*429\b|too many requests|RESOURCE_EXHAUSTED',
+    re.IGNORECASE
+)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    True for provider quota errors (HTTP 429 / ResourceExhausted)
+    """
+    if getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429:
+        return True
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    return RATE_LIMIT_MESSAGE.search(str(error)) is not None
+
+
+def estimate_message_tokens(messages) -> int:
+    """Rough prompt size (~4 characters per token) of a prompt or message list"""
+    if isinstance(messages, str):
+        text = messages
+    else:
+        text = "".join(str(getattr(m, "content", m)) for m in messages)
+    return (len(text) + 3) // 4
+
+
+def call_tokens(messages) -> int:
+    """Tokens a call reserves: estimated prompt + expected output"""
+    return estimate_message_tokens(messages) + LLM_EXPECTED_OUTPUT_TOKENS
+
+
+# ============================================================================
+# TOKEN BUCKET
+# ============================================================================
+
+class TokenBucket:
+    """
+    Refills at `per_minute / 60` units per second up to `per_minute`
+    (one minute of burst). Not thread-safe - RateGovernor holds the lock.
+
+    A single take may exceed the capacity (a very large prompt); the bucket
+    then goes negative and later takes wait until it has refilled.
+    """
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (0 = now)"""
+        self._refill()
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate) if needed > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def give_back(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+# ============================================================================
+# GOVERNOR
+# ============================================================================
+
+class Ticket:
+    """
+    A call waiting for a permit; async tickets carry their loop and event
+    """
+    __slots__ = ("project", "loop", "event")
+
+    def __init__(self, project: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.project = project
+        self.loop = loop
+        self.event = asyncio.Event() if loop else None
+
+    def wake(self) -> None:
+        if self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self.event.set)
+            except RuntimeError:  # loop already closed
+                pass
+
+
+class RateGovernor:
+    """
+    Shared admission control for LLM calls (see module docstring)
+    """
+    def __init__(self, requests_per_minute: int = LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+                 max_concurrency: int = LLM_MAX_CONCURRENT_CALLS,
+                 min_concurrency: int = LLM_MIN_CONCURRENT_CALLS):
+        self._cond = threading.Condition()
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        # project -> deque of waiting tickets; order = round-robin order
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self.stats = {"calls": 0, "throttled": 0, "waited_seconds": 0.0}
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _next_ticket(self):
+        for queue in self._queues.values():
+            if queue:
+                return queue[0]
+        return None
+
+    def _wake_all(self) -> None:
+        """Wake every waiter to re-check admission (lock held)"""
+        self._cond.notify_all()
+        for queue in self._queues.values():
+            for ticket in queue:
+                ticket.wake()
+
+    def _enqueue(self, ticket: Ticket) -> None:
+        self._queues.setdefault(ticket.project, deque()).append(ticket)
+
+    def _dequeue(self, ticket: Ticket) -> None:
+        queue = self._queues.get(ticket.project)
+        if queue is None or ticket not in queue:
+            return
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[ticket.project]
+        # The next ticket may be at the head now
+        self._wake_all()
+
+    def _admission_delay(self, ticket: Ticket, tokens: int) -> Optional[float]:
+        """
+        0 = the ticket may start now, seconds until the budgets allow it,
+        None = not its turn or no free slot (wait for a release)
+        """
+        if self._next_ticket() is not ticket or self.in_flight >= int(self.limit):
+            return None
+        return self._delay_for(tokens)
+
+    def _admit(self, ticket: Ticket, tokens: int, started: float) -> Dict[str, Any]:
+        """Take the permit of an admitted ticket (lock held)"""
+        queue = self._queues[ticket.project]
+        queue.remove(ticket)
+        # Served project goes to the back of the round-robin
+        self._queues.move_to_end(ticket.project)
+        if not queue:
+            del self._queues[ticket.project]
+        if self.requests:
+            self.requests.take(1)
+        if self.tokens:
+            self.tokens.take(tokens)
+        self.in_flight += 1
+        self.stats["calls"] += 1
+        self.stats["waited_seconds"] += time.monotonic() - started
+        self._wake_all()
+        return {"tokens": tokens, "project": ticket.project}
+
+    def _delay_for(self, tokens: int) -> float:
+        delay = max(0.0, self.paused_until - time.monotonic())
+        if self.requests:
+            delay = max(delay, self.requests.wait_time(1))
+        if self.tokens:
+            delay = max(delay, self.tokens.wait_time(tokens))
+        return delay
+
+    def acquire(self, tokens: int, project: Optional[str] = None,
+                timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Block until this call may start
+
+        Args:
+            tokens: Estimated prompt + output tokens for the call
+            project: Queue to wait in (default: current governed_project)
+            timeout: Seconds to wait at most (None = no limit)
+
+        Returns:
+            Permit to pass to release(), None if the wait timed out
+        """
+        ticket = Ticket(project or current_project())
+        started = time.monotonic()
+
+        with self._cond:
+            self._enqueue(ticket)
+            try:
+                while True:
+                    delay = self._admission_delay(ticket, tokens)
+                    if delay is not None and delay <= 0:
+                        return self._admit(ticket, tokens, started)
+                    if timeout is not None:
+                        remaining = timeout - (time.monotonic() - started)
+                        if remaining <= 0:
+                            return None
+                        delay = remaining if delay is None else min(delay, remaining)
+                    self._cond.wait(delay)
+            finally:
+                self._dequeue(ticket)
+
+    def try_acquire(self, tokens: int, project: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Permit if the call may start right now (nobody waiting ahead), else None"""
+        ticket = Ticket(project or current_project())
+        with self._cond:
+            self._enqueue(ticket)
+            try:
+                if self._admission_delay(ticket, tokens) == 0:
+                    return self._admit(ticket, tokens, time.monotonic())
+                return None
+            finally:
+                self._dequeue(ticket)
+
+    async def aacquire(self, tokens: int, project: Optional[str] = None,
+                       timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        acquire() for coroutines - waits on the event loop; a cancelled
+        wait leaves the queue without taking a permit
+        """
+        ticket = Ticket(project or current_project(), asyncio.get_running_loop())
+        started = time.monotonic()
+
+        with self._cond:
+            self._enqueue(ticket)
+        try:
+            while True:
+                with self._cond:
+                    delay = self._admission_delay(ticket, tokens)
+                    if delay is not None and delay <= 0:
+                        return self._admit(ticket, tokens, started)
+                    # Cleared under the lock: a wake-up after this is not lost
+                    ticket.event.clear()
+                if timeout is not None:
+                    remaining = timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        return None
+                    delay = remaining if delay is None else min(delay, remaining)
+                try:
+                    await asyncio.wait_for(ticket.event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                self._dequeue(ticket)
+
+    def release(self, permit: Dict[str, Any], response=None, error: Optional[BaseException] = None,
+                cancelled: bool = False) -> None:
+        """
+        Finish a call: return the concurrency slot, correct the token
+        reservation from usage metadata and adapt the limit
+        (cancelled calls - e.g. losing hedge legs - don't adapt it).
+        A permit is released once; later calls are ignored.
+        """
+        with self._cond:
+            if permit.get("released"):
+                return
+            permit["released"] = True
+            self.in_flight -= 1
+
+            if isinstance(response, dict):  # structured output with include_raw
+                response = response.get("raw")
+            usage = getattr(response, "usage_metadata", None) or {}
+            if self.tokens and usage.get("total_tokens"):
+                difference = permit["tokens"] - usage["total_tokens"]
+                if difference > 0:
+                    self.tokens.give_back(difference)
+                else:
+                    self.tokens.take(-difference)
+
+            if error is not None and is_rate_limit_error(error):
+                self.stats["throttled"] += 1
+                self.limit = max(float(self.min_concurrency), self.limit / 2)
+                self.paused_until = max(self.paused_until, time.monotonic() + LLM_THROTTLE_PAUSE_SECONDS)
+                print(f"     🚦 Quota hit (429) - LLM concurrency limit now {int(self.limit)}")
+            elif error is None and not cancelled:
+                # Additive increase: +1 after about `limit` successful calls
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+            self._wake_all()
+
+    def call(self, llm, messages, permit: Dict[str, Any]):
+        """llm.invoke(messages) with an acquired permit (released when it returns)"""
+        try:
+            response = llm.invoke(messages)
+        except Exception as e:
+            self.release(permit, error=e)
+            raise
+        self.release(permit, response=response)
+        return response
+
+    async def acall(self, llm, messages, permit: Dict[str, Any]):
+        """await llm.ainvoke(messages) with an acquired permit (released when it returns)"""
+        try:
+            response = await llm.ainvoke(messages)
+        except asyncio.CancelledError:
+            self.release(permit, cancelled=True)
+            raise
+        except Exception as e:
+            self.release(permit, error=e)
+            raise
+        self.release(permit, response=response)
+        return response
+
+    def invoke(self, llm, messages):
+        """llm.invoke(messages) inside a permit"""
+        return self.call(llm, messages, self.acquire(call_tokens(messages)))
+
+    async def ainvoke(self, llm, messages):
+        """await llm.ainvoke(messages) inside a permit"""
+        return await self.acall(llm, messages, await self.aacquire(call_tokens(messages)))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limits and counters (for /health and batch summaries)"""
+        with self._cond:
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "waiting": sum(len(q) for q in self._queues.values()),
+                **{k: round(v, 2) if isinstance(v, float) else v for k, v in self.stats.items()},
+            }
+
+
+_governor = RateGovernor()
+
+
+def get_governor() -> RateGovernor:
+    """The process-wide governor"""
+    return _governor
+
+
+def configure_governor(requests_per_minute: int = LLM_REQUESTS_PER_MINUTE,
+                       tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+                       max_concurrency: int = LLM_MAX_CONCURRENT_CALLS) -> RateGovernor:
+    """
+    Replace the process-wide governor (call before starting work -
+    calls already waiting keep the old one)
+    """
+    global _governor
+    _governor = RateGovernor(requests_per_minute, tokens_per_minute, max_concurrency)
+    return _governor
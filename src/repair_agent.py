@@ -0,0 +1,300 @@
+# repair_agent.py
+"""
+Repair Agent - targeted regeneration of failing subsections
+
+Runs after VALIDATION_AGENT. For every section with declared "## ..."
+subsections that is missing one or whose validator result is not ready for
+submission:
+
+    1. failed checks are mapped to the subsection they concern
+       ("Missing cost breakdown subsection" → "## Project Cost Breakdown")
+    2. the model is asked for ONLY those subsections (one small call each,
+       the section prompt plus the validator's complaints)
+    3. the answers are spliced into the section, numbers are re-checked
+       against the financial model (consistency_agent.check_section)
+    4. just that section is re-validated
+
+Rounds are bounded by config.REPAIR_MAX_ROUNDS (per run:
+config["configurable"]["repair_rounds"]). A round that neither restores a
+missing subsection nor raises the score is discarded and ends that
+section's repair. Repair is optional: a subsection whose call fails (model
+outage, every retry timed out) is left as it was and recorded in the
+report, and a section whose repair fails keeps its validated text - the
+run always continues to export. Failed checks that concern no subsection (keyword
+coverage, word count) are not repaired, and sections without declared
+subsections are left to their validation report - rewriting a whole
+section for them costs a full section call and rarely improves the score.
+"""
+import re
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
+from termcolor import cprint
+
+from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.runnables import RunnableConfig
+
+from config import REPAIR_MAX_ROUNDS
+from llm_client import get_llm
+from llm_resilience import invoke_resilient
+from section_registry import SectionSpec, SECTION_REGISTRY
+from document_generator import build_section_prompt
+from consistency_agent import expected_values, check_section
+from validation_agent import validate_section, failed_checks
+from section_store import section_text, store_section
+
+
+# Heading words that don't identify a subsection on their own
+GENERIC_HEADING_WORDS = {"project", "analysis", "assessment", "and", "of", "the", "section"}
+
+REPAIR_INSTRUCTIONS = """
+
+REPAIR REQUEST - the section has already been written. Write ONLY the
+subsection that starts with the line:
+
+{heading}
+
+Start your answer with that exact heading line and do not write any other
+subsection. The reviewer found these problems with it:
+{issues}"""
+
+
+def repair_rounds(config) -> int:
+    """
+    Repair rounds per section: config["configurable"]["repair_rounds"]
+    if given, else config.REPAIR_MAX_ROUNDS (0 = validate only)
+    """
+    configurable = (config or {}).get("configurable") or {}
+    return int(configurable.get("repair_rounds", REPAIR_MAX_ROUNDS))
+
+
+# ============================================================================
+# SUBSECTIONS
+# ============================================================================
+
+def subsection_span(content: str, heading: str) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) of a "## ..." subsection: its heading line up to the next
+    heading of the same or higher level (None if the heading is absent)
+    """
+    match = re.search(rf'^{re.escape(heading)}[ \t]*$', content, re.MULTILINE)
+    if not match:
+        return None
+    following = re.compile(r'^#{1,2} ', re.MULTILINE).search(content, match.end())
+    return match.start(), following.start() if following else len(content)
+
+
+def splice_subsection(content: str, spec: SectionSpec, heading: str, block: str) -> str:
+    """
+    Replace a subsection, or insert a missing one before the next required
+    subsection that is present (appended at the end otherwise)
+    """
+    block = block.strip() + "\n\n"
+    span = subsection_span(content, heading)
+    if span:
+        start, end = span
+        return content[:start] + block + content[end:].lstrip("\n")
+
+    later = spec.required_headings[spec.required_headings.index(heading) + 1:]
+    for next_heading in later:
+        next_span = subsection_span(content, next_heading)
+        if next_span:
+            return content[:next_span[0]] + block + content[next_span[0]:]
+    return content.rstrip() + "\n\n" + block
+
+
+def _heading_words(text: str) -> set:
+    return {word for word in re.findall(r'[a-z]+', text.lower()) if word not in GENERIC_HEADING_WORDS}
+
+
+def match_subsection(spec: SectionSpec, failure: str) -> Optional[str]:
+    """
+    Required subsection a failed check is about (most shared words; None
+    for section-wide checks like word count or scheme mentions)
+    """
+    failure_words = _heading_words(failure)
+    best, best_overlap = None, 0
+    for heading in spec.required_headings:
+        overlap = len(_heading_words(heading) & failure_words)
+        if overlap > best_overlap:
+            best, best_overlap = heading, overlap
+    return best
+
+
+def failing_subsections(spec: SectionSpec, content: str,
+                        result: Optional[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Subsections to regenerate → problems to fix, in document order
+    (failures no subsection is about are left out)
+    """
+    targets: Dict[str, List[str]] = {}
+    for heading in spec.required_headings:
+        if not subsection_span(content, heading):
+            targets[heading] = [f"The '{heading}' subsection is missing"]
+
+    if result is None or result.get("ready_for_submission"):
+        return targets
+
+    for failure in failed_checks(result):
+        heading = match_subsection(spec, failure)
+        if heading:
+            targets.setdefault(heading, []).append(failure)
+
+    order = {heading: index for index, heading in enumerate(spec.required_headings)}
+    return dict(sorted(targets.items(), key=lambda item: order[item[0]]))
+
+
+# ============================================================================
+# REPAIR
+# ============================================================================
+
+def regenerate_subsection(spec: SectionSpec, heading: str, issues: List[str],
+                          project_data: Dict, financial_data: Dict, llm) -> Optional[str]:
+    """
+    One LLM call for one subsection; None if the model never produced it
+    """
+    messages = build_section_prompt(spec, project_data, financial_data)
+    issue_list = "\n".join(f"- {issue}" for issue in issues)
+
+    messages[-1] = HumanMessage(content=messages[-1].content + REPAIR_INSTRUCTIONS.format(
+        heading=heading, issues=issue_list))
+    response = invoke_resilient(
+        llm, messages, key=f"{spec.key}:repair",
+        check=lambda content: None if subsection_span(content, heading) else f"no '{heading}' in answer"
+    )
+    span = subsection_span(response.content, heading)
+    return response.content[span[0]:span[1]] if span else None
+
+
+def _score(result: Optional[Dict[str, Any]]) -> float:
+    return result["overall_score"] if result else 0.0
+
+
+def _missing(spec: SectionSpec, content: str) -> List[str]:
+    return [heading for heading in spec.required_headings if not subsection_span(content, heading)]
+
+
+def repair_section(spec: SectionSpec, content: str, result: Optional[Dict[str, Any]],
+                   project_data: Dict, financial_data: Dict, llm, rounds: int):
+    """
+    Repair rounds for one section
+
+    Returns:
+        (content, validation result, report dict)
+    """
+    expected = expected_values(project_data, financial_data)
+    report = {"rounds": 0, "llm_calls": 0, "subsections": [], "errors": [],
+              "score_before": round(_score(result), 2)}
+
+    for round_number in range(1, rounds + 1):
+        targets = failing_subsections(spec, content, result)
+        if not targets:
+            break
+        report["rounds"] = round_number
+        names = ", ".join(targets)
+        print(f"  🔧 {spec.key} round {round_number}: regenerating {names}")
+
+        candidate = content
+        for heading, issues in targets.items():
+            report["llm_calls"] += 1
+            try:
+                block = regenerate_subsection(spec, heading, issues, project_data, financial_data, llm)
+            except Exception as e:
+                print(f"     ⚠️  {heading} not repaired ({type(e).__name__}: {e})")
+                report["errors"].append({"subsection": heading, "error": f"{type(e).__name__}: {e}"})
+                continue
+            if not block:
+                print(f"     ⚠️  No usable {heading} in the answer")
+                continue
+            candidate = splice_subsection(candidate, spec, heading, block)
+            report["subsections"].append(heading)
+
+        if expected:
+            candidate, _, _ = check_section(candidate, expected)
+
+        # Re-validate just this section
+        new_result = validate_section(spec.key, candidate, project_data, financial_data) if spec.validated else None
+        scored = result is not None and new_result is not None
+        restored = len(_missing(spec, candidate)) < len(_missing(spec, content))
+        gained = scored and _score(new_result) > _score(result)
+        dropped = scored and _score(new_result) < _score(result)
+        if dropped or not (restored or gained):
+            print(f"     ↩️  No improvement ({_score(result):.1f}% → {_score(new_result):.1f}%) - "
+                  f"repair discarded")
+            break
+        content, result = candidate, new_result
+
+    missing = _missing(spec, content)
+    report["score_after"] = round(_score(result), 2)
+    report["ready"] = not missing and (result is None or result.get("ready_for_submission", False))
+    return content, result, report
+
+
+def repair_agent(state: Dict[str, Any], config: RunnableConfig = None) -> Dict[str, Any]:
+    """
+    Regenerate only the failing subsections of each validated section
+    """
+    print()
+    cprint(f"{'NODE: repair_agent':-^80}", 'magenta', attrs=['bold'])
+
+    rounds = repair_rounds(config)
+    dpr_sections = state.get("dpr_sections", {})
+    validation_results = state.get("validation_results", {})
+    project_data = state.get("project_data", {})
+    financial_data = dpr_sections.get("financial", {})
+
+    if rounds <= 0 or not dpr_sections:
+        print("⏭️  Repair disabled or nothing to repair")
+        return {}
+
+    llm = None
+    reports, repaired, revalidated = {}, {}, {}
+    for spec in SECTION_REGISTRY:
+        if spec.key not in dpr_sections or not spec.required_headings:
+            continue
+        content = section_text(dpr_sections[spec.key])
+        result = validation_results.get(spec.key)
+        if not failing_subsections(spec, content, result):
+            continue
+
+        try:
+            llm = llm or get_llm(temperature=0.3)
+            content, result, report = repair_section(spec, content, result,
+                                                     project_data, financial_data, llm, rounds)
+        except Exception as e:
+            # Keep the validated section - repair must never fail the run
+            print(f"  ⚠️  {spec.key}: repair failed ({type(e).__name__}: {e}) - section kept as validated")
+            reports[spec.key] = {"rounds": 0, "llm_calls": 0, "subsections": [],
+                                 "errors": [{"subsection": None, "error": f"{type(e).__name__}: {e}"}],
+                                 "score_before": round(_score(result), 2),
+                                 "score_after": round(_score(result), 2), "ready": False}
+            continue
+        repaired[spec.key] = store_section(content)
+        if result is not None:
+            revalidated[spec.key] = result
+        reports[spec.key] = report
+
+        icon = "✅" if report["ready"] else "⚠️"
+        print(f"  {icon} {spec.key}: {report['score_before']:.1f}% → {report['score_after']:.1f}% "
+              f"({report['llm_calls']} calls, {report['rounds']} rounds)")
+
+    llm_calls = sum(report["llm_calls"] for report in reports.values())
+
+    print(f"\n🔧 Repaired {len(repaired)} sections with {llm_calls} subsection calls")
+    return {
+        "dpr_sections": repaired,
+        "validation_results": revalidated,
+        "repair": {"sections": reports, "llm_calls": llm_calls},
+        "messages": [AIMessage(
+            content=f"Repair complete: {len(repaired)} sections repaired with {llm_calls} LLM calls."
+        )],
+    }
+
+
+async def repair_agent_async(state: Dict[str, Any], config: RunnableConfig = None) -> Dict[str, Any]:
+    """
+    Async variant of repair_agent
+
+    Repairs are few and sequential (each re-validates before the next
+    round), so the sync node runs in a worker thread.
+    """
+    return await asyncio.to_thread(repair_agent, state, config)
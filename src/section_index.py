@@ -0,0 +1,154 @@
+# section_index.py
+"""
+Section Index - linear-time subsection lookup for validators
+
+Validators used to cut subsections out of LLM output with lazy DOTALL
+patterns ('##\\s*Project Cost.*?(.*?)(?=##|$)',
+'\\*\\*1\\.\\s*TECHNOLOGY[^\\*]*\\*\\*.*?(?=\\*\\*[2-9]\\.|\\Z)') and to check
+section order with chains like 'MARKET.*SIZE.*TARGET.*COMPETITION.*DEMAND'.
+On long or malformed output those backtrack - the ordered chains are
+polynomial in the number of keyword hits (a 6 KB section that never
+says "DEMAND" takes minutes).
+
+Here one pass over the lines builds an index of markers:
+
+    "## Project Cost Breakdown"          heading, level 2
+    "**1. TECHNOLOGY OVERVIEW**"         numbered bold marker, number 1
+
+and a subsection is the text from its marker to the next marker of the
+same kind (headings: the next heading of any level). Ordered keyword
+checks are successive str.find calls. Everything is O(length of the
+section); the index of the last few sections is cached.
+"""
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+
+# "**1. TECHNOLOGY OVERVIEW**" - bounded title, so matching a line is linear
+BOLD_MARKER_PATTERN = re.compile(r'\*\*(\d{1,2})\.[ \t]*([^*\n]{0,200})\*\*')
+
+
+class Marker(NamedTuple):
+    kind: str         # "heading" or "bold"
+    level: int        # heading level (# count) or bold marker number
+    title: str
+    start: int        # offset of the marker
+    body_start: int   # offset right after the marker
+
+
+class SectionIndex:
+    """
+    Markers of one section text, in document order
+    """
+    def __init__(self, content: str):
+        self.content = content
+        self.markers: List[Marker] = []
+
+        offset = 0
+        for line in content.splitlines(keepends=True):
+            stripped = line.lstrip()
+            if stripped.startswith("#"):
+                level = len(stripped) - len(stripped.lstrip("#"))
+                title = stripped[level:].strip().rstrip("#").strip()
+                if level <= 6 and title:
+                    self.markers.append(Marker("heading", level, title,
+                                               offset, offset + len(line)))
+            if "**" in line:
+                for match in BOLD_MARKER_PATTERN.finditer(line):
+                    self.markers.append(Marker("bold", int(match.group(1)), match.group(2).strip(),
+                                               offset + match.start(), offset + match.end()))
+            offset += len(line)
+
+    def find(self, title_prefix: str, kind: str = "heading",
+             number: Optional[int] = None) -> Optional[int]:
+        """Index of the first marker whose title starts with title_prefix (case-insensitive)"""
+        prefix = title_prefix.lower()
+        for position, marker in enumerate(self.markers):
+            if marker.kind != kind or (number is not None and marker.level != number):
+                continue
+            if marker.title.lower().startswith(prefix):
+                return position
+        return None
+
+    def body(self, position: int) -> str:
+        """Text of a marker's subsection (up to the next marker of the same kind)"""
+        marker = self.markers[position]
+        end = len(self.content)
+        for following in self.markers[position + 1:]:
+            if following.kind == marker.kind:
+                end = following.start
+                break
+        return self.content[marker.body_start:end]
+
+    def subsection(self, title_prefix: str, kind: str = "heading",
+                   number: Optional[int] = None) -> str:
+        """
+        Body of the first subsection whose title starts with title_prefix
+        ("" if there is none)
+        """
+        position = self.find(title_prefix, kind, number)
+        return self.body(position) if position is not None else ""
+
+
+@lru_cache(maxsize=8)
+def section_index(content: str) -> SectionIndex:
+    """Index of a section text (the tiers of one section share it)"""
+    return SectionIndex(content)
+
+
+def subsection(content: str, title_prefix: str) -> str:
+    """
+    Body of the "## <title_prefix>..." subsection - replaces
+    re.search(r'##\\s*<title>(.*?)(?=##|$)', content, re.DOTALL | re.IGNORECASE)
+    """
+    return section_index(content).subsection(title_prefix)
+
+
+def numbered_subsection(content: str, number: int, title_prefix: str) -> str:
+    """
+    Body of the "**<number>. <title_prefix>...**" subsection up to the next
+    numbered bold marker - replaces the '\\*\\*1\\.\\s*TECHNOLOGY...(?=\\*\\*[2-9]\\.|\\Z)'
+    pattern
+    """
+    return section_index(content).subsection(title_prefix, kind="bold", number=number)
+
+
+def heading_titles(content: str, min_level: int = 2) -> List[str]:
+    """
+    Titles of the markdown headings at min_level or deeper - replaces
+    line scans like re.search(r'##\\s+.*Viability', content)
+    """
+    return [marker.title for marker in section_index(content).markers
+            if marker.kind == "heading" and marker.level >= min_level]
+
+
+def clauses(content: str) -> List[str]:
+    """
+    Clauses ended by "." or ":" (text after the last one on a line is not
+    a clause) - replaces findall(r'(?:word|...).*?(?:\\.|:)') counts
+    """
+    found = []
+    for line in content.splitlines():
+        found.extend(re.split(r'[.:]', line)[:-1])
+    return found
+
+
+def keywords_in_order(content: str, keywords: List[str], same_line: bool = False) -> bool:
+    """
+    True if the keywords occur in this order (case-insensitive) - the
+    linear equivalent of re.search('A.*B.*C', content, re.I | re.S): taking
+    the earliest occurrence of each keyword is always enough
+    (same_line: all on one line, like the pattern without re.S)
+    """
+    if same_line:
+        return any(keywords_in_order(line, keywords) for line in content.splitlines())
+
+    text = content.lower()
+    position = 0
+    for keyword in keywords:
+        found = text.find(keyword.lower(), position)
+        if found < 0:
+            return False
+        position = found + len(keyword)
+    return True
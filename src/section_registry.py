@@ -0,0 +1,1024 @@
+# section_registry.py
+"""
+Section Registry - single declaration of all 21 MSE-CDP DPR sections
+
+Each SectionSpec declares what one section needs and produces:
+- key / num / title / heading  (state key, document order, file + display names)
+- inputs                        (state data the prompt is built from)
+- system_prompt / user_prompt   (user_prompt is a str.format template over
+                                 build_prompt_context())
+- required_headings             (## subsections the output must contain)
+- word_budget                   ((min, max) words, None = not enforced)
+- validators                    (bespoke validation_agent functions)
+- checks                        (declarative checks run by validation_engine
+                                 for sections without validators - check_specs.py)
+
+document_generator (generation), file_export_agent (file names/titles),
+dpr_orchestrator (section counts), validation_agent (dispatch) and
+config.DPR_SECTIONS all read from here - add or change a section in one
+place. This module is pure data: apart from indian_numbers,
+financial_placeholders (figure formatting for the prompts) and check_specs
+it imports nothing from the project.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+
+from indian_numbers import format_inr, format_crore
+from financial_placeholders import financial_values, placeholder_tokens
+from check_specs import (
+    CheckSpec, PROJECT_SPECIFIC, topic, terms, figures, word_budget, judge
+)
+
+
+class SectionSpec:
+    """
+    Declarative description of one DPR section
+    """
+    def __init__(self, key: str, num: int, title: str, heading: str,
+                 system_prompt: str, user_prompt: str,
+                 inputs: Tuple[str, ...] = ("project_data",),
+                 required_headings: Tuple[str, ...] = (),
+                 word_budget: Optional[Tuple[Optional[int], Optional[int]]] = None,
+                 validators: Tuple[str, ...] = (),
+                 checks: Tuple[CheckSpec, ...] = ()):
+        self.key = key
+        self.num = num
+        self.title = title
+        self.heading = heading
+        self.system_prompt = system_prompt
+        self.user_prompt = user_prompt
+        self.inputs = inputs
+        self.required_headings = required_headings
+        self.word_budget = word_budget
+        self.validators = validators
+        self.checks = checks
+
+    @property
+    def needs_financial(self) -> bool:
+        return "financial" in self.inputs
+
+    @property
+    def validated(self) -> bool:
+        """True if validation_agent checks this section (bespoke validators or checks)"""
+        return bool(self.validators or self.checks)
+
+    @property
+    def filename(self) -> str:
+        """Export file name, e.g. 01_executive_summary.md"""
+        return f"{self.num:02d}_{self.key}.md"
+
+    def __repr__(self) -> str:
+        return f"SectionSpec({self.num:02d} {self.key})"
+
+
+def build_prompt_context(project_data: Dict[str, Any],
+                         financial_data: Optional[Dict[str, Any]] = None,
+                         placeholders: bool = False) -> Dict[str, Any]:
+    """
+    Values available to every user_prompt template
+
+    Financial keys ({npv}, {irr}, {dscr_check} ...) hold formatted figures,
+    or with `placeholders` the "{{npv}}" tokens bound after generation
+    (financial_placeholders.py)
+    """
+    cost = project_data.get("project_cost", 0)
+
+    context = {
+        # Project data
+        "cluster_type": project_data.get("cluster_type", "N/A"),
+        "location": project_data.get("location", "N/A"),
+        "members": project_data.get("members", 0),
+        "facility_type": project_data.get("facility_type", "N/A"),
+        "grant_scheme": project_data.get("grant_scheme", "N/A"),
+        "cost": cost,
+        "cost_inr": format_inr(cost),
+        "cost_crore": format_crore(cost),
+    }
+
+    # Financial metrics, loan split and MSE-CDP threshold verdicts
+    context.update(placeholder_tokens() if placeholders else financial_values(financial_data))
+    return context
+
+
+# ============================================================================
+# SECTION DECLARATIONS (document order)
+# ============================================================================
+
+SECTION_REGISTRY: List[SectionSpec] = [
+    SectionSpec(
+        key="executive_summary",
+        num=1,
+        title="Executive Summary",
+        heading="EXECUTIVE SUMMARY",
+        inputs=("project_data", "financial"),
+        required_headings=(
+            "## Project Overview",
+            "## Cluster Profile",
+            "## Financial Highlights",
+            "## Expected Impact",
+            "## Recommendation",
+        ),
+        word_budget=(800, 1500),
+        validators=("validate_executive_summary",),
+        system_prompt="""You are a professional DPR writer specializing in MSME cluster development projects under MSE-CDP scheme.
+
+CRITICAL REQUIREMENTS:
+1. Generate content with EXACT markdown subsection headings (## heading format)
+2. Follow the structure EXACTLY as specified
+3. Write 800-1500 words total
+4. Use formal, professional business language
+5. Be specific with numbers and data
+6. No meta-commentary (don't say "here's a draft" or "based on the data")
+7. Write as if this is the final, polished DPR section
+8. Do NOT include the main heading (# EXECUTIVE SUMMARY) - it will be added automatically""",
+        user_prompt="""Generate a complete Executive Summary section with EXACTLY these subsections in this order:
+
+## Project Overview
+Write 2-3 paragraphs covering:
+- Introduction to the {cluster_type} cluster in {location}
+- Purpose of the Common Facility Centre ({facility_type})
+- Number of member units ({members})
+- Total project cost ({cost_inr} / {cost_crore})
+- Government scheme ({grant_scheme}) with subsidy: "60-80% grant" or "70% subsidy"  ← ADD THIS
+
+## Cluster Profile
+Write 2-3 paragraphs covering:
+- Current status of the cluster
+- Key challenges faced by member units (technology, capital, skills, market access)
+- Existing capabilities and strengths
+- Need for the proposed CFC
+
+## Financial Highlights
+Write 2-3 paragraphs covering:
+- Total Project Cost: {cost_inr} ({cost_crore})
+- Grant/Subsidy breakdown
+- Key financial metrics:
+  * NPV: {npv} (must be positive)
+  * IRR: {irr} (must be > 10%)
+  * DSCR: {dscr} (must be > 3:1)
+  * Break-even: {breakeven} capacity
+- Statement of financial viability
+
+## Expected Impact
+Write 2-3 paragraphs covering:
+- Direct employment generation (MUST include specific numbers: e.g., "85 direct jobs")
+- Indirect employment opportunities (MUST include numbers: e.g., "150+ indirect jobs")
+- Revenue/turnover increase projections (MUST include % or absolute numbers: e.g., "40% increase from ₹25 crore to ₹35 crore")
+- Technology upgradation benefits (be specific)
+- Market access improvements (be specific)
+- Skill development outcomes (include numbers if possible)
+- Social and economic benefits to the region
+CRITICAL: Use specific quantitative data throughout (numbers, percentages, amounts)
+
+## Recommendation
+## Recommendation
+Write 1-2 paragraphs with:
+- MUST start with: "This project is strongly recommended for approval under the MSE-CDP scheme"
+- Justify using THESE EXACT WORDS: "financial viability" (mention NPV, IRR, DSCR), "compliance" (MSE-CDP requirements met), and "impact" (employment, economic benefits)
+- Implementation timeline: State "18 months" or similar timeframe  ← ADD THIS
+- Readiness: Mention SPV formation and approvals in progress  ← ADD THIS
+- Summary of key strengths based on data:
+  * Financial viability: NPV {npv} (positive), IRR {irr} (exceeds 10%), DSCR {dscr} (exceeds 3:1)
+  * MSE-CDP compliance requirements met
+  * Significant economic and social impact potential
+- Readiness for implementation (mention SPV formation, approvals)
+- Expected outcomes and benefits
+CRITICAL: Base recommendation explicitly on the financial metrics provided above
+
+CRITICAL: 
+- Use EXACT heading format: "## Project Overview" (not "Project Overview:" or "**Project Overview**")
+- Total length: 800-1500 words
+- Be specific with numbers and data provided
+- Professional tone throughout
+- No meta-commentary or draft language""",
+    ),
+    SectionSpec(
+        key="organization_details",
+        num=2,
+        title="Organization Details",
+        heading="ORGANIZATION DETAILS",
+        checks=(
+            topic("cluster information", "cluster history", "history", "established"),
+            topic("membership structure", "membership", "member unit"),
+            topic("the common facility centre", "common facility centre", "common facility center", "cfc"),
+            topic("geographic coverage", "geographic", "coverage", "accessibility", "connectivity"),
+            topic("governance structure", "governance", "spv", "special purpose vehicle"),
+            figures("Member and facility figures", "number", min_found=3),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a professional DPR writer specializing in MSME cluster development.
+Generate clear, detailed content for the Organization Details section.
+Focus on structure, governance, and operational details.
+Write in formal business language.""",
+        user_prompt="""Generate content for Organization Details section:
+
+PROJECT DATA:
+- Cluster Type: {cluster_type}
+- Location: {location}
+- Number of Members: {members} units
+- Facility Type: {facility_type}
+
+Generate detailed content covering:
+1. CLUSTER INFORMATION - History, current status, key characteristics
+2. MEMBERSHIP STRUCTURE - Member profiles, size distribution, specializations
+3. COMMON FACILITY CENTRE - Detailed description of proposed facility
+4. GEOGRAPHIC COVERAGE - Area covered, accessibility, infrastructure
+5. GOVERNANCE STRUCTURE - Proposed SPV structure, management, decision-making
+
+Write 5-6 paragraphs with specific details. Be professional and comprehensive.""",
+    ),
+    SectionSpec(
+        key="financial_plan",
+        num=3,
+        title="Financial Plan",
+        heading="FINANCIAL PLAN",
+        inputs=("project_data", "financial"),
+        required_headings=(
+            "## Project Cost Breakdown",
+            "## Funding Structure",
+            "## Financial Viability Metrics",
+            "## Revenue Projections",
+            "## Debt Service Analysis",
+            "## Financial Feasibility Assessment",
+        ),
+        word_budget=(1200, 2000),
+        validators=("validate_financial_plan",),
+        system_prompt="""You are a financial analyst specializing in MSME project financing under MSE-CDP.
+
+CRITICAL REQUIREMENTS:
+1. Generate content with EXACT markdown subsection headings (## heading format)
+2. Follow the structure EXACTLY as specified
+3. Write 1200-2000 words total
+4. Use formal, professional financial language
+5. Be specific with numbers and financial data
+6. No meta-commentary
+7. Write as final polished DPR section
+8. Do NOT include main heading (# FINANCIAL PLAN) - it will be added automatically""",
+        user_prompt="""Generate a complete Financial Plan section with EXACTLY these subsections in order:
+
+## Project Cost Breakdown
+Write 2-3 paragraphs covering:
+- Total project cost: {cost_inr} ({cost_crore})
+- Breakdown by category (equipment, civil works, training, working capital, contingency)
+- Cost justification and basis of estimates
+- Any cost optimization measures
+
+## Funding Structure  
+Write 2-3 paragraphs covering:
+- Total funding requirement: {cost_inr} ({cost_crore})
+- Grant component: {grant_amount} ({grant_percentage} under MSE-CDP)
+- Loan component: {loan_amount}
+- Member contribution/equity (if any)
+- Funding sources and terms
+- Loan tenure, interest rate, moratorium period
+
+## Financial Viability Metrics
+Write 2-3 paragraphs covering these EXACT metrics:
+- Net Present Value (NPV): {npv} ({npv_check})
+- Internal Rate of Return (IRR): {irr} ({irr_check})
+- Debt Service Coverage Ratio (DSCR): {dscr} ({dscr_check})
+- Break-even: {breakeven} capacity ({breakeven_check})
+- Payback Period: {payback}
+- MSE-CDP Compliance: {compliance_status}
+Explain what each metric means and why the project passes/fails
+
+## Revenue Projections
+Write 2-3 paragraphs covering:
+- Revenue model and sources
+- Year-wise revenue projections ({projection_years} years)
+- Growth assumptions and basis
+- Capacity utilization assumptions
+- Market demand justification
+- Operating expenses and profitability
+
+## Debt Service Analysis
+Write 2-3 paragraphs covering:
+- Loan amount: {loan_amount}
+- Repayment schedule (year-wise)
+- Interest payments
+- Principal repayments  
+- Total debt service obligations
+- DSCR year-wise showing ability to service debt
+- Surplus cash flow analysis
+
+## Financial Feasibility Assessment
+Write 1-2 paragraphs with:
+- Overall financial viability conclusion
+- Key strengths (NPV positive, IRR > 10%, DSCR > 3:1)
+- Risk mitigation for financial sustainability
+- Recommendation on financial feasibility
+
+CRITICAL:
+- Use EXACT heading format: "## Project Cost Breakdown" (not variations)
+- Total length: 1200-2000 words
+- Include all metrics and numbers provided
+- Professional financial analysis tone
+- No meta-commentary""",
+    ),
+    SectionSpec(
+        key="project_introduction",
+        num=4,
+        title="Project Introduction & Background",
+        heading="PROJECT INTRODUCTION & BACKGROUND",
+        checks=(
+            topic("project genesis", "genesis", "originated", "stakeholder consultation"),
+            topic("the problem statement", "problem statement", "challenge"),
+            topic("project objectives", "objective"),
+            topic("expected outcomes", "outcome", "benefit", "impact"),
+            topic("project scope", "scope"),
+            terms("Measurable objectives", ("increase", "reduce", "improve", "target", "by year"),
+                  min_found=2),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a professional DPR writer specializing in MSME cluster development.
+Generate clear, compelling content for the Project Introduction & Background section.
+Focus on the rationale, context, and strategic importance of the project.
+Write in formal business language suitable for government submissions.""",
+        user_prompt="""Generate content for Project Introduction & Background section:
+
+PROJECT DATA:
+- Cluster Type: {cluster_type}
+- Location: {location}
+- Members: {members} units
+- Facility Type: {facility_type}
+- Project Cost: {cost_inr} ({cost_crore})
+
+Generate detailed content covering:
+1. PROJECT GENESIS - How the project idea originated, stakeholder consultations
+2. PROBLEM STATEMENT - Current challenges faced by cluster members
+3. PROJECT OBJECTIVES - Clear, measurable objectives for the CFC
+4. EXPECTED OUTCOMES - Tangible benefits and impact expected
+5. PROJECT SCOPE - Boundaries and coverage of the project
+
+Write 5-6 comprehensive paragraphs. Be specific and strategic.""",
+    ),
+    SectionSpec(
+        key="cluster_profile",
+        num=5,
+        title="Cluster Profile Analysis",
+        heading="CLUSTER PROFILE ANALYSIS",
+        checks=(
+            topic("cluster overview", "overview", "history", "evolution"),
+            topic("industry characteristics", "industry characteristic", "characteristic"),
+            topic("current challenges", "challenge", "gap", "limitation"),
+            topic("competitive advantages", "competitive advantage", "strength"),
+            topic("growth potential", "growth potential", "growth", "opportunity"),
+            terms("Challenge areas named", ("infrastructure", "technology", "market access",
+                                            "skill", "finance", "credit"), min_found=3),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+            judge("Industry-specific insights",
+                  "The analysis is specific to this cluster's industry, not generic MSME text"),
+        ),
+        system_prompt="""You are an industry analyst specializing in MSME clusters.
+Generate detailed, analytical content for the Cluster Profile Analysis section.
+Include industry-specific insights and competitive dynamics.
+Write professionally with data-driven insights.""",
+        user_prompt="""Generate content for Cluster Profile Analysis:
+
+CLUSTER DATA:
+- Type: {cluster_type}
+- Location: {location}
+- Number of Units: {members}
+
+Generate comprehensive analysis covering:
+1. CLUSTER OVERVIEW - History, evolution, current state
+2. INDUSTRY CHARACTERISTICS - Specific to {cluster_type}
+3. CURRENT CHALLENGES - Infrastructure gaps, technology limitations, market access issues
+4. COMPETITIVE ADVANTAGES - Unique strengths of this cluster
+5. GROWTH POTENTIAL - Future opportunities and expansion possibilities
+
+Write 5-6 detailed paragraphs with industry-specific insights.""",
+    ),
+    SectionSpec(
+        key="technical_feasibility",
+        num=6,
+        title="Technical Feasibility Study",
+        heading="TECHNICAL FEASIBILITY STUDY",
+        word_budget=(1050, None),
+        validators=("validate_technical_feasibility",),
+        system_prompt="""You are a technical consultant specializing in manufacturing and production facilities.
+Generate detailed technical content for the Technical Feasibility Study section.
+Include specific equipment, processes, and technical specifications.
+Write with technical accuracy and practical implementation focus.""",
+        user_prompt="""Generate content for Technical Feasibility Study:
+
+PROJECT DATA:
+- Cluster Type: {cluster_type}
+- Facility Type: {facility_type}
+- Serving: {members} member units
+
+Generate technical analysis covering:
+**1. TECHNOLOGY OVERVIEW:** (250-300 words minimum)
+Provide a comprehensive analysis of the technology landscape for {facility_type}:
+- Current technology trends in the {cluster_type} sector
+- Specific technologies being proposed (inkjet, laser, digital, offset, etc.)
+- Technical specifications and capabilities of each technology
+- Comparison of different technology options (advantages/disadvantages)
+- Why the selected technology is appropriate for this cluster
+- Industry standards and best practices
+- Future-readiness and scalability of the technology
+- Integration with existing workflows in member units
+
+Example structure:
+"Modern digital printing technologies suitable for this facility include... [detailed explanation of 2-3 technologies]. The selection of [chosen technology] is based on several factors including... [explain benefits]. This technology enables... [capabilities]. Industry standards such as... [mention standards]. The proposed equipment meets/exceeds... [technical requirements]."
+
+2. EQUIPMENT & MACHINERY (200+ words)
+   - List 3-5 specific equipment with brand/model names (e.g., HP Latex 360, Xerox Iridesse)
+   - Include specifications: dimensions, capacity, power requirements
+   - Installation requirements and space needs
+
+3. PRODUCTION PROCESS (150+ words)
+   - Detailed step-by-step workflow
+   - Quality control checkpoints
+   - Safety procedures
+
+4. CAPACITY ANALYSIS (150+ words)
+   - Quantitative data: impressions/day, sq.m/hour, units/month
+   - Utilization projections with numbers
+   - Shift operations and capacity scaling
+
+5. TECHNICAL SPECIFICATIONS (150+ words)
+   - Quality standards (ISO, dpi, resolution)
+   - Technical parameters with numbers
+   - Industry certifications required
+
+6. TECHNOLOGY TRANSFER & TRAINING (150+ words)
+   - Specific training programs
+   - Duration and manpower requirements
+   - Skill development milestones""",
+    ),
+    SectionSpec(
+        key="market_analysis",
+        num=7,
+        title="Market Analysis & Demand Assessment",
+        heading="MARKET ANALYSIS & DEMAND ASSESSMENT",
+        validators=("validate_market_analysis",),
+        system_prompt="""You are a market research analyst specializing in MSME sectors.
+Generate comprehensive market analysis for the Market Analysis & Demand Assessment section.
+Include market sizing, trends, competition, and demand projections.
+Use data-driven language with market insights.""",
+        user_prompt="""Generate content for Market Analysis & Demand Assessment:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Location: {location}
+- Cluster Size: {members} units
+
+Generate market analysis covering:
+1. MARKET SIZE & TRENDS - Current market size, growth trends, drivers
+2. TARGET MARKET SEGMENTS - B2B/B2C segments, customer profiles
+3. COMPETITION ANALYSIS - Key competitors, market positioning
+4. DEMAND PROJECTIONS - 5-10 year demand forecast with assumptions
+5. MARKET ENTRY STRATEGY - How cluster will access and grow market share
+
+Write 5-6 paragraphs with market data and strategic insights.""",
+    ),
+    SectionSpec(
+        key="implementation_schedule",
+        num=8,
+        title="Implementation Schedule & Timeline",
+        heading="IMPLEMENTATION SCHEDULE & TIMELINE",
+        checks=(
+            topic("project phases", "phase", "pre implementation", "commissioning"),
+            topic("timeline and milestones", "milestone", "timeline"),
+            topic("critical path activities", "critical path", "dependency", "critical activity"),
+            topic("the resource deployment plan", "resource deployment", "resource"),
+            topic("monitoring checkpoints", "checkpoint", "review", "progress tracking"),
+            figures("Timeline stated in months/phases", "period", min_found=4, severity="high"),
+            terms("Project stages covered", ("construction", "installation", "commissioning",
+                                             "trial run", "procurement"), min_found=3,
+                  tier="Compliance"),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a project management consultant specializing in infrastructure projects.
+Generate detailed implementation schedule for the Implementation Schedule & Timeline section.
+Include realistic timelines, milestones, and critical path activities.
+Write with project management rigor and practical implementation focus.""",
+        user_prompt="""Generate content for Implementation Schedule & Timeline:
+
+PROJECT DATA:
+- Facility: {facility_type}
+- Budget: {cost_inr} ({cost_crore})
+
+Generate implementation plan covering:
+1. PROJECT PHASES - Pre-implementation, construction, commissioning, operations
+2. TIMELINE & MILESTONES - Month-by-month schedule with key milestones
+3. CRITICAL PATH ACTIVITIES - Dependencies and critical activities
+4. RESOURCE DEPLOYMENT PLAN - When resources (funds, equipment, people) deploy
+5. MONITORING CHECKPOINTS - Review points and progress tracking
+
+Include a realistic 12-18 month implementation timeline. Write 5-6 detailed paragraphs.""",
+    ),
+    SectionSpec(
+        key="management_structure",
+        num=9,
+        title="Management & Organizational Structure",
+        heading="MANAGEMENT & ORGANIZATIONAL STRUCTURE",
+        checks=(
+            topic("the organizational framework", "organizational framework", "spv", "trust", "society"),
+            topic("the management team", "management team", "board"),
+            topic("roles and responsibilities", "role", "responsibility"),
+            topic("governance structure", "governance", "reporting"),
+            topic("the decision-making process", "decision making", "voting", "consensus"),
+            terms("Key positions named", ("chairman", "president", "director", "ceo", "manager",
+                                          "secretary", "treasurer"), min_found=2),
+            terms("MSE-CDP governance (SPV with member representation)",
+                  ("spv", "special purpose vehicle", "general body", "member representation"),
+                  tier="Compliance"),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are an organizational development consultant specializing in MSME clusters.
+Generate detailed content for the Management & Organizational Structure section.
+Include governance models, management hierarchy, and decision-making processes.
+Write professionally with focus on practical implementation.""",
+        user_prompt="""Generate content for Management & Organizational Structure:
+
+PROJECT DATA:
+- Cluster Type: {cluster_type}
+- Number of Members: {members} units
+- Location: {location}
+
+Generate organizational structure covering:
+1. ORGANIZATIONAL FRAMEWORK - SPV/Trust structure, legal entity
+2. MANAGEMENT TEAM - Board composition, management positions, qualifications
+3. ROLES & RESPONSIBILITIES - Clear role definitions for each position
+4. GOVERNANCE STRUCTURE - Decision-making authority, reporting lines
+5. DECISION-MAKING PROCESS - Consensus mechanisms, voting procedures
+
+Write 5-6 detailed paragraphs with practical governance details.""",
+    ),
+    SectionSpec(
+        key="economic_viability",
+        num=10,
+        title="Economic & Commercial Viability",
+        heading="ECONOMIC & COMMERCIAL VIABILITY",
+        inputs=("project_data", "financial"),
+        checks=(
+            topic("economic impact analysis", "economic impact", "job creation", "employment"),
+            topic("commercial feasibility", "commercial feasibility", "commercial", "revenue potential"),
+            topic("cost-benefit analysis", "cost benefit", "npv", "irr"),
+            topic("the revenue model", "revenue model", "revenue stream", "income stream", "pricing"),
+            topic("the sustainability assessment", "sustainability", "long term viability", "scalability"),
+            terms("Financial metrics used", ("npv", "irr", "dscr", "payback", "break even", "breakeven"),
+                  min_found=3, tier="Compliance", severity="high"),
+            figures("Rupee amounts stated", "amount", min_found=2, severity="high"),
+            figures("Percentages stated", "percent", min_found=2),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a financial analyst specializing in MSME projects.
+Generate comprehensive content for the Economic & Commercial Viability section.
+Include economic impact, commercial feasibility, and sustainability analysis.
+Use data-driven language with financial insights.""",
+        user_prompt="""Generate content for Economic & Commercial Viability:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Investment: {cost_inr} ({cost_crore})
+- Member Units: {members}
+- NPV: {npv}
+- IRR: {irr}
+- Payback Period: {payback}
+
+Generate viability analysis covering:
+1. ECONOMIC IMPACT ANALYSIS - Job creation, GDP contribution, multiplier effects
+2. COMMERCIAL FEASIBILITY - Revenue potential, market demand validation
+3. COST-BENEFIT ANALYSIS - Using NPV, IRR, and other metrics provided
+4. REVENUE MODEL - Income streams, pricing strategy, sustainability
+5. SUSTAINABILITY ASSESSMENT - Long-term viability, scalability
+
+Write 5-6 paragraphs using the financial metrics provided.""",
+    ),
+    SectionSpec(
+        key="swot_analysis",
+        num=11,
+        title="SWOT Analysis",
+        heading="SWOT ANALYSIS",
+        checks=(
+            topic("strengths", "strength"),
+            topic("weaknesses", "weakness"),
+            topic("opportunities", "opportunity"),
+            topic("threats", "threat"),
+            topic("strategic implications", "strategic implication", "strategy", "leverage"),
+            terms("Opportunities linked to schemes/markets", ("government scheme", "mse cdp", "export",
+                                                             "market growth", "subsidy")),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+            judge("Internal vs external factors",
+                  "Strengths and weaknesses are internal to the cluster; opportunities and threats are external factors"),
+        ),
+        system_prompt="""You are a strategic planning consultant specializing in MSME clusters.
+Generate comprehensive SWOT Analysis for the project.
+Be specific, realistic, and strategic in identifying factors.
+Write in clear, business-focused language.""",
+        user_prompt="""Generate SWOT Analysis content:
+
+PROJECT DATA:
+- Cluster Type: {cluster_type}
+- Location: {location}
+- Members: {members} units
+- Facility: {facility_type}
+
+Generate detailed SWOT covering:
+1. STRENGTHS - Internal advantages (skilled workforce, established cluster, location, etc.)
+2. WEAKNESSES - Internal limitations (technology gaps, infrastructure, capital constraints)
+3. OPPORTUNITIES - External favorable factors (market growth, government schemes, exports)
+4. THREATS - External challenges (competition, policy changes, economic factors)
+5. STRATEGIC IMPLICATIONS - How to leverage S, overcome W, exploit O, mitigate T
+
+Write 5-6 detailed paragraphs with specific, actionable insights.""",
+    ),
+    SectionSpec(
+        key="risk_analysis",
+        num=12,
+        title="Risk Analysis & Mitigation",
+        heading="RISK ANALYSIS & MITIGATION",
+        checks=(
+            topic("risk identification", "risk identification", "identified risk", "key risk"),
+            topic("risk assessment", "risk assessment", "probability", "likelihood"),
+            topic("mitigation strategies", "mitigation", "mitigate"),
+            topic("contingency plans", "contingency"),
+            topic("risk monitoring", "risk monitoring", "monitor", "risk register"),
+            terms("Risk categories covered", ("technical risk", "financial risk", "market risk",
+                                              "operational risk", "regulatory risk"), min_found=3,
+                  severity="high"),
+            terms("Impact rated", ("high", "medium", "low"), min_found=2),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+            judge("Specific mitigations",
+                  "Every major risk has a specific, actionable mitigation measure"),
+        ),
+        system_prompt="""You are a risk management consultant specializing in manufacturing and MSME projects.
+Generate comprehensive Risk Analysis & Mitigation strategies.
+Identify specific risks and provide actionable mitigation plans.
+Write with practical risk management focus.""",
+        user_prompt="""Generate content for Risk Analysis & Mitigation:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Facility: {facility_type}
+- Investment: {cost_inr} ({cost_crore})
+
+Generate risk analysis covering:
+1. RISK IDENTIFICATION - Technical, financial, market, operational, regulatory risks
+2. RISK ASSESSMENT - Probability and impact assessment for each risk
+3. MITIGATION STRATEGIES - Specific actions to reduce/prevent each risk
+4. CONTINGENCY PLANS - Backup plans if risks materialize
+5. RISK MONITORING - How to track and review risks ongoing
+
+Write 5-6 detailed paragraphs with specific risks and mitigation strategies.""",
+    ),
+    SectionSpec(
+        key="environmental_impact",
+        num=13,
+        title="Environmental & Social Impact Assessment",
+        heading="ENVIRONMENTAL & SOCIAL IMPACT ASSESSMENT",
+        checks=(
+            topic("environmental impact", "environmental impact", "emission", "waste"),
+            topic("social impact", "social impact", "employment", "community"),
+            topic("sustainability measures", "sustainability", "renewable", "recycling", "green"),
+            topic("compliance requirements", "compliance", "clearance", "pollution control"),
+            topic("CSR initiatives", "csr", "corporate social responsibility", "community development"),
+            terms("Environmental clearances named", ("consent to establish", "consent to operate",
+                                                     "pollution control board", "environmental clearance",
+                                                     "cto", "cte"), tier="Compliance", severity="high"),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a sustainability consultant specializing in environmental and social impact.
+Generate comprehensive Environmental & Social Impact Assessment.
+Include compliance, sustainability measures, and CSR initiatives.
+Write with focus on responsible and sustainable operations.""",
+        user_prompt="""Generate content for Environmental & Social Impact Assessment:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Location: {location}
+- Facility: {facility_type}
+- Serving: {members} units
+
+Generate impact assessment covering:
+1. ENVIRONMENTAL IMPACT - Emissions, waste management, resource usage, carbon footprint
+2. SOCIAL IMPACT - Employment generation, skill development, community benefits
+3. SUSTAINABILITY MEASURES - Green technologies, renewable energy, waste recycling
+4. COMPLIANCE REQUIREMENTS - Environmental clearances, pollution norms, regulations
+5. CSR INITIATIVES - Community development, education, health programs
+
+Write 5-6 detailed paragraphs with specific environmental and social considerations.""",
+    ),
+    SectionSpec(
+        key="quality_assurance",
+        num=14,
+        title="Quality Assurance & Standards",
+        heading="QUALITY ASSURANCE & STANDARDS",
+        checks=(
+            topic("the quality policy", "quality policy"),
+            topic("standards and certifications", "certification", "iso", "standard"),
+            topic("quality control processes", "quality control", "inspection point", "quality check"),
+            topic("testing and inspection", "testing", "inspection", "calibration"),
+            topic("continuous improvement", "continuous improvement", "kaizen", "six sigma"),
+            terms("Certifications named", ("iso 9001", "iso 14001", "bis", "iso"), tier="Compliance"),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a quality management consultant specializing in manufacturing and MSME sectors.
+Generate comprehensive content for the Quality Assurance & Standards section.
+Include quality standards, certifications, and continuous improvement processes.
+Write with focus on industry best practices and quality excellence.""",
+        user_prompt="""Generate content for Quality Assurance & Standards:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Facility: {facility_type}
+- Serving: {members} member units
+
+Generate quality assurance content covering:
+1. QUALITY POLICY - Quality vision, commitment to excellence
+2. QUALITY STANDARDS & CERTIFICATIONS - ISO standards, industry certifications
+3. QUALITY CONTROL PROCESSES - Inspection points, quality checks
+4. TESTING & INSPECTION - Testing protocols, equipment calibration
+5. CONTINUOUS IMPROVEMENT - Kaizen, Six Sigma, quality improvement cycles
+
+Write 5-6 detailed paragraphs with specific quality management practices.""",
+    ),
+    SectionSpec(
+        key="supply_chain",
+        num=15,
+        title="Raw Material & Supply Chain Management",
+        heading="RAW MATERIAL & SUPPLY CHAIN MANAGEMENT",
+        checks=(
+            topic("raw material requirements", "raw material"),
+            topic("supplier identification", "supplier", "vendor", "sourcing"),
+            topic("supply chain strategy", "supply chain strategy", "procurement"),
+            topic("inventory management", "inventory", "stock", "reorder"),
+            topic("logistics and distribution", "logistic", "distribution", "transportation", "warehousing"),
+            figures("Quantities stated", "number", min_found=3),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a supply chain consultant specializing in MSME manufacturing.
+Generate comprehensive content for the Raw Material & Supply Chain Management section.
+Include supplier strategies, inventory management, and logistics.
+Write with practical supply chain optimization focus.""",
+        user_prompt="""Generate content for Raw Material & Supply Chain Management:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Location: {location}
+- Facility: {facility_type}
+
+Generate supply chain content covering:
+1. RAW MATERIAL REQUIREMENTS - Materials needed, specifications, quantities
+2. SUPPLIER IDENTIFICATION - Local/national suppliers, sourcing strategy
+3. SUPPLY CHAIN STRATEGY - Procurement approach, vendor relationships
+4. INVENTORY MANAGEMENT - Stock levels, reorder points, JIT principles
+5. LOGISTICS & DISTRIBUTION - Transportation, warehousing, distribution
+
+Write 5-6 detailed paragraphs with specific supply chain strategies.""",
+    ),
+    SectionSpec(
+        key="infrastructure",
+        num=16,
+        title="Infrastructure & Utilities Requirements",
+        heading="INFRASTRUCTURE & UTILITIES REQUIREMENTS",
+        checks=(
+            topic("land and building requirements", "land", "building"),
+            topic("power and energy", "power", "electricity", "energy"),
+            topic("water and effluent treatment", "water", "effluent"),
+            topic("communication and IT infrastructure", "internet", "networking", "it infrastructure",
+                  "communication"),
+            topic("other utilities", "compressed air", "hvac", "fire safety", "utility"),
+            terms("Specifications with units", ("sq ft", "square feet", "sq m", "square meter", "kva",
+                                                "kw", "kl", "litre", "liter"), min_found=2),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are an infrastructure planning consultant for industrial facilities.
+Generate comprehensive content for the Infrastructure & Utilities Requirements section.
+Include detailed specifications for land, utilities, and infrastructure needs.
+Write with technical accuracy and practical implementation focus.""",
+        user_prompt="""Generate content for Infrastructure & Utilities Requirements:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Facility: {facility_type}
+- Location: {location}
+- Investment: {cost_inr} ({cost_crore})
+
+Generate infrastructure requirements covering:
+1. LAND & BUILDING REQUIREMENTS - Area needed, building specifications, layout
+2. POWER & ENERGY - Electricity requirements, backup power, renewable energy
+3. WATER & EFFLUENT TREATMENT - Water supply, consumption, wastewater treatment
+4. COMMUNICATION & IT INFRASTRUCTURE - Internet, networking, software systems
+5. OTHER UTILITIES - Gas, compressed air, HVAC, safety systems
+
+Write 5-6 detailed paragraphs with specific infrastructure specifications.""",
+    ),
+    SectionSpec(
+        key="legal_compliance",
+        num=17,
+        title="Legal & Regulatory Compliance",
+        heading="LEGAL & REGULATORY COMPLIANCE",
+        checks=(
+            topic("legal structure", "legal structure", "registration", "legal entity"),
+            topic("required licenses and permits", "license", "licence", "permit"),
+            topic("the regulatory framework", "regulatory framework", "regulation", "labour law",
+                  "labor law"),
+            topic("the compliance timeline", "compliance timeline", "timeline"),
+            topic("legal risks and mitigation", "legal risk", "mitigation", "compliance strategy"),
+            terms("Statutory registrations named", ("gst", "factory license", "factory licence",
+                                                    "trade license", "trade licence", "udyam",
+                                                    "companies act", "pollution"), min_found=3,
+                  tier="Compliance", severity="high"),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a legal and compliance consultant specializing in MSME regulations.
+Generate comprehensive content for the Legal & Regulatory Compliance section.
+Include all required licenses, permits, and regulatory frameworks.
+Write with detailed compliance requirements and timelines.""",
+        user_prompt="""Generate content for Legal & Regulatory Compliance:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Location: {location}
+- Grant Scheme: {grant_scheme}
+
+Generate legal compliance content covering:
+1. LEGAL STRUCTURE - SPV registration, legal entity formation
+2. REQUIRED LICENSES & PERMITS - Factory license, trade license, GST, pollution clearances
+3. REGULATORY FRAMEWORK - Central and state regulations, labor laws, safety norms
+4. COMPLIANCE TIMELINE - When each license/permit must be obtained
+5. LEGAL RISKS & MITIGATION - Regulatory risks, compliance strategies
+
+Write 5-6 detailed paragraphs with specific compliance requirements.""",
+    ),
+    SectionSpec(
+        key="human_resource",
+        num=18,
+        title="Human Resource & Manpower Plan",
+        heading="HUMAN RESOURCE & MANPOWER PLAN",
+        checks=(
+            topic("manpower requirements", "manpower", "headcount", "position"),
+            topic("the recruitment strategy", "recruitment", "hiring"),
+            topic("training and development", "training", "skill development", "skill upgradation"),
+            topic("compensation and benefits", "compensation", "salary", "wage", "benefit"),
+            topic("HR policies", "hr policy", "leave policy", "performance management", "welfare"),
+            figures("Headcount figures stated", "number", min_found=3),
+            terms("Statutory benefits", ("pf", "provident fund", "esi", "minimum wage", "gratuity"),
+                  tier="Compliance"),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a human resources consultant specializing in manufacturing and MSME sectors.
+Generate comprehensive content for the Human Resource & Manpower Plan section.
+Include staffing requirements, recruitment, training, and HR policies.
+Write with practical HR management and workforce development focus.""",
+        user_prompt="""Generate content for Human Resource & Manpower Plan:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Facility: {facility_type}
+- Serving: {members} member units
+
+Generate HR plan covering:
+1. MANPOWER REQUIREMENTS - Positions needed, skill requirements, headcount
+2. RECRUITMENT STRATEGY - Hiring approach, local employment, skill sourcing
+3. TRAINING & DEVELOPMENT - Technical training, skill upgradation programs
+4. COMPENSATION & BENEFITS - Salary structure, benefits, incentives
+5. HR POLICIES - Leave policy, performance management, employee welfare
+
+Write 5-6 detailed paragraphs with specific HR strategies and workforce plans.""",
+    ),
+    SectionSpec(
+        key="marketing_strategy",
+        num=19,
+        title="Marketing & Sales Strategy",
+        heading="MARKETING & SALES STRATEGY",
+        checks=(
+            topic("market positioning", "positioning", "value proposition"),
+            topic("the marketing mix", "marketing mix", "4p", "product strategy"),
+            topic("sales strategy", "sales strategy", "customer acquisition", "sales"),
+            topic("distribution channels", "distribution channel", "dealer", "channel"),
+            topic("promotional activities", "promotion", "trade fair", "digital marketing", "advertising"),
+            terms("Marketing mix elements", ("product", "price", "place", "promotion"), min_found=3),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a marketing consultant specializing in MSME and manufacturing sectors.
+Generate comprehensive content for the Marketing & Sales Strategy section.
+Include market positioning, marketing mix, sales approach, and promotional strategies.
+Write with practical marketing and business development focus.""",
+        user_prompt="""Generate content for Marketing & Sales Strategy:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Location: {location}
+- Members: {members} units
+- Facility: {facility_type}
+
+Generate marketing strategy covering:
+1. MARKET POSITIONING - Value proposition, competitive advantage, target segments
+2. MARKETING MIX (4Ps) - Product strategy, pricing, place/distribution, promotion
+3. SALES STRATEGY - Sales approach, customer acquisition, relationship management
+4. DISTRIBUTION CHANNELS - Direct sales, dealers, online, exports
+5. PROMOTIONAL ACTIVITIES - Advertising, trade fairs, digital marketing, branding
+
+Write 5-6 detailed paragraphs with specific marketing and sales strategies.""",
+    ),
+    SectionSpec(
+        key="monitoring_framework",
+        num=20,
+        title="Monitoring & Evaluation Framework",
+        heading="MONITORING & EVALUATION FRAMEWORK",
+        checks=(
+            topic("performance indicators", "performance indicator", "kpi"),
+            topic("the monitoring mechanism", "monitoring mechanism", "data collection", "tracking"),
+            topic("the evaluation methodology", "evaluation", "baseline", "mid term", "end term"),
+            topic("the reporting structure", "reporting", "report"),
+            topic("corrective actions", "corrective action", "intervention", "feedback"),
+            terms("Reporting frequency stated", ("monthly", "quarterly", "half yearly", "annual")),
+            figures("Targets quantified", "percent", min_found=1),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a project management consultant specializing in monitoring and evaluation.
+Generate comprehensive content for the Monitoring & Evaluation Framework section.
+Include KPIs, monitoring mechanisms, evaluation methodology, and corrective actions.
+Write with focus on measurable outcomes and continuous improvement.""",
+        user_prompt="""Generate content for Monitoring & Evaluation Framework:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Investment: {cost_inr} ({cost_crore})
+- Serving: {members} member units
+
+Generate monitoring framework covering:
+1. PERFORMANCE INDICATORS - KPIs for financial, operational, social impact metrics
+2. MONITORING MECHANISM - Regular reviews, data collection, tracking systems
+3. EVALUATION METHODOLOGY - Baseline, mid-term, end-term evaluations
+4. REPORTING STRUCTURE - Monthly/quarterly reports, stakeholder communication
+5. CORRECTIVE ACTIONS - Issue identification, intervention strategies, feedback loops
+
+Write 5-6 detailed paragraphs with specific monitoring and evaluation approaches.""",
+    ),
+    SectionSpec(
+        key="annexures",
+        num=21,
+        title="Annexures & Supporting Documents",
+        heading="ANNEXURES & SUPPORTING DOCUMENTS",
+        checks=(
+            topic("financial documents", "financial document", "balance sheet", "bank statement",
+                  "quotation"),
+            topic("technical documents", "technical document", "drawing", "technical specification"),
+            topic("legal documents", "legal document", "registration certificate", "land document", "mou"),
+            topic("organizational documents", "trust deed", "member list", "board resolution", "spv"),
+            topic("other supporting documents", "market study", "feasibility report", "photograph",
+                  "supporting document"),
+            *PROJECT_SPECIFIC,
+            word_budget(300),
+        ),
+        system_prompt="""You are a documentation specialist for DPR preparation.
+Generate comprehensive content for the Annexures & Supporting Documents section.
+List all required supporting documents and their relevance.
+Write as a structured checklist of required documents.""",
+        user_prompt="""Generate content for Annexures & Supporting Documents:
+
+PROJECT DATA:
+- Industry: {cluster_type}
+- Grant Scheme: {grant_scheme}
+
+Generate annexures list covering:
+1. FINANCIAL DOCUMENTS - Balance sheets, bank statements, cost estimates, quotes
+2. TECHNICAL DOCUMENTS - Technical specifications, drawings, equipment details
+3. LEGAL DOCUMENTS - Registration certificates, licenses, land documents, MoUs
+4. ORGANIZATIONAL DOCUMENTS - SPV/Trust deed, member list, board resolutions
+5. OTHER SUPPORTING DOCUMENTS - Market studies, feasibility reports, photos
+
+Write 5-6 detailed paragraphs listing specific documents required for DPR submission.""",
+    ),]
+
+
+# ============================================================================
+# LOOKUPS
+# ============================================================================
+
+SECTIONS: Dict[str, SectionSpec] = {spec.key: spec for spec in SECTION_REGISTRY}
+
+SECTION_KEYS: List[str] = [spec.key for spec in SECTION_REGISTRY]
+
+TOTAL_SECTIONS = len(SECTION_REGISTRY)
+
+
+def get_section(key: str) -> SectionSpec:
+    """Spec for a section key (KeyError for unknown keys)"""
+    return SECTIONS[key]
+
+
+def section_filename(key: str) -> str:
+    """Export file name for a section key, e.g. 03_financial_plan.md"""
+    return SECTIONS[key].filename
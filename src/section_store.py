@@ -0,0 +1,136 @@
+# section_store.py
+"""
+Section Store - content-addressed storage for section bodies
+
+DPR state holds a small reference per section instead of its text:
+
+    state["dpr_sections"]["executive_summary"] = {
+        "blob": "3f9a...e1",     # sha256 of the UTF-8 text
+        "chars": 9214,
+        "words": 1388,
+    }
+
+The text lives once on disk under output/<SECTION_STORE_DIR>/3f/9a...e1 and
+is read back on access (section_text). So a DPR in flight costs a few
+kilobytes however long its sections are, checkpoints and service responses
+stay small, and identical sections across runs share one blob.
+
+Blobs are immutable - a changed section is a new blob and a new reference;
+blobs no export manifest references are garbage-collected
+(export_archive.gc_blobs).
+Recently read bodies are kept in a small LRU cache
+(config.SECTION_STORE_CACHE_SIZE). Plain strings are still accepted
+everywhere a reference is (older states, tests).
+"""
+import os
+import hashlib
+import tempfile
+from functools import lru_cache
+from typing import Dict, Any
+
+from config import SECTION_STORE_DIR, SECTION_STORE_CACHE_SIZE
+
+
+def store_root() -> str:
+    """
+    Blob directory: SECTION_STORE_DIR, relative to ../output unless absolute
+    """
+    if os.path.isabs(SECTION_STORE_DIR):
+        return SECTION_STORE_DIR
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, "..", "output", SECTION_STORE_DIR)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def blob_path(digest: str) -> str:
+    return os.path.join(store_root(), digest[:2], digest[2:])
+
+
+def put_text(text: str) -> str:
+    """
+    Store text once (no-op if the blob exists) and return its hash
+    """
+    digest = content_hash(text)
+    path = blob_path(digest)
+    if os.path.exists(path):
+        # Reused: not garbage for export_archive.gc_blobs' grace period
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return digest
+
+    # Write-then-rename so concurrent runs never read a partial blob
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        # Read-only: blobs are immutable
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return digest
+
+
+@lru_cache(maxsize=SECTION_STORE_CACHE_SIZE)
+def get_text(digest: str) -> str:
+    """Text of a stored blob (KeyError if it is not in the store)"""
+    try:
+        with open(blob_path(digest), encoding="utf-8", newline="") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise KeyError(f"Section blob {digest} not found in {store_root()}") from None
+
+
+# ============================================================================
+# SECTION REFERENCES
+# ============================================================================
+
+def is_section_ref(value: Any) -> bool:
+    return isinstance(value, dict) and "blob" in value
+
+
+def is_section(value: Any) -> bool:
+    """Section body (text or reference) - as opposed to the financial model dict"""
+    return isinstance(value, str) or is_section_ref(value)
+
+
+def store_section(text: str) -> Dict[str, Any]:
+    """Store a section body and return its reference"""
+    return {"blob": put_text(text), "chars": len(text), "words": len(text.split())}
+
+
+def store_sections(sections: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    dpr_sections update with every text body replaced by its reference
+    (other values - the financial model - are passed through)
+    """
+    return {
+        key: store_section(value) if isinstance(value, str) else value
+        for key, value in sections.items()
+    }
+
+
+def section_text(value: Any) -> str:
+    """Text of a section reference (plain strings are returned as they are)"""
+    if is_section_ref(value):
+        return get_text(value["blob"])
+    return value
+
+
+def load_sections(dpr_sections: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of dpr_sections with every reference resolved to its text
+    (for consumers that need all bodies at once, e.g. document rendering)
+    """
+    return {
+        key: section_text(value) if is_section_ref(value) else value
+        for key, value in dpr_sections.items()
+    }
@@ -13,6 +13,10 @@ Usage:
     
     # Test with mock data (edge cases)
     python validate_standalone.py --source mock
+    
+    # Only files that changed in the last export (stat-and-hash check
+    # against the export's manifest.json)
+    python validate_standalone.py --source real --path ../output/Printing_Industry_Tirupati/ --changed-only
 """
 
 import sys
@@ -28,15 +32,17 @@ from validation_agent import (
     validate_financial_plan,
     validate_technical_feasibility,
     validate_market_analysis,
-    ValidationResult,
     generate_validation_report
 )
+from check_specs import TIERS
+from section_registry import section_filename
+from export_archive import latest_manifest, file_hash, entry_hash
 
-# File paths
-EXECUTIVE_SUMMARY_FILE = "01_executive_summary.md"
-FINANCIAL_PLAN_FILE = "03_financial_plan.md"
-TECHNICAL_FEASIBILITY_FILE = "06_technical_feasibility.md"
-MARKET_ANALYSIS_FILE = "07_market_analysis.md"
+# File paths (export names come from section_registry)
+EXECUTIVE_SUMMARY_FILE = section_filename("executive_summary")
+FINANCIAL_PLAN_FILE = section_filename("financial_plan")
+TECHNICAL_FEASIBILITY_FILE = section_filename("technical_feasibility")
+MARKET_ANALYSIS_FILE = section_filename("market_analysis")
 
 # ============================================================================
 # MOCK DATA FOR EDGE CASE TESTING
@@ -163,19 +169,36 @@ def read_dpr_file(file_path: str) -> tuple:
         return None, False, f"Error reading file: {str(e)}"
 
 
+def file_unchanged(path: Path, manifest: dict) -> bool:
+    """
+    True if the last export left this file as it was (same hash as the
+    run before) and it hasn't been edited since - decided from the file's
+    size/mtime against manifest.json, read and hashed only if they differ
+    """
+    entry = manifest.get("files", {}).get(path.name)
+    if not entry or entry.get("changed", True) or not path.exists():
+        return False
+    return file_hash(str(path), entry) == entry_hash(entry)
+
+
 # ============================================================================
 # TEST RUNNER
 # ============================================================================
 
-def test_real_data(output_path: str, project_data: dict, section: str = 'all'):
+def test_real_data(output_path: str, project_data: dict, section: str = 'all',
+                   changed_only: bool = False):
     """
     Test validation with real generated DPR files
+    
+    changed_only: skip files unchanged since the previous export
+    (see file_unchanged)
     """
     print("\n" + "="*80)
     print("🔍 VALIDATION TEST: REAL GENERATED DPR FILES")
     print("="*80)
     
     output_dir = Path(output_path)
+    manifest = latest_manifest(str(output_dir)) if changed_only else {}
     
     # Dummy financial data for validation
     financial_data = {
@@ -201,7 +224,9 @@ def test_real_data(output_path: str, project_data: dict, section: str = 'all'):
     # Executive Summary
     if section in ['executive', 'all']:
         exec_path = output_dir / EXECUTIVE_SUMMARY_FILE
-        if exec_path.exists():
+        if file_unchanged(exec_path, manifest):
+            print(f"\n⏭️  Unchanged since last export: {exec_path.name}")
+        elif exec_path.exists():
             print(f"\n📁 Reading: {exec_path}")
             content, success, error = read_dpr_file(str(exec_path))
             if success:
@@ -217,7 +242,9 @@ def test_real_data(output_path: str, project_data: dict, section: str = 'all'):
     # Financial Plan
     if section in ['financial', 'all']:
         fin_path = output_dir / FINANCIAL_PLAN_FILE
-        if fin_path.exists():
+        if file_unchanged(fin_path, manifest):
+            print(f"\n⏭️  Unchanged since last export: {fin_path.name}")
+        elif fin_path.exists():
             print(f"\n📁 Reading: {fin_path}")
             content, success, error = read_dpr_file(str(fin_path))
             if success:
@@ -233,7 +260,9 @@ def test_real_data(output_path: str, project_data: dict, section: str = 'all'):
     # Technical Feasibility
     if section in ['technical', 'all']:
         tech_path = output_dir / TECHNICAL_FEASIBILITY_FILE
-        if tech_path.exists():
+        if file_unchanged(tech_path, manifest):
+            print(f"\n⏭️  Unchanged since last export: {tech_path.name}")
+        elif tech_path.exists():
             print(f"\n📁 Reading: {tech_path}")
             content, success, error = read_dpr_file(str(tech_path))
             if success:
@@ -249,7 +278,9 @@ def test_real_data(output_path: str, project_data: dict, section: str = 'all'):
     # Market Analysis
     if section in ['market', 'all']:
         market_path = output_dir / MARKET_ANALYSIS_FILE
-        if market_path.exists():
+        if file_unchanged(market_path, manifest):
+            print(f"\n⏭️  Unchanged since last export: {market_path.name}")
+        elif market_path.exists():
             print(f"\n📁 Reading: {market_path}")
             content, success, error = read_dpr_file(str(market_path))
             if success:
@@ -326,51 +357,27 @@ def test_mock_data(project_data: dict):
 
 def display_results(result, label: str):
     """
-    Display validation results - handles both old ValidationResult and new dict format
+    Display validation results (a SectionResult from any validator)
     """
     print(f"\n🎯 {label}")
-    
-    # Check if it's the new dict format (Phase 3+) or old ValidationResult format
-    if isinstance(result, dict) and 'summary' in result:
-        # New format (Phase 3+)
-        summary = result['summary']
-        print(f"   Overall Score: {summary['percentage']:.1f}%")
-        print(f"   Grade: {summary['grade']}")
-        print(f"   Checks: {summary['passed']}/{summary['total_checks']} passed")
-        
-        print(f"\n📊 Tier Breakdown:")
-        for tier in result['tiers']:
-            print(f"   {tier['tier']:<12}: {tier['percentage']:.1f}% ({tier['passed']}/{tier['total']} passed)")
-        
-        # Show failed checks
-        failed_checks = []
-        for tier in result['tiers']:
-            for check in tier['checks']:
-                if not check['passed'] and check['severity'] in ['critical', 'high']:
-                    failed_checks.append(f"{check['id']}: {check['description']}")
-        
-        if failed_checks:
-            print(f"\n⚠️  Critical/High Issues ({len(failed_checks)}):")
-            for i, issue in enumerate(failed_checks[:5], 1):  # Show top 5
-                print(f"   {i}. {issue}")
-    
-    else:
-        # Old format (Phase 2 - Executive Summary)
-        print(f"   Overall Score: {result.overall_score:.1f}%")
-        print(f"   Grade: {result.grade}")
-        print(f"   Status: {result.status}")
-        print(f"   Ready for Submission: {'✅ Yes' if result.ready_for_submission else '❌ No'}")
-        
-        print(f"\n📊 Breakdown:")
-        print(f"   Structure:  {result.structure['score']:.1f}% ({result.structure['passed']}/{result.structure['total']} passed)")
-        print(f"   Content:    {result.content['score']:.1f}% ({result.content['passed']}/{result.content['total']} passed)")
-        print(f"   Compliance: {result.compliance['score']:.1f}% ({result.compliance['passed']}/{result.compliance['total']} passed)")
-        print(f"   Quality:    {result.quality['score']:.1f}%")
-        
-        if result.issues:
-            print(f"\n⚠️  Issues Found ({len(result.issues)}):")
-            for i, issue in enumerate(result.issues[:5], 1):
-                print(f"   {i}. {issue}")
+    print(f"   Overall Score: {result.overall_score:.1f}%")
+    print(f"   Grade: {result.grade}")
+    print(f"   Status: {result.status}")
+    print(f"   Ready for Submission: {'✅ Yes' if result.ready_for_submission else '❌ No'}")
+    print(f"   Checks: {result.passed_checks}/{result.total_checks} passed")
+    
+    print(f"\n📊 Tier Breakdown:")
+    for tier in TIERS:
+        passed, total = result.tier_counts(tier)
+        if total:
+            print(f"   {tier:<12}: {passed / total * 100:.1f}% ({passed}/{total} passed)")
+    
+    # Show failed checks, high severity first
+    failed = sorted(result.failed(), key=lambda check: check.severity not in ('critical', 'high'))
+    if failed:
+        print(f"\n⚠️  Issues Found ({len(failed)}):")
+        for i, check in enumerate(failed[:5], 1):  # Show top 5
+            print(f"   {i}. {check.id}: {check.message}")
 
 
 def display_cumulative_summary(results: dict):
@@ -385,27 +392,10 @@ def display_cumulative_summary(results: dict):
     total_passed = 0
     
     for section_name, result in results.items():
-        if isinstance(result, dict) and 'summary' in result:
-            # New format (Phase 3+: Financial Plan, Technical Feasibility, Market Analysis)
-            summary = result['summary']
-            print(f"{section_name.title():<25}: {summary['percentage']:.1f}% ({summary['grade']}) - {summary['passed']}/{summary['total_checks']}")
-            total_checks += summary['total_checks']
-            total_passed += summary['passed']
-        else:
-            # Old format (Phase 2: Executive Summary)
-            # Calculate totals from old ValidationResult format
-            section_checks = (result.structure['total'] + 
-                            result.content['total'] + 
-                            result.compliance['total'] + 
-                            6)  # Quality tier has 6 checks
-            section_passed = (result.structure['passed'] + 
-                            result.content['passed'] + 
-                            result.compliance['passed'] + 
-                            int(result.quality['score'] / 100 * 6))  # Estimate quality passed
-            
-            print(f"{section_name.title():<25}: {result.overall_score:.1f}% ({result.grade}) - {section_passed}/{section_checks}")
-            total_checks += section_checks
-            total_passed += section_passed
+        print(f"{section_name.title():<25}: {result.overall_score:.1f}% ({result.grade}) - "
+              f"{result.passed_checks}/{result.total_checks}")
+        total_checks += result.total_checks
+        total_passed += result.passed_checks
     
     if total_checks > 0:
         overall = (total_passed / total_checks) * 100
@@ -430,11 +420,11 @@ def compare_results(real_result, mock_results):
         print(f"   Mock (Missing Sections):   {mock_results['missing'].overall_score:.1f}% ({mock_results['missing'].grade})")
     
     print("\n📈 Structure Score Comparison:")
-    print(f"   Real Generated DPR:        {real_result.structure['score']:.1f}%")
+    print(f"   Real Generated DPR:        {real_result.tier_score('Structure'):.1f}%")
     if mock_results:
-        print(f"   Mock (Good):               {mock_results['good'].structure['score']:.1f}%")
-        print(f"   Mock (Poor):               {mock_results['poor'].structure['score']:.1f}%")
-        print(f"   Mock (Missing Sections):   {mock_results['missing'].structure['score']:.1f}%")
+        print(f"   Mock (Good):               {mock_results['good'].tier_score('Structure'):.1f}%")
+        print(f"   Mock (Poor):               {mock_results['poor'].tier_score('Structure'):.1f}%")
+        print(f"   Mock (Missing Sections):   {mock_results['missing'].tier_score('Structure'):.1f}%")
     
     print("\n🎓 Quality Assessment:")
     if real_result.overall_score >= 80:
@@ -486,6 +476,12 @@ Examples:
         help='Path to generated DPR output directory (required for real/both)'
     )
     
+    parser.add_argument(
+        '--changed-only',
+        action='store_true',
+        help="Skip files unchanged since the previous export (uses the export's manifest.json)"
+    )
+    
     args = parser.parse_args()
     
     # Validate arguments
@@ -513,8 +509,8 @@ Examples:
     
     # Test real data
     if args.source in ['real', 'both']:
-        real_results = test_real_data(args.path, project_data, args.section)
-        if not real_results:
+        real_results = test_real_data(args.path, project_data, args.section, args.changed_only)
+        if not real_results and not args.changed_only:
             return 1
     
     # Test mock data
@@ -21,107 +21,43 @@ Last Updated: October 31, 2025
 
 import re
 import json
+import asyncio
 from typing import Dict, Any, List, Tuple
 from typing import Optional
 from termcolor import cprint
 
 from langchain_google_vertexai import ChatVertexAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from config import LLM_MODEL
-
-
-def get_grade(percentage: float) -> str:
-    """
-    Convert percentage to letter grade
-    """
-    if percentage >= 95:
-        return "A+"
-    elif percentage >= 90:
-        return "A"
-    elif percentage >= 85:
-        return "A-"
-    elif percentage >= 80:
-        return "B+"
-    elif percentage >= 75:
-        return "B"
-    elif percentage >= 70:
-        return "B-"
-    elif percentage >= 65:
-        return "C+"
-    elif percentage >= 60:
-        return "C"
-    else:
-        return "F"
-    
-# ============================================================================
-# VALIDATION RESULT DATA STRUCTURE
-# ============================================================================
-
-class ValidationResult:
-    """
-    Standard validation result structure
-    """
-    def __init__(self, section_name: str):
-        self.section = section_name
-        self.structure = {"score": 0, "passed": 0, "failed": 0, "total": 0, "details": []}
-        self.content = {"score": 0, "passed": 0, "failed": 0, "total": 0, "details": []}
-        self.compliance = {"score": 0, "passed": 0, "failed": 0, "total": 0, "details": []}
-        self.quality = {"score": 0, "llm_ratings": [], "details": []}
-        self.overall_score = 0
-        self.grade = ""
-        self.status = ""
-        self.issues = []
-        self.suggestions = []
-        self.ready_for_submission = False
-    
-    def calculate_overall_score(self):
-        """Calculate weighted overall score"""
-        self.overall_score = (
-            self.structure["score"] * 0.25 +
-            self.content["score"] * 0.30 +
-            self.compliance["score"] * 0.30 +
-            self.quality["score"] * 0.15
-        )
-        
-        # Assign grade
-        if self.overall_score >= 90:
-            self.grade = "A+"
-            self.status = "EXCELLENT"
-        elif self.overall_score >= 80:
-            self.grade = "A"
-            self.status = "PASS"
-        elif self.overall_score >= 70:
-            self.grade = "B"
-            self.status = "ACCEPTABLE"
-        elif self.overall_score >= 60:
-            self.grade = "C"
-            self.status = "BELOW_STANDARD"
-        else:
-            self.grade = "F"
-            self.status = "FAIL"
-        
-        # Determine submission readiness
-        self.ready_for_submission = self.overall_score >= 80
-        
-        return self.overall_score
-    
-    def to_dict(self):
-        """Convert to dictionary for storage"""
-        return {
-            "section": self.section,
-            "overall_score": round(self.overall_score, 2),
-            "grade": self.grade,
-            "status": self.status,
-            "breakdown": {
-                "structure": self.structure,
-                "content": self.content,
-                "compliance": self.compliance,
-                "quality": self.quality
-            },
-            "issues": self.issues,
-            "suggestions": self.suggestions,
-            "ready_for_submission": self.ready_for_submission
-        }
+from config import LLM_MODEL, VALIDATION_LLM_JUDGE
+from llm_client import get_llm
+from section_registry import SECTION_REGISTRY, get_section
+from section_store import section_text
+from indian_numbers import format_inr, has_amount, mentions_amount
+from llm_resilience import invoke_resilient, non_empty
+from financial_placeholders import bind_placeholders, financial_values
+from validation_cache import cached_tier, mark_uncacheable
+from validation_engine import run_checks
+from check_results import SectionResult
+from check_specs import TIERS
+from section_index import (
+    subsection, numbered_subsection, heading_titles, clauses, keywords_in_order
+)
+
+
+# Executive summary and financial plan: tier scores weighted into the
+# overall score (the other sections count every check the same)
+TIER_WEIGHTS = {"Structure": 0.25, "Content": 0.30, "Compliance": 0.30, "Quality": 0.15}
+
+
+def print_tier_summary(result: SectionResult) -> None:
+    """Pass counts per tier and the overall score of a section result"""
+    print()
+    for number, tier in enumerate(TIERS, 1):
+        passed, total = result.tier_counts(tier)
+        if total:
+            print(f"Tier {number} - {tier + ':':<13}{passed}/{total} ({passed / total * 100:.1f}%)")
+    print(f"\nOVERALL: {result.passed_checks}/{result.total_checks} "
+          f"({result.overall_score:.1f}%) - Grade {result.grade}")
 
 
 # ============================================================================
@@ -132,6 +68,7 @@ class ValidationResult:
 # TIER 1: STRUCTURE VALIDATION (✅ IMPLEMENTED - Phase 2, Step 2.1)
 # ----------------------------------------------------------------------------
 
+@cached_tier
 def validate_executive_summary_structure(content: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     ✅ TIER 1: STRUCTURE VALIDATION - FULLY IMPLEMENTED
@@ -417,6 +354,7 @@ def validate_executive_summary_structure(content: str, project_data: Dict[str, A
 # TIER 2: CONTENT VALIDATION (⏸️ PLACEHOLDER - Phase 2, Step 2.2)
 # ----------------------------------------------------------------------------
 
+@cached_tier
 def validate_executive_summary_content(content: str, project_data: Dict[str, Any], llm) -> Dict[str, Any]:
     """
     ✅ TIER 2: CONTENT VALIDATION - IMPLEMENTED (Phase 2, Step 2.2)
@@ -452,19 +390,12 @@ def validate_executive_summary_content(content: str, project_data: Dict[str, Any
     impact_section = ""
     recommendation_section = ""
     
-    # Extract subsections using regex for better matching
-    import re
-    overview_match = re.search(r'##\s*Project Overview(.*?)(?=##|$)', content, re.DOTALL | re.IGNORECASE)
-    cluster_match = re.search(r'##\s*Cluster Profile(.*?)(?=##|$)', content, re.DOTALL | re.IGNORECASE)
-    financial_match = re.search(r'##\s*Financial Highlights(.*?)(?=##|$)', content, re.DOTALL | re.IGNORECASE)
-    impact_match = re.search(r'##\s*Expected Impact(.*?)(?=##|$)', content, re.DOTALL | re.IGNORECASE)
-    recommendation_match = re.search(r'##\s*Recommendations?(.*?)(?=##|$)', content, re.DOTALL | re.IGNORECASE)
-
-    overview_section = overview_match.group(1) if overview_match else ""
-    cluster_section = cluster_match.group(1) if cluster_match else ""
-    financial_section = financial_match.group(1) if financial_match else ""
-    impact_section = impact_match.group(1) if impact_match else ""
-    recommendation_section = recommendation_match.group(1) if recommendation_match else ""
+    # Extract subsections (linear-time section index)
+    overview_section = subsection(content, "Project Overview")
+    cluster_section = subsection(content, "Cluster Profile")
+    financial_section = subsection(content, "Financial Highlights")
+    impact_section = subsection(content, "Expected Impact")
+    recommendation_section = subsection(content, "Recommendation")
     
     # C1.1: Project Overview data completeness
     print("\n[C1.1] Checking Project Overview data completeness...")
@@ -515,7 +446,7 @@ Section:
 Answer with ONLY 'PASS' or 'FAIL' followed by brief reason."""
         
         try:
-            response = llm.invoke(profile_prompt)
+            response = invoke_resilient(llm, profile_prompt, check=non_empty, key="validation")
             profile_check = response.content.strip()
             
             if "PASS" in profile_check.upper():
@@ -536,8 +467,10 @@ Answer with ONLY 'PASS' or 'FAIL' followed by brief reason."""
                     "status": "FAIL",
                     "message": "Cluster Profile missing adequate challenge/context coverage"
                 })
-        except:
+        except Exception:
             print(f"  ⚠️  SKIP: LLM check failed, counting as pass")
+            # A judge outage is not a verdict - don't cache this tier result
+            mark_uncacheable(results)
             results["passed"] += 1
             results["details"].append({
                 "check": "C1.2",
@@ -688,7 +621,7 @@ Answer with ONLY 'PASS' or 'FAIL' followed by brief reason."""
     members_str = str(project_data.get("members", ""))
     
     # Check if project cost appears in content
-    cost_in_content = cost_str in content or f"₹{int(project_data.get('project_cost', 0)):,}" in content or "crore" in content.lower()
+    cost_in_content = cost_str in content or mentions_amount(content, project_data.get("project_cost", 0))
     members_in_content = members_str in content
     
     consistency_score = sum([cost_in_content, members_in_content])
@@ -726,6 +659,7 @@ Answer with ONLY 'PASS' or 'FAIL' followed by brief reason."""
 # TIER 3: COMPLIANCE VALIDATION (⏸️ PLACEHOLDER - Phase 2, Step 2.3)
 # ----------------------------------------------------------------------------
 
+@cached_tier
 def validate_executive_summary_compliance(content: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     ✅ TIER 3: COMPLIANCE VALIDATION - IMPLEMENTED (Phase 2, Step 2.3)
@@ -809,22 +743,22 @@ def validate_executive_summary_compliance(content: str, project_data: Dict[str,
     cost_compliant = project_cost <= 300000000  # ₹30 crore
     
     if cost_compliant:
-        print(f"  ✅ PASS: Project cost ₹{project_cost:,} ≤ ₹30 crore")
+        print(f"  ✅ PASS: Project cost {format_inr(project_cost)} ≤ ₹30 crore")
         results["passed"] += 1
         results["details"].append({
             "check": "CP1.3",
             "name": "Project cost within limits",
             "status": "PASS",
-            "message": f"Project cost ₹{project_cost:,} is within MSE-CDP limit (≤ ₹30 crore)"
+            "message": f"Project cost {format_inr(project_cost)} is within MSE-CDP limit (≤ ₹30 crore)"
         })
     else:
-        print(f"  ❌ FAIL: Project cost ₹{project_cost:,} > ₹30 crore")
+        print(f"  ❌ FAIL: Project cost {format_inr(project_cost)} > ₹30 crore")
         results["failed"] += 1
         results["details"].append({
             "check": "CP1.3",
             "name": "Project cost within limits",
             "status": "FAIL",
-            "message": f"Project cost ₹{project_cost:,} exceeds MSE-CDP limit (₹30 crore)"
+            "message": f"Project cost {format_inr(project_cost)} exceeds MSE-CDP limit (₹30 crore)"
         })
     
     # CP1.4: References DPR completeness (implicitly)
@@ -936,6 +870,7 @@ def validate_executive_summary_compliance(content: str, project_data: Dict[str,
 # TIER 4: QUALITY VALIDATION (⏸️ PLACEHOLDER - Phase 2, Step 2.4)
 # ----------------------------------------------------------------------------
 
+@cached_tier
 def validate_executive_summary_quality(content: str, project_data: Dict[str, Any], llm) -> Dict[str, Any]:
     """
     ✅ TIER 4: QUALITY VALIDATION - IMPLEMENTED (Phase 2, Step 2.4)
@@ -946,9 +881,9 @@ def validate_executive_summary_quality(content: str, project_data: Dict[str, Any
     - Q1.3: Active voice usage
     - Q1.4: Technical term consistency
     - Q1.5: Formatting consistency
-    - Q1.6: Professional tone
+    - Q1.6: Professional tone (not implemented yet)
     
-    Total: 6 checks
+    Total: 5 checks
     """
     print("\n" + "="*80)
     print("🔍 TIER 4: QUALITY VALIDATION - Executive Summary")
@@ -958,7 +893,7 @@ def validate_executive_summary_quality(content: str, project_data: Dict[str, Any
         "score": 0,
         "passed": 0,
         "failed": 0,
-        "total": 6,
+        "total": 5,
         "details": []
     }
     
@@ -1084,6 +1019,12 @@ def validate_executive_summary_quality(content: str, project_data: Dict[str, Any
     else:
         print(f"  ❌ FAIL: Formatting issues detected")
         results["failed"] += 1
+        results["details"].append({
+            "check": "Q1.5",
+            "name": "Formatting consistency",
+            "status": "FAIL",
+            "message": "Fewer than 5 ## subsections - formatting inconsistent"
+        })
 
     results["score"] = (results["passed"] / results["total"]) * 100
     
@@ -1096,7 +1037,7 @@ def validate_executive_summary_quality(content: str, project_data: Dict[str, Any
 # EXECUTIVE SUMMARY MASTER VALIDATION
 # ----------------------------------------------------------------------------
 
-def validate_executive_summary(content: str, project_data: Dict[str, Any]) -> ValidationResult:
+def validate_executive_summary(content: str, project_data: Dict[str, Any]) -> SectionResult:
     """
     Master validation function for Executive Summary
     
@@ -1110,27 +1051,17 @@ def validate_executive_summary(content: str, project_data: Dict[str, Any]) -> Va
     cprint("🎯 VALIDATING: EXECUTIVE SUMMARY", 'cyan', attrs=['bold'])
     print("="*80)
     
-    result = ValidationResult("executive_summary")
+    result = SectionResult("executive_summary", TIER_WEIGHTS)
     
-    # Initialize LLM (only when needed for content/quality validation)
-    # For now, only Tier 1 is implemented, so we pass None
-    llm = None  # Will be initialized: ChatVertexAI(model_name=LLM_MODEL, temperature=0)
+    # LLM judge for content checks (config.VALIDATION_LLM_JUDGE) - shared,
+    # rate-governed client; without it the LLM checks are skipped
+    llm = get_llm(temperature=0) if VALIDATION_LLM_JUDGE else None
     
     # Run all tiers
-    result.structure = validate_executive_summary_structure(content, project_data)
-    result.content = validate_executive_summary_content(content, project_data, llm)
-    result.compliance = validate_executive_summary_compliance(content, project_data)
-    result.quality = validate_executive_summary_quality(content, project_data, llm)
-    
-    # Calculate overall score
-    result.calculate_overall_score()
-    
-    # Generate issues and suggestions (currently only from structure)
-    if result.structure["failed"] > 0:
-        for detail in result.structure["details"]:
-            if detail["status"] == "FAIL":
-                result.issues.append(detail["message"])
-                result.suggestions.append(f"Add missing {detail['name']}")
+    result.add_tier(validate_executive_summary_structure(content, project_data), "Structure")
+    result.add_tier(validate_executive_summary_content(content, project_data, llm), "Content")
+    result.add_tier(validate_executive_summary_compliance(content, project_data), "Compliance")
+    result.add_tier(validate_executive_summary_quality(content, project_data, llm), "Quality")
     
     print("\n" + "="*80)
     print(f"📈 OVERALL SCORE: {result.overall_score:.1f}% | Grade: {result.grade} | Status: {result.status}")
@@ -1143,7 +1074,7 @@ def validate_executive_summary(content: str, project_data: Dict[str, Any]) -> Va
 # SECTION 2: FINANCIAL PLAN VALIDATION (⏸️ PLACEHOLDER - Phase 3)
 # ============================================================================
 
-def validate_financial_plan(content: str, project_data: Dict[str, Any], financial_data: Dict[str, Any]) -> ValidationResult:
+def validate_financial_plan(content: str, project_data: Dict[str, Any], financial_data: Dict[str, Any]) -> SectionResult:
     """
     Master validation function for Financial Plan
     
@@ -1157,25 +1088,15 @@ def validate_financial_plan(content: str, project_data: Dict[str, Any], financia
     cprint("🎯 VALIDATING: FINANCIAL PLAN", 'cyan', attrs=['bold'])
     print("="*80)
     
-    result = ValidationResult("financial_plan")
+    result = SectionResult("financial_plan", TIER_WEIGHTS)
     
     llm = None  # LLM not needed for structure
     
     # Run all tiers
-    result.structure = validate_financial_plan_structure(content, project_data)
-    result.content =    validate_financial_plan_content(content, project_data, financial_data, llm)
-    result.compliance = validate_financial_plan_compliance(content, project_data, financial_data)    
-    result.quality = validate_financial_plan_quality(content, project_data, financial_data)
-    
-    # Calculate overall score
-    result.calculate_overall_score()
-    
-    # Generate issues
-    if result.structure["failed"] > 0:
-        for detail in result.structure["details"]:
-            if detail["status"] == "FAIL":
-                result.issues.append(detail["message"])
-                result.suggestions.append(f"Add missing {detail['name']}")
+    result.add_tier(validate_financial_plan_structure(content, project_data), "Structure")
+    result.add_tier(validate_financial_plan_content(content, project_data, financial_data, llm), "Content")
+    result.add_tier(validate_financial_plan_compliance(content, project_data, financial_data), "Compliance")
+    result.add_tier(validate_financial_plan_quality(content, project_data, financial_data), "Quality")
     
     print("\n" + "="*80)
     print(f"📈 OVERALL SCORE: {result.overall_score:.1f}% | Grade: {result.grade} | Status: {result.status}")
@@ -1184,6 +1105,7 @@ def validate_financial_plan(content: str, project_data: Dict[str, Any], financia
     return result
 
 
+@cached_tier
 def validate_financial_plan_structure(content: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     ✅ TIER 1: STRUCTURE VALIDATION - Financial Plan
@@ -1257,8 +1179,9 @@ def validate_financial_plan_structure(content: str, project_data: Dict[str, Any]
     
     # S2.4: Financial Viability Metrics
     print("\n[S2.4] Checking 'Financial Viability Metrics' subsection...")
-    metrics_patterns = [r'##\s+.*Viability', r'##\s+.*Metrics', r'##\s+Financial\s+Analysis']
-    metrics_found = any(re.search(pattern, content, re.IGNORECASE) for pattern in metrics_patterns)
+    metrics_found = any("viability" in title.lower() or "metrics" in title.lower()
+                        or title.lower().startswith("financial analysis")
+                        for title in heading_titles(content))
     
     if metrics_found:
         print("  ✅ PASS: Financial Viability Metrics found")
@@ -1299,8 +1222,9 @@ def validate_financial_plan_structure(content: str, project_data: Dict[str, Any]
     
     # S2.7: Financial Feasibility Assessment
     print("\n[S2.7] Checking 'Financial Feasibility Assessment' subsection...")
-    feasibility_patterns = [r'##\s+.*Feasibility', r'##\s+.*Assessment', r'##\s+Conclusion']
-    feasibility_found = any(re.search(pattern, content, re.IGNORECASE) for pattern in feasibility_patterns)
+    feasibility_found = any("feasibility" in title.lower() or "assessment" in title.lower()
+                            or title.lower().startswith("conclusion")
+                            for title in heading_titles(content))
     
     if feasibility_found:
         print("  ✅ PASS: Feasibility Assessment found")
@@ -1346,36 +1270,7 @@ def validate_financial_plan_structure(content: str, project_data: Dict[str, Any]
     
     return results
 
-# ============================================================================
-# SECTION 3: TECHNICAL FEASIBILITY VALIDATION (⏸️ PLACEHOLDER - Phase 4)
-# ============================================================================
-
-def validate_technical_feasibility(content: str, project_data: Dict[str, Any]) -> ValidationResult:
-    """
-    ⏸️ TECHNICAL FEASIBILITY VALIDATION - PLACEHOLDER
-    
-    To be implemented in Phase 4
-    
-    Will include:
-    - Tier 1: Structure (9 checks)
-    - Tier 2: Content (7 checks)
-    - Tier 3: Compliance (8 checks)
-    - Tier 4: Quality (6 checks)
-    
-    Total: 30 validation points
-    """
-    print("\n⏸️  TECHNICAL FEASIBILITY VALIDATION - Not implemented yet (Phase 4)")
-    
-    result = ValidationResult("technical_feasibility")
-    result.structure = {"score": 0, "passed": 0, "failed": 0, "total": 9, "details": []}
-    result.content = {"score": 0, "passed": 0, "failed": 0, "total": 7, "details": []}
-    result.compliance = {"score": 0, "passed": 0, "failed": 0, "total": 8, "details": []}
-    result.quality = {"score": 0, "llm_ratings": [], "details": []}
-    result.issues = ["Technical Feasibility validation not yet implemented"]
-    result.suggestions = ["Will be implemented in Phase 4"]
-    
-    return result
-
+@cached_tier
 def validate_financial_plan_content(content: str, project_data: Dict[str, Any], financial_data: Dict[str, Any], llm) -> Dict[str, Any]:
     """
     ✅ TIER 2: CONTENT VALIDATION - Financial Plan
@@ -1402,26 +1297,19 @@ def validate_financial_plan_content(content: str, project_data: Dict[str, Any],
         "details": []
     }
     
-    # Extract subsections using regex
-    import re
-    cost_match = re.search(r'##\s*Project Cost.*?(.*?)(?=##|$)', content, re.DOTALL | re.IGNORECASE)
-    funding_match = re.search(r'##\s*Funding.*?(.*?)(?=##|$)', content, re.DOTALL | re.IGNORECASE)
-    metrics_match = re.search(r'##\s*Financial Viability.*?(.*?)(?=##|$)', content, re.DOTALL | re.IGNORECASE)
-    revenue_match = re.search(r'##\s*Revenue.*?(.*?)(?=##|$)', content, re.DOTALL | re.IGNORECASE)
-    debt_match = re.search(r'##\s*Debt.*?(.*?)(?=##|$)', content, re.DOTALL | re.IGNORECASE)
-    
-    cost_section = cost_match.group(1) if cost_match else ""
-    funding_section = funding_match.group(1) if funding_match else ""
-    metrics_section = metrics_match.group(1) if metrics_match else ""
-    revenue_section = revenue_match.group(1) if revenue_match else ""
-    debt_section = debt_match.group(1) if debt_match else ""
+    # Extract subsections (linear-time section index)
+    cost_section = subsection(content, "Project Cost")
+    funding_section = subsection(content, "Funding")
+    metrics_section = subsection(content, "Financial Viability")
+    revenue_section = subsection(content, "Revenue")
+    debt_section = subsection(content, "Debt")
     
     # C2.1: Cost breakdown completeness
     print("\n[C2.1] Checking cost breakdown completeness...")
     cost_components = ["equipment", "civil", "training", "working capital", "contingency"]
     components_found = sum([1 for comp in cost_components if comp in cost_section.lower()])
     project_cost = str(project_data.get("project_cost", ""))
-    has_total_cost = project_cost in cost_section or "₹" in cost_section
+    has_total_cost = project_cost in cost_section or has_amount(cost_section)
     
     if components_found >= 3 and has_total_cost:
         print(f"  ✅ PASS: Cost breakdown mentions {components_found}/5 components with total")
@@ -1471,7 +1359,7 @@ def validate_financial_plan_content(content: str, project_data: Dict[str, Any],
     print("\n[C2.3] Checking financial metrics accuracy...")
     metrics_keywords = ["npv", "irr", "dscr", "break-even", "breakeven", "payback"]
     metrics_found = sum([1 for kw in metrics_keywords if kw in metrics_section.lower()])
-    has_values = bool(re.search(r'₹[\d,]+', metrics_section)) or bool(re.search(r'\d+\.\d+%', metrics_section))
+    has_values = has_amount(metrics_section) or bool(re.search(r'\d+\.\d+%', metrics_section))
     
     if metrics_found >= 4 and has_values:
         print(f"  ✅ PASS: Financial metrics present with values ({metrics_found}/6 metrics)")
@@ -1495,7 +1383,7 @@ def validate_financial_plan_content(content: str, project_data: Dict[str, Any],
     # C2.4: Revenue projection specificity
     print("\n[C2.4] Checking revenue projection specificity...")
     has_years = bool(re.search(r'\d+\s*year', revenue_section.lower()))
-    has_numbers = bool(re.search(r'₹[\d,]+', revenue_section))
+    has_numbers = has_amount(revenue_section)
     has_growth = any(word in revenue_section.lower() for word in ["growth", "increase", "projection", "forecast"])
     
     specificity_score = sum([has_years, has_numbers, has_growth])
@@ -1548,16 +1436,14 @@ def validate_financial_plan_content(content: str, project_data: Dict[str, Any],
     print("\n[C2.6] Checking data consistency...")
     project_cost = project_data.get("project_cost", 0)
     cost_str = str(project_cost)
-    formatted_cost = f"₹{project_cost:,}"
     
-    cost_in_content = cost_str in content or formatted_cost in content or "crore" in content.lower()
+    cost_in_content = cost_str in content or mentions_amount(content, project_cost)
     
-    # Check if financial metrics appear
+    # Check if financial metrics appear (any ₹ / crore / lakh form)
     metrics = financial_data.get("metrics", {})
-    npv_str = str(int(metrics.get("npv", 0)))
     irr_str = str(metrics.get("irr", 0))
     
-    metrics_consistent = npv_str[:4] in content or irr_str in content
+    metrics_consistent = mentions_amount(content, metrics.get("npv", 0)) or irr_str in content
     
     consistency_score = sum([cost_in_content, metrics_consistent])
     
@@ -1593,6 +1479,7 @@ def validate_financial_plan_content(content: str, project_data: Dict[str, Any],
 # PHASE 4: TECHNICAL FEASIBILITY VALIDATION
 # ============================================================================
 
+@cached_tier
 def validate_technical_feasibility_structure(content: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Tier 1: Structure validation for Technical Feasibility (9 checks)
@@ -1701,6 +1588,7 @@ def validate_technical_feasibility_structure(content: str, project_data: Dict[st
     }
 
 
+@cached_tier
 def validate_technical_feasibility_content(content: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Tier 2: Content validation for Technical Feasibility (7 checks)
@@ -1708,14 +1596,8 @@ def validate_technical_feasibility_content(content: str, project_data: Dict[str,
     checks = []
 
     # C3.1: Technology description (>200 words)
-    # Match from "**1. TECHNOLOGY" until next "**2." or "**3." section
-    tech_section = re.search(r'\*\*1\.\s*TECHNOLOGY[^\*]*\*\*.*?(?=\*\*[2-9]\.|\Z)', content, re.IGNORECASE | re.DOTALL)
-    if tech_section:
-        # Extract just the content (remove heading)
-        tech_content = re.sub(r'\*\*1\.\s*TECHNOLOGY[^\*]*\*\*\s*', '', tech_section.group(0))
-        tech_words = len(tech_content.split())
-    else:
-        tech_words = 0
+    # From "**1. TECHNOLOGY ...**" until the next numbered bold marker
+    tech_words = len(numbered_subsection(content, 1, "TECHNOLOGY").split())
         
     tech_adequate = tech_words > 200
     checks.append({
@@ -1793,6 +1675,7 @@ def validate_technical_feasibility_content(content: str, project_data: Dict[str,
     }
 
 
+@cached_tier
 def validate_technical_feasibility_compliance(content: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Tier 3: MSE-CDP Compliance validation for Technical Feasibility (8 checks)
@@ -1800,7 +1683,7 @@ def validate_technical_feasibility_compliance(content: str, project_data: Dict[s
     checks = []
     
     # CP3.1: Technology overview present
-    has_tech_overview = bool(re.search(r'TECHNOLOGY\s+OVERVIEW|technology.*overview', content, re.IGNORECASE))
+    has_tech_overview = keywords_in_order(content, ["technology", "overview"], same_line=True)
     checks.append({
         "id": "CP3.1",
         "description": "Technology overview section present (MSE-CDP requirement)",
@@ -1887,6 +1770,7 @@ def validate_technical_feasibility_compliance(content: str, project_data: Dict[s
     }
 
 
+@cached_tier
 def validate_technical_feasibility_quality(content: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Tier 4: Quality validation for Technical Feasibility (6 checks)
@@ -1950,12 +1834,12 @@ def validate_technical_feasibility_quality(content: str, project_data: Dict[str,
     })
     
     # Q3.6: Logical flow (sections in reasonable order)
-    section_order_patterns = [
-        r'TECHNOLOGY.*EQUIPMENT.*PROCESS',
-        r'OVERVIEW.*EQUIPMENT.*CAPACITY',
-        r'TECHNOLOGY.*PROCESS.*TRAINING'
+    section_orders = [
+        ["TECHNOLOGY", "EQUIPMENT", "PROCESS"],
+        ["OVERVIEW", "EQUIPMENT", "CAPACITY"],
+        ["TECHNOLOGY", "PROCESS", "TRAINING"]
     ]
-    logical_flow = any(re.search(pattern, content, re.IGNORECASE | re.DOTALL) for pattern in section_order_patterns)
+    logical_flow = any(keywords_in_order(content, order) for order in section_orders)
     checks.append({
         "id": "Q3.6",
         "description": "Logical section flow (Technology → Equipment → Process)",
@@ -1974,7 +1858,7 @@ def validate_technical_feasibility_quality(content: str, project_data: Dict[str,
 
 
 def validate_technical_feasibility(content: str, project_data: Dict[str, Any], 
-                                   financial_data: Optional[Dict[str, Any]] = None):
+                                   financial_data: Optional[Dict[str, Any]] = None) -> SectionResult:
     """
     Master validation function for Technical Feasibility section
     Runs all 4 tiers: Structure, Content, Compliance, Quality
@@ -1985,38 +1869,13 @@ def validate_technical_feasibility(content: str, project_data: Dict[str, Any],
     print("="*80)
     
     # Run all tier validations
-    tier1 = validate_technical_feasibility_structure(content, project_data)
-    tier2 = validate_technical_feasibility_content(content, project_data)
-    tier3 = validate_technical_feasibility_compliance(content, project_data)
-    tier4 = validate_technical_feasibility_quality(content, project_data)
-    
-    # Aggregate results
-    all_tiers = [tier1, tier2, tier3, tier4]
-    total_checks = sum(t["total"] for t in all_tiers)
-    total_passed = sum(t["passed"] for t in all_tiers)
-    overall_percentage = (total_passed / total_checks) * 100
-    
-    # Determine grade
-    grade = get_grade(overall_percentage)
-    
-    result = {
-        "section": "Technical Feasibility",
-        "tiers": all_tiers,
-        "summary": {
-            "total_checks": total_checks,
-            "passed": total_passed,
-            "failed": total_checks - total_passed,
-            "percentage": overall_percentage,
-            "grade": grade
-        }
-    }
+    result = SectionResult("technical_feasibility")
+    result.add_tier(validate_technical_feasibility_structure(content, project_data))
+    result.add_tier(validate_technical_feasibility_content(content, project_data))
+    result.add_tier(validate_technical_feasibility_compliance(content, project_data))
+    result.add_tier(validate_technical_feasibility_quality(content, project_data))
     
-    # Print summary
-    print(f"\nTier 1 - Structure:   {tier1['passed']}/{tier1['total']} ({tier1['percentage']:.1f}%)")
-    print(f"Tier 2 - Content:     {tier2['passed']}/{tier2['total']} ({tier2['percentage']:.1f}%)")
-    print(f"Tier 3 - Compliance:  {tier3['passed']}/{tier3['total']} ({tier3['percentage']:.1f}%)")
-    print(f"Tier 4 - Quality:     {tier4['passed']}/{tier4['total']} ({tier4['percentage']:.1f}%)")
-    print(f"\nOVERALL: {total_passed}/{total_checks} ({overall_percentage:.1f}%) - Grade {grade}")
+    print_tier_summary(result)
     print("="*80)
     
     return result
@@ -2025,6 +1884,7 @@ def validate_technical_feasibility(content: str, project_data: Dict[str, Any],
 # PHASE 5: MARKET ANALYSIS VALIDATION
 # ============================================================================
 
+@cached_tier
 def validate_market_analysis_structure(content: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Tier 1: Structure validation for Market Analysis (9 checks)
@@ -2127,6 +1987,7 @@ def validate_market_analysis_structure(content: str, project_data: Dict[str, Any
     }
 
 
+@cached_tier
 def validate_market_analysis_content(content: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Tier 2: Content validation for Market Analysis (7 checks)
@@ -2134,12 +1995,7 @@ def validate_market_analysis_content(content: str, project_data: Dict[str, Any])
     checks = []
     
     # C4.1: Industry overview depth (>150 words)
-    market_section = re.search(r'\*\*1\.\s*MARKET[^\*]*\*\*.*?(?=\*\*[2-9]\.|\Z)', content, re.IGNORECASE | re.DOTALL)
-    if market_section:
-        market_content = re.sub(r'\*\*1\.\s*MARKET[^\*]*\*\*\s*', '', market_section.group(0))
-        market_words = len(market_content.split())
-    else:
-        market_words = 0
+    market_words = len(numbered_subsection(content, 1, "MARKET").split())
     market_adequate = market_words > 150
     checks.append({
         "id": "C4.1",
@@ -2149,7 +2005,7 @@ def validate_market_analysis_content(content: str, project_data: Dict[str, Any])
     })
     
     # C4.2: Market size with quantitative data
-    has_market_numbers = bool(re.search(r'₹|INR|Rs\.?\s*\d+|crore|lakh|million|billion', content, re.IGNORECASE))
+    has_market_numbers = has_amount(content)
     checks.append({
         "id": "C4.2",
         "description": "Market size with quantitative data (currency amounts)",
@@ -2218,6 +2074,7 @@ def validate_market_analysis_content(content: str, project_data: Dict[str, Any])
     }
 
 
+@cached_tier
 def validate_market_analysis_compliance(content: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Tier 3: MSE-CDP Compliance validation for Market Analysis (8 checks)
@@ -2315,6 +2172,7 @@ def validate_market_analysis_compliance(content: str, project_data: Dict[str, An
     }
 
 
+@cached_tier
 def validate_market_analysis_quality(content: str, project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Tier 4: Quality validation for Market Analysis (6 checks)
@@ -2342,7 +2200,9 @@ def validate_market_analysis_quality(content: str, project_data: Dict[str, Any])
     })
     
     # Q4.3: Data sources mentioned
-    sources = re.findall(r'(?:source|according to|based on|report|study).*?(?:\.|:)', content, re.IGNORECASE)
+    source_words = ["source", "according to", "based on", "report", "study"]
+    sources = [clause for clause in clauses(content)
+               if any(word in clause.lower() for word in source_words)]
     has_sources = len(sources) >= 1
     checks.append({
         "id": "Q4.3",
@@ -2378,12 +2238,12 @@ def validate_market_analysis_quality(content: str, project_data: Dict[str, Any])
     })
     
     # Q4.6: Logical section flow
-    section_order_patterns = [
-        r'MARKET.*SIZE.*TARGET.*COMPETITION.*DEMAND',
-        r'INDUSTRY.*SEGMENT.*COMPETITOR.*PROJECTION',
-        r'OVERVIEW.*MARKET.*ANALYSIS.*STRATEGY'
+    section_orders = [
+        ["MARKET", "SIZE", "TARGET", "COMPETITION", "DEMAND"],
+        ["INDUSTRY", "SEGMENT", "COMPETITOR", "PROJECTION"],
+        ["OVERVIEW", "MARKET", "ANALYSIS", "STRATEGY"]
     ]
-    logical_flow = any(re.search(pattern, content, re.IGNORECASE | re.DOTALL) for pattern in section_order_patterns)
+    logical_flow = any(keywords_in_order(content, order) for order in section_orders)
     checks.append({
         "id": "Q4.6",
         "description": "Logical section flow (Market → Segments → Competition → Projections)",
@@ -2402,7 +2262,7 @@ def validate_market_analysis_quality(content: str, project_data: Dict[str, Any])
 
 
 def validate_market_analysis(content: str, project_data: Dict[str, Any], 
-                             financial_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                             financial_data: Optional[Dict[str, Any]] = None) -> SectionResult:
     """
     Master validation function for Market Analysis section
     Runs all 4 tiers: Structure, Content, Compliance, Quality
@@ -2413,43 +2273,19 @@ def validate_market_analysis(content: str, project_data: Dict[str, Any],
     print("="*80)
     
     # Run all tier validations
-    tier1 = validate_market_analysis_structure(content, project_data)
-    tier2 = validate_market_analysis_content(content, project_data)
-    tier3 = validate_market_analysis_compliance(content, project_data)
-    tier4 = validate_market_analysis_quality(content, project_data)
-    
-    # Aggregate results
-    all_tiers = [tier1, tier2, tier3, tier4]
-    total_checks = sum(t["total"] for t in all_tiers)
-    total_passed = sum(t["passed"] for t in all_tiers)
-    overall_percentage = (total_passed / total_checks) * 100
-    
-    # Determine grade
-    grade = get_grade(overall_percentage)
-    
-    result = {
-        "section": "Market Analysis",
-        "tiers": all_tiers,
-        "summary": {
-            "total_checks": total_checks,
-            "passed": total_passed,
-            "failed": total_checks - total_passed,
-            "percentage": overall_percentage,
-            "grade": grade
-        }
-    }
+    result = SectionResult("market_analysis")
+    result.add_tier(validate_market_analysis_structure(content, project_data))
+    result.add_tier(validate_market_analysis_content(content, project_data))
+    result.add_tier(validate_market_analysis_compliance(content, project_data))
+    result.add_tier(validate_market_analysis_quality(content, project_data))
     
-    # Print summary
-    print(f"\nTier 1 - Structure:   {tier1['passed']}/{tier1['total']} ({tier1['percentage']:.1f}%)")
-    print(f"Tier 2 - Content:     {tier2['passed']}/{tier2['total']} ({tier2['percentage']:.1f}%)")
-    print(f"Tier 3 - Compliance:  {tier3['passed']}/{tier3['total']} ({tier3['percentage']:.1f}%)")
-    print(f"Tier 4 - Quality:     {tier4['passed']}/{tier4['total']} ({tier4['percentage']:.1f}%)")
-    print(f"\nOVERALL: {total_passed}/{total_checks} ({overall_percentage:.1f}%) - Grade {grade}")
+    print_tier_summary(result)
     print("="*80)
     
     return result
 
 
+@cached_tier
 def validate_financial_plan_compliance(content: str, project_data: Dict[str, Any], financial_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     ✅ TIER 3: COMPLIANCE VALIDATION - Financial Plan
@@ -2536,16 +2372,16 @@ def validate_financial_plan_compliance(content: str, project_data: Dict[str, Any
     cost_compliant = project_cost <= 300000000  # ₹30 crore
     
     if cost_compliant:
-        print(f"  ✅ PASS: Project cost ₹{project_cost:,} ≤ ₹30 crore")
+        print(f"  ✅ PASS: Project cost {format_inr(project_cost)} ≤ ₹30 crore")
         results["passed"] += 1
         results["details"].append({
             "check": "CP2.3",
             "name": "Project cost compliance",
             "status": "PASS",
-            "message": f"Project cost ₹{project_cost:,} within MSE-CDP limit"
+            "message": f"Project cost {format_inr(project_cost)} within MSE-CDP limit"
         })
     else:
-        print(f"  ❌ FAIL: Project cost ₹{project_cost:,} > ₹30 crore")
+        print(f"  ❌ FAIL: Project cost {format_inr(project_cost)} > ₹30 crore")
         results["failed"] += 1
         results["details"].append({
             "check": "CP2.3",
@@ -2630,22 +2466,22 @@ def validate_financial_plan_compliance(content: str, project_data: Dict[str, Any
     npv_positive = npv_value > 0
     
     if has_npv and npv_positive:
-        print(f"  ✅ PASS: NPV ₹{npv_value:,.2f} is positive")
+        print(f"  ✅ PASS: NPV {format_inr(npv_value, 2)} is positive")
         results["passed"] += 1
         results["details"].append({
             "check": "CP2.6",
             "name": "NPV positive",
             "status": "PASS",
-            "message": f"NPV ₹{npv_value:,.2f} is positive (compliant)"
+            "message": f"NPV {format_inr(npv_value, 2)} is positive (compliant)"
         })
     elif has_npv:
-        print(f"  ❌ FAIL: NPV ₹{npv_value:,.2f} is negative")
+        print(f"  ❌ FAIL: NPV {format_inr(npv_value, 2)} is negative")
         results["failed"] += 1
         results["details"].append({
             "check": "CP2.6",
             "name": "NPV positive",
             "status": "FAIL",
-            "message": f"NPV ₹{npv_value:,.2f} is negative (non-compliant)"
+            "message": f"NPV {format_inr(npv_value, 2)} is negative (non-compliant)"
         })
     else:
         print(f"  ❌ FAIL: NPV not mentioned")
@@ -2773,6 +2609,7 @@ def validate_financial_plan_compliance(content: str, project_data: Dict[str, Any
     
     return results
 
+@cached_tier
 def validate_financial_plan_quality(content: str, project_data: Dict[str, Any], financial_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     ✅ TIER 4: QUALITY VALIDATION - Financial Plan
@@ -2985,16 +2822,109 @@ def validate_financial_plan_quality(content: str, project_data: Dict[str, Any],
 # MAIN VALIDATION AGENT (Phase 5 - Integration)
 # ============================================================================
 
+# ============================================================================
+# SECTION VALIDATOR DISPATCH (names used in section_registry validators)
+# ============================================================================
+
+SECTION_VALIDATORS = {
+    "validate_executive_summary":
+        lambda content, project_data, financial_data: validate_executive_summary(content, project_data),
+    "validate_financial_plan": validate_financial_plan,
+    "validate_technical_feasibility": validate_technical_feasibility,
+    "validate_market_analysis": validate_market_analysis,
+}
+
+
+def failed_checks(result: Dict[str, Any]) -> List[str]:
+    """
+    Messages of every failed check in a stored section result
+    (SectionResult.to_dict; "details" entries of results stored before it)
+    """
+    failures = []
+    for tier in result.get("breakdown", {}).values():
+        for detail in tier.get("details", []):
+            if detail.get("status") == "FAIL":
+                failures.append(detail.get("message") or detail.get("name", ""))
+        for check in tier.get("checks", []):
+            if not check.get("passed"):
+                failures.append(check.get("description", check.get("id", "")))
+    return failures
+
+
+def print_check_summary(result: SectionResult) -> None:
+    """One line per section validated from registry checks, plus its failures"""
+    summary = " | ".join(f"{tier} {passed}/{total}" for tier, (passed, total)
+                         in ((tier, result.tier_counts(tier)) for tier in TIERS) if total)
+    print(f"  {result.title}: {summary} → {result.overall_score:.1f}% ({result.grade})")
+    for check in result.failed():
+        print(f"    ❌ {check.id}: {check.message}")
+
+
+def judge_llm(specs) -> Optional[Any]:
+    """Judge model if the LLM judge is on and one of the specs has judge checks"""
+    if VALIDATION_LLM_JUDGE and any(check.kind == "judge" for spec in specs for check in spec.checks):
+        return get_llm(temperature=0)
+    return None
+
+
+def validate_with_checks(specs_and_contents: Dict[str, Tuple[Any, str]], project_data: Dict[str, Any],
+                         financial_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the registry checks of several sections in one engine pass
+    ({{npv}} placeholders are bound to financial_data first)
+
+    Returns:
+        key → stored result dict (sections without applicable checks left out)
+    """
+    values = financial_values(financial_data)
+    sections = {
+        key: (spec, bind_placeholders(content, values))
+        for key, (spec, content) in specs_and_contents.items()
+    }
+    llm = judge_llm([spec for spec, _ in sections.values()])
+    results = {}
+    for key, result in run_checks(sections, project_data, llm).items():
+        if len(result):
+            print_check_summary(result)
+            results[key] = result.to_dict()
+    return results
+
+
+def validate_section(key: str, content: str, project_data: Dict[str, Any],
+                     financial_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Run the validators the registry declares for one section - its bespoke
+    validators, or else its declarative checks (validation_engine.py)
+    ({{npv}} placeholders are bound to financial_data first)
+    
+    Returns:
+        Stored result dict (None if the section is not validated)
+    """
+    spec = get_section(key)
+    if not spec.validators:
+        if not spec.checks:
+            return None
+        return validate_with_checks({key: (spec, content)}, project_data, financial_data).get(key)
+
+    content = bind_placeholders(content, financial_values(financial_data))
+    result = None
+    for validator_name in spec.validators:
+        validator = SECTION_VALIDATORS[validator_name]
+        result = validator(content, project_data, financial_data).to_dict()
+    return result
+
+
 def validation_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Main Validation Agent - Validates generated DPR sections
     
     Current Implementation Status:
-    - ✅ Executive Summary: Tier 1 (Structure) only
-    - ⏸️ Financial Plan: Placeholder
-    - ⏸️ Technical Feasibility: Placeholder
+    - ✅ Executive Summary, Financial Plan, Technical Feasibility,
+      Market Analysis: bespoke 4-tier validators
+    - ✅ Other 17 sections: registry checks (validation_engine.py)
     
-    Integration: To be added to orchestrator in Phase 5
+    Integration: VALIDATION_AGENT node, followed by REPAIR_AGENT
+    (repair_agent.py) which acts on the failed checks
     """
     print()
     cprint(f"{'NODE: validation_agent':-^80}", 'magenta', attrs=['bold'])
@@ -3005,40 +2935,30 @@ def validation_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     
     if not dpr_sections:
         print("⚠️  No DPR sections available for validation")
-        return state
+        return {}
     
     validation_results = {}
-    
-    # Validate Executive Summary (Only Tier 1 implemented)
-    if "executive_summary" in dpr_sections:
-        print("\n" + "🔍"*40)
-        result = validate_executive_summary(
-            dpr_sections["executive_summary"],
-            project_data
-        )
-        validation_results["executive_summary"] = result.to_dict()
-    
-    # Validate Financial Plan (Placeholder)
-    if "financial_plan" in dpr_sections:
+    financial_data = dpr_sections.get("financial", {})
+    
+    # Bespoke validators first, then the declarative checks of every other
+    # section in one engine pass (one parse per section, judges concurrent)
+    checked = {}
+    for spec in SECTION_REGISTRY:
+        if spec.key not in dpr_sections or not spec.validated:
+            continue
+        content = section_text(dpr_sections[spec.key])
+        if not spec.validators:
+            checked[spec.key] = (spec, content)
+            continue
         print("\n" + "🔍"*40)
-        result = validate_financial_plan(
-            dpr_sections["financial_plan"],
-            project_data,
-            dpr_sections.get("financial", {})
-        )
-        validation_results["financial_plan"] = result.to_dict()
-    
-    # Validate Technical Feasibility (Placeholder)
-    if "technical_feasibility" in dpr_sections:
+        validation_results[spec.key] = validate_section(spec.key, content, project_data, financial_data)
+
+    if checked:
         print("\n" + "🔍"*40)
-        result = validate_technical_feasibility(
-            dpr_sections["technical_feasibility"],
-            project_data
-        )
-        validation_results["technical_feasibility"] = result.to_dict()
-    
-    # Store validation results in state
-    state["validation_results"] = validation_results
+        print(f"VALIDATING: {len(checked)} SECTIONS FROM REGISTRY CHECKS")
+        validation_results.update(validate_with_checks(checked, project_data, financial_data))
+    validation_results = {key: validation_results[key] for key in
+                          [spec.key for spec in SECTION_REGISTRY] if key in validation_results}
     
     # Generate summary
     print("\n" + "="*80)
@@ -3056,11 +2976,20 @@ def validation_agent(state: Dict[str, Any]) -> Dict[str, Any]:
         content=f"Validation complete. Analyzed {len(validation_results)} sections. "
                 f"Phase 2, Step 2.1 (Structure validation) implemented."
     )
-    state["messages"].append(validation_msg)
     
     print("\n✅ Validation agent complete (Phase 2, Step 2.1)")
     
-    return state
+    return {"validation_results": validation_results, "messages": [validation_msg]}
+
+
+async def validation_agent_async(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async variant of validation_agent
+
+    Runs in a worker thread - the optional LLM judge
+    (config.VALIDATION_LLM_JUDGE) makes blocking calls.
+    """
+    return await asyncio.to_thread(validation_agent, state)
 
 
 # ============================================================================
@@ -0,0 +1,206 @@
+# validation_cache.py
+"""
+Validation Cache - persistent tier results keyed by content hash
+
+Every validation tier function (validate_<section>_structure / _content /
+_compliance / _quality in validation_agent.py) is wrapped with
+@cached_tier. A tier result is stored in SQLite under:
+
+    (tier, section content hash, inputs hash)   + the tier's rule version
+
+- inputs hash: project_data (+ financial_data for tiers that take it, and
+  whether an LLM judge was used)
+- rule version: hash of the tier function's source, the source of the
+  functions of its own module it calls (transitively), the source of the
+  shared validation modules (config.VALIDATION_HELPER_MODULES:
+  section_index, indian_numbers, check_results ...) and
+  config.VALIDATION_RULESET_VERSION - editing one tier's checks
+  invalidates only that tier's entries, editing a helper every tier that
+  uses it
+
+A tier whose LLM judge could not answer scores the check as a fallback
+and marks its result with mark_uncacheable(); such a result is returned
+but not stored, so the judge is asked again next time (as in
+validation_engine.run_judge).
+
+So validating an unchanged file again (dev iterations, nightly jobs,
+validate_standalone.py) reads four rows instead of re-running the checks.
+Cached tiers don't re-print their per-check output.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import inspect
+import importlib
+import threading
+import functools
+from typing import Dict, Any, Optional
+
+from config import (
+    VALIDATION_CACHE, VALIDATION_CACHE_FILE, VALIDATION_RULESET_VERSION, VALIDATION_HELPER_MODULES,
+    LLM_MODEL
+)
+
+
+_local = threading.local()
+
+# Key of a tier result that must not be stored (removed before returning)
+UNCACHEABLE = "_uncacheable"
+
+
+def mark_uncacheable(result: Dict[str, Any]) -> None:
+    """Keep a tier result out of the cache (e.g. it holds a judge fallback)"""
+    result[UNCACHEABLE] = True
+
+
+def cache_path() -> str:
+    """SQLite file: VALIDATION_CACHE_FILE, relative to ../output unless absolute"""
+    if os.path.isabs(VALIDATION_CACHE_FILE):
+        return VALIDATION_CACHE_FILE
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, "..", "output", VALIDATION_CACHE_FILE)
+
+
+def _connection() -> sqlite3.Connection:
+    """One connection per thread (validation runs in worker threads)"""
+    path = cache_path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == path:
+        return conn
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tier_results (
+            tier TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            inputs_hash TEXT NOT NULL,
+            rule_version TEXT NOT NULL,
+            result TEXT NOT NULL,
+            created REAL NOT NULL,
+            PRIMARY KEY (tier, content_hash, inputs_hash)
+        )
+    """)
+    _local.conn, _local.path = conn, path
+    return conn
+
+
+def _hash(value: Any) -> str:
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def helpers_version() -> str:
+    """Hash of the source of the shared validation modules"""
+    return _hash([inspect.getsource(importlib.import_module(name)) for name in VALIDATION_HELPER_MODULES])
+
+
+def _code_names(code) -> set:
+    """Global names used by a code object and the functions nested in it"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+
+def called_sources(func) -> list:
+    """
+    Source of func and of every function of its module it calls,
+    transitively (sorted by name after func itself)
+    """
+    func = inspect.unwrap(func)
+    found = {func.__name__: func}
+    pending = [func]
+    while pending:
+        current = pending.pop()
+        for name in _code_names(current.__code__):
+            target = inspect.unwrap(current.__globals__.get(name)) if name in current.__globals__ else None
+            if (inspect.isfunction(target) and target.__module__ == func.__module__
+                    and target.__name__ not in found):
+                found[target.__name__] = target
+                pending.append(target)
+    helpers = sorted(name for name in found if name != func.__name__)
+    return [inspect.getsource(found[name]) for name in [func.__name__] + helpers]
+
+
+@functools.lru_cache(maxsize=None)
+def rule_version(func) -> str:
+    """
+    Version of one tier's rules: its source and the helpers it calls, the
+    shared validation modules and the rule-set version
+    """
+    return _hash([VALIDATION_RULESET_VERSION, helpers_version()] + called_sources(func))
+
+
+def lookup(tier: str, content_hash: str, inputs_hash: str, version: str) -> Optional[Dict[str, Any]]:
+    row = _connection().execute(
+        "SELECT rule_version, result FROM tier_results WHERE tier = ? AND content_hash = ? AND inputs_hash = ?",
+        (tier, content_hash, inputs_hash)
+    ).fetchone()
+    if row is None or row[0] != version:
+        return None
+    return json.loads(row[1])
+
+
+def store(tier: str, content_hash: str, inputs_hash: str, version: str, result: Dict[str, Any]) -> None:
+    conn = _connection()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO tier_results VALUES (?, ?, ?, ?, ?, ?)",
+            (tier, content_hash, inputs_hash, version, json.dumps(result, default=str), time.time())
+        )
+
+
+def cached_tier(func):
+    """
+    Decorator for tier functions (content, project_data, [financial_data], [llm])
+    """
+    def run(content: str, project_data: Dict[str, Any], *args):
+        """(tier result, whether it may be stored)"""
+        result = func(content, project_data, *args)
+        return result, not result.pop(UNCACHEABLE, False)
+
+    @functools.wraps(func)
+    def wrapper(content: str, project_data: Dict[str, Any], *args):
+        if not VALIDATION_CACHE:
+            return run(content, project_data, *args)[0]
+
+        # An LLM judge is part of the inputs (by model), not the client object
+        inputs = [project_data] + [
+            arg if isinstance(arg, (dict, type(None))) else {"llm_judge": LLM_MODEL}
+            for arg in args
+        ]
+        key = (func.__name__, _hash(content), _hash(inputs), rule_version(func))
+        try:
+            result = lookup(*key)
+        except sqlite3.Error as e:
+            print(f"  ⚠️  Validation cache unavailable ({e})")
+            return run(content, project_data, *args)[0]
+        if result is not None:
+            print(f"  ♻️  {func.__name__}: cached result")
+            return result
+
+        result, cacheable = run(content, project_data, *args)
+        if not cacheable:
+            print(f"  ⚠️  {func.__name__}: judge fallback in result - not cached")
+            return result
+        try:
+            store(*key, result)
+        except sqlite3.Error as e:
+            print(f"  ⚠️  Validation cache not updated ({e})")
+        return result
+
+    return wrapper
+
+
+def clear_cache() -> int:
+    """Delete every cached tier result; returns the number of rows removed"""
+    conn = _connection()
+    with conn:
+        return conn.execute("DELETE FROM tier_results").rowcount
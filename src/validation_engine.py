@@ -0,0 +1,290 @@
+# validation_engine.py
+"""
+Validation Engine - runs the declarative checks of section_registry.py
+
+Sections without bespoke validators (all but executive summary, financial
+plan, technical feasibility and market analysis) are validated from their
+SectionSpec.checks (check_specs.py) plus checks derived from the spec
+itself (required_headings, word_budget).
+
+Each section text is parsed ONCE into a ParsedSection:
+- tokens (lower case, singular/plural folded) and their n-gram sets - every
+  keyword family of every check is a set lookup, not a rescan
+- the shared section_index markers (headings)
+- figure counts (amounts, percentages, numbers, periods), each one pass,
+  computed only if a check asks for them
+
+run_checks() is the one scheduler for a whole DPR: all sections are parsed
+and checked, then the LLM-judge prompts of every section run concurrently
+(VALIDATION_JUDGE_CONCURRENCY, governed like every other LLM call) and are
+cached in the validation cache by content hash. Each section's checks land
+in a SectionResult (check_results.py); messages with counts are kept as
+templates and rendered only when read.
+"""
+import re
+import hashlib
+from functools import cached_property, lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from langchain_core.messages import SystemMessage, HumanMessage
+
+import validation_cache
+from config import LLM_MODEL, VALIDATION_JUDGE_CONCURRENCY, VALIDATION_RULESET_VERSION
+from check_specs import CheckSpec, TIERS, ID_PREFIXES, heading, word_budget
+from check_results import SectionResult
+from section_registry import SectionSpec
+from section_index import section_index
+from indian_numbers import find_amounts
+from llm_resilience import invoke_resilient
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Bounded repetitions only - every figure count is one linear pass
+FIGURE_PATTERNS = {
+    "percent": re.compile(r"\d{1,3}(?:\.\d{1,2})?[ \t]*(?:%|per[ \t]?cent)", re.IGNORECASE),
+    "number": re.compile(r"\d[\d,]{0,20}(?:\.\d{1,4})?"),
+    "period": re.compile(
+        r"\b(?:(?:months?|years?|weeks?|quarters?|phases?|days?)[ \t]{0,3}\d{1,3}"
+        r"|\d{1,3}(?:[ \t]{0,3}-[ \t]{0,3}\d{1,3})?[ \t]{0,3}(?:months?|years?|weeks?|days?)"
+        r"|q[1-4])\b",
+        re.IGNORECASE,
+    ),
+}
+
+JUDGE_EXCERPT_CHARS = 4000
+
+
+def _fold(token: str) -> str:
+    """Singular form of a token (crude, but applied to text and phrases alike)"""
+    if len(token) > 4 and token.endswith(("sses", "xes", "ches", "shes")):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+@lru_cache(maxsize=4096)
+def phrase_tokens(phrase: str) -> Tuple[str, ...]:
+    """Folded tokens of a check phrase ("Risk Registers" → ("risk", "register"))"""
+    return tuple(_fold(token) for token in TOKEN_PATTERN.findall(phrase.lower()))
+
+
+# ============================================================================
+# PARSED DOCUMENT MODEL
+# ============================================================================
+
+class ParsedSection:
+    """
+    One section text, parsed once for all of its checks
+    """
+    def __init__(self, key: str, content: str):
+        self.key = key
+        self.content = content
+        self.word_count = len(content.split())
+        self.tokens = [_fold(token) for token in TOKEN_PATTERN.findall(content.lower())]
+        self._ngrams: Dict[int, set] = {}
+        self._figures: Dict[str, int] = {}
+
+    def ngrams(self, n: int) -> set:
+        """Every run of n consecutive tokens (built on first use)"""
+        if n not in self._ngrams:
+            self._ngrams[n] = set(zip(*(self.tokens[i:] for i in range(n))))
+        return self._ngrams[n]
+
+    def has_phrase(self, phrase: str) -> bool:
+        tokens = phrase_tokens(phrase)
+        return bool(tokens) and tokens in self.ngrams(len(tokens))
+
+    def phrases_found(self, phrases: Tuple[str, ...]) -> List[str]:
+        return [phrase for phrase in phrases if self.has_phrase(phrase)]
+
+    @cached_property
+    def index(self):
+        return section_index(self.content)
+
+    def has_heading(self, title: str) -> bool:
+        return self.index.find(title) is not None
+
+    def figure_count(self, kind: str) -> int:
+        if kind not in self._figures:
+            if kind == "amount":
+                self._figures[kind] = len(find_amounts(self.content))
+            else:
+                self._figures[kind] = sum(1 for _ in FIGURE_PATTERNS[kind].finditer(self.content))
+        return self._figures[kind]
+
+
+# ============================================================================
+# CHECKS
+# ============================================================================
+
+def section_checks(spec: SectionSpec) -> List[CheckSpec]:
+    """
+    Checks of a section: its required headings and word budget, then the
+    declared spec.checks
+    """
+    checks = [heading(title) for title in spec.required_headings]
+    if spec.word_budget:
+        checks.append(word_budget(*spec.word_budget))
+    checks.extend(spec.checks)
+    return checks
+
+
+def check_ids(spec: SectionSpec) -> List[Tuple[str, CheckSpec]]:
+    """
+    (id, check) of every check of a section - numbered per tier by position
+    in section_checks(spec), so an id doesn't change when other checks are
+    skipped (no judge model, project field not set)
+    """
+    counts = {tier: 0 for tier in TIERS}
+    numbered = []
+    for check in section_checks(spec):
+        counts[check.tier] += 1
+        numbered.append((f"{ID_PREFIXES[check.tier]}{spec.num}.{counts[check.tier]}", check))
+    return numbered
+
+
+def evaluate(check: CheckSpec, parsed: ParsedSection,
+             project_data: Dict[str, Any]) -> Optional[Tuple[bool, str, Tuple]]:
+    """
+    (passed, message template, template args) of a non-judge check;
+    None = not applicable
+    """
+    if check.kind == "heading":
+        return parsed.has_heading(check.phrases[0]), check.description, ()
+
+    if check.kind == "terms":
+        found = parsed.phrases_found(check.phrases)
+        if check.min_found <= 1:
+            return bool(found), check.description, ()
+        return (len(found) >= check.min_found, "{} ({}/{} found)",
+                (check.description, len(found), check.min_found))
+
+    if check.kind == "figures":
+        count = parsed.figure_count(check.phrases[0])
+        return count >= check.min_found, "{} (found {})", (check.description, count)
+
+    if check.kind == "project":
+        value = str(project_data.get(check.field) or "").split(",")[0].strip()
+        if not value:
+            return None
+        return parsed.has_phrase(value), "{} ({})", (check.description, value)
+
+    if check.kind == "words":
+        words = parsed.word_count
+        passed = words >= check.min_found and (check.max_found is None or words <= check.max_found)
+        return passed, "{} (found: {})", (check.description, words)
+
+    raise ValueError(f"Unknown check kind '{check.kind}'")
+
+
+def judge_messages(spec: SectionSpec, content: str, check: CheckSpec) -> list:
+    excerpt = content[:JUDGE_EXCERPT_CHARS]
+    return [
+        SystemMessage(content="You review sections of Detailed Project Reports (DPR) for MSE-CDP cluster projects."),
+        HumanMessage(content=f"""Section: {spec.title}
+
+{excerpt}
+
+Requirement: {check.requirement}
+
+Answer with ONLY 'PASS' or 'FAIL' followed by brief reason."""),
+    ]
+
+
+def _judge_key(spec: SectionSpec, check_id: str, check: CheckSpec, content: str) -> Tuple[str, str, str, str]:
+    """Validation cache key of one judge answer (model and requirement versioned)"""
+    def digest(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return (f"judge:{spec.key}:{check_id}", digest(content), digest(LLM_MODEL),
+            digest(f"{VALIDATION_RULESET_VERSION}\n{check.requirement}"))
+
+
+def run_judge(spec: SectionSpec, check_id: str, check: CheckSpec, content: str, llm) -> Optional[bool]:
+    """
+    One LLM-judge verdict (None if the judge could not answer)
+    """
+    key = _judge_key(spec, check_id, check, content)
+    if validation_cache.VALIDATION_CACHE:
+        try:
+            cached = validation_cache.lookup(*key)
+            if cached is not None:
+                return cached["passed"]
+        except Exception as e:
+            print(f"  ⚠️  Validation cache unavailable ({e})")
+
+    try:
+        response = invoke_resilient(llm, judge_messages(spec, content, check),
+                                    check=lambda answer: None if re.search(r"PASS|FAIL", answer.upper())
+                                    else "no PASS/FAIL verdict",
+                                    key="validation")
+    except Exception as e:
+        print(f"  ⚠️  {spec.key} {check_id}: judge unavailable ({e})")
+        return None
+
+    passed = response.content.strip().upper().startswith("PASS")
+    if validation_cache.VALIDATION_CACHE:
+        try:
+            validation_cache.store(*key, {"passed": passed})
+        except Exception as e:
+            print(f"  ⚠️  Validation cache not updated ({e})")
+    return passed
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+def run_checks(sections: Dict[str, Tuple[SectionSpec, str]], project_data: Dict[str, Any],
+               llm=None) -> Dict[str, SectionResult]:
+    """
+    Run the checks of several sections (one parse per section, judge
+    prompts of all sections concurrently)
+
+    Args:
+        sections: key → (spec, section text with placeholders bound)
+        llm: Judge model (None = judge checks are skipped)
+
+    Returns:
+        key → SectionResult (checks in declaration order)
+    """
+    pending: Dict[str, List[list]] = {}
+    judge_jobs = []
+
+    for key, (spec, content) in sections.items():
+        parsed = ParsedSection(key, content)
+        entries = pending[key] = []
+        for check_id, check in check_ids(spec):
+            if check.kind == "judge":
+                if llm is None:
+                    continue
+                outcome = None
+            else:
+                outcome = evaluate(check, parsed, project_data)
+                if outcome is None:
+                    continue
+            if outcome is None:
+                outcome = [None, check.description, ()]
+                judge_jobs.append((outcome, spec, check_id, check, content))
+            entries.append([check, check_id, outcome])
+
+    if judge_jobs:
+        workers = min(VALIDATION_JUDGE_CONCURRENCY, len(judge_jobs))
+        print(f"  ⚖️  {len(judge_jobs)} LLM-judge checks ({workers} concurrent)")
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            verdicts = list(pool.map(lambda job: run_judge(*job[1:], llm), judge_jobs))
+        for (outcome, _, _, _, _), verdict in zip(judge_jobs, verdicts):
+            outcome[0] = verdict
+
+    results = {}
+    for key, entries in pending.items():
+        result = results[key] = SectionResult(key)
+        for check, check_id, (passed, template, args) in entries:
+            if passed is None:
+                continue  # judge could not answer
+            result.add(check.tier, check_id, passed, template, args, check.severity)
+    return results
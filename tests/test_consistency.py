@@ -0,0 +1,75 @@
+# test_consistency.py
+"""
+Claim extraction of the numeric consistency check (consistency_agent.py)
+
+Figures about the project headline that contradict the financial model are
+mismatches; figures about another subject (a component cost, another year,
+comparable clusters, a subset of members) must not be touched.
+
+    python tests/test_consistency.py
+    pytest tests/test_consistency.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from consistency_agent import check_section, extract_claims
+
+
+EXPECTED = {
+    "npv": 320.5,
+    "irr": 18.5,
+    "dscr": 1.85,
+    "project_cost": 82000000.0,
+    "loan_amount": 16400000.0,
+    "grant_amount": 57400000.0,
+    "members": 50.0,
+}
+
+OTHER_SUBJECT = [
+    "The total cost of the CFC building is ₹2.5 crore.",
+    "Working capital term loan of Rs 20 lakh is tied up with the bank.",
+    "The IRR of comparable clusters in 2019 was 14%.",
+    "DSCR for year 1 is 1.2, rising as the loan is repaid.",
+    "Of the 50 member units, 12 msme units are women-owned.",
+    "The project cost of the boundary wall is ₹40 lakh.",
+]
+
+
+def test_other_subject_figures_are_not_claims():
+    for text in OTHER_SUBJECT:
+        patched, _, mismatches = check_section(text, EXPECTED, auto_patch=True)
+        assert not mismatches, (text, mismatches)
+        assert patched == text
+
+
+def test_headline_mismatches_are_found():
+    text = ("The total project cost is ₹7.5 crore. The IRR of the project is 14%. "
+            "DSCR is 1.2. The cluster has 45 member units.")
+    _, checked, mismatches = check_section(text, EXPECTED, auto_patch=False)
+    assert checked == 4
+    assert sorted(m["metric"] for m in mismatches) == ["dscr", "irr", "members", "project_cost"]
+
+
+def test_flag_only_by_default():
+    text = "The IRR is 14% and the payback is short."
+    patched, _, mismatches = check_section(text, EXPECTED)
+    assert len(mismatches) == 1
+    assert patched == text
+
+
+def test_auto_patch_restates_expected_value():
+    patched, _, _ = check_section("The IRR is 14% and DSCR is 1.2.", EXPECTED, auto_patch=True)
+    assert patched == "The IRR is 18.5% and DSCR is 1.85."
+
+
+def test_thresholds_are_not_claims():
+    assert extract_claims("The IRR exceeds 12% and DSCR is above 1.5.") == []
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,89 @@
+# test_dpr_service.py
+"""
+Job lifecycle of the DPR service (dpr_service.py)
+
+A job that stops at a clarification question exposes the question and is
+resumed by a reply; token events are dropped once a job is idle.
+
+    pytest tests/test_dpr_service.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from dpr_service import DPRJobService
+
+
+QUESTION = "Which city is the cluster in?"
+
+
+class ClarifyingGraph:
+    """Asks for the location on the first run, completes once answered"""
+    def __init__(self):
+        self.inputs = []
+
+    def stream(self, init_state, config=None, stream_mode=None):
+        self.inputs.append(init_state)
+        on_progress = config["configurable"]["on_progress"]
+        messages = init_state["messages"]
+        if len(messages) == 1:
+            yield "updates", {"CLARIFICATION_AGENT": {}}
+            yield "values", {"messages": messages, "current_stage": "awaiting_clarification",
+                             "clarification": {"missing_fields": ["location"], "question": QUESTION}}
+            return
+        for text in ("Execu", "tive ", "Summary"):
+            on_progress({"type": "token", "section": "executive_summary", "text": text})
+        on_progress({"type": "section", "section": "executive_summary", "index": 1, "total": 21})
+        yield "updates", {"DOCUMENT_GENERATOR_AGENT": {}}
+        yield "values", {"messages": messages, "current_stage": "complete",
+                         "validation": {"valid": True}}
+
+
+def _run_next(service):
+    service._run_job(service.queue.get_nowait())
+
+
+def test_clarification_question_is_exposed_and_answered():
+    graph = ClarifyingGraph()
+    service = DPRJobService(graph, workers=1)
+    job = service.submit("Printing cluster DPR, 50 units")
+    _run_next(service)
+
+    data = job.to_dict()
+    assert data["status"] == "awaiting_clarification"
+    assert data["clarification"]["question"] == QUESTION
+    assert data["clarification"]["reply_url"] == f"/dpr/{job.id}/reply"
+    assert job.events[-1]["question"] == QUESTION
+
+    assert service.reply(job, "Tirupati")
+    assert not service.reply(job, "Tirupati")  # already queued
+    _run_next(service)
+
+    assert job.status == "complete"
+    assert [m.content for m in graph.inputs[-1]["messages"]] == ["Printing cluster DPR, 50 units", "Tirupati"]
+    assert "clarification" not in job.to_dict()
+
+
+def test_reply_needs_a_pending_question():
+    service = DPRJobService(ClarifyingGraph(), workers=1)
+    job = service.submit("Printing cluster DPR")
+    assert not service.reply(job, "Tirupati")
+
+
+def test_token_events_are_dropped_when_done():
+    service = DPRJobService(ClarifyingGraph(), workers=1)
+    job = service.submit("Printing cluster DPR")
+    _run_next(service)
+    service.reply(job, "Tirupati")
+    _run_next(service)
+
+    types = [event["type"] for event in job.events]
+    assert "token" not in types
+    assert "section" in types and "node" in types
+    seqs = [event["seq"] for event in job.events]
+    assert seqs == sorted(seqs) and job.next_seq > len(job.events)
+
+    # A late SSE listener resumes by sequence number across the gaps
+    events, idle = job.wait_for_events(seqs[2], timeout=0)
+    assert idle and [e["seq"] for e in events] == seqs[2:]
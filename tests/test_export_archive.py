@@ -0,0 +1,127 @@
+# test_export_archive.py
+"""
+Exported files vs the section store (export_archive.py)
+
+A section is stored once, as the blob the DPR state references; exports
+are plain files rendered from it. An edited export is restored on the next
+run (hash, not inode), an unchanged one is not rewritten, and blobs no run
+manifest references are garbage-collected after the grace period.
+
+    pytest tests/test_export_archive.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import section_store
+import export_archive
+from section_store import blob_path, content_hash
+
+
+def _isolated_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(section_store, "SECTION_STORE_DIR", str(tmp_path / "blobs"))
+    section_store.get_text.cache_clear()
+
+
+def _blobs(tmp_path):
+    root = tmp_path / "blobs"
+    return sorted(p.parent.name + p.name for p in root.glob("??/*")) if root.exists() else []
+
+
+def _age(digest, seconds):
+    old = time.time() - seconds
+    os.utime(blob_path(digest), (old, old))
+
+
+def test_export_is_a_plain_writable_file(monkeypatch, tmp_path):
+    _isolated_store(monkeypatch, tmp_path)
+    path = str(tmp_path / "01_executive_summary.md")
+    entry = export_archive.archive_file(path, "# Executive Summary\nNPV ₹2.87 crore\n")
+
+    assert entry["written"]
+    assert os.stat(path).st_nlink == 1
+    assert os.access(path, os.W_OK)
+
+
+def test_one_blob_per_section(monkeypatch, tmp_path):
+    _isolated_store(monkeypatch, tmp_path)
+    body = "NPV {{npv}}\n"
+    ref = section_store.store_section(body)
+    path = str(tmp_path / "01_executive_summary.md")
+
+    entry = export_archive.archive_file(path, "# Executive Summary\nNPV ₹2.87 crore\n",
+                                        section_blob=ref["blob"])
+    assert entry["section_blob"] == ref["blob"]
+    assert _blobs(tmp_path) == [ref["blob"]]
+
+
+def test_in_place_edit_is_restored(monkeypatch, tmp_path):
+    _isolated_store(monkeypatch, tmp_path)
+    content = "# Executive Summary\nNPV ₹2.87 crore\n"
+    path = str(tmp_path / "01_executive_summary.md")
+    first = export_archive.archive_file(path, content)
+
+    with open(path, "r+", encoding="utf-8") as f:  # in-place edit, same inode
+        f.write("# Edited")
+
+    # Next run: same content as last manifest, but the file was edited
+    second = export_archive.archive_file(path, content, previous=first)
+    assert not second["changed"]
+    assert second["written"]
+    with open(path, encoding="utf-8", newline="") as f:
+        assert content_hash(f.read()) == second["sha256"]
+    assert export_archive.file_hash(path, second) == second["sha256"]
+
+
+def test_unchanged_file_is_not_rewritten(monkeypatch, tmp_path):
+    _isolated_store(monkeypatch, tmp_path)
+    path = str(tmp_path / "02_swot_analysis.md")
+    first = export_archive.archive_file(path, "# SWOT\nbody\n")
+    inode = os.stat(path).st_ino
+
+    second = export_archive.archive_file(path, "# SWOT\nbody\n", previous=first)
+    assert os.stat(path).st_ino == inode
+    assert second["mtime_ns"] == first["mtime_ns"]
+    assert not second["written"]
+
+
+def test_version_1_manifest_entry_is_understood(monkeypatch, tmp_path):
+    _isolated_store(monkeypatch, tmp_path)
+    content = "# Market Analysis\nbody\n"
+    path = str(tmp_path / "05_market_analysis.md")
+    previous = {"blob": content_hash(content), "method": "copy"}
+
+    entry = export_archive.archive_file(path, content, previous=previous)
+    assert not entry["changed"]
+
+
+def test_gc_removes_only_old_unreferenced_blobs(monkeypatch, tmp_path):
+    _isolated_store(monkeypatch, tmp_path)
+    referenced = section_store.put_text("kept: in a manifest")
+    abandoned = section_store.put_text("removed: old and unreferenced")
+    fresh = section_store.put_text("kept: a run still in flight")
+    _age(referenced, 30 * 86400)
+    _age(abandoned, 30 * 86400)
+
+    export_dir = tmp_path / "output" / "Printing_Industry_Tirupati"
+    export_dir.mkdir(parents=True)
+    files = {"01_executive_summary.md": {"sha256": "x", "section_blob": referenced}}
+    export_archive.write_manifest(str(export_dir), files, {})
+
+    stats = export_archive.gc_blobs(str(tmp_path / "output"), grace_seconds=86400)
+    assert stats["removed"] == 1
+    assert stats["kept"] == 2
+    assert _blobs(tmp_path) == sorted([referenced, fresh])
+
+
+def test_reused_blob_is_not_collected(monkeypatch, tmp_path):
+    _isolated_store(monkeypatch, tmp_path)
+    digest = section_store.put_text("section body")
+    _age(digest, 30 * 86400)
+
+    assert section_store.put_text("section body") == digest  # stored again by a new run
+    stats = export_archive.gc_blobs(str(tmp_path / "output"), grace_seconds=86400)
+    assert stats["removed"] == 0
+    assert os.path.exists(blob_path(digest))
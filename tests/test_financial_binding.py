@@ -0,0 +1,62 @@
+# test_financial_binding.py
+"""
+Financial figures in the public section generators (document_generator.py)
+
+Prompts carry {{npv}}-style placeholders (config.FINANCIAL_PLACEHOLDERS);
+the generate_* wrappers must return the figures bound to the financial
+data they were given. Only the graph (bind=False) keeps the placeholders
+until export.
+
+    pytest tests/test_financial_binding.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from section_registry import SECTIONS
+from financial_placeholders import has_placeholders
+from document_generator import (
+    generate_executive_summary, generate_financial_plan, generate_economic_viability,
+    generate_section
+)
+
+
+FINANCIAL_DATA = {
+    "metrics": {"npv": 28700000, "irr": 15.5, "dscr": 1.85,
+                "breakeven_percentage": 42.0, "payback_period_years": 5.2},
+    "loan_details": {"grant_amount": 57400000, "loan_amount": 16400000},
+}
+
+PROJECT_DATA = {"cluster_type": "Printing", "location": "Tirupati, Andhra Pradesh",
+                "members": 50, "project_cost": 82000000}
+
+
+class AnswerWithPlaceholders:
+    """Stand-in model: every required heading, figures as placeholders"""
+    def __init__(self, key):
+        self.spec = SECTIONS[key]
+
+    def invoke(self, messages):
+        body = "\n\n".join(f"{heading}\nNPV {{{{npv}}}}, IRR {{{{irr}}}}."
+                           for heading in self.spec.required_headings or ("## Overview",))
+
+        class Response:
+            content = body
+        return Response()
+
+
+def test_wrappers_bind_figures():
+    for key, generate in (("executive_summary", generate_executive_summary),
+                          ("financial_plan", generate_financial_plan),
+                          ("economic_viability", generate_economic_viability)):
+        content = generate(PROJECT_DATA, FINANCIAL_DATA, AnswerWithPlaceholders(key))
+        assert not has_placeholders(content), key
+        assert "15.5" in content, key
+
+
+def test_graph_keeps_placeholders():
+    spec = SECTIONS["executive_summary"]
+    content = generate_section(spec, PROJECT_DATA, FINANCIAL_DATA,
+                               AnswerWithPlaceholders(spec.key), bind=False)
+    assert "{{npv}}" in content
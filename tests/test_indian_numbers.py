@@ -0,0 +1,47 @@
+# test_indian_numbers.py
+"""
+Parsing and formatting of rupee amounts (indian_numbers.py)
+
+    pytest tests/test_indian_numbers.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from indian_numbers import parse_rupee_amount, format_inr, format_crore, find_amounts
+
+
+def test_parse_rupee_amount():
+    assert parse_rupee_amount("₹8.2 crore") == 82_000_000
+    assert parse_rupee_amount("Rs. 45 lakh") == 4_500_000
+    assert parse_rupee_amount("₹8,20,00,000") == 82_000_000
+    assert parse_rupee_amount("82,000,000") == 82_000_000
+    assert parse_rupee_amount("INR 2.5 million") == 2_500_000
+    assert parse_rupee_amount("5,00,00,000/-") == 50_000_000
+    assert parse_rupee_amount("₹8.2 crore (approx)") == 82_000_000
+    assert parse_rupee_amount("about eight crore") is None
+    assert parse_rupee_amount("₹8.2 crore and ₹1 lakh") is None
+
+
+def test_format_inr():
+    assert format_inr(82_000_000) == "₹8,20,00,000"
+    assert format_inr(999) == "₹999"
+    assert format_inr(123456.789, 2) == "₹1,23,456.79"
+    assert format_inr(-4_500_000) == "-₹45,00,000"
+    assert format_crore(82_000_000) == "₹8.20 crore"
+    assert format_crore(4_500_000) == "₹45.00 lakh"
+    assert format_crore(50_000) == "₹50,000"
+
+
+def test_find_amounts():
+    text = "The project costs ₹8.2 crore (₹8,20,00,000), with a grant of 45 lakh and Rs 2 million loan."
+    assert find_amounts(text) == (82_000_000, 82_000_000, 4_500_000, 2_000_000)
+    assert find_amounts("Sanctioned 3.5 cr in 2023 for 50 units at 25%.") == (35_000_000,)
+
+
+def test_counts_are_not_amounts():
+    assert find_amounts("The cluster produces 5 million pieces a year.") == ()
+    assert find_amounts("It employs 2 thousand workers.") == ()
+    assert find_amounts("The portal has 3 k users.") == ()
+    assert find_amounts("Output of 12 mn units, 1 billion impressions.") == ()
@@ -0,0 +1,76 @@
+# test_prompt_compiler.py
+"""
+Shared-prefix prompts (prompt_compiler.py)
+
+On models with implicit prefix caching every section is sent as the
+byte-identical shared prefix plus its own suffix, with the section's
+"PROJECT DATA:" block replaced by a pointer to the fact sheet.
+
+    pytest tests/test_prompt_compiler.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from langchain_core.messages import SystemMessage, HumanMessage
+
+from section_registry import SECTIONS
+from document_generator import build_section_prompt
+from prompt_compiler import PromptCompiler, FACT_BLOCK_REPLACEMENT, prompt_hash
+
+
+PROJECT_DATA = {"cluster_type": "Printing", "location": "Tirupati, Andhra Pradesh",
+                "members": 50, "project_cost": 82000000, "grant_scheme": "MSE-CDP"}
+
+
+class RecordingModel:
+    model_name = "gemini-2.5-flash"
+
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, messages):
+        self.prompts.append(messages)
+
+        class Response:
+            content = "## Overview\nText."
+            usage_metadata = {}
+        return Response()
+
+
+def test_shared_prefix_by_model():
+    assert PromptCompiler(PROJECT_DATA, {}, model_name="gemini-2.5-flash").active
+    assert PromptCompiler(PROJECT_DATA, {}, model_name="gemini-2.5-pro").active
+    assert not PromptCompiler(PROJECT_DATA, {}, model_name="gemini-2.0-flash-exp").active
+    assert not PromptCompiler(PROJECT_DATA, {}, shared_prefix_without_cache=False,
+                              model_name="gemini-2.5-flash").active
+
+
+def test_compiled_prompts_share_one_prefix():
+    compiler = PromptCompiler(PROJECT_DATA, {}, model_name=RecordingModel.model_name)
+    model = RecordingModel()
+
+    for key in ("swot_analysis", "risk_analysis", "executive_summary"):
+        original = build_section_prompt(SECTIONS[key], PROJECT_DATA)
+        compiler.bind(model, key).invoke(original)
+
+        system, suffix = model.prompts[-1]
+        assert isinstance(system, SystemMessage) and isinstance(suffix, HumanMessage)
+        assert system.content == compiler.shared_prefix
+        assert "PROJECT FACT SHEET" in system.content
+        assert SECTIONS[key].system_prompt in suffix.content
+
+        entry = compiler.stats[key]
+        assert entry["compiled"] and not entry["cached_prefix"]
+        assert entry["prompt_hash"] == prompt_hash(original)
+
+    assert any(FACT_BLOCK_REPLACEMENT in suffix.content for _, suffix in model.prompts)
+    assert "PROJECT DATA:\n- " not in "".join(suffix.content for _, suffix in model.prompts)
+
+
+def test_cached_prefix_sends_only_suffix():
+    compiler = PromptCompiler(PROJECT_DATA, {}, model_name="gemini-2.0-flash-exp")
+    compiler.cache_name = "projects/p/locations/l/cachedContents/1"
+    compiled = compiler.compile(build_section_prompt(SECTIONS["swot_analysis"], PROJECT_DATA))
+    assert len(compiled) == 1 and isinstance(compiled[0], HumanMessage)
@@ -0,0 +1,121 @@
+# test_rate_governor.py
+"""
+Admission control of LLM calls (rate_governor.py, llm_resilience.py)
+
+- waiting coroutines don't occupy threads; timed-out and cancelled waits
+  leave the queue without a permit
+- an attempt's deadline and latency start once it holds a permit
+- only real quota errors count as 429s
+
+    pytest tests/test_rate_governor.py
+"""
+import os
+import sys
+import time
+import asyncio
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import llm_resilience
+from rate_governor import RateGovernor, is_rate_limit_error
+from llm_resilience import invoke_resilient, LLMCallTimeout, LatencyTracker
+
+
+class SlowModel:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        time.sleep(self.seconds)
+
+        class Response:
+            content = "answer"
+            usage_metadata = {}
+        return Response()
+
+
+def _use_governor(monkeypatch, governor):
+    monkeypatch.setattr(llm_resilience, "get_governor", lambda: governor)
+    monkeypatch.setattr(llm_resilience, "latency_tracker", LatencyTracker())
+
+
+def test_waiting_coroutines_use_no_threads():
+    governor = RateGovernor(0, 0, max_concurrency=1)
+
+    async def main():
+        held = await governor.aacquire(10)
+        threads = threading.active_count()
+        waiters = [asyncio.ensure_future(governor.aacquire(10)) for _ in range(50)]
+        await asyncio.sleep(0.05)
+        assert threading.active_count() == threads
+        assert governor.snapshot()["waiting"] == 50
+
+        governor.release(held)
+        for waiter in waiters:
+            governor.release(await waiter)
+        assert governor.snapshot()["in_flight"] == 0
+
+    asyncio.run(main())
+
+
+def test_cancelled_and_timed_out_waits_leave_the_queue():
+    governor = RateGovernor(0, 0, max_concurrency=1)
+
+    async def main():
+        held = await governor.aacquire(10)
+        waiter = asyncio.ensure_future(governor.aacquire(10))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert await governor.aacquire(10, timeout=0.05) is None
+        assert governor.acquire(10, timeout=0.05) is None
+        assert governor.snapshot()["waiting"] == 0
+        governor.release(held)
+        assert governor.snapshot()["in_flight"] == 0
+
+    asyncio.run(main())
+
+
+def test_deadline_starts_with_the_permit(monkeypatch):
+    governor = RateGovernor(0, 0, max_concurrency=1)
+    _use_governor(monkeypatch, governor)
+    held = governor.acquire(10)
+    threading.Timer(0.3, governor.release, args=(held,)).start()
+
+    # 0.3 s in the queue + 0.25 s call > 0.5 s, but each part is within it
+    invoke_resilient(SlowModel(0.25), "prompt", timeout=0.5, max_retries=0, hedge=False)
+    latency = llm_resilience.latency_tracker.hedge_delay(None, min_samples=1)
+    assert 0.2 < latency < 0.3
+    assert governor.snapshot()["in_flight"] == 0
+
+
+def test_no_permit_no_call(monkeypatch):
+    governor = RateGovernor(0, 0, max_concurrency=1)
+    _use_governor(monkeypatch, governor)
+    held = governor.acquire(10)
+    model = SlowModel(0)
+
+    with pytest.raises(LLMCallTimeout):
+        invoke_resilient(model, "prompt", timeout=0.1, max_retries=0, hedge=False)
+    governor.release(held)
+    time.sleep(0.05)
+    assert model.calls == 0
+    assert governor.snapshot()["waiting"] == 0
+
+
+def test_rate_limit_errors():
+    class ResourceExhausted(Exception):
+        pass
+
+    assert is_rate_limit_error(ResourceExhausted("quota"))
+    assert is_rate_limit_error(Exception("429 Too Many Requests"))
+    assert is_rate_limit_error(Exception("HTTP 429: slow down"))
+    assert is_rate_limit_error(Exception("RESOURCE_EXHAUSTED: quota exceeded"))
+    assert not is_rate_limit_error(Exception("Invalid token at position 429"))
+    assert not is_rate_limit_error(Exception("Processed 14290 rows, section 429 failed"))
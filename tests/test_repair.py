@@ -0,0 +1,121 @@
+# test_repair.py
+"""
+Repair rounds (repair_agent.py): only failing subsections are regenerated,
+and a section's repair stops at the first round that does not improve it
+
+    pytest tests/test_repair.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import repair_agent
+from section_registry import SECTIONS
+
+
+SECTION = "\n\n".join(f"{heading}\nBody." for heading in SECTIONS["executive_summary"].required_headings)
+
+
+def _result(score, failures=()):
+    return {
+        "overall_score": score,
+        "ready_for_submission": score >= 80,
+        "breakdown": {"content": {"checks": [
+            {"id": f"C1.{n}", "description": failure, "passed": False}
+            for n, failure in enumerate(failures, 1)
+        ]}},
+    }
+
+
+class SubsectionModel:
+    """Stand-in model answering with the requested subsection"""
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        heading = next(line for line in messages[-1].content.splitlines()[::-1]
+                       if line.startswith("## "))
+
+        class Response:
+            content = f"{heading}\nRewritten body."
+        return Response()
+
+
+def test_stops_after_round_without_gain(monkeypatch):
+    spec = SECTIONS["executive_summary"]
+    failing = _result(60, ["Financial highlights lack IRR", "Recommendation is vague"])
+    monkeypatch.setattr(repair_agent, "validate_section", lambda *args: failing)
+    model = SubsectionModel()
+
+    content, result, report = repair_agent.repair_section(spec, SECTION, failing, {}, {}, model, rounds=5)
+    assert report["rounds"] == 1
+    assert model.calls == 2
+    assert content == SECTION
+
+
+def test_improving_rounds_continue(monkeypatch):
+    spec = SECTIONS["executive_summary"]
+    scores = iter([65, 70, 75])
+    monkeypatch.setattr(repair_agent, "validate_section",
+                        lambda *args: _result(next(scores), ["Recommendation is vague"]))
+    model = SubsectionModel()
+
+    content, result, report = repair_agent.repair_section(
+        spec, SECTION, _result(60, ["Recommendation is vague"]), {}, {}, model, rounds=3)
+    assert report["rounds"] == 3
+    assert result["overall_score"] == 75
+    assert "Rewritten body." in content
+
+
+def test_missing_subsection_is_restored():
+    spec = SECTIONS["executive_summary"]
+    content = SECTION.replace("## Expected Impact\nBody.\n\n", "")
+    targets = repair_agent.failing_subsections(spec, content, None)
+    assert list(targets) == ["## Expected Impact"]
+
+
+def test_section_wide_failures_are_not_rewritten():
+    # Keyword / word-budget failures and sections without ## subsections
+    failing = _result(50, ["Covers competitive landscape", "At least 600 words"])
+    assert repair_agent.failing_subsections(SECTIONS["executive_summary"], SECTION, failing) == {}
+    assert repair_agent.failing_subsections(SECTIONS["swot_analysis"], "# SWOT\nBody.", failing) == {}
+
+
+class FailingModel:
+    """Stand-in model that never answers (outage / every retry timed out)"""
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        raise TimeoutError("model unavailable")
+
+
+def test_failed_calls_leave_section_unchanged(monkeypatch):
+    spec = SECTIONS["executive_summary"]
+    failing = _result(60, ["Financial highlights lack IRR", "Recommendation is vague"])
+    monkeypatch.setattr(repair_agent, "validate_section", lambda *args: failing)
+    monkeypatch.setattr(repair_agent, "invoke_resilient", lambda llm, messages, **kwargs: llm.invoke(messages))
+
+    content, result, report = repair_agent.repair_section(spec, SECTION, failing, {}, {},
+                                                          FailingModel(), rounds=2)
+    assert content == SECTION
+    assert [error["subsection"] for error in report["errors"]] == ["## Financial Highlights",
+                                                                   "## Recommendation"]
+
+
+def test_repair_agent_never_fails_the_run(monkeypatch):
+    failing = _result(60, ["Recommendation is vague"])
+    monkeypatch.setattr(repair_agent, "get_llm", lambda **kwargs: FailingModel())
+    monkeypatch.setattr(repair_agent, "validate_section",
+                        lambda *args: (_ for _ in ()).throw(RuntimeError("validator crashed")))
+    monkeypatch.setattr(repair_agent, "invoke_resilient", lambda llm, messages, **kwargs: llm.invoke(messages))
+    monkeypatch.setattr(repair_agent, "store_section", lambda text: text)
+
+    state = {"dpr_sections": {"executive_summary": SECTION, "financial": {}},
+             "validation_results": {"executive_summary": failing}, "project_data": {}}
+    update = repair_agent.repair_agent(state, {"configurable": {"repair_rounds": 1}})
+    assert "executive_summary" not in update["dpr_sections"]  # state keeps the validated text
+    assert update["repair"]["sections"]["executive_summary"]["errors"]
@@ -0,0 +1,138 @@
+# test_section_index.py
+"""
+Adversarial-input benchmark for the validators' subsection extraction
+
+Every validator runs on pathological ~200 KB sections (marker floods,
+keyword floods without the closing keyword, one huge line) and must finish
+within MAX_SECONDS - the old lazy-DOTALL / ".*" chain patterns took
+minutes on inputs like these. The registry checks of the other 17 sections
+(validation_engine.py) get the same bound for all of them together.
+
+    python tests/test_section_index.py      (prints timings)
+    pytest tests/test_section_index.py
+"""
+import io
+import os
+import re
+import sys
+import time
+import contextlib
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import validation_cache
+from section_registry import SECTION_REGISTRY
+from validation_engine import run_checks
+from section_index import subsection, numbered_subsection, keywords_in_order, clauses
+from validation_agent import validate_section
+
+MAX_SECONDS = 2.0
+SIZE = 200_000
+
+PROJECT_DATA = {
+    "cluster_type": "Printing Industry",
+    "location": "Tirupati, Andhra Pradesh",
+    "members": 50,
+    "project_cost": 82000000,
+}
+
+FINANCIAL_DATA = {
+    "metrics": {"npv": 28700000, "irr": 15.5, "dscr": 3.5,
+                "breakeven_percentage": 55, "payback_period_years": 4.5},
+    "loan_details": {"grant_amount": 57400000, "grant_percentage": 70, "loan_amount": 24600000},
+}
+
+SECTIONS = ["executive_summary", "financial_plan", "technical_feasibility", "market_analysis"]
+
+
+@pytest.fixture(autouse=True, scope="module")
+def no_validation_cache():
+    """Tier results must be computed, not read from the cache"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(validation_cache, "VALIDATION_CACHE", False)
+        yield
+
+
+def _fill(unit: str) -> str:
+    return unit * (SIZE // len(unit))
+
+
+ADVERSARIAL_INPUTS = {
+    "heading markers on one line": _fill("## "),
+    "unclosed bold markers": "**1. TECHNOLOGY*" + "x" * SIZE,
+    "repeated bold openers": _fill("**1. TECHNOLOGY **1. MARKET "),
+    "order keywords, last one missing": _fill("market size target competition technology equipment "),
+    "heading keyword flood": _fill("## Project Cost ## Funding ## Debt "),
+    "source words without full stop": _fill("report according to study "),
+    "technology without overview": _fill("technology "),
+    "long real-looking section": "# EXECUTIVE SUMMARY\n\n" + _fill(
+        "## Project Overview\nThe project cost is ₹8.2 crore for 50 member units.\n\n"),
+}
+
+
+def _validate_timed(content: str, key: str) -> float:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        validate_section(key, content, PROJECT_DATA, FINANCIAL_DATA)
+    return time.perf_counter() - started
+
+
+def test_adversarial_inputs_bounded_time():
+    for name, content in ADVERSARIAL_INPUTS.items():
+        for key in SECTIONS:
+            elapsed = _validate_timed(content, key)
+            assert elapsed < MAX_SECONDS, f"{key} on '{name}' took {elapsed:.2f}s"
+
+
+def test_registry_checks_bounded_time():
+    # The other 17 sections: one engine pass per DPR, one parse per section
+    specs = [spec for spec in SECTION_REGISTRY if spec.checks]
+    for name, content in ADVERSARIAL_INPUTS.items():
+        started = time.perf_counter()
+        results = run_checks({spec.key: (spec, content) for spec in specs}, PROJECT_DATA)
+        elapsed = time.perf_counter() - started
+        assert len(results) == len(specs)
+        assert elapsed < MAX_SECONDS, f"registry checks on '{name}' took {elapsed:.2f}s"
+
+
+def test_subsection_matches_heading_pattern():
+    content = ("# FINANCIAL PLAN\n\n## Project Cost Breakdown\nEquipment ₹5 crore\n\n"
+               "### Details\nmore\n\n## Funding Structure\nGrant 70%\n")
+    assert subsection(content, "Project Cost").strip() == "Equipment ₹5 crore"
+    assert subsection(content, "funding").strip() == "Grant 70%"
+    assert subsection(content, "Debt") == ""
+
+
+def test_numbered_subsection_stops_at_next_marker():
+    content = "**1. TECHNOLOGY OVERVIEW**\nalpha beta\n**2. EQUIPMENT**\ngamma"
+    assert numbered_subsection(content, 1, "TECHNOLOGY").split() == ["alpha", "beta"]
+    assert numbered_subsection(content, 1, "MARKET") == ""
+
+
+def test_keywords_in_order_equals_dotall_chain():
+    keywords = ["market", "size", "demand"]
+    samples = ["Market size and demand", "demand before market size", "market\nsize\n\ndemand",
+               "market size", "MARKETSIZEDEMAND", ""]
+    for sample in samples:
+        expected = bool(re.search(".*".join(keywords), sample, re.IGNORECASE | re.DOTALL))
+        assert keywords_in_order(sample, keywords) == expected, sample
+
+
+def test_clauses_count_like_findall():
+    pattern = r'(?:source|according to|based on|report|study).*?(?:\.|:)'
+    text = "According to a report: demand grows. Source. no terminator source\nstudy here."
+    words = ["source", "according to", "based on", "report", "study"]
+    found = [c for c in clauses(text) if any(w in c.lower() for w in words)]
+    assert len(found) == len(re.findall(pattern, text, re.IGNORECASE))
+
+
+if __name__ == "__main__":
+    validation_cache.VALIDATION_CACHE = False
+    print(f"\nValidator time on ~{SIZE // 1000} KB adversarial sections (limit {MAX_SECONDS}s)\n")
+    for name, content in ADVERSARIAL_INPUTS.items():
+        timings = "  ".join(f"{key.split('_')[0]:>9} {_validate_timed(content, key) * 1000:7.1f}ms"
+                            for key in SECTIONS)
+        print(f"  {name:<36} {timings}")
+    print()
@@ -0,0 +1,131 @@
+# test_validation_cache.py
+"""
+Rule versions of cached validation tiers (validation_cache.py)
+
+Editing one tier function invalidates only that tier's cached rows;
+editing a helper it calls invalidates every tier that calls it.
+
+    pytest tests/test_validation_cache.py
+"""
+import os
+import sys
+import importlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import validation_cache
+
+
+TIERS_SOURCE = '''
+from validation_cache import cached_tier
+
+
+def count_words(content):
+    return len(content.split())
+
+
+@cached_tier
+def validate_demo_structure(content, project_data):
+    return {"tier": "Structure", "words": count_words(content)}
+
+
+@cached_tier
+def validate_demo_content(content, project_data):
+    return {"tier": "Content", "chars": len(content)}
+
+
+@cached_tier
+def validate_demo_quality(content, project_data):
+    return {"tier": "Quality", "long": count_words(content) > 3}
+'''
+
+
+def _load(tmp_path, source):
+    (tmp_path / "demo_tiers.py").write_text(source, encoding="utf-8")
+    sys.modules.pop("demo_tiers", None)
+    importlib.invalidate_caches()
+    return importlib.import_module("demo_tiers")
+
+
+def _cached_tiers(module, capsys):
+    capsys.readouterr()
+    for name in ("validate_demo_structure", "validate_demo_content", "validate_demo_quality"):
+        getattr(module, name)("one two three four", {"cluster_type": "Printing"})
+    output = capsys.readouterr().out
+    return {name for name in ("structure", "content", "quality")
+            if f"validate_demo_{name}: cached result" in output}
+
+
+def _isolated_cache(monkeypatch, tmp_path):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(validation_cache, "VALIDATION_CACHE", True)
+    monkeypatch.setattr(validation_cache, "VALIDATION_CACHE_FILE", str(tmp_path / "cache.sqlite3"))
+
+
+def test_edited_tier_invalidates_only_its_rows(monkeypatch, tmp_path, capsys):
+    _isolated_cache(monkeypatch, tmp_path)
+    module = _load(tmp_path, TIERS_SOURCE)
+    assert _cached_tiers(module, capsys) == set()
+    assert _cached_tiers(module, capsys) == {"structure", "content", "quality"}
+
+    edited = TIERS_SOURCE.replace('"chars": len(content)', '"chars": len(content.strip())')
+    module = _load(tmp_path, edited)
+    assert _cached_tiers(module, capsys) == {"structure", "quality"}
+
+
+def test_edited_helper_invalidates_its_callers(monkeypatch, tmp_path, capsys):
+    _isolated_cache(monkeypatch, tmp_path)
+    module = _load(tmp_path, TIERS_SOURCE)
+    _cached_tiers(module, capsys)
+
+    edited = TIERS_SOURCE.replace("len(content.split())", "len(content.split(' '))")
+    module = _load(tmp_path, edited)
+    assert _cached_tiers(module, capsys) == {"content"}
+
+
+def test_shared_modules_are_versioned():
+    assert len(validation_cache.helpers_version()) == 64
+    assert "section_index" in validation_cache.VALIDATION_HELPER_MODULES
+    assert "indian_numbers" in validation_cache.VALIDATION_HELPER_MODULES
+
+
+class FlakyJudge:
+    """LLM judge that is down for its first call, then answers PASS"""
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("Vertex AI unavailable")
+
+        class Response:
+            content = "PASS - covers challenges and context"
+        return Response()
+
+
+def test_judge_fallback_is_not_cached(monkeypatch, tmp_path):
+    import validation_agent
+
+    _isolated_cache(monkeypatch, tmp_path)
+    monkeypatch.setattr(validation_agent, "invoke_resilient",
+                        lambda llm, messages, **kwargs: llm.invoke(messages))
+    content = ("## Project Overview\nPrinting cluster in Tirupati.\n\n"
+               "## Cluster Profile\nFifty printing units face high costs.\n")
+    project_data = {"cluster_type": "Printing", "location": "Tirupati"}
+    judge = FlakyJudge()
+
+    def c12(result):
+        return next(detail["message"] for detail in result["details"] if detail["check"] == "C1.2")
+
+    first = validation_agent.validate_executive_summary_content(content, project_data, judge)
+    assert c12(first) == "LLM check unavailable, manual review needed"
+    assert "_uncacheable" not in first
+
+    second = validation_agent.validate_executive_summary_content(content, project_data, judge)
+    assert judge.calls == 2
+    assert c12(second) != c12(first)
+
+    third = validation_agent.validate_executive_summary_content(content, project_data, judge)
+    assert judge.calls == 2  # the real verdict is cached
+    assert third == second
@@ -0,0 +1,51 @@
+# test_validation_engine.py
+"""
+Check ids of the registry checks (validation_engine.py)
+
+An id is fixed by the check's position in its section - skipped checks (no
+judge model, project field not set) must not renumber the others.
+
+    pytest tests/test_validation_engine.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import validation_cache
+from section_registry import SECTION_REGISTRY
+from validation_engine import check_ids, run_checks
+
+
+PROJECT_DATA = {"cluster_type": "Printing", "location": "Tirupati, Andhra Pradesh"}
+
+
+class PassJudge:
+    def invoke(self, messages):
+        class Response:
+            content = "PASS - specific enough"
+        return Response()
+
+
+def _ids(result):
+    return {check.id: check.message for check in result.checks()}
+
+
+def test_ids_unique_per_section():
+    for spec in SECTION_REGISTRY:
+        ids = [check_id for check_id, _ in check_ids(spec)]
+        assert len(ids) == len(set(ids)), spec.key
+
+
+def test_skipped_checks_keep_other_ids(monkeypatch):
+    monkeypatch.setattr(validation_cache, "VALIDATION_CACHE", False)
+    specs = [spec for spec in SECTION_REGISTRY if spec.checks]
+    sections = {spec.key: (spec, f"# {spec.title}\nPrinting cluster in Tirupati.") for spec in specs}
+
+    full = run_checks(sections, PROJECT_DATA, llm=PassJudge())
+    partial = run_checks(sections, {}, llm=None)
+    for spec in specs:
+        full_ids, partial_ids = _ids(full[spec.key]), _ids(partial[spec.key])
+        assert len(partial_ids) < len(full_ids), spec.key
+        for check_id, message in partial_ids.items():
+            assert full_ids[check_id] == message, (spec.key, check_id)